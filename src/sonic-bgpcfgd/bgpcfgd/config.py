@@ -1,11 +1,275 @@
+import re
+import time
+
+from .log import log_crit
+
+
+
+class FRRConfigModel(object):
+    """
+    FRR running configuration, split into top-level stanzas and indexed by stanza type and name.
+    route-map, prefix-list and community-list stanzas could be updated in place from the commands
+    bgpcfgd pushes to FRR, so the config doesn't have to be re-read after every commit.
+    """
+    ROUTE_MAP = 'route-map'
+    PREFIX_LIST = 'prefix-list'
+    COMMUNITY_LIST = 'community-list'
+    OTHER = 'other'
+
+    re_route_map = re.compile(r'^route-map (\S+) (permit|deny) (\d+)$')
+    re_no_route_map = re.compile(r'^no route-map (\S+)(?: (permit|deny) (\d+))?$')
+    re_prefix_list = re.compile(r'^(ip|ipv6) prefix-list (\S+) seq (\d+) (.+)$')
+    re_no_prefix_list = re.compile(r'^no (ip|ipv6) prefix-list (\S+)(?: seq (\d+).*)?$')
+    re_community_list = re.compile(r'^bgp community-list (?:standard|expanded) (\S+) .+$')
+    re_no_community_list = re.compile(r'^no bgp community-list (?:standard|expanded) (\S+)$')
+    re_neighbor = re.compile(r'^\s*neighbor (\S+) (.+)$')
+
+    # route-map entry commands which replace the previous value of the same command
+    route_map_commands = (
+        'match ip address prefix-list ',
+        'match ipv6 address prefix-list ',
+        'match community ',
+        'match tag ',
+        'set community ',
+        'set comm-list ',
+        'set tag ',
+        'set local-preference ',
+        'set origin ',
+        'call ',
+        'on-match ',
+    )
+
+    def __init__(self, lines):
+        """
+        Parse FRR configuration
+        :param lines: list of configuration lines without comments
+        """
+        self.stanzas = {}
+        self.index = {self.ROUTE_MAP: {}, self.PREFIX_LIST: {}, self.COMMUNITY_LIST: {}}
+        self.neighbors = None
+        self.n_other = 0
+        self.generation = 0
+        current = None
+        for line in lines:
+            if line.strip() != '' and not line.startswith(' '):
+                current = self.__add_stanza(self.__stanza_key(line), line)
+            elif current is None:
+                current = self.__add_stanza(self.__other_key(), line)
+            else:
+                self.stanzas[current].append(line)
+
+    def get_text(self):
+        """
+        Return configuration lines
+        :return: list of configuration lines in the order they were read or added
+        """
+        text = []
+        for lines in self.stanzas.values():
+            text.extend(lines)
+        return text
+
+    def get_route_map(self, name):
+        """
+        Get entries of the route-map
+        :param name: name of the route-map
+        :return: a list of tuples (action, sequence number, list of stripped entry commands) sorted by sequence number
+        """
+        entries = self.index[self.ROUTE_MAP].get(name, {})
+        return [self.__route_map_entry(entries[seq]) for seq in sorted(entries)]
+
+    def get_route_map_entry(self, name, seq):
+        """
+        Get one entry of the route-map
+        :param name: name of the route-map
+        :param seq: sequence number of the entry
+        :return: a tuple (action, sequence number, list of stripped entry commands) or None if the entry doesn't exist
+        """
+        key = self.index[self.ROUTE_MAP].get(name, {}).get(seq)
+        return self.__route_map_entry(key) if key is not None else None
+
+    def get_prefix_list(self, family, name):
+        """
+        Get rules of the prefix-list
+        :param family: 'ip' or 'ipv6'
+        :param name: name of the prefix-list
+        :return: a list of tuples (sequence number, rule) sorted by sequence number
+        """
+        entries = self.index[self.PREFIX_LIST].get((family, name), {})
+        result = []
+        for seq in sorted(entries):
+            matched = self.re_prefix_list.match(self.stanzas[entries[seq]][0])
+            result.append((seq, matched.group(4)))
+        return result
+
+    def get_community_list(self, name):
+        """
+        Get lines of the community-list
+        :param name: name of the community-list
+        :return: a list of community-list lines
+        """
+        return list(self.index[self.COMMUNITY_LIST].get(name, {}))
+
+    def get_neighbors(self):
+        """
+        Get neighbor and peer-group statements from all stanzas which are not indexed (router bgp, ...)
+        :return: a dictionary: key - neighbor or peer-group name, value - list of its statements without the name
+        """
+        if self.neighbors is None:
+            self.neighbors = {}
+            for key, lines in self.stanzas.items():
+                if key[0] != self.OTHER:
+                    continue
+                for line in lines:
+                    matched = self.re_neighbor.match(line)
+                    if matched:
+                        self.neighbors.setdefault(matched.group(1), []).append(matched.group(2))
+        return self.neighbors
+
+    def apply(self, cmds):
+        """
+        Update the model with commands which were successfully written to FRR
+        :param cmds: list of FRR commands
+        :return: True if all commands were applied, False if the model can't follow the commands
+                 and should be re-read from FRR
+        """
+        self.generation += 1
+        current = None
+        for cmd in cmds:
+            s_cmd = cmd.strip()
+            if s_cmd == '' or s_cmd.startswith('!'):
+                continue
+            if cmd.startswith(' '):
+                if current is None or not self.__apply_route_map_command(current, s_cmd):
+                    return False
+                continue
+            current = None
+            matched = self.re_route_map.match(s_cmd)
+            if matched:
+                current = (self.ROUTE_MAP, matched.group(1), int(matched.group(3)))
+                if current in self.stanzas:
+                    self.stanzas[current][0] = s_cmd
+                else:
+                    self.__add_stanza(current, s_cmd)
+                continue
+            matched = self.re_prefix_list.match(s_cmd)
+            if matched:
+                key = (self.PREFIX_LIST, (matched.group(1), matched.group(2)), int(matched.group(3)))
+                self.__remove_stanza(key)
+                self.__add_stanza(key, s_cmd)
+                continue
+            matched = self.re_community_list.match(s_cmd)
+            if matched:
+                key = (self.COMMUNITY_LIST, matched.group(1), s_cmd)
+                if key not in self.stanzas:
+                    self.__add_stanza(key, s_cmd)
+                continue
+            matched = self.re_no_route_map.match(s_cmd)
+            if matched:
+                name, seq = matched.group(1), matched.group(3)
+                if not self.__remove_named(self.ROUTE_MAP, name, int(seq) if seq else None):
+                    return False
+                continue
+            matched = self.re_no_prefix_list.match(s_cmd)
+            if matched:
+                name, seq = (matched.group(1), matched.group(2)), matched.group(3)
+                if not self.__remove_named(self.PREFIX_LIST, name, int(seq) if seq else None):
+                    return False
+                continue
+            matched = self.re_no_community_list.match(s_cmd)
+            if matched:
+                if not self.__remove_named(self.COMMUNITY_LIST, matched.group(1), None):
+                    return False
+                continue
+            return False  # the command changes a stanza which is not indexed
+        return True
+
+    def __apply_route_map_command(self, key, s_cmd):
+        """ Add or replace a command in a route-map entry. Return False if the command is not supported """
+        if key[0] != self.ROUTE_MAP:
+            return False
+        prefix = next((p for p in self.route_map_commands if s_cmd.startswith(p)), None)
+        if prefix is None:
+            return False
+        lines = self.stanzas[key]
+        for i, line in enumerate(lines[1:], 1):
+            if line.strip().startswith(prefix):
+                lines[i] = ' ' + s_cmd
+                return True
+        lines.append(' ' + s_cmd)
+        return True
+
+    def __route_map_entry(self, key):
+        lines = self.stanzas[key]
+        action = self.re_route_map.match(lines[0]).group(2)
+        return action, key[2], [line.strip() for line in lines[1:] if line.strip() != '']
+
+    def __stanza_key(self, line):
+        """ Build an index key for a top-level line """
+        matched = self.re_route_map.match(line)
+        if matched:
+            return self.ROUTE_MAP, matched.group(1), int(matched.group(3))
+        matched = self.re_prefix_list.match(line)
+        if matched:
+            return self.PREFIX_LIST, (matched.group(1), matched.group(2)), int(matched.group(3))
+        matched = self.re_community_list.match(line)
+        if matched:
+            return self.COMMUNITY_LIST, matched.group(1), line
+        return self.__other_key()
+
+    def __other_key(self):
+        self.n_other += 1
+        return self.OTHER, None, self.n_other
+
+    def __add_stanza(self, key, line):
+        if key in self.stanzas:  # the same stanza is presented twice. Keep both of them
+            key = self.__other_key()
+        self.stanzas[key] = [line]
+        if key[0] != self.OTHER:
+            self.index[key[0]].setdefault(key[1], {})[key[2]] = key
+        return key
+
+    def __remove_stanza(self, key):
+        if key not in self.stanzas:
+            return False
+        del self.stanzas[key]
+        entries = self.index[key[0]][key[1]]
+        del entries[key[2]]
+        if not entries:
+            del self.index[key[0]][key[1]]
+        return True
+
+    def __remove_named(self, stanza_type, name, sub_key):
+        """ Remove one entry or all entries of a named stanza. Return False if nothing was found """
+        entries = self.index[stanza_type].get(name, {})
+        if sub_key is not None:
+            return self.__remove_stanza((stanza_type, name, sub_key))
+        if not entries:
+            return False
+        for key in list(entries.values()):
+            self.__remove_stanza(key)
+        return True
+
+
 class ConfigMgr(object):
     """ The class represents frr configuration """
-    def __init__(self, frr):
+    RECONCILE_INTERVAL = 60  # seconds between full reads of FRR configuration
+
+    def __init__(self, frr, reconcile_interval=RECONCILE_INTERVAL):
         self.frr = frr
         self.current_config = None
         self.current_config_raw = None
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.reconcile_interval = reconcile_interval
+        self.model = None
+        self.model_read_time = 0.0
+        self.model_generation = None
+        self.pending_blocks = set()
+        self.pending_keys = {}
+        self.pending_commands = 0
+        self.duplicates = 0
+        self.last_commit = {}
+        self.write_failures = 0
 
     def reset(self):
         """ Reset stored config """
@@ -13,9 +277,32 @@ class ConfigMgr(object):
         self.current_config_raw = None
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.pending_blocks = set()
+        self.pending_keys = {}
+        self.pending_commands = 0
+        self.duplicates = 0
+
+    def invalidate(self):
+        """ Drop the config model. The next self.update() reads the config from FRR """
+        self.model = None
+        self.model_generation = None
 
     def update(self):
-        """ Read current config from FRR """
+        """
+        Read current config from FRR.
+        The config is read only when the model is missing or older than self.reconcile_interval.
+        Otherwise the config is built from the model which follows the changes committed by bgpcfgd.
+        Pending changes are committed before, so the caller sees its own changes
+        """
+        if self.changes.strip() != "" and not self.commit():
+            log_crit("ConfigMgr::update(): commit of pending changes was unsuccessful")
+        if self.model is not None and time.monotonic() - self.model_read_time < self.reconcile_interval:
+            if self.model_generation != self.model.generation or self.current_config_raw is None:
+                text = self.model.get_text()
+                self.current_config_raw = text + ["     "]
+                self.current_config = self.to_canonical("\n".join(text))
+                self.model_generation = self.model.generation
+            return
         self.current_config = None
         self.current_config_raw = None
         out = self.frr.get_config()
@@ -24,31 +311,97 @@ class ConfigMgr(object):
             if line.lstrip().startswith('!'):
                 continue
             text.append(line)
+        self.model = FRRConfigModel(text)
+        self.model_read_time = time.monotonic()
+        self.model_generation = self.model.generation
         text += ["     "]  # Add empty line to have something to work on, if there is no text
         self.current_config_raw = text
         self.current_config = self.to_canonical(out)  # FIXME: use text as an input
 
+    def get_model(self):
+        """
+        Get the indexed config model. self.update() must be called before
+        :return: FRRConfigModel object
+        """
+        return self.model
+
     def push_list(self, cmdlist):
         """
         Prepare new changes for FRR. The changes should be committed by self.commit()
         :param cmdlist: configuration change for FRR. Type: List of Strings
         """
-        self.changes += "\n".join(cmdlist) + "\n"
+        self.__add_changes("\n".join(cmdlist) + "\n")
 
     def push(self, cmd):
         """
         Prepare new changes for FRR. The changes should be committed by self.commit()
         :param cmd: configuration change for FRR. Type: String
         """
-        self.changes += cmd + "\n"
+        self.__add_changes(cmd + "\n")
         return True
 
+    def __add_changes(self, text):
+        """
+        Add a block of changes to the pending changes.
+        The block is dropped if the same block is already pending and no block added after it
+        configures the same commands, see self.get_block_keys(). Every BGP neighbor renders
+        the same policy and peer-group blocks, so a batch of neighbors would otherwise write
+        them once per neighbor. A block with "no" commands makes every pending block stale
+        :param text: block of commands
+        """
+        keys = self.get_block_keys(text)
+        if text in self.pending_blocks and all(self.pending_keys.get(key) == text for key in keys):
+            self.duplicates += 1
+            return
+        lines = [line.strip() for line in text.split("\n")]
+        lines = [line for line in lines if line != "" and not line.startswith("!")]
+        if any(line.startswith("no ") for line in lines):
+            self.pending_blocks = set()
+            self.pending_keys = {}
+        else:
+            self.pending_blocks.add(text)
+            self.pending_keys.update((key, text) for key in keys)
+        self.pending_commands += len(lines)
+        self.changes += text
+
+    @staticmethod
+    def get_block_keys(text):
+        """
+        Get what a block of commands configures. Every command, which doesn't enter a context,
+        is keyed by the path of its context and its first two words, without leading "no".
+        A later command with the same key may override it, e.g. "neighbor PEER_V4 allowas-in 1"
+        and "neighbor PEER_V4 allowas-in 3" in the same address-family of the same bgp instance
+        :param text: block of commands
+        :return: set of keys. Key is a tuple of strings
+        """
+        lines = [line.rstrip() for line in text.split("\n")]
+        lines = [line for line in lines if line.strip() != "" and not line.strip().startswith("!")]
+        lines = [line for line in lines if line.split()[0] not in ("exit", "exit-address-family", "exit-vrf", "end")]
+        keys = set()
+        path = []  # list of (offset, command) of the current context
+        for i, line in enumerate(lines):
+            offset = ConfigMgr.count_spaces(line)
+            while path and path[-1][0] >= offset:
+                path.pop()
+            if i + 1 < len(lines) and ConfigMgr.count_spaces(lines[i + 1]) > offset:
+                path.append((offset, line.strip()))
+                continue
+            words = line.split()
+            if words[0] == "no":
+                words = words[1:]
+            keys.add(tuple(command for _, command in path) + (" ".join(words[:2]),))
+        return keys
+
+    def get_pending_commands(self):
+        """ Return number of commands waiting for self.commit() """
+        return self.pending_commands
+
     def restart_peer_groups(self, peer_groups):
         """
         Schedule peer_groups for restart on commit
         :param peer_groups: List of peer_groups
         """
-        self.peer_groups_to_restart.extend(peer_groups)
+        self.peer_groups_to_restart.extend(pg for pg in peer_groups if pg not in self.peer_groups_to_restart)
 
     def commit(self):
         """
@@ -57,8 +410,19 @@ class ConfigMgr(object):
         """
         if self.changes.strip() == "":
             return True
+        start = time.monotonic()
         rc_write = self.frr.write(self.changes)
         rc_restart = self.frr.restart_peer_groups(self.peer_groups_to_restart)
+        self.last_commit = {
+            'commands': self.pending_commands,
+            'duplicates': self.duplicates,
+            'peer_groups': len(self.peer_groups_to_restart),
+            'latency': time.monotonic() - start,
+        }
+        if not rc_write:
+            self.write_failures += 1
+        if not rc_write or self.model is None or not self.model.apply(self.changes.split('\n')):
+            self.invalidate()
         self.reset()
         return rc_write and rc_restart
 
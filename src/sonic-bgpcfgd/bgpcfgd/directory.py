@@ -3,12 +3,72 @@ from collections import defaultdict
 from .log import log_err
 
 
+class PathTrie(object):
+    """ Handlers subscribed to the paths of one storage slot. The trie is indexed by the path components """
+    def __init__(self, path=''):
+        self.path = path           # path which ends at this node
+        self.handlers = []         # handlers subscribed to self.path
+        self.children = {}         # path component -> PathTrie
+
+    def add(self, path, handler):
+        """
+        Subscribe the handler to the path
+        :param path: storage path as a string where each internal key is separated by '/'
+        :param handler: callback
+        """
+        node = self
+        if path != '':
+            for component in path.split("/"):
+                if component not in node.children:
+                    node.children[component] = PathTrie(component if node.path == '' else node.path + "/" + component)
+                node = node.children[component]
+        node.handlers.append(handler)
+
+    def remove(self, path):
+        """
+        Remove all handlers subscribed to the path
+        :param path: storage path
+        """
+        node = self
+        if path != '':
+            for component in path.split("/"):
+                if component not in node.children:
+                    return
+                node = node.children[component]
+        node.handlers = []
+
+    def walk(self):
+        """ Generate (path, handlers) pairs for this node and all nodes below """
+        if self.handlers:
+            yield self.path, self.handlers
+        for child in self.children.values():
+            yield from child.walk()
+
+    def match(self, key):
+        """
+        Generate (path, handlers) pairs for the paths which could be changed by the change of the key.
+        These are the whole slot path, and the paths which start with the key.
+        A table key 'Loopback0|10.1.0.32/32' is a part of the object 'Loopback0',
+        so the change notifies the paths which start with 'Loopback0' too
+        :param key: changed key of the slot
+        """
+        if self.handlers:
+            yield self.path, self.handlers
+        components = [key]
+        if '|' in key:
+            components.append(key.split('|', 1)[0])
+        for component in components:
+            if component in self.children:
+                yield from self.children[component].walk()
+
+
 class Directory(object):
     """ This class stores values and notifies callbacks which were registered to be executed as soon
         as some value is changed. This class works as DB cache mostly """
     def __init__(self):
         self.data = defaultdict(dict)  # storage. A key is a slot name, a value is a dictionary with data
-        self.notify = defaultdict(lambda: defaultdict(list))  # registered callbacks: slot -> path -> handlers[]
+        self.notify = defaultdict(PathTrie)  # registered callbacks: slot -> trie of paths with handlers
+        self.deferred = None  # handlers to run by self.run_deferred_notifications(). None when notifications are not deferred
 
     @staticmethod
     def get_slot_name(db, table):
@@ -72,15 +132,38 @@ class Directory(object):
         slot = self.get_slot_name(db, table)
         self.data[slot][key] = value
         if slot in self.notify:
-            handlers_to_run = []
+            handlers_to_run = {}  # a handler subscribed to several changed paths runs once
 
-            for path in self.notify[slot].keys():
+            for path, handlers in self.notify[slot].match(key):
                 if self.path_exist(db, table, path):
-                    handlers_to_run += self.notify[slot][path]
+                    handlers_to_run.update((handler, None) for handler in handlers)
+
+            if self.deferred is not None:
+                self.deferred.update(handlers_to_run)
+                return
 
             for handler in handlers_to_run:
                 handler()
 
+    def defer_notifications(self):
+        """ Collect handlers to notify instead of running them on every put() """
+        if self.deferred is None:
+            self.deferred = {}
+
+    def run_deferred_notifications(self):
+        """
+        Run every collected handler once and stop deferring notifications.
+        Handlers notified by put() calls of the running handlers are run after them
+        """
+        try:
+            while self.deferred:
+                handlers_to_run = self.deferred
+                self.deferred = {}
+                for handler in handlers_to_run:
+                    handler()
+        finally:
+            self.deferred = None
+
     def get(self, db, table, key):
         """
         Get a value from the storage
@@ -160,11 +243,10 @@ class Directory(object):
         """
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
-            self.notify[slot][path].append(handler)
+            self.notify[slot].add(path, handler)
 
     def unsubscribe(self, deps):
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
             if slot in self.notify:
-                if path in self.notify[slot]:
-                    del self.notify[slot][path]
\ No newline at end of file
+                self.notify[slot].remove(path)
\ No newline at end of file
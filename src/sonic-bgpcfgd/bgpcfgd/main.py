@@ -40,7 +40,8 @@ from .vars import g_debug
 
 def do_work():
     """ Main function """
-    st_rt_timer = StaticRouteTimer()
+    constants = read_constants()
+    st_rt_timer = StaticRouteTimer(use_deadlines=constants.get('bgp', {}).get('static_route_expiry', {}).get('use_deadlines', False))
     thr = threading.Thread(target = st_rt_timer.run)
     thr.start()
     frr = FRR(["bgpd", "zebra", "staticd"])
@@ -67,7 +68,7 @@ def do_work():
         'directory': Directory(),
         'cfg_mgr':   ConfigMgr(frr),
         'tf':        TemplateFabric(),
-        'constants': read_constants(),
+        'constants': constants,
         'state_db_conn': swsscommon.DBConnector("STATE_DB", 0)
     }
     managers = [
@@ -131,7 +132,12 @@ def do_work():
         managers.append(AsPathMgr(common_objs, "CONFIG_DB", "DEVICE_METADATA"))
         log_notice("Prefix List Manager and AsPath Manager are enabled for UpperSpineRouter/UpstreamLC")
 
-    runner = Runner(common_objs['cfg_mgr'])
+    commit_cfg = common_objs['constants'].get('bgp', {}).get('commit', {})
+    runner = Runner(common_objs['cfg_mgr'],
+                    commit_interval=int(commit_cfg.get('interval_ms', Runner.COMMIT_INTERVAL)),
+                    commit_max_commands=int(commit_cfg.get('max_commands', Runner.COMMIT_MAX_COMMANDS)),
+                    state_db_conn=common_objs['state_db_conn'],
+                    directory=common_objs['directory'])
     for mgr in managers:
         runner.add_manager(mgr)
     runner.run()
@@ -31,6 +31,10 @@ class Manager(object):
         """ Return associated table name"""
         return self.table_name
 
+    def get_stats(self):
+        """ Return counters of the manager. They are published with the commit statistics """
+        return {}
+
     def handler(self, key, op, data):
         """
         This method is executed on each add/remove event on the table.
@@ -1,3 +1,4 @@
+import hashlib
 import json
 from swsscommon import swsscommon
 
@@ -22,10 +23,65 @@ class BGPPeerGroupMgr(object):
         """
         self.cfg_mgr = common_objs['cfg_mgr']
         self.constants = common_objs['constants']
+        self.directory = common_objs['directory']
         tf = common_objs['tf']
         self.policy_template = tf.from_file(base_template + "policies.conf.j2")
         self.peergroup_template = tf.from_file(base_template + "peer-group.conf.j2")
         self.device_global_cfgmgr = DeviceGlobalCfgMgr(common_objs, "CONFIG_DB", swsscommon.CFG_BGP_DEVICE_GLOBAL_TABLE_NAME)
+        self.constants_digest = self.get_digest(self.constants)
+        self.pushed = {}  # (entity, vrf) -> digest of the rendering inputs of the last pushed entity
+        self.write_failures = self.cfg_mgr.write_failures
+        self.stats = {'renders': 0, 'pushes': 0, 'saved': 0}
+
+    @staticmethod
+    def get_digest(obj):
+        """
+        Get a stable hash of the object
+        :param obj: json serializable object
+        :return: hex digest
+        """
+        return hashlib.sha1(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_inputs_digest(self, entity, **kwargs):
+        """
+        Get a hash of everything the peer-group and policy templates are rendered from.
+        The peer address and session attributes aren't used by the templates, so all peers
+        of the same type and vrf share the digest
+        :param entity: 'policy' or 'peer-group'
+        :param kwargs: dictionary with parameters for rendering
+        :return: hex digest
+        """
+        inputs = {
+            'constants': self.constants_digest,
+            'CONFIG_DB__DEVICE_METADATA': kwargs.get('CONFIG_DB__DEVICE_METADATA'),
+            'CONFIG_DB__BGP_BBR': kwargs.get('CONFIG_DB__BGP_BBR'),
+            'CONFIG_DB__LOOPBACK_INTERFACE': sorted("|".join(key) for key in kwargs.get('CONFIG_DB__LOOPBACK_INTERFACE', {})),
+            'loopback0_ipv4': kwargs.get('loopback0_ipv4'),
+            'bgp_asn': kwargs.get('bgp_asn'),
+            'vrf': kwargs.get('vrf'),
+        }
+        if entity == 'peer-group' and self.directory.available("CONFIG_DB", swsscommon.CFG_BGP_DEVICE_GLOBAL_TABLE_NAME):
+            # TSA and IDF isolation route-maps are added to the peer-group
+            inputs['BGP_DEVICE_GLOBAL'] = self.directory.get_slot("CONFIG_DB", swsscommon.CFG_BGP_DEVICE_GLOBAL_TABLE_NAME)
+        return self.get_digest(inputs)
+
+    def is_pushed(self, entity, digest, vrf):
+        """
+        Check that the entity rendered from the same inputs was already pushed to FRR
+        :param entity: 'policy' or 'peer-group'
+        :param digest: digest of the rendering inputs
+        :param vrf: vrf of the entity
+        :return: True if the entity doesn't need to be pushed again
+        """
+        write_failures = self.cfg_mgr.write_failures
+        if write_failures != self.write_failures:
+            # a failed write could drop the pushed entities
+            self.pushed = {}
+            self.write_failures = write_failures
+        if self.pushed.get((entity, vrf)) == digest:
+            self.stats['saved'] += 1
+            return True
+        return False
 
     def update(self, name, **kwargs):
         """
@@ -43,12 +99,18 @@ class BGPPeerGroupMgr(object):
         :param name: name of the peer. Used for logging only
         :param kwargs: dictionary with parameters for rendering
         """
+        digest = self.get_inputs_digest('policy', **kwargs)
+        if self.is_pushed('policy', digest, kwargs['vrf']):
+            log_debug("Routing policy for peer '%s' is up to date" % name)
+            return True
         try:
+            self.stats['renders'] += 1
             policy = self.policy_template.render(**kwargs)
         except jinja2.TemplateError as e:
             log_err("Can't render policy template name: '%s': %s" % (name, str(e)))
             return False
         self.update_entity(policy, "Routing policy for peer '%s'" % name)
+        self.pushed[('policy', kwargs['vrf'])] = digest
         return True
 
     def update_pg(self, name, **kwargs):
@@ -57,7 +119,12 @@ class BGPPeerGroupMgr(object):
         :param name: name of the peer. Used for logging only
         :param kwargs: dictionary with parameters for rendering
         """
+        digest = self.get_inputs_digest('peer-group', **kwargs)
+        if self.is_pushed('peer-group', digest, kwargs['vrf']):
+            log_debug("Peer-group for peer '%s' is up to date" % name)
+            return True
         try:
+            self.stats['renders'] += 1
             pg = self.peergroup_template.render(**kwargs)
             tsa_rm = self.device_global_cfgmgr.check_state_and_get_tsa_routemaps(pg)
             idf_isolation_rm = self.device_global_cfgmgr.check_state_and_get_idf_isolation_routemaps()
@@ -70,6 +137,7 @@ class BGPPeerGroupMgr(object):
         else:
             cmd = ('router bgp %s vrf %s\n' % (kwargs['bgp_asn'], kwargs['vrf'])) + pg + tsa_rm + idf_isolation_rm + "\nexit"
         self.update_entity(cmd, "Peer-group for peer '%s'" % name)
+        self.pushed[('peer-group', kwargs['vrf'])] = digest
         return True
 
     def update_entity(self, cmd, txt):
@@ -80,6 +148,7 @@ class BGPPeerGroupMgr(object):
         :return:
         """
         self.cfg_mgr.push(cmd)
+        self.stats['pushes'] += 1
         log_info("%s has been scheduled to be updated" % txt)
         return True
 
@@ -156,6 +225,10 @@ class BGPPeerMgrBase(Manager):
         self.peer_group_mgr = BGPPeerGroupMgr(self.common_objs, base_template)
         return
 
+    def get_stats(self):
+        """ Return the peer-group and routing policy counters: renders, pushes to FRR and pushes saved """
+        return {'peer_group_' + name: value for name, value in self.peer_group_mgr.stats.items()}
+
     def set_handler(self, key, data):
         """
          It runs on 'SET' command
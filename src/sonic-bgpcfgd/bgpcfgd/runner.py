@@ -1,7 +1,9 @@
+import math
+import time
 from collections import defaultdict
 from swsscommon import swsscommon
 
-from .log import log_debug, log_crit
+from .log import log_debug, log_crit, log_err
 
 
 g_run = True
@@ -19,14 +21,39 @@ class Runner(object):
         when corresponding db/table is updated
     """
     SELECT_TIMEOUT = 1000
+    COMMIT_INTERVAL = 100  # ms. Changes received during the interval are committed together
+    COMMIT_MAX_COMMANDS = 2000  # commit earlier when so many commands are pending
+    STATS_TABLE = "BGPCFGD_COMMIT_STATS"
+    STATS_KEY = "global"
 
-    def __init__(self, cfg_manager):
-        """ Constructor """
+    def __init__(self, cfg_manager, commit_interval=COMMIT_INTERVAL, commit_max_commands=COMMIT_MAX_COMMANDS, state_db_conn=None, directory=None):
+        """
+        Constructor
+        :param cfg_manager: ConfigMgr object
+        :param commit_interval: max time in ms between receiving the first change and committing it
+        :param commit_max_commands: max number of pending commands
+        :param state_db_conn: STATE_DB connector to publish commit statistics. Statistics aren't published when None
+        :param directory: Directory object. Its notifications are run once per loop iteration. Run on every change when None
+        """
         self.cfg_manager = cfg_manager
+        self.directory = directory
         self.db_connectors = {}
         self.selector = swsscommon.Select()
         self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
         self.subscribers = set()
+        self.managers = []
+        self.commit_interval = commit_interval / 1000.0
+        self.commit_max_commands = commit_max_commands
+        self.stats_table = swsscommon.Table(state_db_conn, self.STATS_TABLE) if state_db_conn is not None else None
+        self.window_start = None
+        self.window_events = 0
+        self.stats = {
+            'commits': 0,
+            'failed_commits': 0,
+            'commands': 0,
+            'duplicates': 0,
+            'max_latency': 0.0,
+        }
 
     def add_manager(self, manager):
         """
@@ -35,6 +62,7 @@ class Runner(object):
         handlers of corresponding objects will be executed
         :param manager: an object implementing Manager
         """
+        self.managers.append(manager)
         db_name = manager.get_database()
         table_name = manager.get_table_name()
         db = swsscommon.SonicDBConfig.getDbId(db_name)
@@ -54,20 +82,92 @@ class Runner(object):
     def run(self):
         """ Main loop """
         while g_run:
-            state, _ = self.selector.select(Runner.SELECT_TIMEOUT)
-            if state == self.selector.TIMEOUT:
-                continue
-            elif state == self.selector.ERROR:
+            state, _ = self.selector.select(self.get_select_timeout())
+            if state == self.selector.ERROR:
                 raise Exception("Received error from select")
+            elif state != self.selector.TIMEOUT:
+                self.process_events()
+            self.commit_if_ready()
 
+    def process_events(self):
+        """ Run handlers for all received messages. Directory notifications caused by them are run once at the end """
+        if self.directory is not None:
+            self.directory.defer_notifications()
+        try:
             for subscriber in self.subscribers:
                 while True:
                     key, op, fvs = subscriber.pop()
                     if not key:
                         break
                     log_debug("Received message : '%s'" % str((key, op, fvs)))
+                    self.window_events += 1
                     for callback in self.callbacks[subscriber.getDbConnector().getDbId()][subscriber.getTableName()]:
                         callback(key, op, dict(fvs))
-            rc = self.cfg_manager.commit()
-            if not rc:
-                log_crit("Runner::commit was unsuccessful")
+        finally:
+            if self.directory is not None:
+                self.directory.run_deferred_notifications()
+
+    def get_select_timeout(self):
+        """ Wake up in time to commit the pending changes """
+        if self.window_start is None:
+            return Runner.SELECT_TIMEOUT
+        left = self.window_start + self.commit_interval - time.monotonic()
+        return max(0, min(Runner.SELECT_TIMEOUT, int(math.ceil(left * 1000))))
+
+    def commit_if_ready(self):
+        """ Commit pending changes when the commit window is over or too many commands are pending """
+        pending = self.cfg_manager.get_pending_commands()
+        if pending == 0:
+            self.window_start = None
+            self.window_events = 0
+            return
+        now = time.monotonic()
+        if self.window_start is None:
+            self.window_start = now
+        if pending < self.commit_max_commands and now - self.window_start < self.commit_interval:
+            return
+        rc = self.cfg_manager.commit()
+        if not rc:
+            log_crit("Runner::commit was unsuccessful")
+        self.update_stats(rc)
+        self.window_start = None
+        self.window_events = 0
+
+    def get_manager_stats(self):
+        """ Sum the counters of all managers by name """
+        stats = defaultdict(int)
+        for manager in self.managers:
+            for name, value in manager.get_stats().items():
+                stats[name] += value
+        return stats
+
+    def update_stats(self, rc):
+        """
+        Update commit statistics and publish them to STATE_DB
+        :param rc: result of the commit
+        """
+        last = self.cfg_manager.last_commit
+        self.stats['commits'] += 1
+        self.stats['failed_commits'] += 0 if rc else 1
+        self.stats['commands'] += last['commands']
+        self.stats['duplicates'] += last['duplicates']
+        self.stats['max_latency'] = max(self.stats['max_latency'], last['latency'])
+        if self.stats_table is None:
+            return
+        fvs = [
+            ('commits', str(self.stats['commits'])),
+            ('failed_commits', str(self.stats['failed_commits'])),
+            ('commands', str(self.stats['commands'])),
+            ('duplicates', str(self.stats['duplicates'])),
+            ('max_latency_ms', "%.1f" % (self.stats['max_latency'] * 1000)),
+            ('last_commands', str(last['commands'])),
+            ('last_duplicates', str(last['duplicates'])),
+            ('last_peer_groups', str(last['peer_groups'])),
+            ('last_latency_ms', "%.1f" % (last['latency'] * 1000)),
+            ('last_queue_depth', str(self.window_events)),
+        ]
+        fvs += [(name, str(value)) for name, value in sorted(self.get_manager_stats().items())]
+        try:
+            self.stats_table.set(self.STATS_KEY, fvs)
+        except Exception as e:
+            log_err("Runner::Can't update commit statistics: %s" % str(e))
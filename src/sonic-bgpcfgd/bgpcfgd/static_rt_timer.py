@@ -1,19 +1,39 @@
-from .log import log_err, log_info, log_debug
+from .log import log_err, log_info, log_debug, log_warn
 from swsscommon import swsscommon
+import heapq
+import redis
 import time
 
 class StaticRouteTimer(object):
     """ This class checks the static routes and deletes those entries that have not been refreshed """
-    def __init__(self):
+    def __init__(self, use_deadlines=False):
+        """
+        Initialize the object
+        :param use_deadlines: check every route when its own deadline passes instead of checking all routes at once
+        """
         self.db = swsscommon.SonicV2Connector()
         self.db.connect(self.db.APPL_DB)
+        self.client = self.get_redis_client()
         self.timer = None
         self.start = None
+        self.deadlines = [] if use_deadlines else None  # min-heap of (deadline, route key)
+        self.tracked = {}  # route key -> its deadline in self.deadlines
+        self.pubsub = None  # keyspace notifications of the static routes
+        self.next_scan = None  # time of the next full scan for the routes missed by the notifications
 
     DEFAULT_TIMER = 180
     DEFAULT_SLEEP = 60
     # keep same range as value defined in sonic-restapi/sonic_api.yaml
     MAX_TIMER     = 172800
+    KEY_PATTERN = "STATIC_ROUTE:*"
+    SCAN_COUNT = 1000  # keys returned by one SCAN, and routes read or written by one pipeline
+    DELETE_EVENTS = ("del", "expired", "evicted", "rename_from")
+
+    @staticmethod
+    def get_redis_client():
+        """ Client of APPL_DB which reads and writes the routes by SCAN and pipelines, and subscribes to keyspace notifications """
+        return redis.Redis(unix_socket_path=swsscommon.SonicDBConfig.getDbSock("APPL_DB"),
+                           db=swsscommon.SonicDBConfig.getDbId("APPL_DB"), decode_responses=True)
 
     def set_timer(self):
         """ Check for custom route expiry time in STATIC_ROUTE_EXPIRY_TIME """
@@ -29,27 +49,145 @@ class StaticRouteTimer(object):
 
     def alarm(self):
         """ Clear unrefreshed static routes """
-        static_routes = self.db.keys(self.db.APPL_DB, "STATIC_ROUTE:*")
-        if static_routes is not None:
-            for sr in static_routes:
-                expiry = self.db.get(self.db.APPL_DB, sr, "expiry")
-                if expiry == "false":
-                    continue
-                refresh = self.db.get(self.db.APPL_DB, sr, "refresh")
-                if refresh == "true":
-                    self.db.set(self.db.APPL_DB, sr, "refresh", "false")
-                    log_debug("Refresh status of static route {} is set to false".format(sr))
-                else:
-                    self.db.delete(self.db.APPL_DB, sr)
-                    log_debug("Static route {} deleted".format(sr))
+        try:
+            self.sweep()
+        except redis.RedisError as e:
+            log_err("StaticRouteTimer: Static routes check failed: {}".format(e))
         self.start = time.time()
         return
 
+    def scan(self):
+        """ Generate lists of static route keys with SCAN. Every key is generated once """
+        seen = set()
+        cursor = 0
+        while True:
+            cursor, keys = self.client.scan(cursor, match=self.KEY_PATTERN, count=self.SCAN_COUNT)
+            new_keys = []
+            for key in keys:
+                if key not in seen:  # SCAN can return a key more than once
+                    seen.add(key)
+                    new_keys.append(key)
+            if new_keys:
+                yield new_keys
+            if cursor == 0:
+                return
+
+    def sweep(self):
+        """ Clear unrefreshed static routes, reading and updating them by pipelines """
+        for keys in self.scan():
+            self.check_routes(keys)
+
+    def check_routes(self, keys):
+        """
+        Clear refresh flag of the refreshed routes, delete unrefreshed routes
+        :param keys: list of route keys
+        :return: list of keys of the routes which were not deleted
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hmget(key, "expiry", "refresh")
+        values = pipe.execute()
+        kept = []
+        pipe = self.client.pipeline(transaction=False)
+        for key, (expiry, refresh) in zip(keys, values):
+            if expiry == "false":
+                kept.append(key)
+            elif refresh == "true":
+                pipe.hset(key, "refresh", "false")
+                kept.append(key)
+                log_debug("Refresh status of static route {} is set to false".format(key))
+            else:
+                pipe.delete(key)
+                log_debug("Static route {} deleted".format(key))
+        pipe.execute()
+        return kept
+
+    def subscribe(self):
+        """ Subscribe to keyspace notifications of the static routes. Return None if it's not possible """
+        try:
+            pubsub = self.client.pubsub()
+            pubsub.psubscribe("__keyspace@{}__:{}".format(swsscommon.SonicDBConfig.getDbId("APPL_DB"), self.KEY_PATTERN))
+            return pubsub
+        except redis.RedisError as e:
+            log_warn("StaticRouteTimer: Can't subscribe to keyspace notifications: {}. New routes are found by scans".format(e))
+            return None
+
+    def track(self, key, deadline):
+        """ Check the route when the deadline passes """
+        self.tracked[key] = deadline
+        heapq.heappush(self.deadlines, (deadline, key))
+
+    def read_notifications(self, deadline):
+        """
+        Start tracking the routes created and stop tracking the routes deleted since the last read
+        :param deadline: deadline of the new routes
+        """
+        while True:
+            message = self.pubsub.get_message(timeout=0)
+            if message is None:
+                return
+            if message["type"] != "pmessage":
+                continue
+            key = message["channel"].split(":", 1)[1]
+            if message["data"] in self.DELETE_EVENTS:
+                self.tracked.pop(key, None)
+            elif key not in self.tracked:
+                self.track(key, deadline)
+
+    def reset_deadlines(self):
+        """ Forget the tracked routes and the subscription. The routes are found again by the next check """
+        if self.pubsub is not None:
+            try:
+                self.pubsub.close()
+            except redis.RedisError:
+                pass
+        self.pubsub = None
+        self.next_scan = None
+        self.deadlines = []
+        self.tracked = {}
+
+    def check_deadlines(self, timer):
+        """
+        Start tracking new routes and check the routes which deadlines passed.
+        A route is checked when the timer passes after it was found or checked last time.
+        New routes are found by keyspace notifications, and by a full scan once per timer
+        in case notifications were lost or are disabled
+        :param timer: route expiry time in seconds
+        """
+        now = time.time()
+        if self.pubsub is None:
+            self.pubsub = self.subscribe()
+        if self.next_scan is None or now >= self.next_scan:
+            for keys in self.scan():
+                for key in keys:
+                    if key not in self.tracked:
+                        self.track(key, now + timer)
+            self.next_scan = now + timer
+        if self.pubsub is not None:
+            self.read_notifications(now + timer)
+        due = []
+        while self.deadlines and self.deadlines[0][0] <= now:
+            deadline, key = heapq.heappop(self.deadlines)
+            if self.tracked.get(key) == deadline:
+                due.append(key)
+                del self.tracked[key]
+        for i in range(0, len(due), self.SCAN_COUNT):
+            for key in self.check_routes(due[i:i + self.SCAN_COUNT]):
+                self.track(key, now + timer)
+
     def run(self):
         self.start = time.time()
         while True:
             self.set_timer()
-            if self.timer:
+            if self.deadlines is not None:
+                timer = self.timer or self.DEFAULT_TIMER
+                time.sleep(min(timer, self.DEFAULT_SLEEP))
+                try:
+                    self.check_deadlines(timer)
+                except redis.RedisError as e:
+                    log_err("StaticRouteTimer: Deadlines check failed: {}. Routes are found again by the next check".format(e))
+                    self.reset_deadlines()
+            elif self.timer:
                 log_info("Static route expiry set to {}s".format(self.timer))
                 time.sleep(self.timer)
                 self.alarm()
@@ -57,4 +195,3 @@ class StaticRouteTimer(object):
                 time.sleep(self.DEFAULT_SLEEP)
                 if time.time() - self.start >= self.DEFAULT_TIMER:
                     self.alarm()
-
@@ -2,17 +2,26 @@ import subprocess
 import yaml
 
 from .log import log_crit, log_debug, log_err
+from .vtysh import vtysh_client
 
 
 def run_command(command, shell=False, hide_errors=False):
     """
     Run a linux command. The command is defined as a list. See subprocess.Popen documentation on format
+    vtysh commands are sent through the persistent FRR daemon connection when it is possible
     :param command: command to execute. Type: List of strings
     :param shell: execute the command through shell when True. Type: Boolean
     :param hide_errors: don't report errors to syslog when True. Type: Boolean
     :return: Tuple: integer exit code from the command, stdout as a string, stderr as a string
     """
     log_debug("execute command '%s'." % str(command))
+    if not shell:
+        result = vtysh_client.run(command)
+        if result is not None:
+            if result[0] != 0 and not hide_errors:
+                print_tuple = result[0], str(command), result[1], result[2]
+                log_err("command execution returned %d. Command: '%s', stdout: '%s', stderr: '%s'" % print_tuple)
+            return result
     p = subprocess.Popen(command, shell=shell, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding='utf-8')
     stdout, stderr = p.communicate()
     if p.returncode != 0:
@@ -0,0 +1,198 @@
+"""
+Persistent connections to vty sockets of FRR daemons.
+vtysh commands which can be served by a single daemon are sent through the connection
+instead of spawning a vtysh process for every command.
+"""
+import os
+import re
+import socket
+import threading
+
+from .log import log_debug, log_warn
+
+
+class VtyConnection(object):
+    """ Connection to the vty socket of one FRR daemon """
+    REPLY_END = b'\0\0\0'
+    READ_SIZE = 65536
+
+    def __init__(self, path, timeout):
+        """
+        Initialize the object
+        :param path: path to the daemon vty socket
+        :param timeout: socket timeout in seconds
+        """
+        self.path = path
+        self.timeout = timeout
+        self.sock = None
+        self.buffer = b''
+
+    def connect(self):
+        """ Connect to the daemon and enter the enable node """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        self.buffer = b''
+        ret_code, out = self.execute(['enable'])[0]
+        if ret_code != 0:
+            self.close()
+            raise OSError("Can't enter enable node on '%s': %s" % (self.path, out))
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+        self.sock = None
+        self.buffer = b''
+
+    def is_connected(self):
+        return self.sock is not None
+
+    def execute(self, commands):
+        """
+        Send all commands at once and read replies for them
+        :param commands: list of commands
+        :return: list of tuples (return code, output) for each command
+        """
+        self.sock.sendall(b''.join(cmd.encode('utf-8') + b'\0' for cmd in commands))
+        return [self.__read_reply() for _ in commands]
+
+    def __read_reply(self):
+        """ Read one reply. The reply is the command output followed by three zero bytes and the return code """
+        while True:
+            pos = self.buffer.find(self.REPLY_END)
+            if pos != -1 and len(self.buffer) > pos + len(self.REPLY_END):
+                out = self.buffer[:pos].decode('utf-8', errors='replace')
+                ret_code = self.buffer[pos + len(self.REPLY_END)]
+                self.buffer = self.buffer[pos + len(self.REPLY_END) + 1:]
+                return ret_code, out
+            data = self.sock.recv(self.READ_SIZE)
+            if not data:
+                raise OSError("Connection to '%s' was closed" % self.path)
+            self.buffer += data
+
+
+class VtyshClient(object):
+    """
+    Runs vtysh command lines (as passed to subprocess) through persistent daemon connections.
+    Commands which need vtysh itself (show running-config, show daemons) or more than one daemon are not handled
+    """
+    VTY_PATH = '/run/frr/%s.vty'
+    TIMEOUT = 120  # seconds
+    PIPELINE_DEPTH = 100  # max number of commands sent before reading replies
+    CONFIG_COMMANDS = {'conf t', 'configure', 'configure terminal'}
+    SHOW_DAEMONS = [
+        (re.compile(r'^(show|clear) (ip |ipv6 )?bgp( |$)'), 'bgpd'),
+        (re.compile(r'^show bfd( |$)'), 'bfdd'),
+    ]
+    # top-level configuration lines which exist only in bgpd
+    BGPD_CONFIG = re.compile(r'^(exit$|(no )?(router bgp|bgp as-path access-list|bgp (community|large-community|extcommunity)-list)( |$))')
+
+    def __init__(self, vty_path=VTY_PATH, timeout=TIMEOUT):
+        self.vty_path = vty_path
+        self.timeout = timeout
+        self.connections = {}
+        self.lock = threading.Lock()
+
+    def run(self, command):
+        """
+        Run vtysh command line through the daemon connection
+        :param command: vtysh command line. Type: List of strings
+        :return: Tuple: exit code, stdout, stderr like vtysh would return, or None if the command must be run by vtysh
+        """
+        commands = self.__parse_command_line(command)
+        if not commands:
+            return None
+        daemon, commands = self.__route(commands)
+        if daemon is None:
+            return None
+        with self.lock:
+            conn = self.__get_connection(daemon)
+            if conn is None:
+                return None
+            try:
+                replies = []
+                for i in range(0, len(commands), self.PIPELINE_DEPTH):
+                    replies += conn.execute(commands[i:i + self.PIPELINE_DEPTH])
+            except OSError as e:
+                log_warn("VtyshClient::Connection to '%s' failed: %s. Falling back to vtysh" % (daemon, str(e)))
+                conn.close()
+                return None
+        out = "".join(reply for _, reply in replies)
+        failed = [(cmd, reply) for cmd, (ret_code, reply) in zip(commands, replies) if ret_code != 0]
+        if failed:
+            err = "\n".join("%s: %s" % (cmd, reply.strip()) for cmd, reply in failed)
+            return 1, out, err
+        return 0, out, ""
+
+    def close(self):
+        """ Close all daemon connections """
+        with self.lock:
+            for conn in self.connections.values():
+                conn.close()
+            self.connections = {}
+
+    def __get_connection(self, daemon):
+        conn = self.connections.get(daemon)
+        if conn is None:
+            conn = VtyConnection(self.vty_path % daemon, self.timeout)
+            self.connections[daemon] = conn
+        if not conn.is_connected():
+            if not os.path.exists(conn.path):
+                return None
+            try:
+                conn.connect()
+                log_debug("VtyshClient::Connected to '%s'" % conn.path)
+            except OSError as e:
+                log_warn("VtyshClient::Can't connect to '%s': %s" % (conn.path, str(e)))
+                return None
+        return conn
+
+    @staticmethod
+    def __parse_command_line(command):
+        """ Extract commands from vtysh arguments. Return None if the arguments are not supported """
+        if not isinstance(command, list) or len(command) < 3 or command[0] != 'vtysh':
+            return None
+        commands = []
+        args = iter(command[1:])
+        for arg in args:
+            value = next(args, None)
+            if value is None:
+                return None
+            if arg == '-c':
+                commands.append(value)
+            elif arg == '-f':
+                with open(value) as fp:
+                    commands += ['configure terminal'] + fp.read().split('\n')
+            elif arg != '-H':
+                return None
+        return commands
+
+    def __route(self, commands):
+        """
+        Find the daemon which can run all commands
+        :return: a tuple: daemon name or None, list of commands to send to the daemon
+        """
+        if commands[0].strip() not in self.CONFIG_COMMANDS:
+            daemons = set()
+            for cmd in commands:
+                daemon = next((daemon for regex, daemon in self.SHOW_DAEMONS if regex.match(cmd.strip())), None)
+                if daemon is None:
+                    return None, commands
+                daemons.add(daemon)
+            return (daemons.pop(), commands) if len(daemons) == 1 else (None, commands)
+        config = [cmd for cmd in commands[1:] if cmd.strip() != '' and not cmd.strip().startswith('!')]
+        if config and config[0].strip() == 'bfd':
+            daemon = 'bfdd'
+        elif all(self.BGPD_CONFIG.match(line) for line in config if not line.startswith(' ')):
+            daemon = 'bgpd'
+        else:
+            return None, commands
+        return daemon, ['configure terminal'] + [line.strip() for line in config] + ['end']
+
+
+vtysh_client = VtyshClient()
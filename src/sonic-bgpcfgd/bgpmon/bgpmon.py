@@ -23,9 +23,19 @@ Description: bgpmon.py -- populating bgp related information in stateDB.
     "previous" neighbor dictionary will be kept and used to determine if there
     is a need to perform update or the peer is stale to be removed from the
     state DB
+
+    In the event mode (--mode event) the log is tailed for the %ADJCHANGE lines
+    which bgpd writes for "bgp log-neighbor-changes". Only the neighbors from
+    these lines are updated. A full snapshot is read on start, every
+    EVENT_RESYNC_INTERVAL seconds, when the log is missing, rotated or
+    truncated, and when the lines can't be applied one by one (unknown
+    neighbor, too many changes at once). FRR logs to syslog, so --log-file
+    must name the file rsyslog writes the bgpd messages to.
 """
+import argparse
 import json
 import os
+import re
 import sys
 import syslog
 from swsscommon import swsscommon
@@ -33,9 +43,82 @@ import time
 from sonic_py_common.general import getstatusoutput_noshell
 
 PIPE_BATCH_MAX_COUNT = 50
+FRR_LOG_FILE = "/var/log/frr/frr.log"
+POLL_INTERVAL = 15  # seconds
+EVENT_POLL_INTERVAL = 0.2  # seconds between checks of the log in the event mode
+EVENT_RESYNC_THRESHOLD = 50  # more neighbor changes at once are read by a full snapshot
+EVENT_RESYNC_INTERVAL = 300  # seconds between full snapshots in the event mode, in case a change was missed
+
+# %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T2) in vrf default Up
+# %ADJCHANGE: neighbor fc00::2 Down BGP Notification send
+ADJCHANGE_RE = re.compile(r'%ADJCHANGE: neighbor (?P<peer>[^\s(]+)(\([^)]*\))?( in vrf (?P<vrf>\S+))? (?P<event>Up|Down)')
+
+
+class AdjChangeLogSource:
+    """
+    Tails the FRR log and extracts the neighbor adjacency changes from it
+    """
+    def __init__(self, path=FRR_LOG_FILE):
+        self.path = path
+        self.fp = None
+        self.inode = None
+        self.offset = 0
+        self.partial = b''
+
+    def open(self):
+        """ Open the log and skip its current content. Return True on success """
+        self.close()
+        try:
+            self.fp = open(self.path, 'rb')
+        except (IOError, OSError):
+            return False
+        self.inode = os.fstat(self.fp.fileno()).st_ino
+        self.offset = self.fp.seek(0, os.SEEK_END)
+        return True
+
+    def close(self):
+        if self.fp is not None:
+            self.fp.close()
+        self.fp = None
+        self.inode = None
+        self.offset = 0
+        self.partial = b''
+
+    def is_open(self):
+        return self.fp is not None
+
+    def read_events(self):
+        """
+        Read the lines appended to the log since the last call
+        Return: list of (peer, vrf, 'Up'|'Down') tuples, or None if changes could be missed
+                (the log is missing, or was rotated or truncated)
+        """
+        try:
+            stat = os.stat(self.path)
+        except (IOError, OSError):
+            self.close()
+            return None
+        if self.fp is None or stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.open()
+            return None
+        if stat.st_size == self.offset:
+            return []
+        data = self.fp.read()
+        self.offset += len(data)
+        lines = (self.partial + data).split(b'\n')
+        self.partial = lines.pop()
+        events = []
+        for line in lines:
+            if b'%ADJCHANGE' not in line:
+                continue
+            m = ADJCHANGE_RE.search(line.decode('utf-8', errors='replace'))
+            if m:
+                events.append((m.group('peer'), m.group('vrf') or 'default', m.group('event')))
+        return events
+
 
 class BgpStateGet:
-    def __init__(self):
+    def __init__(self, log_file=FRR_LOG_FILE):
         # set peer_l stores the Neighbor peer Ip address
         # dic peer_state stores the Neighbor peer state entries
         # set new_peer_l stores the new snapshot of Neighbor peer ip address
@@ -45,6 +128,7 @@ class BgpStateGet:
         self.new_peer_l = set()
         self.new_peer_state = {}
         self.cached_timestamp = 0
+        self.log_file = log_file
         self.db = swsscommon.SonicV2Connector()
         self.db.connect(self.db.STATE_DB, False)
         self.pipe = swsscommon.RedisPipeline(self.db.get_redis_client(self.db.STATE_DB))
@@ -58,7 +142,7 @@ class BgpStateGet:
     # out, it will default back to constant pulling every 15 seconds
     def bgp_activity_detected(self):
         try:
-            timestamp = os.stat("/var/log/frr/frr.log").st_mtime
+            timestamp = os.stat(self.log_file).st_mtime
             if timestamp != self.cached_timestamp:
                 self.cached_timestamp = timestamp
                 return True
@@ -85,10 +169,10 @@ class BgpStateGet:
                 rc, output = getstatusoutput_noshell(cmd)
                 if rc:
                     syslog.syslog(syslog.LOG_ERR, "*ERROR* Failed with rc:{} when execute: {}".format(rc, cmd))
-                    return
+                    return False
                 if len(output) == 0:
                     syslog.syslog(syslog.LOG_WARNING, "*WARNING* output none when execute: {}".format(cmd))
-                    return
+                    return False
 
                 peer_info = json.loads(output)
                 # cmd ran successfully, safe to Clean the "new" set/dict for new snapshot
@@ -97,7 +181,7 @@ class BgpStateGet:
                 for key, value in peer_info.items():
                     if key == "ipv4Unicast" or key == "ipv6Unicast":
                         self.update_new_peer_states(value)
-                return
+                return True
 
             except json.JSONDecodeError as decode_error:
                 # Log the exception and retry if within the maximum attempts
@@ -185,22 +269,123 @@ class BgpStateGet:
         # Save the new set
         self.peer_l = self.new_peer_l.copy()
 
+    # Read the full snapshot and update the state DB. Return False if the snapshot wasn't read
+    def resync(self):
+        if not self.get_all_neigh_states():
+            return False
+        self.update_neigh_states()
+        return True
+
+    # Get the states of the given neighbors with one vtysh call.
+    # Return {peer: (state, remoteAs, localAs)} or None if the states can't be read
+    def get_neigh_states(self, peers):
+        cmd = ["vtysh", "-H", "/dev/null"]
+        for peer in peers:
+            cmd += ["-c", "show bgp summary neighbor {} json".format(peer)]
+        try:
+            rc, output = getstatusoutput_noshell(cmd)
+            if rc or len(output) == 0:
+                return None
+            # vtysh prints one json document per command
+            decoder = json.JSONDecoder()
+            states = {}
+            pos = 0
+            output = output.strip()
+            while pos < len(output):
+                peer_info, pos = decoder.raw_decode(output, pos)
+                while pos < len(output) and output[pos].isspace():
+                    pos += 1
+                for key, value in peer_info.items():
+                    if key == "ipv4Unicast" or key == "ipv6Unicast":
+                        for peer, info in value.get("peers", {}).items():
+                            states[peer] = (info["state"], info["remoteAs"], info["localAs"])
+            return states
+        except Exception as e:
+            syslog.syslog(syslog.LOG_WARNING, "*WARNING* An unexpected error occurred: {} when execute: {}".format(e, cmd))
+            return None
+
+    def apply_adj_changes(self, events):
+        """Update the state DB entries of the neighbors from the adjacency changes.
+        Args:
+            events: list of (peer, vrf, 'Up'|'Down') tuples in the log order
+        Returns:
+            False if the changes can't be applied one by one and a full snapshot is required
+        """
+        # only the last change of every neighbor matters
+        changes = {}
+        for peer, vrf, event in events:
+            if vrf == "default":
+                changes[peer] = event
+        if len(changes) > EVENT_RESYNC_THRESHOLD:
+            return False
+        if any(peer not in self.peer_state for peer in changes):
+            return False
+        # Up means Established. The state after Down is read from bgpd
+        down_peers = [peer for peer, event in changes.items() if event == "Down"]
+        neigh_states = self.get_neigh_states(down_peers) if down_peers else {}
+        if neigh_states is None or any(peer not in neigh_states for peer in down_peers):
+            return False
+        data = {}
+        for peer, event in changes.items():
+            if event == "Up":
+                state = "Established"
+                value = {'state':state}
+            else:
+                state, remoteAs, localAs = neigh_states[peer]
+                peerType = "i-BGP" if remoteAs == localAs else "e-BGP"
+                value = {'state':state, 'peerType':peerType}
+            if self.peer_state[peer] != state:
+                data["NEIGH_STATE_TABLE|%s" % peer] = value
+                self.peer_state[peer] = state
+            if len(data) > PIPE_BATCH_MAX_COUNT:
+                self.flush_pipe(data)
+        if len(data) > 0:
+            self.flush_pipe(data)
+        return True
+
+    # Update the neighbor states from the adjacency changes in the log as soon as they are written
+    def run_events(self, source):
+        source.open()
+        resync = True
+        next_resync = 0
+        while True:
+            if resync or time.monotonic() >= next_resync:
+                if not self.resync():
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                next_resync = time.monotonic() + EVENT_RESYNC_INTERVAL
+            events = source.read_events()
+            resync = events is None or (len(events) > 0 and not self.apply_adj_changes(events))
+            time.sleep(EVENT_POLL_INTERVAL if source.is_open() else POLL_INTERVAL)
+
+    # periodically obtain the new neighbor information and update if necessary
+    def run_poll(self):
+        while True:
+            time.sleep(POLL_INTERVAL)
+            if self.bgp_activity_detected():
+                self.get_all_neigh_states()
+                self.update_neigh_states()
+
 def main():
+    parser = argparse.ArgumentParser(description="Populate BGP neighbor states in the state DB")
+    parser.add_argument("--mode", choices=["event", "poll"], default="poll",
+                        help="follow the neighbor changes in the log, or poll all neighbors every {} seconds "
+                             "when the log changed".format(POLL_INTERVAL))
+    parser.add_argument("--log-file", default=FRR_LOG_FILE, help="log with the bgpd messages")
+    args = parser.parse_args()
 
-    syslog.syslog(syslog.LOG_INFO, "bgpmon service started")
+    syslog.syslog(syslog.LOG_INFO, "bgpmon service started in {} mode".format(args.mode))
     bgp_state_get = None
     try:
-        bgp_state_get = BgpStateGet()
+        bgp_state_get = BgpStateGet(args.log_file)
     except Exception as e:
         syslog.syslog(syslog.LOG_ERR, "{}: error exit 1, reason {}".format("THIS_MODULE", str(e)))
         sys.exit(1)
 
-    # periodically obtain the new neighbor information and update if necessary
-    while True:
-        time.sleep(15)
-        if bgp_state_get.bgp_activity_detected():
-            bgp_state_get.get_all_neigh_states()
-            bgp_state_get.update_neigh_states()
+    if args.mode == "event":
+        bgp_state_get.run_events(AdjChangeLogSource(args.log_file))
+    else:
+        bgp_state_get.run_poll()
 
 if __name__ == '__main__':
     main()
@@ -20,6 +20,7 @@ setuptools.setup(
         'jinja2>=2.10',
         'netaddr==0.8.0',
         'pyyaml>=6.0.1',
+        'redis',
     ],
     setup_requires = [
         'pytest-runner',
@@ -3,11 +3,13 @@ import signal
 import sys
 import syslog
 import threading
+import time
 import traceback
 from collections import defaultdict
 from ipaddress import IPv4Address, IPv6Address
 from copy import deepcopy
 
+import redis
 from swsscommon import swsscommon
 
 from .vars import g_debug, bfd_multihop, bfd_rx_interval, bfd_tx_interval, bfd_multiplier
@@ -22,6 +24,7 @@ INTERFACE_TABLE_NAME = "INTERFACE"
 PORTCHANNEL_INTERFACE_TABLE_NAME = "PORTCHANNEL_INTERFACE"
 STATIC_ROUTE_TABLE_NAME = "STATIC_ROUTE"
 BFD_SESSION_TABLE_NAME = "BFD_SESSION_TABLE"
+RECONCILIATION_TABLE_NAME = "STATIC_ROUTE_BFD_RECONCILIATION_TABLE"
 
 LOCAL_CONFIG_TABLE = "config"
 LOCAL_NEXTHOP_TABLE = "nexthop"
@@ -95,6 +98,49 @@ def check_ip(ip):
             valid = False
     return valid, is_ipv4, v
 
+class BulkTableReader(object):
+    """ Read whole tables with SCAN and pipelined HGETALL instead of KEYS and one HGETALL for every entry """
+
+    SCAN_COUNT = 1000  # keys returned by one SCAN, and entries read by one pipeline
+
+    def __init__(self):
+        self.clients = {}  # db name -> redis-py client
+
+    def get_client(self, db_name):
+        if db_name not in self.clients:
+            self.clients[db_name] = redis.Redis(unix_socket_path=swsscommon.SonicDBConfig.getDbSock(db_name),
+                                                db=swsscommon.SonicDBConfig.getDbId(db_name), decode_responses=True)
+        return self.clients[db_name]
+
+    def read_table(self, db_name, table_name, separator, with_data=True):
+        """
+        Read all entries of a table
+        :param db_name: name of the database
+        :param table_name: name of the table
+        :param separator: separator between the table name and the key
+        :param with_data: read the fields of the entries. Empty dicts are returned otherwise
+        :return: list of (key without the table name, fields of the entry)
+        """
+        return self.read_table_pipelined(self.get_client(db_name), table_name + separator, with_data)
+
+    def read_table_pipelined(self, client, prefix, with_data):
+        entries = {}
+        cursor = 0
+        while True:
+            cursor, keys = client.scan(cursor, match=prefix + "*", count=self.SCAN_COUNT)
+            keys = [key for key in dict.fromkeys(keys) if key[len(prefix):] not in entries]  # SCAN can return a key more than once
+            if with_data and keys:
+                pipe = client.pipeline(transaction=False)
+                for key in keys:
+                    pipe.hgetall(key)
+                values = pipe.execute()
+            else:
+                values = [{} for _ in keys]
+            for key, data in zip(keys, values):
+                entries[key[len(prefix):]] = data
+            if cursor == 0:
+                return list(entries.items())
+
 class StaticRouteBfd(object):
 
     SELECT_TIMEOUT = 1000
@@ -118,6 +164,9 @@ class StaticRouteBfd(object):
         self.bfd_appl_tbl = swsscommon.ProducerStateTable(self.appl_db, BFD_SESSION_TABLE_NAME)
 
         self.static_route_appl_tbl = swsscommon.Table(self.appl_db, STATIC_ROUTE_TABLE_NAME)
+        self.appl_db_batch = None  # appl_db table -> key -> (deleted, fields to set) while writes are batched
+
+        self.reconciliation_tbl = swsscommon.Table(self.state_db, RECONCILIATION_TABLE_NAME)
 
         self.selector = swsscommon.Select()
         self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
@@ -174,12 +223,57 @@ class StaticRouteBfd(object):
                 self.remove_from_local_db(LOCAL_NEXTHOP_TABLE, nh_key)
 
     def set_bfd_session_into_appl_db(self, key, data):
-        fvs = swsscommon.FieldValuePairs(list(data.items()))
-        self.bfd_appl_tbl.set(key, fvs)
+        self.write_to_appl_db(self.bfd_appl_tbl, key, data)
         log_debug("set bfd session to appl_db, key %s, data %s"%(key, str(data)))
 
     def del_bfd_session_from_appl_db(self, key):
-        self.bfd_appl_tbl.delete(key)
+        self.write_to_appl_db(self.bfd_appl_tbl, key, None)
+
+    def start_appl_db_batch(self):
+        """ Keep appl_db writes in memory until flush_appl_db_batch() """
+        if self.appl_db_batch is None:
+            self.appl_db_batch = defaultdict(dict)
+
+    def write_to_appl_db(self, table, key, data):
+        """
+        Write an entry to an appl_db table, or add the write to the batch.
+        Writes of the same key are merged in the batch, the same way redis applies them
+        :param table: bfd_appl_tbl or static_route_appl_tbl
+        :param key: key of the entry
+        :param data: fields to set, None to delete the entry
+        """
+        if self.appl_db_batch is None:
+            if data is None:
+                table.delete(key)
+            else:
+                table.set(key, swsscommon.FieldValuePairs(list(data.items())))
+            return
+        deleted, fields = self.appl_db_batch[table].get(key, (False, {}))
+        if data is None:
+            self.appl_db_batch[table][key] = (True, {})
+        else:
+            fields = fields.copy()
+            fields.update(data)
+            self.appl_db_batch[table][key] = (deleted, fields)
+
+    def flush_appl_db_batch(self):
+        """
+        Write the batched entries, every table by one pipeline
+        :return: number of written entries
+        """
+        batch, self.appl_db_batch = self.appl_db_batch, None
+        if not batch:
+            return 0
+        for table, entries in batch.items():
+            table.setBuffered(True)
+            for key, (deleted, fields) in entries.items():
+                if deleted:
+                    table.delete(key)
+                if fields:
+                    table.set(key, swsscommon.FieldValuePairs(list(fields.items())))
+            table.flush()
+            table.setBuffered(False)
+        return sum(len(entries) for entries in batch.values())
 
     def interface_set_handler(self, key, data):
         valid, is_ipv4, if_name, ip = self.get_ip_from_key(key)
@@ -245,59 +339,61 @@ class StaticRouteBfd(object):
     def strip_table_name(self, key, splitter):
         return key.split(splitter, 1)[1]
 
+    def record_phase(self, timing, phase, phase_start):
+        now = time.monotonic()
+        timing[phase + "_ms"] = "%.1f" % ((now - phase_start) * 1000)
+        log_info("reconciliation phase %s took %sms" % (phase, timing[phase + "_ms"]))
+        return now
+
     def reconciliation(self):
-        #to use SonicV2Connector get_all method, DBConnector doesn't have get_all
-        db = swsscommon.SonicV2Connector()
-        db.connect(db.CONFIG_DB)
-        db.connect(db.APPL_DB)
-        db.connect(db.STATE_DB)
+        reader = BulkTableReader()
+        timing = {}
+        start = phase_start = time.monotonic()
+        self.start_appl_db_batch()
 
         #MUST keep the restore sequene
         #restore interface(loopback/interface/portchannel_interface) tables
 
         #restore interface tables
         log_info("restore interface table -->")
-        keys = db.keys(db.CONFIG_DB, "LOOPBACK_INTERFACE|*")
-        for key in keys:
-            key_new = self.strip_table_name(key, "|")
-            self.interface_set_handler(key_new, "")
-        keys = db.keys(db.CONFIG_DB, "INTERFACE|*")
-        for key in keys:
-            key_new = self.strip_table_name(key, "|")
-            self.interface_set_handler(key_new, "")
-        keys = db.keys(db.CONFIG_DB, "PORTCHANNEL_INTERFACE|*")
-        for key in keys:
-            key_new = self.strip_table_name(key, "|")
-            self.interface_set_handler(key_new, "")
+        for table_name in ["LOOPBACK_INTERFACE", INTERFACE_TABLE_NAME, PORTCHANNEL_INTERFACE_TABLE_NAME]:
+            for key, _ in reader.read_table(CONFIG_DB_NAME, table_name, "|", with_data=False):
+                self.interface_set_handler(key, "")
+        phase_start = self.record_phase(timing, "interface", phase_start)
 
         #restore bfd session table, static route won't create bfd session if it is already in appl_db
         log_info("restore bfd session table -->")
-        keys = db.keys(db.APPL_DB, "BFD_SESSION_TABLE:*")
-        for key in keys:
-            data = db.get_all(db.APPL_DB, key)
-            key_new = self.strip_table_name(key, ":")
-            self.set_local_db(LOCAL_BFD_TABLE, key_new, data)
+        for key, data in reader.read_table(APPL_DB_NAME, BFD_SESSION_TABLE_NAME, ":"):
+            self.set_local_db(LOCAL_BFD_TABLE, key, data)
+        phase_start = self.record_phase(timing, "bfd_session", phase_start)
 
         #restore static route table
         log_info("restore static route table -->")
-        keys = db.keys(db.CONFIG_DB, "STATIC_ROUTE|*")
-        for key in keys:
-            data = db.get_all(db.CONFIG_DB, key)
-            key_new = self.strip_table_name(key, "|")
+        static_routes = reader.read_table(CONFIG_DB_NAME, STATIC_ROUTE_TABLE_NAME, "|")
+        for key, data in static_routes:
             log_debug("SRT_BFD: restore static route from config_db, key %s, data %s"%(key, str(data)))
-            self.static_route_set_handler(key_new, data)
+            self.static_route_set_handler(key, data)
+        phase_start = self.record_phase(timing, "static_route", phase_start)
 
         #clean up local bfd table, remove non static route bfd session
         log_info("cleanup bfd session table -->")
         self.cleanup_local_bfd_table()
+        phase_start = self.record_phase(timing, "cleanup", phase_start)
 
         #restore bfd state table
         log_info("restore bfd state table -->")
-        keys = db.keys(db.STATE_DB, "BFD_SESSION_TABLE|*")
-        for key in keys:
-            data = db.get_all(db.STATE_DB, key)
-            key_new = self.strip_table_name(key, "|")
-            self.bfd_state_set_handler(key_new, data)
+        for key, data in reader.read_table(STATE_DB_NAME, BFD_SESSION_TABLE_NAME, "|"):
+            self.bfd_state_set_handler(key, data)
+        phase_start = self.record_phase(timing, "bfd_state", phase_start)
+
+        log_info("write appl_db -->")
+        appl_db_writes = self.flush_appl_db_batch()
+        self.record_phase(timing, "appl_db_write", phase_start)
+        self.record_phase(timing, "total", start)
+
+        timing["static_routes"] = str(len(static_routes))
+        timing["appl_db_writes"] = str(appl_db_writes)
+        self.reconciliation_tbl.set("staticroutebfd", swsscommon.FieldValuePairs(list(timing.items())))
 
     def cleanup_local_bfd_table(self):
         kl=[]
@@ -585,12 +681,11 @@ class StaticRouteBfd(object):
                 self.remove_from_local_db(LOCAL_SRT_TABLE, srt_key)
 
     def set_static_route_into_appl_db(self, key, data):
-        fvs = swsscommon.FieldValuePairs(list(data.items()))
-        self.static_route_appl_tbl.set(key, fvs)
+        self.write_to_appl_db(self.static_route_appl_tbl, key, data)
         log_debug("SRT_BFD: set static route to appl_db, key %s, data %s"%(key, str(data)))
 
     def del_static_route_from_appl_db(self, key):
-        self.static_route_appl_tbl.delete(key)
+        self.write_to_appl_db(self.static_route_appl_tbl, key, None)
 
     def reconstruct_static_route_config(self, original_config, reachable_nexthops):
         arg_list    = lambda v: [x.strip() for x in v.split(',')] if len(v.strip()) != 0 else None
@@ -748,14 +843,19 @@ class StaticRouteBfd(object):
                 self.first_time = False
                 self.reconciliation()
 
-            for sub in self.subscribers:
-                while True:
-                    key, op, fvs = sub.pop()
-                    if len(key) == 0:
-                        break
-                    log_debug("Received message : '%s'" % str((key, op, fvs)))
-                    for callback in self.callbacks[sub.getDbConnector().getDbId()][sub.getTableName()]:
-                        callback(key, op, dict(fvs))
+            #appl_db writes caused by the popped messages are written together
+            self.start_appl_db_batch()
+            try:
+                for sub in self.subscribers:
+                    while True:
+                        key, op, fvs = sub.pop()
+                        if len(key) == 0:
+                            break
+                        log_debug("Received message : '%s'" % str((key, op, fvs)))
+                        for callback in self.callbacks[sub.getDbConnector().getDbId()][sub.getTableName()]:
+                            callback(key, op, dict(fvs))
+            finally:
+                self.flush_appl_db_batch()
 
 def do_work():
     sr_bfd = StaticRouteBfd()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Measure how long a neighbor state change takes to reach NEIGH_STATE_TABLE in bgpmon.
+
+A mock event source flaps neighbors: it changes the state reported by a fake vtysh
+and appends the matching %ADJCHANGE line to a temporary frr.log. Every state DB
+write is timestamped, so the latency is the time between the log line and the write.
+    python3 tests/benchmark_bgpmon_events.py --neighbors 1000 --flaps 200 --poll-interval 5
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+
+class FakeRedisCommand(object):
+    def formatHSET(self, key, value):
+        self.key = key
+        self.value = value
+
+    def formatDEL(self, key):
+        self.key = key
+        self.value = None
+
+
+class FakeRedisPipeline(object):
+    """ Remembers when every neighbor state was written """
+    def __init__(self, *args):
+        self.pending = []
+        self.writes = []
+
+    def push(self, command):
+        self.pending.append(command)
+
+    def flush(self):
+        now = time.monotonic()
+        for command in self.pending:
+            if command.value is not None:
+                self.writes.append((now, command.key.split('|', 1)[1], command.value['state']))
+        self.pending = []
+
+
+def install_swsscommon():
+    swsscommon = MagicMock()
+    swsscommon.RedisCommand = FakeRedisCommand
+    swsscommon.RedisPipeline = FakeRedisPipeline
+    module = MagicMock(swsscommon=swsscommon)
+    sys.modules['swsscommon'] = module
+    sys.modules['swsscommon.swsscommon'] = swsscommon
+
+
+class FakeFRR(object):
+    """ Neighbor states as bgpd reports them through vtysh """
+    def __init__(self, neighbors, vtysh_latency):
+        self.states = {"10.%d.%d.1" % (i // 256, i % 256): "Established" for i in range(neighbors)}
+        self.vtysh_latency = vtysh_latency
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.snapshots = 0
+
+    def summary(self, peers):
+        return json.dumps({"ipv4Unicast": {"peers": {
+            peer: {"state": state, "remoteAs": 65200, "localAs": 65100, "pfxRcd": 6400, "msgRcvd": 1234,
+                   "msgSent": 1234, "tableVersion": 0, "outq": 0, "inq": 0, "peerUptime": "01:02:03"}
+            for peer, state in peers.items()
+        }}})
+
+    def getstatusoutput_noshell(self, cmd):
+        time.sleep(self.vtysh_latency)
+        commands = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-c']
+        with self.lock:
+            self.calls += 1
+            if commands == ['show bgp summary json']:
+                self.snapshots += 1
+                return 0, self.summary(self.states)
+            peers = [command.split()[4] for command in commands]
+            return 0, "\n".join(self.summary({peer: self.states[peer]} if peer in self.states else {}) for peer in peers)
+
+
+def flap(frr, log_path, flaps, rate, sent):
+    """ The mock event source: change neighbor states and log the changes like bgpd does """
+    peers = sorted(frr.states)
+    for _ in range(flaps):
+        peer = random.choice(peers)
+        with frr.lock:
+            up = frr.states[peer] != "Established"
+            frr.states[peer] = "Established" if up else "Active"
+        with open(log_path, 'a') as fp:
+            fp.write("bgpd[42]: [M59KS-A3ZXZ] %%ADJCHANGE: neighbor %s(ARISTA) in vrf default %s\n" % (peer, "Up" if up else "Down"))
+        sent.append((time.monotonic(), peer, frr.states[peer]))
+        time.sleep(1.0 / rate)
+
+
+def latencies(sent, writes):
+    """ For every change find the first state DB write of the new state after it """
+    result = []
+    for sent_at, peer, state in sent:
+        written_at = next((at for at, key, value in writes if key == peer and value == state and at >= sent_at), None)
+        if written_at is not None:
+            result.append(written_at - sent_at)
+    return sorted(result)
+
+
+class StoppableTime(object):
+    """ time module for bgpmon which ends its loop once stopped """
+    def __init__(self):
+        self.stopped = threading.Event()
+
+    def sleep(self, interval):
+        if self.stopped.wait(interval):
+            raise SystemExit
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def run(mode, args):
+    import bgpmon.bgpmon as bgpmon
+    random.seed(args.seed)
+    bgpmon.time = StoppableTime()
+    frr = FakeFRR(args.neighbors, args.vtysh_latency / 1000.0)
+    bgpmon.getstatusoutput_noshell = frr.getstatusoutput_noshell
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = os.path.join(tmp_dir, 'frr.log')
+        open(log_path, 'w').close()
+        bgpmon.FRR_LOG_FILE = log_path
+        bgpmon.POLL_INTERVAL = args.poll_interval
+        bgp_state_get = bgpmon.BgpStateGet()
+        if mode == 'event':
+            target = lambda: bgp_state_get.run_events(bgpmon.AdjChangeLogSource(log_path))
+        else:
+            bgp_state_get.resync()
+            target = bgp_state_get.run_poll
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        time.sleep(0.5)
+        sent = []
+        flap(frr, log_path, args.flaps, args.rate, sent)
+        time.sleep((args.poll_interval if mode == 'poll' else bgpmon.EVENT_POLL_INTERVAL) + 1.0)
+        bgpmon.time.stopped.set()
+        thread.join()
+    result = latencies(sent, bgp_state_get.pipe.writes)
+    if not result:
+        print('{:>5} mode: no changes were written'.format(mode))
+        return
+    print('{:>5} mode: {:>4}/{} changes written, latency avg {:>8.1f} ms, p99 {:>8.1f} ms, max {:>8.1f} ms, '
+          '{:>5} vtysh calls, {:>3} full snapshots'.format(
+              mode, len(result), len(sent), 1000 * sum(result) / len(result),
+              1000 * result[int(len(result) * 0.99) - 1 if len(result) > 1 else 0], 1000 * result[-1],
+              frr.calls, frr.snapshots))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--neighbors', type=int, default=1000)
+    parser.add_argument('--flaps', type=int, default=100, help='number of neighbor state changes')
+    parser.add_argument('--rate', type=float, default=50.0, help='state changes per second')
+    parser.add_argument('--vtysh-latency', type=float, default=50.0, help='ms spent by every vtysh call')
+    parser.add_argument('--poll-interval', type=float, default=15.0, help='seconds between polls in the poll mode')
+    parser.add_argument('--modes', default='event,poll', help='comma separated bgpmon modes')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    install_swsscommon()
+    print('{} neighbors, {} changes at {}/s'.format(args.neighbors, args.flaps, args.rate))
+    for mode in args.modes.split(','):
+        run(mode, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Drive bgpcfgd Directory and Manager objects with a synthetic boot event stream.
+
+The stream sets DEVICE_METADATA, then --neighbors BGP neighbors which wait for their
+local interfaces, then the interfaces. Every event is handled like Runner does it,
+--burst events per loop iteration. The modes are:
+    linear    every put() checks every subscribed path of the slot and notifies at once
+    indexed   put() checks only the paths which intersect the changed key and notifies at once
+    deferred  like indexed, notifications are run once per loop iteration
+    python3 tests/benchmark_directory.py --neighbors 2000 --managers 6 --burst 100
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+
+def install_swsscommon():
+    swsscommon = MagicMock()
+    swsscommon.SET_COMMAND = "SET"
+    swsscommon.DEL_COMMAND = "DEL"
+    module = MagicMock(swsscommon=swsscommon)
+    sys.modules['swsscommon'] = module
+    sys.modules['swsscommon.swsscommon'] = swsscommon
+
+
+def make_classes():
+    from bgpcfgd.directory import Directory
+    from bgpcfgd.manager import Manager
+
+    class LinearDirectory(Directory):
+        """ Notifies the handlers of all existing paths of the slot on every put() """
+        def put(self, db, table, key, value):
+            slot = self.get_slot_name(db, table)
+            self.data[slot][key] = value
+            if slot in self.notify:
+                handlers_to_run = []
+                for path, handlers in self.notify[slot].walk():
+                    if self.path_exist(db, table, path):
+                        handlers_to_run += handlers
+                for handler in handlers_to_run:
+                    handler()
+
+    class PeerMgr(Manager):
+        """ Peer manager which waits for the local interface of the peer """
+        def __init__(self, common_objs, table_name):
+            deps = [
+                ("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"),
+                ("CONFIG_DB", "DEVICE_METADATA", "localhost/type"),
+                ("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0"),
+                ("LOCAL", "local_addresses", ""),
+                ("LOCAL", "interfaces", ""),
+            ]
+            super(PeerMgr, self).__init__(common_objs, deps, "CONFIG_DB", table_name)
+            self.calls = 0
+            self.added = 0
+            self.notifications = 0
+
+        def on_deps_change(self):
+            self.notifications += 1
+            super(PeerMgr, self).on_deps_change()
+
+        def set_handler(self, key, data):
+            self.calls += 1
+            if not self.directory.path_exist("LOCAL", "local_addresses", data["local_addr"]):
+                return False
+            self.added += 1
+            self.directory.put(self.db_name, self.table_name, key, data)
+            return True
+
+    class InterfaceMgr(Manager):
+        def __init__(self, common_objs):
+            super(InterfaceMgr, self).__init__(common_objs, [], "CONFIG_DB", "INTERFACE")
+
+        def set_handler(self, key, data):
+            ip = key.split("|")[1].split("/")[0]
+            self.directory.put("LOCAL", "local_addresses", ip, {"interface": key})
+            self.directory.put(self.db_name, self.table_name, key, data)
+            self.directory.put("LOCAL", "interfaces", key, data)
+            return True
+
+    return {'linear': LinearDirectory, 'indexed': Directory, 'deferred': Directory}, PeerMgr, InterfaceMgr
+
+
+def generate_stream(neighbors, managers):
+    stream = [
+        ("INTERFACE", "Loopback0", {}),
+        ("METADATA", "localhost", {"bgp_asn": "65100", "type": "LeafRouter"}),
+    ]
+    for i in range(neighbors):
+        address = "10.%d.%d.%d" % (i // 16384, (i // 64) % 256, (i % 64) * 4)
+        stream.append(("PEERS%d" % (i % managers), address, {"local_addr": address, "asn": "65200"}))
+    for i in range(neighbors):
+        address = "10.%d.%d.%d" % (i // 16384, (i // 64) % 256, (i % 64) * 4)
+        stream.append(("INTERFACE", "Ethernet%d|%s/31" % (i, address), {}))
+    return stream
+
+
+def run(mode, stream, args):
+    directories, PeerMgr, InterfaceMgr = make_classes()
+    directory = directories[mode]()
+    common_objs = {'directory': directory, 'cfg_mgr': MagicMock(), 'constants': {}}
+    peer_mgrs = [PeerMgr(common_objs, "PEERS%d" % i) for i in range(args.managers)]
+    interface_mgr = InterfaceMgr(common_objs)
+    handlers = {"PEERS%d" % i: mgr.handler for i, mgr in enumerate(peer_mgrs)}
+    handlers["METADATA"] = lambda key, op, data: directory.put("CONFIG_DB", "DEVICE_METADATA", key, data)
+    handlers["INTERFACE"] = lambda key, op, data: (directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", key, data)
+                                                   if key.startswith("Loopback") else interface_mgr.handler(key, op, data))
+
+    start = time.time()
+    for i in range(0, len(stream), args.burst):
+        if mode == 'deferred':
+            directory.defer_notifications()
+        for table, key, data in stream[i:i + args.burst]:
+            handlers[table](key, "SET", dict(data))
+        if mode == 'deferred':
+            directory.run_deferred_notifications()
+    elapsed = time.time() - start
+    print('{:>9}: {:>8.2f} s, {:>9} dependency notifications, {:>10} set_handler calls, {:>6} peers added'.format(
+        mode, elapsed, sum(mgr.notifications for mgr in peer_mgrs), sum(mgr.calls for mgr in peer_mgrs), sum(mgr.added for mgr in peer_mgrs)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--neighbors', type=int, default=1000)
+    parser.add_argument('--managers', type=int, default=6, help='number of peer managers')
+    parser.add_argument('--burst', type=int, default=100, help='events handled per loop iteration')
+    parser.add_argument('--modes', default='linear,indexed,deferred', help='comma separated modes')
+    args = parser.parse_args()
+
+    install_swsscommon()
+    stream = generate_stream(args.neighbors, args.managers)
+    print('{} events, {} per loop iteration'.format(len(stream), args.burst))
+    for mode in args.modes.split(','):
+        run(mode, stream, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Replay a CONFIG_DB event stream through bgpcfgd Runner against a fake FRR
+and compare commit windows.
+
+The stream is a file with one JSON event per line:
+    {"table": "BGP_NEIGHBOR", "key": "10.0.0.1", "op": "SET", "fvs": {"asn": "65200", "name": "ARISTA01T2"}}
+Without a file a config reload with --neighbors BGP_NEIGHBOR entries is generated:
+    python3 tests/benchmark_runner_replay.py --neighbors 500 --write-latency 30
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+import yaml
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+TEMPLATE_PATH = os.path.abspath(os.path.join(TESTS_DIR, '../../../dockers/docker-fpm-frr/frr'))
+CONSTANTS_PATH = os.path.abspath(os.path.join(TESTS_DIR, '../../../files/image_config/constants/constants.yml'))
+
+
+class ReplaySubscriber(object):
+    def __init__(self, conn, table_name):
+        self.conn = conn
+        self.table_name = table_name
+        self.events = []
+
+    def pop(self):
+        if not self.events:
+            return "", "", []
+        event = self.events.pop(0)
+        return event['key'], event['op'], list(event.get('fvs', {}).items())
+
+    def getDbConnector(self):
+        return self.conn
+
+    def getTableName(self):
+        return self.table_name
+
+
+class ReplayDBConnector(object):
+    def __init__(self, db_name, *args):
+        self.db_name = db_name
+
+    def getDbId(self):
+        return self.db_name
+
+
+class ReplaySelect(object):
+    """ Delivers the recorded events in bursts, one burst per select() call """
+    OBJECT = 0
+    TIMEOUT = 1
+    ERROR = 2
+
+    def __init__(self):
+        self.subscribers = {}
+        self.stream = []
+        self.burst = 1
+        self.gap = 0.0
+        self.runner = None
+
+    def addSelectable(self, subscriber):
+        self.subscribers[subscriber.getTableName()] = subscriber
+
+    def select(self, timeout):
+        if self.stream:
+            time.sleep(self.gap)
+            for event in self.stream[:self.burst]:
+                self.subscribers[event['table']].events.append(event)
+            del self.stream[:self.burst]
+            return self.OBJECT, None
+        if self.runner.cfg_manager.get_pending_commands() == 0:
+            sys.modules['bgpcfgd.runner'].g_run = False
+        time.sleep(timeout / 1000.0)
+        return self.TIMEOUT, None
+
+
+def install_swsscommon():
+    swsscommon = MagicMock()
+    swsscommon.CFG_DEVICE_METADATA_TABLE_NAME = "DEVICE_METADATA"
+    swsscommon.CFG_BGP_NEIGHBOR_TABLE_NAME = "BGP_NEIGHBOR"
+    swsscommon.CFG_DEVICE_NEIGHBOR_METADATA_TABLE_NAME = "DEVICE_NEIGHBOR_METADATA"
+    swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME = "LOOPBACK_INTERFACE"
+    swsscommon.CFG_BGP_DEVICE_GLOBAL_TABLE_NAME = "BGP_DEVICE_GLOBAL"
+    swsscommon.SET_COMMAND = "SET"
+    swsscommon.DEL_COMMAND = "DEL"
+    swsscommon.SonicDBConfig.getDbId = lambda db_name: db_name
+    swsscommon.DBConnector = ReplayDBConnector
+    swsscommon.SubscriberStateTable = ReplaySubscriber
+    swsscommon.Select = ReplaySelect
+    module = MagicMock(swsscommon=swsscommon)
+    sys.modules['swsscommon'] = module
+    sys.modules['swsscommon.swsscommon'] = swsscommon
+
+
+class FakeFRR(object):
+    """ FRR which spends the time of a vtysh process spawn on every call """
+    def __init__(self, write_latency, restart_latency):
+        self.write_latency = write_latency
+        self.restart_latency = restart_latency
+        self.writes = 0
+        self.restarts = 0
+
+    def write(self, config_text):
+        self.writes += 1
+        time.sleep(self.write_latency)
+        return True
+
+    def restart_peer_groups(self, peer_groups):
+        self.restarts += len(peer_groups)
+        time.sleep(self.restart_latency * len(peer_groups))
+        return True
+
+
+def generate_stream(neighbors):
+    stream = [
+        {"table": "DEVICE_METADATA", "key": "localhost", "op": "SET",
+         "fvs": {"bgp_asn": "65100", "hostname": "sonic", "type": "LeafRouter"}},
+        {"table": "LOOPBACK_INTERFACE", "key": "Loopback0", "op": "SET", "fvs": {}},
+        {"table": "LOOPBACK_INTERFACE", "key": "Loopback0|10.1.0.32/32", "op": "SET", "fvs": {}},
+        {"table": "INTERFACE", "key": "Ethernet0", "op": "SET", "fvs": {}},
+        {"table": "INTERFACE", "key": "Ethernet0|10.0.0.0/31", "op": "SET", "fvs": {}},
+    ]
+    for index in range(neighbors):
+        stream.append({"table": "BGP_NEIGHBOR", "key": "10.%d.%d.1" % (index // 256, index % 256), "op": "SET",
+                       "fvs": {"asn": str(64600 + index), "name": "ARISTA%02dT2" % index, "holdtime": "10", "keepalive": "3"}})
+    return stream
+
+
+def replay(stream, args, commit_interval):
+    import bgpcfgd.managers_bgp
+    import bgpcfgd.runner
+    from bgpcfgd.config import ConfigMgr
+    from bgpcfgd.directory import Directory
+    from bgpcfgd.managers_bgp import BGPPeerMgrBase
+    from bgpcfgd.managers_db import BGPDataBaseMgr
+    from bgpcfgd.managers_intf import InterfaceMgr
+    from bgpcfgd.template import TemplateFabric
+
+    bgpcfgd.managers_bgp.run_command = lambda cmd: (0, '{"vrfs": {"default": {}}}' if 'vrfs' in str(cmd) else '{}', '')
+    with open(CONSTANTS_PATH) as fp:
+        constants = yaml.safe_load(fp)['constants']
+    frr = FakeFRR(args.write_latency / 1000.0, args.restart_latency / 1000.0)
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr':   ConfigMgr(frr),
+        'tf':        TemplateFabric(TEMPLATE_PATH),
+        'constants': constants,
+    }
+    runner = bgpcfgd.runner.Runner(common_objs['cfg_mgr'], commit_interval=commit_interval,
+                                   commit_max_commands=args.max_commands, directory=common_objs['directory'])
+    runner.selector.stream = list(stream)
+    runner.selector.burst = args.burst
+    runner.selector.gap = args.gap / 1000.0
+    runner.selector.runner = runner
+    for mgr in [
+        BGPDataBaseMgr(common_objs, "CONFIG_DB", "DEVICE_METADATA"),
+        InterfaceMgr(common_objs, "CONFIG_DB", "LOOPBACK_INTERFACE"),
+        InterfaceMgr(common_objs, "CONFIG_DB", "INTERFACE"),
+        BGPPeerMgrBase(common_objs, "CONFIG_DB", "BGP_NEIGHBOR", "general", False),
+    ]:
+        runner.add_manager(mgr)
+    bgpcfgd.runner.g_run = True
+    start = time.time()
+    runner.run()
+    elapsed = time.time() - start
+    print('commit window {:>5} ms: {:>8.2f} s, {:>5} commits, {:>7} commands, {:>6} duplicates, {:>5} peer-group restarts, max commit {:>8.1f} ms'.format(
+        commit_interval, elapsed, runner.stats['commits'], runner.stats['commands'], runner.stats['duplicates'],
+        frr.restarts, runner.stats['max_latency'] * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('stream', nargs='?', help='file with recorded CONFIG_DB events')
+    parser.add_argument('--neighbors', type=int, default=500)
+    parser.add_argument('--burst', type=int, default=10, help='events delivered per select() wakeup')
+    parser.add_argument('--gap', type=float, default=1.0, help='ms between bursts')
+    parser.add_argument('--write-latency', type=float, default=30.0, help='ms spent by every FRR write')
+    parser.add_argument('--restart-latency', type=float, default=30.0, help='ms spent by every peer-group restart')
+    parser.add_argument('--max-commands', type=int, default=2000)
+    parser.add_argument('--windows', default='0,100,500', help='comma separated commit windows in ms')
+    args = parser.parse_args()
+
+    install_swsscommon()
+    if args.stream:
+        with open(args.stream) as fp:
+            stream = [json.loads(line) for line in fp if line.strip()]
+    else:
+        stream = generate_stream(args.neighbors)
+    print('{} events, {} per wakeup'.format(len(stream), args.burst))
+    for window in args.windows.split(','):
+        replay(stream, args, int(window))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Measure one StaticRouteTimer expiry sweep over --routes synthetic static routes.
+
+A third of the routes is refreshed, a third has expiry disabled and the rest is deleted.
+The routes are stored in fakeredis, or in a real redis with --unix-socket or --host.
+Every round trip to redis can be delayed by --rtt microseconds. The modes are:
+    keys       KEYS, then HGET/HSET/DEL for every route like SonicV2Connector does it
+    scan       SCAN pages, pipelined HMGET and pipelined HSET/DEL for every page
+    deadlines  the routes are found by one check and checked by the next one when their deadline passes
+    python3 tests/benchmark_static_rt_timer.py --routes 100000 --rtt 50
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+TEST_DB = 15
+
+
+def install_swsscommon():
+    swsscommon = MagicMock()
+    module = MagicMock(swsscommon=swsscommon)
+    sys.modules['swsscommon'] = module
+    sys.modules['swsscommon.swsscommon'] = swsscommon
+
+
+class RoundTrips(object):
+    """ Counts the round trips to redis and delays every one of them """
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+
+class CountingPipeline(object):
+    def __init__(self, pipe, round_trips):
+        self.pipe = pipe
+        self.round_trips = round_trips
+
+    def execute(self):
+        self.round_trips()
+        return self.pipe.execute()
+
+    def __getattr__(self, name):
+        return getattr(self.pipe, name)
+
+
+class CountingClient(object):
+    """ redis-py client which counts SCAN and pipeline round trips """
+    def __init__(self, client, round_trips):
+        self.client = client
+        self.round_trips = round_trips
+
+    def scan(self, *args, **kwargs):
+        self.round_trips()
+        return self.client.scan(*args, **kwargs)
+
+    def pipeline(self, *args, **kwargs):
+        return CountingPipeline(self.client.pipeline(*args, **kwargs), self.round_trips)
+
+    def pubsub(self, *args, **kwargs):
+        return self.client.pubsub(*args, **kwargs)
+
+
+class Connector(object):
+    """ The part of SonicV2Connector used by the per-key sweep, one round trip for every call """
+    APPL_DB = 'APPL_DB'
+
+    def __init__(self, client, round_trips):
+        self.client = client
+        self.round_trips = round_trips
+
+    def keys(self, db, pattern):
+        self.round_trips()
+        return self.client.keys(pattern)
+
+    def get(self, db, key, field):
+        self.round_trips()
+        return self.client.hget(key, field)
+
+    def set(self, db, key, field, value):
+        self.round_trips()
+        return self.client.hset(key, field, value)
+
+    def delete(self, db, key):
+        self.round_trips()
+        return self.client.delete(key)
+
+
+def make_client(args):
+    import redis
+    if args.unix_socket:
+        return redis.Redis(unix_socket_path=args.unix_socket, db=TEST_DB, decode_responses=True)
+    if args.host:
+        return redis.Redis(host=args.host, port=args.port, db=TEST_DB, decode_responses=True)
+    import fakeredis
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def load_routes(client, routes):
+    client.flushdb()
+    pipe = client.pipeline(transaction=False)
+    for i in range(routes):
+        key = "STATIC_ROUTE:10.%d.%d.0/24" % (i // 256, i % 256)
+        value = {"nexthop": "10.0.0.1", "ifname": "Ethernet0"}
+        if i % 3 == 0:
+            value["refresh"] = "true"
+        elif i % 3 == 1:
+            value["expiry"] = "false"
+        pipe.hset(key, mapping=value)
+        if i % 10000 == 9999:
+            pipe.execute()
+            pipe = client.pipeline(transaction=False)
+    pipe.execute()
+
+
+def alarm_by_key(db):
+    """ Expiry sweep with one round trip for every read and write, like SonicV2Connector does it """
+    for key in db.keys(db.APPL_DB, "STATIC_ROUTE:*") or []:
+        if db.get(db.APPL_DB, key, "expiry") == "false":
+            continue
+        if db.get(db.APPL_DB, key, "refresh") == "true":
+            db.set(db.APPL_DB, key, "refresh", "false")
+        else:
+            db.delete(db.APPL_DB, key)
+
+
+def run(mode, client, args):
+    from bgpcfgd.static_rt_timer import StaticRouteTimer
+    load_routes(client, args.routes)
+    round_trips = RoundTrips(args.rtt / 1000000.0)
+    timer = StaticRouteTimer(use_deadlines=(mode == 'deadlines'))
+    timer.db = Connector(client, round_trips)
+    timer.client = CountingClient(client, round_trips)
+    start = time.time()
+    if mode == 'keys':
+        alarm_by_key(timer.db)
+    elif mode == 'deadlines':
+        with patch('bgpcfgd.static_rt_timer.time.time', return_value=0.0):
+            timer.check_deadlines(args.timer)
+        with patch('bgpcfgd.static_rt_timer.time.time', return_value=float(args.timer)):
+            timer.check_deadlines(args.timer)
+    else:
+        timer.alarm()
+    elapsed = time.time() - start
+    print('{:>9}: {:>8.2f} s, {:>7} round trips, {:>6} routes left'.format(
+        mode, elapsed, round_trips.count, len(client.keys("STATIC_ROUTE:*"))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--routes', type=int, default=100000)
+    parser.add_argument('--rtt', type=float, default=0.0, help='microseconds added to every round trip')
+    parser.add_argument('--timer', type=int, default=180, help='route expiry time in seconds')
+    parser.add_argument('--unix-socket', help='redis unix socket. db {} is flushed'.format(TEST_DB))
+    parser.add_argument('--host', help='redis host. db {} is flushed'.format(TEST_DB))
+    parser.add_argument('--port', type=int, default=6379)
+    parser.add_argument('--modes', default='keys,scan,deadlines', help='comma separated modes')
+    args = parser.parse_args()
+
+    install_swsscommon()
+    client = make_client(args)
+    print('{} routes, {} us per round trip'.format(args.routes, args.rtt))
+    for mode in args.modes.split(','):
+        run(mode, client, args)
+
+
+if __name__ == '__main__':
+    main()
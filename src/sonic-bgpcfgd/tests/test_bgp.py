@@ -129,6 +129,26 @@ def test_add_peer_internal_router_id():
         res = m.set_handler("30.30.30.1", {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'})
         assert res, "Expect True return value"
 
+def test_add_peers_peer_group_pushed_once():
+    for constant in load_constant_files():
+        m = constructor(constant)
+        m.cfg_mgr.write_failures = 0
+        for i in range(1, 4):
+            res = m.set_handler("30.30.30.%d" % i, {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'})
+            assert res, "Expect True return value"
+        assert m.peer_group_mgr.stats == {'renders': 2, 'pushes': 2, 'saved': 4}
+        # rendering inputs are changed
+        m.directory.put("CONFIG_DB", swsscommon.CFG_DEVICE_METADATA_TABLE_NAME, "localhost", {"bgp_asn": "65100", "type": "LeafRouter"})
+        m.set_handler("30.30.30.4", {'asn': '65200', 'local_addr': '30.30.30.30', 'name': 'TOR'})
+        assert m.peer_group_mgr.stats == {'renders': 4, 'pushes': 4, 'saved': 4}
+        # the pushed entities could be lost
+        m.cfg_mgr.write_failures = 1
+        m.set_handler("30.30.30.5", {'asn': '65200', 'local_addr': '30.30.30.30', 'name': 'TOR'})
+        assert m.peer_group_mgr.stats == {'renders': 6, 'pushes': 6, 'saved': 4}
+        m.set_handler("30.30.30.6", {'asn': '65200', 'local_addr': '30.30.30.30', 'name': 'TOR'})
+        assert m.peer_group_mgr.stats == {'renders': 6, 'pushes': 6, 'saved': 6}
+        assert m.get_stats() == {'peer_group_renders': 6, 'peer_group_pushes': 6, 'peer_group_saved': 6}
+
 def test_add_peer_internal_router_id_no_lo4096():
     for constant in load_constant_files():
         m = constructor(constant, bgp_router_id="8.8.8.8", peer_type="internal")
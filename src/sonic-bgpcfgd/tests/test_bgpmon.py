@@ -0,0 +1,217 @@
+import json
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+swsscommon_module_mock = MagicMock()
+
+@pytest.fixture
+def bgpmon():
+    with patch.dict("sys.modules", swsscommon=swsscommon_module_mock):
+        import bgpmon.bgpmon
+        yield bgpmon.bgpmon
+
+@pytest.fixture
+def bgp_state_get(bgpmon):
+    m = bgpmon.BgpStateGet()
+    m.flush_pipe = MagicMock(side_effect=lambda data: m.flushed.append(dict(data)) or data.clear())
+    m.flushed = []
+    return m
+
+def summary(peers):
+    return json.dumps({
+        "ipv4Unicast": {
+            "peers": {peer: {"state": state, "remoteAs": 65200, "localAs": 65100} for peer, state in peers.items()}
+        }
+    })
+
+def test_adjchange_lines(bgpmon):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'frr.log')
+        with open(path, 'w') as fp:
+            fp.write("Jan 1 bgpd[1]: [M59KS-A3ZXZ] %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T2) in vrf default Up\n")
+        source = bgpmon.AdjChangeLogSource(path)
+        assert source.open()
+        assert source.read_events() == []
+        with open(path, 'a') as fp:
+            fp.write("Jan 1 bgpd[1]: [M59KS-A3ZXZ] %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T2) in vrf default Down BGP Notification send\n")
+            fp.write("Jan 1 bgpd[1]: %ADJCHANGE: neighbor fc00::2 Up\n")
+            fp.write("Jan 1 zebra[1]: interface Ethernet0 is up\n")
+            fp.write("Jan 1 bgpd[1]: %ADJCHANGE: neighbor 10.0.0.5 in vrf Vrf1 Up\n")
+            fp.write("Jan 1 bgpd[1]: %ADJCHANGE: neighbor 10.0.")
+        assert source.read_events() == [
+            ('10.0.0.1', 'default', 'Down'),
+            ('fc00::2', 'default', 'Up'),
+            ('10.0.0.5', 'Vrf1', 'Up'),
+        ]
+        with open(path, 'a') as fp:
+            fp.write("0.3(ARISTA03T2) in vrf default Up\n")
+        assert source.read_events() == [('10.0.0.3', 'default', 'Up')]
+        source.close()
+
+def test_log_gaps(bgpmon):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'frr.log')
+        source = bgpmon.AdjChangeLogSource(path)
+        assert not source.open()
+        assert source.read_events() is None
+        with open(path, 'w') as fp:
+            fp.write("line 1\nline 2\n")
+        assert source.read_events() is None
+        assert source.is_open()
+        assert source.read_events() == []
+        # truncated
+        with open(path, 'w') as fp:
+            fp.write("x\n")
+        assert source.read_events() is None
+        assert source.read_events() == []
+        # rotated
+        os.rename(path, path + '.1')
+        with open(path, 'w') as fp:
+            fp.write("line 1\nline 2\n")
+        assert source.read_events() is None
+        os.remove(path)
+        assert source.read_events() is None
+        assert not source.is_open()
+
+@patch('bgpmon.bgpmon.getstatusoutput_noshell')
+def test_apply_adj_changes(mocked_getstatusoutput, bgp_state_get):
+    mocked_getstatusoutput.return_value = (0, summary({"10.0.0.1": "Active", "10.0.0.3": "Established"}))
+    assert bgp_state_get.resync()
+    assert bgp_state_get.flushed == [{
+        "NEIGH_STATE_TABLE|10.0.0.1": {'state': 'Active', 'peerType': 'e-BGP'},
+        "NEIGH_STATE_TABLE|10.0.0.3": {'state': 'Established', 'peerType': 'e-BGP'},
+    }]
+    bgp_state_get.flushed = []
+    mocked_getstatusoutput.reset_mock()
+    mocked_getstatusoutput.return_value = (0, summary({"10.0.0.1": "Connect"}) + "\n" + summary({"10.0.0.3": "Idle"}) + "\n")
+    events = [
+        ("10.0.0.1", "default", "Up"),
+        ("10.0.0.1", "default", "Down"),
+        ("10.0.0.3", "default", "Down"),
+        ("10.0.0.9", "Vrf1", "Up"),
+    ]
+    assert bgp_state_get.apply_adj_changes(events)
+    mocked_getstatusoutput.assert_called_once_with(["vtysh", "-H", "/dev/null",
+                                                    "-c", "show bgp summary neighbor 10.0.0.1 json",
+                                                    "-c", "show bgp summary neighbor 10.0.0.3 json"])
+    assert bgp_state_get.flushed == [{
+        "NEIGH_STATE_TABLE|10.0.0.1": {'state': 'Connect', 'peerType': 'e-BGP'},
+        "NEIGH_STATE_TABLE|10.0.0.3": {'state': 'Idle', 'peerType': 'e-BGP'},
+    }]
+    assert bgp_state_get.peer_state == {"10.0.0.1": "Connect", "10.0.0.3": "Idle"}
+    bgp_state_get.flushed = []
+    mocked_getstatusoutput.reset_mock()
+    assert bgp_state_get.apply_adj_changes([("10.0.0.1", "default", "Up")])
+    assert not mocked_getstatusoutput.called
+    assert bgp_state_get.flushed == [{"NEIGH_STATE_TABLE|10.0.0.1": {'state': 'Established'}}]
+    # the same state isn't written again
+    bgp_state_get.flushed = []
+    assert bgp_state_get.apply_adj_changes([("10.0.0.1", "default", "Down"), ("10.0.0.1", "default", "Up")])
+    assert bgp_state_get.flushed == []
+
+@patch('bgpmon.bgpmon.getstatusoutput_noshell')
+def test_apply_adj_changes_needs_resync(mocked_getstatusoutput, bgpmon, bgp_state_get):
+    mocked_getstatusoutput.return_value = (0, summary({"10.0.0.1": "Established"}))
+    assert bgp_state_get.resync()
+    # unknown neighbor
+    assert not bgp_state_get.apply_adj_changes([("10.0.0.2", "default", "Up")])
+    # neighbor was removed
+    mocked_getstatusoutput.return_value = (0, summary({}))
+    assert not bgp_state_get.apply_adj_changes([("10.0.0.1", "default", "Down")])
+    # too many changes
+    bgp_state_get.peer_state.update({"10.1.0.%d" % i: "Active" for i in range(bgpmon.EVENT_RESYNC_THRESHOLD + 1)})
+    assert not bgp_state_get.apply_adj_changes([("10.1.0.%d" % i, "default", "Up") for i in range(bgpmon.EVENT_RESYNC_THRESHOLD + 1)])
+
+def test_run_events(bgpmon, bgp_state_get):
+    source = MagicMock()
+    source.is_open.return_value = True
+    source.read_events.side_effect = [[], None, [("10.0.0.1", "default", "Up")], [("10.0.0.2", "default", "Up")], []]
+    bgp_state_get.resync = MagicMock(side_effect=[True, False, True, True])
+    bgp_state_get.apply_adj_changes = MagicMock(side_effect=[True, False])
+    sleeps = []
+    def sleep(interval):
+        sleeps.append(interval)
+        if len(sleeps) == 6:
+            raise StopIteration
+    with patch('bgpmon.bgpmon.time.sleep', side_effect=sleep), patch('bgpmon.bgpmon.time.monotonic', return_value=0):
+        with pytest.raises(StopIteration):
+            bgp_state_get.run_events(source)
+    source.open.assert_called_once()
+    # resync on start, after the gap (failed once), and after the change which can't be applied
+    assert bgp_state_get.resync.call_count == 4
+    assert sleeps == [bgpmon.EVENT_POLL_INTERVAL, bgpmon.EVENT_POLL_INTERVAL, bgpmon.POLL_INTERVAL,
+                      bgpmon.EVENT_POLL_INTERVAL, bgpmon.EVENT_POLL_INTERVAL, bgpmon.EVENT_POLL_INTERVAL]
+
+def run_events_until(bgpmon, bgp_state_get, source, count):
+    """ Run the event loop for count sleeps, the monotonic clock is the time slept """
+    sleeps = []
+    clock = [0]
+    def sleep(interval):
+        sleeps.append(interval)
+        clock[0] += interval
+        if len(sleeps) == count:
+            raise StopIteration
+    with patch('bgpmon.bgpmon.time.sleep', side_effect=sleep), \
+         patch('bgpmon.bgpmon.time.monotonic', side_effect=lambda: clock[0]):
+        with pytest.raises(StopIteration):
+            bgp_state_get.run_events(source)
+    return sleeps
+
+def test_run_events_no_events(bgpmon, bgp_state_get):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bgpd.log')
+        with open(path, 'w') as fp:
+            fp.write("Jan 1 bgpd[1]: %ADJCHANGE: neighbor 10.0.0.1 Up\n")
+        source = bgpmon.AdjChangeLogSource(path)
+        bgp_state_get.resync = MagicMock(return_value=True)
+        bgp_state_get.apply_adj_changes = MagicMock()
+        count = int(bgpmon.EVENT_RESYNC_INTERVAL / bgpmon.EVENT_POLL_INTERVAL) + 10
+        sleeps = run_events_until(bgpmon, bgp_state_get, source, count)
+        source.close()
+    assert sleeps == [bgpmon.EVENT_POLL_INTERVAL] * count
+    # the lines written before start are covered by the first snapshot
+    assert not bgp_state_get.apply_adj_changes.called
+    # on start, and once the resync interval is over
+    assert bgp_state_get.resync.call_count == 2
+
+def test_run_events_missing_log(bgpmon, bgp_state_get):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = bgpmon.AdjChangeLogSource(os.path.join(tmp_dir, 'bgpd.log'))
+        bgp_state_get.resync = MagicMock(return_value=True)
+        bgp_state_get.apply_adj_changes = MagicMock()
+        sleeps = run_events_until(bgpmon, bgp_state_get, source, 3)
+    # changes can't be followed, every check reads the full snapshot at the poll interval
+    assert sleeps == [bgpmon.POLL_INTERVAL] * 3
+    assert bgp_state_get.resync.call_count == 3
+    assert not bgp_state_get.apply_adj_changes.called
+
+def test_bgp_activity_detected(bgpmon):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bgpd.log')
+        bgp_state_get = bgpmon.BgpStateGet(path)
+        # the log is missing
+        assert bgp_state_get.bgp_activity_detected()
+        with open(path, 'w') as fp:
+            fp.write("line 1\n")
+        assert bgp_state_get.bgp_activity_detected()
+        assert not bgp_state_get.bgp_activity_detected()
+        os.utime(path, (1, 1))
+        assert bgp_state_get.bgp_activity_detected()
+
+@pytest.mark.parametrize("argv,mode", [([], "poll"), (["--mode", "event"], "event")])
+def test_main(bgpmon, argv, mode):
+    with patch('sys.argv', ['bgpmon'] + argv + ['--log-file', '/var/log/frr/bgpd.log']), \
+         patch('bgpmon.bgpmon.BgpStateGet') as mocked_bgp_state_get:
+        bgpmon.main()
+    mocked_bgp_state_get.assert_called_once_with('/var/log/frr/bgpd.log')
+    bgp_state_get = mocked_bgp_state_get.return_value
+    if mode == "poll":
+        bgp_state_get.run_poll.assert_called_once_with()
+        assert not bgp_state_get.run_events.called
+    else:
+        assert bgp_state_get.run_events.call_args[0][0].path == '/var/log/frr/bgpd.log'
+        assert not bgp_state_get.run_poll.called
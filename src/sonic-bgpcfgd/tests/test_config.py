@@ -205,3 +205,100 @@ def test_from_canonical():
     c = ConfigMgr(frr)
     raw = c.from_canonical(canonical)
     assert raw == expected
+
+frr_config_sample = """!
+router bgp 64601
+ neighbor PEER_V4 peer-group
+ address-family ipv4 unicast
+  neighbor PEER_V4 route-map FROM_BGP_PEER_V4 in
+ exit-address-family
+!
+ip prefix-list PL_A seq 20 permit 20.0.0.0/8 le 32
+ip prefix-list PL_A seq 10 deny 0.0.0.0/0 le 17
+ipv6 prefix-list PL_A seq 10 deny ::/0 le 59
+bgp community-list standard CL_A permit 1010:2020
+route-map FROM_BGP_PEER_V4 permit 2
+ call ALLOW_LIST_V4
+ on-match next
+route-map ALLOW_LIST_V4 permit 65535
+ set community 123:123 additive
+route-map ALLOW_LIST_V4 permit 10
+ match ip address prefix-list PL_A
+"""
+
+def test_model_index():
+    c = ConfigMgr(MagicMock())
+    c.frr.get_config = MagicMock(return_value=frr_config_sample)
+    c.update()
+    m = c.get_model()
+    assert m.get_text() == c.get_text()[:-1]
+    assert m.get_prefix_list('ip', 'PL_A') == [(10, 'deny 0.0.0.0/0 le 17'), (20, 'permit 20.0.0.0/8 le 32')]
+    assert m.get_prefix_list('ipv6', 'PL_A') == [(10, 'deny ::/0 le 59')]
+    assert m.get_prefix_list('ip', 'PL_B') == []
+    assert m.get_community_list('CL_A') == ['bgp community-list standard CL_A permit 1010:2020']
+    assert m.get_route_map('ALLOW_LIST_V4') == [
+        ('permit', 10, ['match ip address prefix-list PL_A']),
+        ('permit', 65535, ['set community 123:123 additive']),
+    ]
+    assert m.get_route_map_entry('FROM_BGP_PEER_V4', 2) == ('permit', 2, ['call ALLOW_LIST_V4', 'on-match next'])
+    assert m.get_route_map_entry('FROM_BGP_PEER_V4', 3) is None
+    assert m.get_neighbors() == {'PEER_V4': ['peer-group', 'route-map FROM_BGP_PEER_V4 in']}
+
+def test_model_apply():
+    c = ConfigMgr(MagicMock())
+    c.frr.get_config = MagicMock(return_value=frr_config_sample)
+    c.frr.write = MagicMock(return_value=True)
+    c.frr.restart_peer_groups = MagicMock(return_value=True)
+    c.update()
+    c.push_list([
+        'no ip prefix-list PL_A',
+        'ip prefix-list PL_A seq 10 permit 30.0.0.0/8 le 32',
+        'no bgp community-list standard CL_A',
+        'bgp community-list standard CL_A permit 3030:4040',
+        'route-map ALLOW_LIST_V4 permit 65535',
+        ' set community 456:456 additive',
+        'route-map ALLOW_LIST_V4 permit 20',
+        ' match ip address prefix-list PL_B',
+        'no route-map ALLOW_LIST_V4 permit 10',
+    ])
+    assert c.commit()
+    c.update()
+    assert c.frr.get_config.call_count == 1
+    m = c.get_model()
+    assert m.get_prefix_list('ip', 'PL_A') == [(10, 'permit 30.0.0.0/8 le 32')]
+    assert m.get_prefix_list('ipv6', 'PL_A') == [(10, 'deny ::/0 le 59')]
+    assert m.get_community_list('CL_A') == ['bgp community-list standard CL_A permit 3030:4040']
+    assert m.get_route_map('ALLOW_LIST_V4') == [
+        ('permit', 20, ['match ip address prefix-list PL_B']),
+        ('permit', 65535, ['set community 456:456 additive']),
+    ]
+    assert 'route-map ALLOW_LIST_V4 permit 20' in c.get_text()
+    assert ' set community 123:123 additive' not in c.get_text()
+    assert c.current_config == c.to_canonical("\n".join(c.get_text()))
+
+def model_reread_common(write_result, cmds):
+    c = ConfigMgr(MagicMock())
+    c.frr.get_config = MagicMock(return_value=frr_config_sample)
+    c.frr.write = MagicMock(return_value=write_result)
+    c.frr.restart_peer_groups = MagicMock(return_value=True)
+    c.update()
+    c.push_list(cmds)
+    c.commit()
+    c.update()
+    assert c.frr.get_config.call_count == 2
+
+def test_model_reread_on_write_error():
+    model_reread_common(False, ['ip prefix-list PL_A seq 30 permit 30.0.0.0/8 le 32'])
+
+def test_model_reread_on_unknown_command():
+    model_reread_common(True, ['router bgp 64601', ' neighbor PEER_V6 peer-group'])
+
+def test_model_reread_on_mismatch():
+    model_reread_common(True, ['no route-map NOT_EXISTING permit 10'])
+
+def test_model_reread_on_interval():
+    c = ConfigMgr(MagicMock(), reconcile_interval=0)
+    c.frr.get_config = MagicMock(return_value=frr_config_sample)
+    c.update()
+    c.update()
+    assert c.frr.get_config.call_count == 2
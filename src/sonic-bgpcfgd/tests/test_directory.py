@@ -55,3 +55,59 @@ def test_directory(mocked_log_err):
     # Test remove_slot() with nonexist table
     directory.remove_slot("db_name", "table_nonexist")
     mocked_log_err.assert_called_with("Directory: Can't remove slot 'db_name__table_nonexist'. The slot doesn't exist")
+
+def test_notify_intersecting_paths():
+    directory = Directory()
+    on_metadata = MagicMock()
+    on_asn = MagicMock()
+    on_loopback = MagicMock()
+    on_any_address = MagicMock()
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"),
+                         ("CONFIG_DB", "DEVICE_METADATA", "localhost/type")], on_metadata)
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn")], on_asn)
+    directory.subscribe([("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0")], on_loopback)
+    directory.subscribe([("LOCAL", "local_addresses", "")], on_any_address)
+
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100", "type": "LeafRouter"})
+    assert on_metadata.call_count == 1
+    assert on_asn.call_count == 1
+    # the changed key doesn't intersect the subscribed paths
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "other", {"bgp_asn": "65100"})
+    assert on_metadata.call_count == 1
+    # the subscribed path doesn't exist
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"type": "LeafRouter"})
+    assert on_metadata.call_count == 2
+    assert on_asn.call_count == 1
+
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback1", {})
+    assert not on_loopback.called
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0", {})
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0|10.1.0.32/32", {})
+    assert on_loopback.call_count == 2
+
+    directory.put("LOCAL", "local_addresses", "10.0.0.0", {})
+    directory.put("LOCAL", "local_addresses", "10.0.0.2", {})
+    assert on_any_address.call_count == 2
+
+    directory.unsubscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/type")])
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"type": "LeafRouter"})
+    assert on_metadata.call_count == 2
+
+def test_deferred_notifications():
+    directory = Directory()
+    calls = []
+    on_lo = MagicMock(side_effect=lambda: calls.append("lo") or directory.put("LOCAL", "local_addresses", "10.1.0.32", {}))
+    on_address = MagicMock(side_effect=lambda: calls.append("address"))
+    directory.subscribe([("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0")], on_lo)
+    directory.subscribe([("LOCAL", "local_addresses", "")], on_address)
+
+    directory.defer_notifications()
+    for i in range(10):
+        directory.put("LOCAL", "local_addresses", "10.0.0.%d" % i, {})
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0", {})
+    assert calls == []
+    directory.run_deferred_notifications()
+    assert calls == ["address", "lo", "address"]
+    assert directory.deferred is None
+    directory.put("LOCAL", "local_addresses", "10.0.0.20", {})
+    assert calls == ["address", "lo", "address", "address"]
@@ -0,0 +1,164 @@
+from unittest.mock import MagicMock, patch
+
+from bgpcfgd.config import ConfigMgr
+
+
+swsscommon_module_mock = MagicMock()
+
+def make_cfg_mgr():
+    frr = MagicMock()
+    frr.write = MagicMock(return_value=True)
+    frr.restart_peer_groups = MagicMock(return_value=True)
+    return ConfigMgr(frr)
+
+@patch.dict("sys.modules", swsscommon=swsscommon_module_mock)
+def make_runner(cfg_mgr, **kwargs):
+    from bgpcfgd.runner import Runner
+    return Runner(cfg_mgr, **kwargs)
+
+def test_commit_after_interval():
+    cfg_mgr = make_cfg_mgr()
+    runner = make_runner(cfg_mgr, commit_interval=100)
+    with patch('bgpcfgd.runner.time.monotonic') as mocked_monotonic:
+        commit_after_interval_common(runner, cfg_mgr, mocked_monotonic)
+
+def commit_after_interval_common(runner, cfg_mgr, mocked_monotonic):
+    mocked_monotonic.return_value = 10.0
+    runner.commit_if_ready()
+    assert runner.window_start is None
+    cfg_mgr.push("router bgp 65100\n neighbor 10.0.0.1 remote-as 65200")
+    runner.commit_if_ready()
+    assert not cfg_mgr.frr.write.called
+    assert runner.get_select_timeout() == 100
+    mocked_monotonic.return_value = 10.05
+    cfg_mgr.push("router bgp 65100\n neighbor 10.0.0.2 remote-as 65200")
+    runner.commit_if_ready()
+    assert not cfg_mgr.frr.write.called
+    assert runner.get_select_timeout() == 50
+    mocked_monotonic.return_value = 10.2
+    runner.commit_if_ready()
+    cfg_mgr.frr.write.assert_called_once_with("router bgp 65100\n neighbor 10.0.0.1 remote-as 65200\n"
+                                              "router bgp 65100\n neighbor 10.0.0.2 remote-as 65200\n")
+    assert runner.window_start is None
+    assert runner.stats['commits'] == 1
+    assert runner.stats['commands'] == 4
+
+def test_commit_on_max_commands():
+    cfg_mgr = make_cfg_mgr()
+    runner = make_runner(cfg_mgr, commit_interval=10000, commit_max_commands=4)
+    cfg_mgr.push_list(["route-map A permit 10", " set tag 1"])
+    runner.commit_if_ready()
+    assert not cfg_mgr.frr.write.called
+    cfg_mgr.push_list(["route-map A permit 20", " set tag 2"])
+    runner.commit_if_ready()
+    assert cfg_mgr.frr.write.called
+
+def test_duplicates_and_peer_groups():
+    cfg_mgr = make_cfg_mgr()
+    runner = make_runner(cfg_mgr, commit_interval=0)
+    policy = "ip prefix-list DEFAULT_IPV4 permit 0.0.0.0/0"
+    cfg_mgr.push(policy)
+    cfg_mgr.push("router bgp 65100\n neighbor 10.0.0.1 peer-group PEER_V4")
+    cfg_mgr.push(policy)
+    cfg_mgr.restart_peer_groups(["PEER_V4"])
+    cfg_mgr.restart_peer_groups(["PEER_V4", "PEER_V6"])
+    runner.commit_if_ready()
+    cfg_mgr.frr.write.assert_called_once_with(policy + "\nrouter bgp 65100\n neighbor 10.0.0.1 peer-group PEER_V4\n")
+    cfg_mgr.frr.restart_peer_groups.assert_called_once_with(["PEER_V4", "PEER_V6"])
+    assert runner.stats['duplicates'] == 1
+
+def test_manager_stats_published():
+    cfg_mgr = make_cfg_mgr()
+    runner = make_runner(cfg_mgr, commit_interval=0, state_db_conn=MagicMock())
+    runner.stats_table = MagicMock()
+    for stats in [{'peer_group_renders': 2, 'peer_group_pushes': 2, 'peer_group_saved': 4},
+                  {'peer_group_renders': 1, 'peer_group_pushes': 1, 'peer_group_saved': 0},
+                  {}]:
+        manager = MagicMock()
+        manager.get_stats.return_value = stats
+        runner.add_manager(manager)
+    cfg_mgr.push("router bgp 65100\n neighbor 10.0.0.1 remote-as 65200")
+    runner.commit_if_ready()
+    key, fvs = runner.stats_table.set.call_args[0]
+    assert key == runner.STATS_KEY
+    fvs = dict(fvs)
+    assert fvs['commits'] == '1'
+    assert (fvs['peer_group_renders'], fvs['peer_group_pushes'], fvs['peer_group_saved']) == ('3', '3', '4')
+
+def test_duplicate_after_no_command():
+    cfg_mgr = make_cfg_mgr()
+    cfg_mgr.push("router bgp 65100\n neighbor PEER_V4 allowas-in 1")
+    cfg_mgr.push("router bgp 65100\n no neighbor PEER_V4 allowas-in 1")
+    cfg_mgr.push("router bgp 65100\n neighbor PEER_V4 allowas-in 1")
+    assert cfg_mgr.duplicates == 0
+    assert cfg_mgr.get_pending_commands() == 6
+
+def test_duplicate_after_override():
+    cfg_mgr = make_cfg_mgr()
+    block_a = "router bgp 65100\n address-family ipv4\n  neighbor PEER_V4 allowas-in 1"
+    block_b = "router bgp 65100\n address-family ipv4\n  neighbor PEER_V4 allowas-in 3"
+    cfg_mgr.push(block_a)
+    cfg_mgr.push(block_b)
+    cfg_mgr.push(block_a)
+    assert cfg_mgr.duplicates == 0
+    cfg_mgr.commit()
+    # The last block wins, as it would when every block is written
+    cfg_mgr.frr.write.assert_called_once_with(block_a + "\n" + block_b + "\n" + block_a + "\n")
+
+def test_duplicate_after_other_context():
+    cfg_mgr = make_cfg_mgr()
+    peer_group = "router bgp 65100\n neighbor PEER_V4 peer-group\n address-family ipv4\n  neighbor PEER_V4 allowas-in 1\n exit-address-family"
+    cfg_mgr.push(peer_group)
+    cfg_mgr.push("router bgp 65100\n neighbor 10.0.0.1 remote-as 65200\n address-family ipv4\n  neighbor 10.0.0.1 peer-group PEER_V4\n exit-address-family")
+    cfg_mgr.push(peer_group)
+    cfg_mgr.push("router bgp 65100\n address-family ipv6\n  neighbor PEER_V4 allowas-in 1")
+    cfg_mgr.push(peer_group)
+    # Neither the neighbor nor PEER_V4 in the ipv6 address-family override the peer-group block
+    assert cfg_mgr.duplicates == 2
+
+def test_get_block_keys():
+    keys = ConfigMgr.get_block_keys("router bgp 65100\n no neighbor 10.0.0.1 shutdown\n address-family ipv6\n  neighbor 10.0.0.1 activate\n exit-address-family\n!\nip prefix-list PL_LoopbackV4 permit 10.1.0.32/32")
+    assert keys == {
+        ("router bgp 65100", "neighbor 10.0.0.1"),
+        ("router bgp 65100", "address-family ipv6", "neighbor 10.0.0.1"),
+        ("ip prefix-list",),
+    }
+
+def test_update_commits_pending_changes():
+    cfg_mgr = make_cfg_mgr()
+    cfg_mgr.frr.get_config = MagicMock(return_value="")
+    cfg_mgr.push("bgp community-list standard A permit 1:1")
+    cfg_mgr.update()
+    cfg_mgr.frr.write.assert_called_once_with("bgp community-list standard A permit 1:1\n")
+    assert cfg_mgr.get_pending_commands() == 0
+
+def test_stats_in_state_db():
+    state_db_conn = MagicMock()
+    cfg_mgr = make_cfg_mgr()
+    runner = make_runner(cfg_mgr, commit_interval=0, state_db_conn=state_db_conn)
+    runner.window_events = 3
+    cfg_mgr.push("bgp community-list standard A permit 1:1")
+    runner.commit_if_ready()
+    key, fvs = runner.stats_table.set.call_args[0]
+    assert key == "global"
+    fvs = dict(fvs)
+    assert fvs['commits'] == '1'
+    assert fvs['last_commands'] == '1'
+    assert fvs['last_queue_depth'] == '3'
+    assert 'last_latency_ms' in fvs
+
+def test_directory_notifications_once_per_iteration():
+    from bgpcfgd.directory import Directory
+    directory = Directory()
+    on_change = MagicMock()
+    directory.subscribe([("CONFIG_DB", "INTERFACE", "")], on_change)
+    subscriber = MagicMock()
+    subscriber.pop.side_effect = [("Ethernet%d" % i, "SET", []) for i in range(5)] + [("", "", [])]
+    cfg_mgr = make_cfg_mgr()
+    runner = make_runner(cfg_mgr, directory=directory)
+    runner.subscribers.add(subscriber)
+    runner.callbacks[subscriber.getDbConnector().getDbId()][subscriber.getTableName()].append(
+        lambda key, op, data: directory.put("CONFIG_DB", "INTERFACE", key, data))
+    runner.process_events()
+    assert len(directory.get_slot("CONFIG_DB", "INTERFACE")) == 5
+    on_change.assert_called_once()
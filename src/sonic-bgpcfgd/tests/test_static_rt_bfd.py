@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, Mock, call, patch
 #from unittest.mock import MagicMock, patch
 
 from staticroutebfd.main import *
@@ -750,3 +750,100 @@ def test_set_del_ifname_only_route():
 
     assert "Static route bfd set Failed, nexthop, interface and vrf lists do not match or some of them is empty."\
         in test_set_del_ifname_only_route.logs
+
+class FakeBulkTableReader(object):
+    tables = {
+        ("CONFIG_DB", "INTERFACE"): [("if1|192.168.1.1/24", {}), ("if2|192.168.2.1/24", {})],
+        ("CONFIG_DB", "STATIC_ROUTE"): [("2.2.2.0/24", {
+            "bfd": "true",
+            "nexthop": "192.168.1.2,192.168.2.2",
+            "ifname": "if1,if2",
+        })],
+        ("STATE_DB", "BFD_SESSION_TABLE"): [
+            ("default|default|192.168.1.2", {"state": "Up"}),
+            ("default|default|192.168.2.2", {"state": "Up"}),
+        ],
+    }
+
+    def read_table(self, db_name, table_name, separator, with_data=True):
+        return self.tables.get((db_name, table_name), [])
+
+@patch('swsscommon.swsscommon.FieldValuePairs', new=lambda fvs: fvs)
+@patch('staticroutebfd.main.BulkTableReader', new=FakeBulkTableReader)
+def test_reconciliation():
+    dut = constructor()
+    dut.bfd_appl_tbl = MagicMock()
+    dut.static_route_appl_tbl = MagicMock()
+    dut.reconciliation_tbl = MagicMock()
+
+    dut.reconciliation()
+
+    assert sorted(call[0][0] for call in dut.bfd_appl_tbl.set.call_args_list) == \
+        ["default:default:192.168.1.2", "default:default:192.168.2.2"]
+    dut.bfd_appl_tbl.flush.assert_called_once()
+    #both bfd sessions up write the route, the writes are merged in the batch
+    dut.static_route_appl_tbl.set.assert_called_once()
+    key, fvs = dut.static_route_appl_tbl.set.call_args[0]
+    assert key == "default:2.2.2.0/24"
+    assert sorted(dict(fvs)["nexthop"].split(",")) == ["192.168.1.2", "192.168.2.2"]
+    dut.static_route_appl_tbl.flush.assert_called_once()
+    assert dut.appl_db_batch is None
+
+    key, fvs = dut.reconciliation_tbl.set.call_args[0]
+    timing = dict(fvs)
+    assert key == "staticroutebfd"
+    for phase in ["interface", "bfd_session", "static_route", "cleanup", "bfd_state", "appl_db_write", "total"]:
+        assert phase + "_ms" in timing
+    assert timing["static_routes"] == "1"
+    assert timing["appl_db_writes"] == "3"
+
+@patch('swsscommon.swsscommon.FieldValuePairs', new=lambda fvs: fvs)
+def test_appl_db_batch():
+    dut = constructor()
+    table = Mock()
+    dut.start_appl_db_batch()
+    dut.write_to_appl_db(table, "k1", {"a": "1", "b": "1"})
+    dut.write_to_appl_db(table, "k1", {"b": "2"})
+    dut.write_to_appl_db(table, "k2", {"a": "1"})
+    dut.write_to_appl_db(table, "k2", None)
+    dut.write_to_appl_db(table, "k3", None)
+    dut.write_to_appl_db(table, "k3", {"a": "3"})
+    table.set.assert_not_called()
+    table.delete.assert_not_called()
+
+    assert dut.flush_appl_db_batch() == 3
+    assert table.mock_calls == [
+        call.setBuffered(True),
+        call.set("k1", [("a", "1"), ("b", "2")]),
+        call.delete("k2"),
+        call.delete("k3"),
+        call.set("k3", [("a", "3")]),
+        call.flush(),
+        call.setBuffered(False),
+    ]
+
+    #without a batch the entries are written at once
+    table.reset_mock()
+    dut.write_to_appl_db(table, "k1", {"a": "1"})
+    table.set.assert_called_once_with("k1", [("a", "1")])
+
+def test_bulk_table_reader():
+    client = MagicMock()
+    client.scan.side_effect = [
+        (5, ["STATIC_ROUTE|1.1.1.0/24", "STATIC_ROUTE|2.2.2.0/24"]),
+        (0, ["STATIC_ROUTE|2.2.2.0/24", "STATIC_ROUTE|default|3.3.3.0/24"]),
+    ]
+    pipe = client.pipeline.return_value
+    pipe.execute.side_effect = [
+        [{"nexthop": "10.0.0.1"}, {"nexthop": "10.0.0.2"}],
+        [{"nexthop": "10.0.0.3"}],
+    ]
+    reader = BulkTableReader()
+    reader.clients["CONFIG_DB"] = client
+
+    assert reader.read_table("CONFIG_DB", "STATIC_ROUTE", "|") == [
+        ("1.1.1.0/24", {"nexthop": "10.0.0.1"}),
+        ("2.2.2.0/24", {"nexthop": "10.0.0.2"}),
+        ("default|3.3.3.0/24", {"nexthop": "10.0.0.3"}),
+    ]
+    assert pipe.hgetall.call_count == 3
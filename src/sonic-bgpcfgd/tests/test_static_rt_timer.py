@@ -0,0 +1,188 @@
+import fnmatch
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+swsscommon_module_mock = MagicMock()
+
+class FakeRedis(object):
+    """ Hashes in memory. SCAN returns the last key of the previous page again like redis does while rehashing """
+    def __init__(self, routes):
+        self.data = {key: dict(value) for key, value in routes.items()}
+        self.scanned = []
+        self.executed = 0
+        self.scans = 0
+        self.messages = []
+
+    def scan(self, cursor, match, count):
+        if cursor == 0:
+            self.scans += 1
+            self.scanned = sorted(key for key in self.data if fnmatch.fnmatch(key, match))
+        page = [key for key in self.scanned[max(cursor - 1, 0):cursor + count] if key in self.data]
+        cursor += count
+        return (cursor if cursor < len(self.scanned) else 0), page
+
+    def pipeline(self, transaction):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    def notify(self, key, event):
+        self.messages.append({"type": "pmessage", "pattern": "__keyspace@0__:STATIC_ROUTE:*",
+                              "channel": "__keyspace@0__:" + key, "data": event})
+
+class FakePubSub(object):
+    def __init__(self, client):
+        self.client = client
+
+    def psubscribe(self, pattern):
+        self.client.messages.append({"type": "psubscribe", "pattern": None, "channel": pattern, "data": 1})
+
+    def get_message(self, timeout):
+        return self.client.messages.pop(0) if self.client.messages else None
+
+    def close(self):
+        pass
+
+class FakePipeline(object):
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def hmget(self, key, *fields):
+        self.commands.append(lambda: [self.client.data.get(key, {}).get(field) for field in fields])
+
+    def hset(self, key, field, value):
+        self.commands.append(lambda: self.client.data[key].__setitem__(field, value))
+
+    def delete(self, key):
+        self.commands.append(lambda: self.client.data.pop(key, None))
+
+    def execute(self):
+        self.client.executed += 1
+        return [command() for command in self.commands]
+
+ROUTES = {
+    "STATIC_ROUTE:10.0.0.0/24": {"nexthop": "1.1.1.1", "refresh": "true"},
+    "STATIC_ROUTE:10.0.1.0/24": {"nexthop": "1.1.1.1", "refresh": "false"},
+    "STATIC_ROUTE:10.0.2.0/24": {"nexthop": "1.1.1.1", "expiry": "false"},
+    "STATIC_ROUTE:10.0.3.0/24": {"nexthop": "1.1.1.1"},
+    "STATIC_ROUTE:10.0.4.0/24": {"nexthop": "1.1.1.1", "expiry": "true", "refresh": "true"},
+    "STATIC_ROUTE_EXPIRY_TIME": {"time": "10"},
+}
+
+@pytest.fixture
+def static_rt_timer():
+    with patch.dict("sys.modules", swsscommon=swsscommon_module_mock):
+        import bgpcfgd.static_rt_timer
+        yield bgpcfgd.static_rt_timer
+
+def make_timer(module, use_deadlines=False):
+    timer = module.StaticRouteTimer(use_deadlines=use_deadlines)
+    timer.client = FakeRedis(ROUTES)
+    timer.SCAN_COUNT = 2
+    return timer
+
+def test_sweep(static_rt_timer):
+    timer = make_timer(static_rt_timer)
+    timer.alarm()
+    assert timer.client.data == {
+        "STATIC_ROUTE:10.0.0.0/24": {"nexthop": "1.1.1.1", "refresh": "false"},
+        "STATIC_ROUTE:10.0.2.0/24": {"nexthop": "1.1.1.1", "expiry": "false"},
+        "STATIC_ROUTE:10.0.4.0/24": {"nexthop": "1.1.1.1", "expiry": "true", "refresh": "false"},
+        "STATIC_ROUTE_EXPIRY_TIME": {"time": "10"},
+    }
+    # one read and one write pipeline for every SCAN page
+    assert timer.client.executed == 6
+    assert not timer.db.keys.called
+    timer.alarm()
+    assert sorted(timer.client.data) == ["STATIC_ROUTE:10.0.2.0/24", "STATIC_ROUTE_EXPIRY_TIME"]
+
+def test_sweep_error(static_rt_timer):
+    timer = make_timer(static_rt_timer)
+    timer.client.scan = MagicMock(side_effect=static_rt_timer.redis.ConnectionError("no redis"))
+    with patch('bgpcfgd.static_rt_timer.time.time', return_value=100.0):
+        timer.alarm()
+    # routes are checked by the next alarm
+    assert timer.client.data == ROUTES
+    assert timer.start == 100.0
+    del timer.client.scan
+    timer.alarm()
+    assert "STATIC_ROUTE:10.0.1.0/24" not in timer.client.data
+
+def test_deadlines(static_rt_timer):
+    timer = make_timer(static_rt_timer, use_deadlines=True)
+    with patch('bgpcfgd.static_rt_timer.time.time', return_value=100.0):
+        timer.check_deadlines(10)
+    assert len(timer.tracked) == 5
+    assert timer.client.data == {key: value for key, value in ROUTES.items()}
+    timer.client.data["STATIC_ROUTE:10.0.5.0/24"] = {"nexthop": "1.1.1.1"}
+    with patch('bgpcfgd.static_rt_timer.time.time', return_value=110.0):
+        timer.check_deadlines(10)
+    # the routes found at 100 are checked, the new route waits for its own deadline
+    assert sorted(timer.client.data) == [
+        "STATIC_ROUTE:10.0.0.0/24",
+        "STATIC_ROUTE:10.0.2.0/24",
+        "STATIC_ROUTE:10.0.4.0/24",
+        "STATIC_ROUTE:10.0.5.0/24",
+        "STATIC_ROUTE_EXPIRY_TIME",
+    ]
+    assert timer.client.data["STATIC_ROUTE:10.0.0.0/24"]["refresh"] == "false"
+    assert timer.tracked["STATIC_ROUTE:10.0.5.0/24"] == 120.0
+    assert timer.tracked["STATIC_ROUTE:10.0.0.0/24"] == 120.0
+    with patch('bgpcfgd.static_rt_timer.time.time', return_value=115.0):
+        timer.check_deadlines(10)
+    assert "STATIC_ROUTE:10.0.5.0/24" in timer.client.data
+    with patch('bgpcfgd.static_rt_timer.time.time', return_value=120.0):
+        timer.check_deadlines(10)
+    assert sorted(timer.client.data) == ["STATIC_ROUTE:10.0.2.0/24", "STATIC_ROUTE_EXPIRY_TIME"]
+    assert sorted(timer.tracked) == ["STATIC_ROUTE:10.0.2.0/24"]
+
+def test_deadlines_notifications(static_rt_timer):
+    timer = make_timer(static_rt_timer, use_deadlines=True)
+    with patch('bgpcfgd.static_rt_timer.time.time', return_value=100.0):
+        timer.check_deadlines(10)
+    assert timer.client.scans == 1
+    timer.client.data["STATIC_ROUTE:10.0.5.0/24"] = {"nexthop": "1.1.1.1"}
+    timer.client.notify("STATIC_ROUTE:10.0.5.0/24", "hset")
+    del timer.client.data["STATIC_ROUTE:10.0.3.0/24"]
+    timer.client.notify("STATIC_ROUTE:10.0.3.0/24", "del")
+    timer.client.notify("STATIC_ROUTE:10.0.0.0/24", "hset")
+    with patch('bgpcfgd.static_rt_timer.time.time', return_value=105.0):
+        timer.check_deadlines(10)
+    # the changes are found without a scan
+    assert timer.client.scans == 1
+    assert timer.tracked["STATIC_ROUTE:10.0.5.0/24"] == 115.0
+    assert timer.tracked["STATIC_ROUTE:10.0.0.0/24"] == 110.0
+    assert "STATIC_ROUTE:10.0.3.0/24" not in timer.tracked
+    # a route missed by the notifications is found by the scan once per timer
+    timer.client.data["STATIC_ROUTE:10.0.6.0/24"] = {"nexthop": "1.1.1.1"}
+    with patch('bgpcfgd.static_rt_timer.time.time', return_value=110.0):
+        timer.check_deadlines(10)
+    assert timer.client.scans == 2
+    assert timer.tracked["STATIC_ROUTE:10.0.6.0/24"] == 120.0
+    assert "STATIC_ROUTE:10.0.1.0/24" not in timer.client.data
+
+def test_deadlines_error(static_rt_timer):
+    timer = make_timer(static_rt_timer, use_deadlines=True)
+    timer.db.get.return_value = None
+    with patch('bgpcfgd.static_rt_timer.time.time', return_value=100.0):
+        timer.check_deadlines(10)
+    assert len(timer.tracked) == 5
+    timer.client.pipeline = MagicMock(side_effect=static_rt_timer.redis.ConnectionError("no redis"))
+    timer.client.scan = MagicMock(side_effect=static_rt_timer.redis.ConnectionError("no redis"))
+    sleeps = []
+    def sleep(interval):
+        sleeps.append(interval)
+        if len(sleeps) == 2:
+            raise StopIteration
+    with patch('bgpcfgd.static_rt_timer.time.sleep', side_effect=sleep):
+        with pytest.raises(StopIteration):
+            timer.run()
+    # the routes are found again by the next check
+    assert timer.tracked == {}
+    assert timer.deadlines == []
+    assert timer.pubsub is None
+    assert timer.next_scan is None
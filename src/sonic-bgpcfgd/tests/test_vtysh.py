@@ -0,0 +1,121 @@
+import os
+import socket
+import tempfile
+import threading
+
+from bgpcfgd.vtysh import VtyshClient
+
+
+class FakeVtyDaemon(object):
+    """ Serves the vty protocol: each command ends with zero byte, each reply ends with three zero bytes and rc """
+    def __init__(self, path, replies=None):
+        self.commands = []
+        self.connections = 0
+        self.replies = replies or {}
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(path)
+        self.sock.listen(1)
+        self.thread = threading.Thread(target=self.serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            buffer = b''
+            while True:
+                data = conn.recv(4096)
+                if not data:
+                    break
+                buffer += data
+                while b'\0' in buffer:
+                    cmd, buffer = buffer.split(b'\0', 1)
+                    cmd = cmd.decode()
+                    self.commands.append(cmd)
+                    out, rc = self.replies.get(cmd, ('', 0))
+                    conn.sendall(out.encode() + b'\0\0\0' + bytes([rc]))
+            conn.close()
+
+    def close(self):
+        self.sock.close()
+
+
+def make_client(tmp_dir, replies=None):
+    daemon = FakeVtyDaemon(os.path.join(tmp_dir, 'bgpd.vty'), replies)
+    return VtyshClient(vty_path=os.path.join(tmp_dir, '%s.vty'), timeout=5), daemon
+
+def test_show_command():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client, daemon = make_client(tmp_dir, {'show bgp vrfs json': ('{"vrfs": {}}', 0)})
+        assert client.run(["vtysh", "-H", "/dev/null", "-c", "show bgp vrfs json"]) == (0, '{"vrfs": {}}', '')
+        assert client.run(["vtysh", "-c", "clear bgp peer-group PEER_V4 soft in"]) == (0, '', '')
+        assert daemon.commands == ['enable', 'show bgp vrfs json', 'clear bgp peer-group PEER_V4 soft in']
+        assert daemon.connections == 1
+        client.close()
+        daemon.close()
+
+def test_command_error():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client, daemon = make_client(tmp_dir, {'show bgp vrf Vrf1 neighbors json': ('% no vrf', 1)})
+        rc, out, err = client.run(["vtysh", "-c", "show bgp vrf Vrf1 neighbors json"])
+        assert rc == 1
+        assert err == 'show bgp vrf Vrf1 neighbors json: % no vrf'
+        client.close()
+        daemon.close()
+
+def test_config_file():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client, daemon = make_client(tmp_dir)
+        client.PIPELINE_DEPTH = 2
+        config = os.path.join(tmp_dir, 'config')
+        with open(config, 'w') as fp:
+            fp.write("router bgp 65100\n neighbor 10.0.0.1 remote-as 65200\n!\n address-family ipv4\n  neighbor 10.0.0.1 activate\n exit-address-family\nexit\n")
+        assert client.run(["vtysh", "-f", config]) == (0, '', '')
+        assert daemon.commands == [
+            'enable',
+            'configure terminal',
+            'router bgp 65100',
+            'neighbor 10.0.0.1 remote-as 65200',
+            'address-family ipv4',
+            'neighbor 10.0.0.1 activate',
+            'exit-address-family',
+            'exit',
+            'end',
+        ]
+        client.close()
+        daemon.close()
+
+def test_not_handled_commands():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client, daemon = make_client(tmp_dir)
+        config = os.path.join(tmp_dir, 'config')
+        with open(config, 'w') as fp:
+            fp.write("ip route 10.0.0.0/24 10.0.0.1\n")
+        assert client.run(["vtysh", "-f", config]) is None
+        assert client.run(["vtysh", "-c", "show running-config"]) is None
+        assert client.run(["vtysh", "-c", "show daemons"]) is None
+        assert client.run(["vtysh", "-c", "show bgp summary", "-c", "show bfd peers json"]) is None
+        assert client.run(["ls", "-l", "/"]) is None
+        assert daemon.commands == []
+        client.close()
+        daemon.close()
+
+def test_daemon_is_not_running():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client = VtyshClient(vty_path=os.path.join(tmp_dir, '%s.vty'), timeout=5)
+        assert client.run(["vtysh", "-c", "show bfd peers json"]) is None
+
+def test_reconnect():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client, daemon = make_client(tmp_dir)
+        assert client.run(["vtysh", "-c", "show bgp summary"]) == (0, '', '')
+        client.connections['bgpd'].sock.shutdown(socket.SHUT_RDWR)
+        assert client.run(["vtysh", "-c", "show bgp summary"]) is None
+        assert client.run(["vtysh", "-c", "show bgp summary"]) == (0, '', '')
+        assert daemon.connections == 2
+        client.close()
+        daemon.close()
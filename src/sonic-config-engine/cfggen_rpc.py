@@ -0,0 +1,51 @@
+"""
+Wire protocol shared by sonic-cfggen-server and sonic-cfggen-client.
+
+Every message is a JSON document prefixed with its length as a 4 byte
+big-endian unsigned integer. This module must stay free of heavy imports,
+the client is supposed to start faster than a plain sonic-cfggen run.
+"""
+
+import json
+import os
+import struct
+
+DEFAULT_SOCKET_PATH = '/var/run/sonic-cfggen.sock'
+SOCKET_PATH_ENV = 'SONIC_CFGGEN_SOCKET'
+
+_HEADER = struct.Struct('!I')
+
+
+def get_socket_path():
+    return os.environ.get(SOCKET_PATH_ENV, DEFAULT_SOCKET_PATH)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_message(sock, message):
+    payload = json.dumps(message).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock):
+    """
+    Receive one message from the socket
+    Return:
+        decoded message or None if the peer closed the connection
+    """
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    payload = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+    return json.loads(payload.decode('utf-8'))
@@ -1,12 +1,16 @@
 from __future__ import print_function
 
+import copy
+import hashlib
 import ipaddress
 import math
 import os
+import pickle
 import sys
 import json
 import jinja2
 import subprocess
+import tempfile
 from collections import defaultdict
 
 
@@ -247,13 +251,14 @@ def parse_chassis_metadata(root,hname, lcname):
     return max_num_core, num_voq, chassis_linecards
 
 
-def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, chassis_intf_map, voq_intf_attributes):
+def parse_chassis_deviceinfo_intf_metadata(interface_metadata, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, chassis_intf_map, voq_intf_attributes):
     """
     This function iterates InterfaceMetadata for every port in the chassis and genetate the configuration for 
     systemport, chassis port alias and port default speeds.d.
 
     Args:
-        device_info: The XML element containing device info.
+        interface_metadata (list): (interface name, properties) of the InterfaceMetadata entries, see
+            parse_chassis_deviceinfo.
         chassis_linecards_info (dict): A dictionary mapping slot indices to hostnames.
         chassis_hwsku (str): The hardware SKU of the chassis.
         num_voq (str): The number of VoQ.
@@ -271,15 +276,13 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
     port_default_speed = {}
     system_port_id = 1
 
-    interface_metadata = device_info.find(str(QName(ns, "InterfaceMetadata")))
-    for interface in interface_metadata.findall(str(QName(ns1, "DeviceInterfaceMetadata"))):
+    for intf_name, intf_properties in interface_metadata:
         linecard_name = None
         asic_name = None
         core_port_id = None
         core_id = None
         switch_id = None
         slot_index = None
-        intf_name = interface.find(str(QName(ns1, "InterfaceName"))).text
         # ignore the managment interfaces
         if any(mgmt_intf in intf_name for mgmt_intf in ['Management', 'console']) == True:
             continue
@@ -301,16 +304,12 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
                   (intf_name), file=sys.stderr)
             continue
 
-        intf_properties = interface.find(str(QName(ns1, "Properties")))
         if intf_properties is None:
             print('Warning cannot find interface porperties  for interface' %
                   (intf_name), file=sys.stderr)
             continue
 
-        for intf_property in intf_properties.findall(str(QName(ns1, "InterfaceProperty"))):
-
-            name = intf_property.find(str(QName(ns1, "Name"))).text
-            value = intf_property.find(str(QName(ns1, "Value"))).text
+        for name, value in intf_properties:
             if name == "CoreId":
                 core_id = value
             if name == "SlotIndex":
@@ -420,11 +419,31 @@ def parse_chassis_deviceinfo_intfs(device_info):
     return interface_map
 
 
-def parse_chassis_deviceinfo(deviceinfos, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, voq_intf_attributes):
-    system_ports = {}
-    chassis_port_alias = {}
-    chassis_name = None
-    port_default_speed = {}
+def parse_chassis_deviceinfo_interface_metadata(device_info):
+    interface_metadata = []
+    metadata = device_info.find(str(QName(ns, "InterfaceMetadata")))
+    for interface in metadata.findall(str(QName(ns1, "DeviceInterfaceMetadata"))):
+        intf_name = interface.find(str(QName(ns1, "InterfaceName"))).text
+        intf_properties = interface.find(str(QName(ns1, "Properties")))
+        if intf_properties is not None:
+            intf_properties = [(intf_property.find(str(QName(ns1, "Name"))).text, intf_property.find(str(QName(ns1, "Value"))).text)
+                               for intf_property in intf_properties.findall(str(QName(ns1, "InterfaceProperty")))]
+        interface_metadata.append((intf_name, intf_properties))
+    return interface_metadata
+
+
+def parse_chassis_deviceinfo(deviceinfos, chassis_hwsku, chassis_type):
+    """
+    Parse the chassis device info. It only depends on the minigraph, the system ports, chassis port
+    alias and port default speeds of a linecard asic are then generated by
+    parse_chassis_deviceinfo_intf_metadata.
+
+    Returns:
+        chassis_intf_map (dict): A dictionary mapping interface names to their properties.
+        interface_metadata (list): (interface name, properties) of the InterfaceMetadata entries.
+    """
+    chassis_intf_map = {}
+    interface_metadata = []
 
     for device_info in deviceinfos.findall(str(QName(ns, "DeviceInfo"))):
         dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
@@ -444,9 +463,8 @@ def parse_chassis_deviceinfo(deviceinfos, chassis_linecards_info, chassis_hwsku,
                         device_info)
                 chassis_intf_map.update(chassis_internal_intf_map)
 
-            system_ports, chassis_port_alias, port_default_speed  = parse_chassis_deviceinfo_intf_metadata(
-                    device_info, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, chassis_intf_map, voq_intf_attributes)
-    return system_ports, chassis_port_alias, port_default_speed
+            interface_metadata = parse_chassis_deviceinfo_interface_metadata(device_info)
+    return chassis_intf_map, interface_metadata
 
 
 class minigraph_encoder(json.JSONEncoder):
@@ -1673,8 +1691,10 @@ def parse_asic_meta(meta, hname):
     return sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile
 
 def parse_deviceinfo(meta, hwsku):
-    port_speeds = {}
-    port_descriptions = {}
+    """ Get the interfaces of hwsku, by minigraph alias, and its system ports.
+        get_deviceinfo_port_speeds maps the interfaces to the asic ports.
+    """
+    port_interfaces = []
     sys_ports = {}
     for device_info in meta.findall(str(QName(ns, "DeviceInfo"))):
         dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
@@ -1685,9 +1705,10 @@ def parse_deviceinfo(meta, hwsku):
                 alias = interface.find(str(QName(ns, "InterfaceName"))).text
                 speed = interface.find(str(QName(ns, "Speed"))).text
                 desc  = interface.find(str(QName(ns, "Description")))
+                intf = {'alias': alias, 'speed': speed}
                 if desc != None:
-                    port_descriptions[port_alias_map.get(alias, alias)] = desc.text
-                port_speeds[port_alias_map.get(alias, alias)] = speed
+                    intf['description'] = desc.text
+                port_interfaces.append(intf)
 
             sysports = device_info.find(str(QName(ns, "SystemPorts")))
             if sysports is not None:
@@ -1708,7 +1729,17 @@ def parse_deviceinfo(meta, hwsku):
                        key = "%s|%s" % (hostname.text, key)
                     sys_ports[key] = {"system_port_id": system_port_id, "switch_id": switch_id, "core_index": core_id, "core_port_index": core_port_id, "speed": speed, "num_voq": num_voq}
 
-    return port_speeds, port_descriptions, sys_ports
+    return port_interfaces, sys_ports
+
+def get_deviceinfo_port_speeds(interfaces):
+    port_speeds = {}
+    port_descriptions = {}
+    for intf in interfaces:
+        port = port_alias_map.get(intf['alias'], intf['alias'])
+        if 'description' in intf:
+            port_descriptions[port] = intf['description']
+        port_speeds[port] = intf['speed']
+    return port_speeds, port_descriptions
 
 # Function to check if IP address is present in the key.
 # If it is present, then the key would be a tuple.
@@ -1964,7 +1995,7 @@ def update_forced_mgmt_route(mgmt_intf, mgmt_routes):
 # Main functions
 #
 ###############################################################################
-def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None ):
+def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None, cache_dir=None):
     """ Parse minigraph xml file.
 
     Keyword arguments:
@@ -1974,9 +2005,76 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     asic_name -- asic name; to parse multi-asic device minigraph to
     generate asic specific configuration.
     fabric_port_config_file -- fabric port config file name
+    cache_dir -- directory of the compiled minigraph cache, see
+    MinigraphCache; the cache is not used when None
      """
 
-    root = ET.parse(filename).getroot()
+    if cache_dir is not None:
+        (results, qos_profile, hwsku) = _parse_xml_cached(MinigraphCache(cache_dir), filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file)
+    else:
+        (results, qos_profile, hwsku) = _parse_xml(filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file)
+
+    select_mmu_profiles(qos_profile, platform, hwsku)
+
+    return results
+
+def _parse_device_xml(root):
+    """ Parse the parts of minigraph xml file which are the same for every
+    asic namespace of the device: global and chassis metadata, link metadata
+    and the DeviceInfos interfaces by minigraph alias.
+
+    Return:
+    dict of the parse results, the asic independent inputs of _parse_xml
+    """
+    hwsku, hostname, docker_routing_config_mode, chassis_type, chassis_hostname = parse_global_info(root)
+    device = {
+        'hwsku': hwsku,
+        'hostname': hostname,
+        'docker_routing_config_mode': docker_routing_config_mode,
+        'chassis_type': chassis_type,
+        'chassis_hostname': chassis_hostname,
+        'macsec_enabled': is_chassis_lc_macsec_enabled(root, hostname),
+        'chassis_metadata': None,
+        'chassis_hwsku': None,
+        'local_devices': parse_asic_meta_get_devices(root),
+        'linkmetas': None,
+        'deviceinfo': None,
+        'chassis_deviceinfo': None,
+        'chassis_meta': None,
+    }
+
+    if is_minigraph_for_chassis(chassis_type):
+        device['chassis_metadata'] = parse_chassis_metadata(root, chassis_hostname, hostname)
+        device['chassis_hwsku'] = parse_chassis_hwsku(root, chassis_hostname)
+
+    for child in root:
+        if child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            device['linkmetas'] = parse_linkmeta(child, chassis_hostname if chassis_hostname else hostname)
+        elif child.tag == str(QName(ns, "DeviceInfos")):
+            device['deviceinfo'] = parse_deviceinfo(child, hwsku)
+            if chassis_hostname:
+                device['chassis_deviceinfo'] = parse_chassis_deviceinfo(child, device['chassis_hwsku'], chassis_type)
+        elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            if chassis_hostname:
+                device['chassis_meta'] = parse_chassis_meta(child, chassis_hostname)
+
+    return device
+
+def _parse_xml(filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file, device=None):
+    """ Parse minigraph xml file for one asic namespace. Only the asic
+    specific sections are parsed here, the rest comes from device, see
+    load_minigraph_device.
+
+    The port configuration of the asic is merged into the global
+    port_names_map, port_alias_map and port_alias_asic_map.
+
+    Return:
+    (results, qos_profile, hwsku)
+    """
+
+    root = load_minigraph_root(filename)
+    if device is None:
+        device = load_minigraph_device(filename)
 
     u_neighbors = None
     u_devices = None
@@ -2047,19 +2145,12 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     card_type = None
     macsec_enabled = None
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    docker_routing_config_mode_qn = QName(ns, "DockerRoutingConfigMode")
-    for child in root:
-        if child.tag == str(hwsku_qn):
-            hwsku = child.text
-        if child.tag == str(hostname_qn):
-            hostname = child.text
-        if child.tag == str(docker_routing_config_mode_qn):
-            docker_routing_config_mode = child.text
-
-    hwsku, hostname, docker_routing_config_mode, chassis_type, chassis_hostname = parse_global_info(root)
-    macsec_enabled = is_chassis_lc_macsec_enabled(root, hostname)
+    hwsku = device['hwsku']
+    hostname = device['hostname']
+    docker_routing_config_mode = device['docker_routing_config_mode']
+    chassis_type = device['chassis_type']
+    chassis_hostname = device['chassis_hostname']
+    macsec_enabled = device['macsec_enabled']
 
     (ports, alias_map, alias_asic_map) = get_port_config(hwsku=hwsku, platform=platform, port_config_file=port_config_file, asic_name=asic_name, hwsku_config_file=hwsku_config_file)
 
@@ -2068,8 +2159,8 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     if is_minigraph_for_chassis(chassis_type):
         alias_map = normailize_port_map_for_chassis(asic_name, alias_map)
         alias_asic_map = normailize_port_map_for_chassis(asic_name, alias_asic_map)
-        (max_num_cores, num_voq, chassis_linecards_info) = parse_chassis_metadata(root, chassis_hostname, hostname)
-        chassis_hwsku = parse_chassis_hwsku(root, chassis_hostname)
+        (max_num_cores, num_voq, chassis_linecards_info) = device['chassis_metadata']
+        chassis_hwsku = device['chassis_hwsku']
         voq_intf_attributes = get_voq_intf_attributes(ports)
 
     port_names_map.update(ports)
@@ -2078,7 +2169,7 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
 
     slot_index = get_linecard_slot_index(hostname, chassis_linecards_info)
     # Get the local device node from DeviceMetadata
-    local_devices = parse_asic_meta_get_devices(root)
+    local_devices = device['local_devices']
 
     for child in root:
         if asic_hostname is None:
@@ -2092,10 +2183,6 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
                 (u_neighbors, u_devices, _, _, _, _, _, _) = parse_png(child, hostname, None)
             elif child.tag == str(QName(ns, "MetadataDeclaration")):
                 (syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data, macsec_profile, downstream_redundancy_types, redundancy_type, qos_profile, rack_mgmt_map) = parse_meta(child, hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
-                (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
         else:
             if child.tag == str(QName(ns, "DpgDec")):
                 (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, asic_hostname)
@@ -2106,22 +2193,20 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
                 (neighbors, devices, port_speed_png) = parse_asic_png(child, asic_hostname, hostname)
             elif child.tag == str(QName(ns, "MetadataDeclaration")):
                 (sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile) = parse_asic_meta(child, asic_hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
-                (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
-
-        if chassis_hostname:
-            if child.tag == str(QName(ns, "DeviceInfos")):
-                if asic_hostname is not None:
-                    (sys_ports, chassis_port_alias, port_speeds_default) = parse_chassis_deviceinfo(child, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, voq_intf_attributes)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
-                (syslog_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, macsec_profile) = parse_chassis_meta(child, chassis_hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                linkmetas = parse_linkmeta(child, chassis_hostname)
 
-    select_mmu_profiles(qos_profile, platform, hwsku)
-    
+    # The asic independent sections, the chassis metadata overrides the one
+    # of the linecard asic
+    if device['linkmetas'] is not None:
+        linkmetas = device['linkmetas']
+    if device['deviceinfo'] is not None:
+        (deviceinfo_interfaces, sys_ports) = device['deviceinfo']
+        (port_speeds_default, port_descriptions) = get_deviceinfo_port_speeds(deviceinfo_interfaces)
+        if chassis_hostname and asic_hostname is not None:
+            (chassis_intf_map, interface_metadata) = device['chassis_deviceinfo']
+            (sys_ports, chassis_port_alias, port_speeds_default) = parse_chassis_deviceinfo_intf_metadata(interface_metadata, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, chassis_intf_map, voq_intf_attributes)
+    if device['chassis_meta'] is not None:
+        (syslog_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, macsec_profile) = device['chassis_meta']
+
     # for chassis get the device type from chassis metadata not the asic or linecard type
     if chassis_hostname:
         device_type = devices.get(chassis_hostname, {}).get('type', None)
@@ -2646,10 +2731,7 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
         results['NTP_SERVER'] = dict((item, {'iburst': 'on'}) for item in ntp_servers)
         # Set default DNS nameserver from dns.j2
         results['DNS_NAMESERVER'] = {}
-        if os.environ.get("CFGGEN_UNIT_TESTING", "0") == "2":
-            dns_conf = os.path.join(os.path.dirname(__file__), "tests/", "dns.j2")
-        else:
-            dns_conf = "/usr/share/sonic/templates/dns.j2"
+        dns_conf = _get_dns_conf_path()
         if os.path.isfile(dns_conf):
             text = ""
             with open(dns_conf) as template_file:
@@ -2743,7 +2825,123 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     if current_device and current_device['type'] in leafrouter_device_types:
         results['DEVICE_METADATA']['localhost']['suppress-fib-pending'] = 'enabled'
 
-    return results
+    return results, qos_profile, hwsku
+
+def _file_digest(path):
+    if path is None or not os.path.isfile(path):
+        return None
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def _get_dns_conf_path():
+    if os.environ.get("CFGGEN_UNIT_TESTING", "0") == "2":
+        return os.path.join(os.path.dirname(__file__), "tests/", "dns.j2")
+    return "/usr/share/sonic/templates/dns.j2"
+
+class MinigraphCache(object):
+    """ On disk cache of parse_xml results.
+
+    Entries live in a sub directory per minigraph content hash:
+    - one 'device' entry holds what is shared by every namespace, the asic
+      independent _parse_device_xml results, keyed by the parser code
+    - one entry per namespace holds the parse_xml results, keyed by a hash
+      of every other input: port, hwsku and fabric configuration (whether
+      read from files or config DB), platform, asic name, dns template and
+      the parser code itself
+
+    Entries are pickled and written atomically, so namespaces can be parsed
+    concurrently against the same cache directory. Entries which could be
+    written by other users are ignored.
+    """
+    VERSION = 2
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _path(self, minigraph_digest, name):
+        return os.path.join(self.cache_dir, minigraph_digest, name + '.pickle')
+
+    def load(self, minigraph_digest, name):
+        path = self._path(minigraph_digest, name)
+        try:
+            with open(path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                # only trust an entry which could not be written by other users
+                if st.st_uid not in (0, os.getuid()) or st.st_mode & 0o022:
+                    print("Warning: ignore minigraph cache entry {} owned by uid {} mode {:o}".format(path, st.st_uid, st.st_mode), file=sys.stderr)
+                    return None
+                return pickle.load(f)
+        except Exception:
+            # Missing, partially written or incompatible entry
+            return None
+
+    def store(self, minigraph_digest, name, value):
+        path = self._path(minigraph_digest, name)
+        try:
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_path, path)
+        except (IOError, OSError) as e:
+            # The cache is an optimization only
+            print("Warning: failed to store minigraph cache entry {}: {}".format(path, e), file=sys.stderr)
+
+    @staticmethod
+    def code_digest():
+        sha = hashlib.sha256()
+        for module_file in [__file__, sys.modules[get_port_config.__module__].__file__]:
+            sha.update(str(_file_digest(os.path.splitext(module_file)[0] + '.py')).encode())
+        return sha.hexdigest()
+
+def _parse_xml_cached(cache, filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file):
+    minigraph_digest = _file_digest(filename)
+    code_digest = MinigraphCache.code_digest()
+
+    # Parsed once for all namespaces of the device
+    device_name = 'device-' + hashlib.sha256('{}:{}'.format(MinigraphCache.VERSION, code_digest).encode()).hexdigest()
+    device = cache.load(minigraph_digest, device_name)
+    if device is None:
+        device = load_minigraph_device(filename)
+        cache.store(minigraph_digest, device_name, device)
+    hwsku = device['hwsku']
+
+    # The same inputs parse_xml reads besides the minigraph itself
+    inputs = {
+        'version': MinigraphCache.VERSION,
+        'code': code_digest,
+        'platform': platform,
+        'asic_name': asic_name,
+        'multi_asic': is_multi_asic(),
+        'port_config': get_port_config(hwsku=hwsku, platform=platform, port_config_file=port_config_file, asic_name=asic_name, hwsku_config_file=hwsku_config_file),
+        'fabric_monitor': get_fabric_monitor_config(hwsku=hwsku, asic_name=asic_name),
+        'fabric_port': get_fabric_port_config(hwsku=hwsku, platform=platform, fabric_port_config_file=fabric_port_config_file, asic_name=asic_name, hwsku_config_file=hwsku_config_file),
+        'dns_conf': _file_digest(_get_dns_conf_path()),
+    }
+    entry_name = hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+    entry = cache.load(minigraph_digest, entry_name)
+    if entry is None:
+        (results, qos_profile, hwsku) = _parse_xml(filename, platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file, device)
+        entry = {
+            'results': results,
+            'qos_profile': qos_profile,
+            'hwsku': hwsku,
+            'port_names_map': dict(port_names_map),
+            'port_alias_map': dict(port_alias_map),
+            'port_alias_asic_map': dict(port_alias_asic_map),
+        }
+        cache.store(minigraph_digest, entry_name, entry)
+        return results, qos_profile, hwsku
+
+    port_names_map.update(entry['port_names_map'])
+    port_alias_map.update(entry['port_alias_map'])
+    port_alias_asic_map.update(entry['port_alias_asic_map'])
+    return entry['results'], entry['qos_profile'], entry['hwsku']
 
 def get_tunnel_entries(tunnel_intfs, tunnel_intfs_qos_remap_config, lo_intfs, tunnel_qos_remap, mux_tunnel_name, peer_switch_ip):
     lo_addr = ''
@@ -2852,6 +3050,93 @@ def get_mux_cable_entries(ports, mux_cable_ports, active_active_ports, neighbors
     return mux_cable_table
 
 
+# Parsed minigraph files, keyed by real path. Each entry is only valid for the
+# file version (mtime, size) it was built from.
+_minigraph_cache = {}
+
+class _MinigraphCacheEntry(object):
+    def __init__(self, version):
+        self.version = version
+        self.root = None
+        self.sections = {}
+        self.device = None
+
+def _get_minigraph_cache_entry(filename):
+    stat = os.stat(filename)
+    version = (stat.st_mtime, stat.st_size)
+    path = os.path.realpath(filename)
+    entry = _minigraph_cache.get(path)
+    if entry is None or entry.version != version:
+        entry = _minigraph_cache[path] = _MinigraphCacheEntry(version)
+    return entry
+
+def clear_minigraph_cache():
+    _minigraph_cache.clear()
+
+def load_minigraph_root(filename):
+    """ Parse the whole minigraph file, once per file version in this process """
+    entry = _get_minigraph_cache_entry(filename)
+    if entry.root is None:
+        entry.root = ET.parse(filename).getroot()
+        entry.sections = {}
+    return entry.root
+
+def load_minigraph_device(filename):
+    """ Parse the asic independent part of the minigraph, see _parse_device_xml,
+        once per file version in this process. Every call gets its own copy.
+    """
+    entry = _get_minigraph_cache_entry(filename)
+    if entry.device is None:
+        entry.device = _parse_device_xml(load_minigraph_root(filename))
+    return copy.deepcopy(entry.device)
+
+# Bulky top level minigraph sections, freed while streaming when not requested
+MINIGRAPH_SECTIONS = ["PngDec", "DpgDec", "CpgDec", "UngDec", "MetadataDeclaration", "LinkMetadataDeclaration", "DeviceInfos"]
+
+def _iterparse_sections(filename, tags):
+    """ Stream the minigraph file and keep only the requested top level
+        elements. The other bulky sections are freed as soon as they are
+        fully parsed, and parsing stops once all requested ones are found.
+    """
+    wanted = dict((str(QName(ns, tag)), tag) for tag in tags)
+    watched = set(wanted) | set(str(QName(ns, tag)) for tag in MINIGRAPH_SECTIONS)
+    sections = dict((tag, None) for tag in tags)
+    remaining = len(wanted)
+    # Filtering by tag keeps the per element work inside lxml
+    for _, elem in ET.iterparse(filename, events=('end',), tag=list(watched)):
+        parent = elem.getparent()
+        if parent is None or parent.getparent() is not None:
+            continue
+        tag = wanted.get(elem.tag)
+        if tag is None:
+            elem.clear()
+            continue
+        if sections[tag] is None:
+            sections[tag] = elem
+            remaining -= 1
+            if remaining == 0:
+                break
+    return sections
+
+def get_minigraph_sections(filename, tags):
+    """ Get top level minigraph elements by local tag name, e.g. 'Hostname' or
+        'MetadataDeclaration', without building the sections that are not
+        requested. Missing sections are returned as None.
+    """
+    entry = _get_minigraph_cache_entry(filename)
+    if entry.root is not None:
+        sections = dict((tag, entry.root.find(str(QName(ns, tag)))) for tag in tags)
+    else:
+        missing = [tag for tag in tags if tag not in entry.sections]
+        if missing:
+            entry.sections.update(_iterparse_sections(filename, missing))
+        sections = dict((tag, entry.sections[tag]) for tag in tags)
+    return sections
+
+def _sections_as_root(sections):
+    """ Present a subset of sections to helpers written against the root element """
+    return [section for section in sections.values() if section is not None]
+
 def parse_device_desc_xml(filename):
     root = ET.parse(filename).getroot()
     (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, hostname, hwsku, d_type, _, _, _, _) = parse_device(root)
@@ -2885,27 +3170,23 @@ def parse_hostname(filename):
     hostName = None
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
-    hostname_qn = QName(ns, "Hostname")
-    for child in root:
-        if child.tag == str(hostname_qn):
-            hostName = child.text
-            break
+    hostname = get_minigraph_sections(filename, ["Hostname"])["Hostname"]
+    if hostname is not None:
+        hostName = hostname.text
 
     return hostName
 
 def parse_asic_sub_role(filename, asic_name):
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
-    for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            sub_role, _, _, _, _, _= parse_asic_meta(child, asic_name)
-            return sub_role
+    meta = get_minigraph_sections(filename, ["MetadataDeclaration"])["MetadataDeclaration"]
+    if meta is not None:
+        sub_role, _, _, _, _, _= parse_asic_meta(meta, asic_name)
+        return sub_role
 
 def parse_asic_switch_type(filename, asic_name, hostname):
     if os.path.isfile(filename):
-        root = ET.parse(filename).getroot()
+        root = _sections_as_root(get_minigraph_sections(filename, ["MetadataDeclaration"]))
         switch_type, _ = get_chassis_type_and_hostname(root, hostname)
         if switch_type:
             return switch_type
@@ -42,6 +42,16 @@ else:
         'pyyaml==5.4.1',
     ]
 
+scripts = [
+    'sonic-cfggen',
+]
+if sys.version_info.major == 3:
+    # Python 3-only scripts
+    scripts += [
+        'sonic-cfggen-server',
+        'sonic-cfggen-client'
+    ]
+
 # Common modules for python2 and python3
 py_modules = [
     'config_samples',
@@ -54,7 +64,8 @@ py_modules = [
 if sys.version_info.major == 3:
     # Python 3-only modules
     py_modules += [
-        'sonic_yang_cfg_generator'
+        'sonic_yang_cfg_generator',
+        'cfggen_rpc'
     ]
 
 dependencies += sonic_dependencies
@@ -79,9 +90,7 @@ setup(
     author_email = 'taoyl@microsoft.com',
     url = 'https://github.com/Azure/sonic-buildimage',
     py_modules = py_modules,
-    scripts = [
-        'sonic-cfggen',
-    ],
+    scripts = scripts,
     install_requires = dependencies,
     data_files = [
         ('/usr/share/sonic/templates', glob.glob('data/*')),
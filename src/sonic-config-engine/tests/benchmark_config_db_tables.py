@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark full config DB reads against table scoped reads used by
+'sonic-cfggen -d' when only some tables are referenced.
+
+The config DB is a redis stand-in filled with a synthetic config:
+    python3 tests/benchmark_config_db_tables.py --acl-rules 50000 --routes 20000
+
+A real redis server can be used instead of fakeredis:
+    python3 tests/benchmark_config_db_tables.py --unix-socket /var/run/redis/redis.sock --db 15
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from sonic_py_common.general import load_module_from_source
+
+CFGGEN_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'sonic-cfggen')
+
+
+def get_client(args):
+    if args.unix_socket:
+        import redis
+        return redis.Redis(unix_socket_path=args.unix_socket, db=args.db, decode_responses=True)
+    import fakeredis
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def fill_config(client, args):
+    client.flushdb()
+    pipe = client.pipeline(transaction=False)
+    pipe.hset('DEVICE_METADATA|localhost', mapping={'hwsku': 'Force10-S6000', 'hostname': 'sonic', 'type': 'LeafRouter'})
+    for index in range(args.ports):
+        pipe.hset('PORT|Ethernet{}'.format(index * 4), mapping={'lanes': str(index), 'speed': '100000', 'admin_status': 'up'})
+    for index in range(args.acl_rules):
+        pipe.hset('ACL_RULE|DATAACL|RULE_{}'.format(index), mapping={
+            'PRIORITY': str(index), 'PACKET_ACTION': 'FORWARD', 'SRC_IP': '10.{}.{}.0/24'.format(index // 256 % 256, index % 256)})
+        if index % 1000 == 0:
+            pipe.execute()
+    for index in range(args.routes):
+        pipe.hset('STATIC_ROUTE|default|20.{}.{}.0/24'.format(index // 256 % 256, index % 256), mapping={
+            'nexthop': '10.0.0.1', 'ifname': 'Ethernet0'})
+        if index % 1000 == 0:
+            pipe.execute()
+    pipe.execute()
+
+
+def get_full_config(client):
+    # Same access pattern as ConfigDBPipeConnector.get_config()
+    configdb = sys.modules['sonic_cfggen'].ConfigDBConnector()
+    data = {}
+    cursor = 0
+    while True:
+        cursor, keys = client.scan(cursor, match='*', count=1000)
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        for key, raw_data in zip(keys, pipe.execute()):
+            table, row = key.split('|', 1)
+            data.setdefault(table, {})[configdb.deserialize_key(row)] = configdb.raw_to_typed(raw_data)
+        if cursor == 0:
+            break
+    return data
+
+
+def get_tables(client, tables):
+    # Same access pattern as _read_config_db_tables() of 'sonic-cfggen -d'
+    configdb = sys.modules['sonic_cfggen'].ConfigDBConnector()
+    keys = []
+    for table in tables:
+        keys.extend(client.keys(table + '|*'))
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.hgetall(key)
+    data = {}
+    for key, raw_data in zip(keys, pipe.execute()):
+        table, row = key.split('|', 1)
+        data.setdefault(table, {})[configdb.deserialize_key(row)] = configdb.raw_to_typed(raw_data)
+    return data
+
+
+def get_tables_by_key(client, tables):
+    # Same access pattern as ConfigDBConnector.get_table(), one HGETALL round trip per key
+    configdb = sys.modules['sonic_cfggen'].ConfigDBConnector()
+    data = {}
+    for table in tables:
+        for key in client.keys(table + '|*'):
+            row = key.split('|', 1)[1]
+            data.setdefault(table, {})[configdb.deserialize_key(row)] = configdb.raw_to_typed(client.hgetall(key))
+    return data
+
+
+def measure(name, func, iterations):
+    start = time.time()
+    for _ in range(iterations):
+        result = func()
+    elapsed = (time.time() - start) / iterations
+    print('{:<40} {:>10.2f} ms {:>8} tables'.format(name, elapsed * 1000, len(result)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ports', type=int, default=128)
+    parser.add_argument('--acl-rules', type=int, default=20000)
+    parser.add_argument('--routes', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--unix-socket', help='use a real redis server instead of fakeredis')
+    parser.add_argument('--db', type=int, default=15)
+    args = parser.parse_args()
+
+    cfggen = load_module_from_source('sonic_cfggen', CFGGEN_PATH)
+    client = get_client(args)
+    fill_config(client, args)
+
+    env = cfggen.jinja2.Environment()
+    tables = cfggen.jinja2.meta.find_undeclared_variables(env.parse('{{ DEVICE_METADATA.localhost.hwsku }}'))
+
+    measure('full config DB read', lambda: get_full_config(client), args.iterations)
+    measure('table scoped read ({})'.format(','.join(sorted(tables))),
+            lambda: get_tables(client, sorted(tables)), args.iterations)
+    measure('table scoped read (DEVICE_METADATA,PORT)',
+            lambda: get_tables(client, ['DEVICE_METADATA', 'PORT']), args.iterations)
+    measure('table scoped read (ACL_RULE)', lambda: get_tables(client, ['ACL_RULE']), args.iterations)
+    measure('table scoped read by key (ACL_RULE)', lambda: get_tables_by_key(client, ['ACL_RULE']), args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the minigraph queries done by 'sonic-cfggen -H -m -n asicN':
+hostname, asic sub role and asic switch type.
+
+'full parse' loads the whole tree for every query, as the helpers used to do,
+'streamed' uses the iterparse based section accessors and 'parse_xml + queries'
+shows the queries answered from the tree memoized by parse_xml.
+
+Each scenario runs in its own process so that the peak RSS is comparable:
+    python3 tests/benchmark_minigraph_parse.py tests/minigraph-str2-temp-2-lc04.xml
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+import minigraph
+from lxml import etree as ET
+
+DEFAULT_MINIGRAPHS = [
+    'minigraph-str2-temp-2-lc04.xml',
+    'sample-arista-7800r3a-36dm2-c36-lc-t2-minigraph.xml',
+    'sample-chassis-packet-lc-graph.xml',
+]
+
+
+def full_parse_queries(filename, asic_name):
+    hostname = None
+    for child in ET.parse(filename).getroot():
+        if child.tag == str(minigraph.QName(minigraph.ns, "Hostname")):
+            hostname = child.text
+    root = ET.parse(filename).getroot()
+    for child in root:
+        if child.tag == str(minigraph.QName(minigraph.ns, "MetadataDeclaration")):
+            minigraph.parse_asic_meta(child, asic_name)
+    root = ET.parse(filename).getroot()
+    minigraph.get_chassis_type_and_hostname(root, hostname)
+
+
+def streamed_queries(filename, asic_name):
+    hostname = minigraph.parse_hostname(filename)
+    minigraph.parse_asic_sub_role(filename, asic_name)
+    minigraph.parse_asic_switch_type(filename, asic_name, hostname)
+
+
+def memoized_queries(filename, asic_name):
+    minigraph.load_minigraph_root(filename)
+    streamed_queries(filename, asic_name)
+
+
+def run_scenario(func, filename, asic_name, iterations, queue):
+    start = time.time()
+    for _ in range(iterations):
+        minigraph.clear_minigraph_cache()
+        func(filename, asic_name)
+    elapsed = (time.time() - start) / iterations
+    queue.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def measure(func, filename, asic_name, iterations):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run_scenario, args=(func, filename, asic_name, iterations, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('minigraph', nargs='*', default=[os.path.join(TESTS_DIR, name) for name in DEFAULT_MINIGRAPHS])
+    parser.add_argument('-n', '--asic-name', default='asic0')
+    parser.add_argument('--iterations', type=int, default=10)
+    args = parser.parse_args()
+
+    scenarios = [
+        ('full parse', full_parse_queries),
+        ('streamed', streamed_queries),
+        ('parse_xml + queries', memoized_queries),
+    ]
+    for filename in args.minigraph:
+        print('{} ({} KB)'.format(os.path.basename(filename), os.path.getsize(filename) // 1024))
+        for name, func in scenarios:
+            elapsed, max_rss = measure(func, filename, args.asic_name, args.iterations)
+            print('    {:<24} {:>10.2f} ms {:>10} KB peak RSS'.format(name, elapsed * 1000, max_rss))
+
+
+if __name__ == '__main__':
+    main()
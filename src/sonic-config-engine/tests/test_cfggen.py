@@ -1,9 +1,14 @@
+import argparse
+import copy
 import json
+import shutil
 import subprocess
 import os
+import tempfile
 import tests.common_utils as utils
 
-from unittest import TestCase
+from unittest import TestCase, mock
+from sonic_py_common.general import load_module_from_source
 
 TOR_ROUTER = 'ToRRouter'
 BACKEND_TOR_ROUTER = 'BackEndToRRouter'
@@ -128,6 +133,206 @@ class TestCfgGen(TestCase):
         output = self.run_script(argument)
         self.assertTrue(len(output.strip()) > 0)
 
+    def test_from_db_print_data(self):
+        argument = ['-d', '--print-data']
+        output = json.loads(self.run_script(argument))
+        self.assertTrue(set(['FEATURE', 'HEARTBEAT', 'PORT']) <= set(output.keys()))
+
+    def test_from_db_tables(self):
+        argument = ['-d', '--tables', 'FEATURE,HEARTBEAT', '--print-data']
+        output = json.loads(self.run_script(argument))
+        self.assertEqual(set(output.keys()), set(['FEATURE', 'HEARTBEAT']))
+        self.assertEqual(output['HEARTBEAT'], {'orchagent': {'heartbeat_interval': '10000', 'alert_interval': '60000'}})
+
+    def test_from_db_var(self):
+        argument = ['-d', '-v', "PORT['Ethernet0']['lanes'] if FEATURE.bgp.state == 'enabled' else ''"]
+        output = self.run_script(argument)
+        self.assertEqual(output.strip(), '29,30,31,32')
+
+    def test_from_db_template(self):
+        template_dir = tempfile.mkdtemp()
+        try:
+            self.write_referencing_templates(template_dir)
+            argument = ['-d', '-t', os.path.join(template_dir, 'main.j2')]
+            output = self.run_script(argument)
+            self.assertEqual(output.strip().split(), ['orchagent:10000', 'Ethernet0:29,30,31,32', 'bgp:enabled'])
+        finally:
+            shutil.rmtree(template_dir)
+
+    def write_referencing_templates(self, template_dir, dynamic_include=False):
+        templates = {
+            'main.j2': "{% extends 'base.j2' %}{% block body %} {% include 'port.j2' %} "
+                       "{% from 'feature.j2' import feature_state with context %}{{ feature_state('bgp') }}{% endblock %}",
+            'base.j2': "{% for name, hb in HEARTBEAT.items() %}{{ name }}:{{ hb.heartbeat_interval }}{% endfor %}"
+                       "{% block body %}{% endblock %}",
+            'port.j2': "Ethernet0:{{ PORT['Ethernet0'].lanes }}",
+            'feature.j2': "{% macro feature_state(name) %}{{ name }}:{{ FEATURE[name].state }}{% endmacro %}",
+            'bgp.j2': "{% from 'feature.j2' import feature_state with context %}{{ feature_state('bgp') }}",
+            'dynamic.j2': "{% include 'port' + '.j2' %} {% set name = 'bgp' %}{% include name + '.j2' %}",
+        }
+        for name, source in templates.items():
+            with open(os.path.join(template_dir, name), 'w') as f:
+                f.write(source)
+
+    def load_cfggen(self):
+        return load_module_from_source('sonic_cfggen', self.script_file[1])
+
+    def get_tables_to_fetch(self, cfggen, env=None, template_files=[], **kwargs):
+        args = argparse.Namespace(tables=None, print_data=False, write_to_db=False, preset=None, var_json=None, var=None)
+        for key, value in kwargs.items():
+            setattr(args, key, value)
+        return cfggen._get_tables_to_fetch(args, env, template_files)
+
+    def test_find_template_variables(self):
+        cfggen = self.load_cfggen()
+        template_dir = tempfile.mkdtemp()
+        try:
+            self.write_referencing_templates(template_dir)
+            env = cfggen._get_jinja2_env([template_dir])
+            # Variables of extended, included and imported templates are found
+            self.assertEqual(cfggen.find_template_variables(env, ['main.j2']), set(['HEARTBEAT', 'PORT', 'FEATURE']))
+            # Constant expressions are followed, a name known at render time needs the whole config DB
+            self.assertIsNone(cfggen.find_template_variables(env, ['dynamic.j2']))
+            self.assertIsNone(self.get_tables_to_fetch(cfggen, env, [os.path.join(template_dir, 'dynamic.j2')]))
+            self.assertEqual(self.get_tables_to_fetch(cfggen, env, [os.path.join(template_dir, 'port.j2')]), set(['PORT']))
+        finally:
+            shutil.rmtree(template_dir)
+
+    def test_get_tables_to_fetch(self):
+        cfggen = self.load_cfggen()
+        self.assertEqual(self.get_tables_to_fetch(cfggen, var="DEVICE_METADATA['localhost']['hwsku']"),
+                         set(['DEVICE_METADATA']))
+        self.assertEqual(self.get_tables_to_fetch(cfggen, var="(PORT.keys()|list)[0] if FEATURE else VLAN|length"),
+                         set(['PORT', 'FEATURE', 'VLAN']))
+        self.assertEqual(self.get_tables_to_fetch(cfggen, var="PORT[DEVICE_METADATA.localhost.port]"),
+                         set(['PORT', 'DEVICE_METADATA']))
+        self.assertEqual(self.get_tables_to_fetch(cfggen, var_json='PORT'), set(['PORT']))
+        self.assertEqual(self.get_tables_to_fetch(cfggen, tables='PORT,,VLAN', print_data=True), set(['PORT', 'VLAN']))
+        # The whole config DB is read when the output does not tell which tables are used
+        self.assertIsNone(self.get_tables_to_fetch(cfggen, print_data=True))
+        self.assertIsNone(self.get_tables_to_fetch(cfggen, write_to_db=True))
+        self.assertIsNone(self.get_tables_to_fetch(cfggen, preset='l2'))
+        self.assertIsNone(self.get_tables_to_fetch(cfggen))
+        self.assertIsNone(self.get_tables_to_fetch(cfggen, var="[x for x in PORT]"))
+        # Variables which are not config DB tables are not read
+        self.assertEqual(self.get_tables_to_fetch(cfggen, var="PORT[port] if namespace else hwsku"), set(['PORT']))
+
+    def test_from_db_dynamic_include_reads_whole_db(self):
+        cfggen = self.load_cfggen()
+        template_dir = tempfile.mkdtemp()
+        output_file = os.path.join(template_dir, 'output')
+        try:
+            self.write_referencing_templates(template_dir)
+            with mock.patch.object(cfggen, '_read_config_db', wraps=cfggen._read_config_db) as read_db, \
+                 mock.patch.object(cfggen, '_read_config_db_tables', wraps=cfggen._read_config_db_tables) as read_tables:
+                cfggen.main(['-d', '-t', os.path.join(template_dir, 'dynamic.j2') + ',' + output_file])
+                read_db.assert_called_once()
+                read_tables.assert_not_called()
+                with open(output_file) as f:
+                    self.assertEqual(f.read().split(), ['Ethernet0:29,30,31,32', 'bgp:enabled'])
+
+                read_db.reset_mock()
+                cfggen.main(['-d', '-t', os.path.join(template_dir, 'main.j2') + ',' + output_file])
+                read_db.assert_not_called()
+                read_tables.assert_called_once_with(None, {}, set(['HEARTBEAT', 'PORT', 'FEATURE']))
+        finally:
+            shutil.rmtree(template_dir)
+
+    def test_from_db_shipped_templates(self):
+        """
+        Render shipped templates from a config DB holding a full minigraph config, the output
+        with the tables detected from the templates is the same as with the whole config DB.
+        """
+        argument = ['-m', self.sample_graph_t0, '-p', self.port_config, '--print-data']
+        db_data = json.loads(self.run_script(argument))
+        cfggen = self.load_cfggen()
+        db_data = cfggen.FormatConverter.output_to_db(cfggen.FormatConverter.to_deserialized(db_data))
+
+        # redis keys of the rows, a row key may be a tuple
+        rows = dict(('{}|{}'.format(table, row), (table, row)) for table in db_data for row in db_data[table])
+        row_keys = dict((str(row), row) for table in db_data for row in db_data[table])
+
+        class Pipeline(object):
+            def __init__(self):
+                self.keys = []
+
+            def hgetall(self, key):
+                self.keys.append(key)
+
+            def execute(self):
+                return [db_data[table][row] for table, row in (rows[key] for key in self.keys)]
+
+        class Client(object):
+            def keys(self, pattern):
+                return [key for key in rows if rows[key][0] == pattern.split('|', 1)[0]]
+
+            def pipeline(self):
+                return Pipeline()
+
+        class ConfigDB(object):
+            db_name = 'CONFIG_DB'
+            TABLE_NAME_SEPARATOR = '|'
+
+            def __init__(self, **kwargs):
+                pass
+
+            def connect(self):
+                pass
+
+            def get_config(self):
+                return copy.deepcopy(db_data)
+
+            def get_redis_client(self, db_name):
+                return Client()
+
+            @staticmethod
+            def raw_to_typed(raw_data):
+                return copy.deepcopy(raw_data)
+
+            @staticmethod
+            def deserialize_key(key):
+                return row_keys[key]
+
+        dockers_dir = os.path.join(self.test_dir, '..', '..', '..', 'dockers')
+        image_config_dir = os.path.join(self.test_dir, '..', '..', '..', 'files', 'image_config')
+        templates = [
+            os.path.join(dockers_dir, 'docker-dhcp-relay', 'docker-dhcp-relay.supervisord.conf.j2'),
+            os.path.join(dockers_dir, 'docker-dhcp-relay', 'wait_for_intf.sh.j2'),
+            os.path.join(dockers_dir, 'docker-lldp', 'lldpd.conf.j2'),
+            os.path.join(dockers_dir, 'docker-orchagent', 'ipinip.json.j2'),
+            os.path.join(dockers_dir, 'docker-orchagent', 'ports.json.j2'),
+            os.path.join(dockers_dir, 'docker-router-advertiser', 'radvd.conf.j2'),
+            os.path.join(image_config_dir, 'interfaces', 'interfaces.j2'),
+            os.path.join(image_config_dir, 'rsyslog', 'rsyslog.conf.j2'),
+        ]
+        with mock.patch.object(cfggen, 'ConfigDBPipeConnector', ConfigDB), \
+             mock.patch.object(cfggen, '_read_config_db_tables', wraps=cfggen._read_config_db_tables) as read_tables:
+            for template in templates:
+                outputs = []
+                for get_tables in [cfggen._get_tables_to_fetch, lambda *args: None]:
+                    with mock.patch.object(cfggen, '_get_tables_to_fetch', get_tables):
+                        cfggen.main(['-d', '-t', template + ',' + self.output_file])
+                    with open(self.output_file) as f:
+                        outputs.append(f.read())
+                self.assertEqual(outputs[0], outputs[1], template)
+                self.assertTrue(len(outputs[0].strip()) > 0, template)
+            self.assertEqual(read_tables.call_count, len(templates))
+
+    def test_minigraph_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            argument = ['-m', self.sample_graph_t0, '-p', self.port_config, '--print-data']
+            expected = self.run_script(argument)
+            argument += ['--minigraph-cache-dir', cache_dir]
+            # First run populates the cache, second one is served from it
+            self.assertEqual(self.run_script(argument), expected)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            entry_dir = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+            self.assertEqual(len(os.listdir(entry_dir)), 2)
+            self.assertEqual(self.run_script(argument), expected)
+        finally:
+            shutil.rmtree(cache_dir)
+
     def test_jinja_expression(self, graph=None, port_config=None, expected_router_type='LeafRouter'):
         if graph is None:
             graph = self.sample_graph
@@ -203,6 +408,29 @@ class TestCfgGen(TestCase):
         with open(self.output2_file) as tf:
             self.assertEqual(tf.read().strip(), 'value')
 
+    def test_template_manifest_mode(self):
+        manifest_file = os.path.join(self.test_dir, 'manifest.json')
+        manifest = [
+            {'template': os.path.join(self.test_dir, 'test.j2'), 'destination': self.output_file},
+            {'template': os.path.join(self.test_dir, 'test2.j2'), 'destination': self.output2_file, 'vars': {'key1': 'override'}},
+            {'template': os.path.join(self.test_dir, 'test2.j2')},
+        ]
+        with open(manifest_file, 'w') as mf:
+            json.dump(manifest, mf)
+        try:
+            for jobs in ['1', '3']:
+                argument = ['-y', os.path.join(self.test_dir, 'test.yml')]
+                argument += ['-a', '{"key1":"value"}']
+                argument += ['--manifest', manifest_file, '--jobs', jobs]
+                output = self.run_script(argument)
+                self.assertEqual(output.strip(), 'value')
+                with open(self.output_file) as tf:
+                    self.assertEqual(tf.read().strip(), 'value1\nvalue2')
+                with open(self.output2_file) as tf:
+                    self.assertEqual(tf.read().strip(), 'override')
+        finally:
+            os.remove(manifest_file)
+
     def test_template_json_batch_mode(self):
         data = {"key1_1":"value1_1", "key1_2":"value1_2", "key2_1":"value2_1", "key2_2":"value2_2"}
         argument = ["-a", '{0}'.format(repr(data).replace('\'', '"'))]
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import tempfile
+import threading
+
+import tests.common_utils as utils
+
+from unittest import TestCase
+from sonic_py_common.general import load_module_from_source
+
+
+class TestCfgGenServer(TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.dirname(os.path.realpath(__file__))
+        self.script_file = [utils.PYTHON_INTERPRETTER, os.path.join(self.test_dir, '..', 'sonic-cfggen')]
+        self.client_file = [utils.PYTHON_INTERPRETTER, os.path.join(self.test_dir, '..', 'sonic-cfggen-client')]
+        self.sample_graph = os.path.join(self.test_dir, 'sample_graph.xml')
+        self.port_config = os.path.join(self.test_dir, 't0-sample-port-config.ini')
+        self.output_file = os.path.join(self.test_dir, 'output')
+        self.socket_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.socket_dir, 'sonic-cfggen.sock')
+        os.environ["CFGGEN_UNIT_TESTING"] = "2"
+
+        server_module = load_module_from_source('sonic_cfggen_server', os.path.join(self.test_dir, '..', 'sonic-cfggen-server'))
+        cfggen = load_module_from_source('sonic_cfggen', server_module.CFGGEN_PATH)
+        self.server = server_module.CfggenServer(self.socket_path, cfggen)
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        os.environ["CFGGEN_UNIT_TESTING"] = ""
+        for path in [self.output_file, self.socket_path]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        os.rmdir(self.socket_dir)
+
+    def run_both(self, argument):
+        env = dict(os.environ, SONIC_CFGGEN_SOCKET=self.socket_path)
+        local = subprocess.run(self.script_file + argument, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        served = subprocess.run(self.client_file + argument, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+        return local, served
+
+    def test_var_output_identical(self):
+        argument = ['-v', "DEVICE_METADATA[\'localhost\'][\'hostname\']", '-m', self.sample_graph, '-p', self.port_config]
+        local, served = self.run_both(argument)
+        self.assertEqual(local.returncode, 0)
+        self.assertEqual(served.returncode, 0)
+        self.assertEqual(local.stdout, served.stdout)
+        self.assertEqual(served.stdout.strip(), b'OCPSCH01040DDLF')
+
+    def test_template_output_identical(self):
+        argument = ['-y', os.path.join(self.test_dir, 'test.yml'), '-t', os.path.join(self.test_dir, 'test.j2')]
+        for _ in range(2):
+            local, served = self.run_both(argument)
+            self.assertEqual(local.stdout, served.stdout)
+            self.assertEqual(served.stdout.strip(), b'value1\nvalue2')
+
+    def test_template_to_relative_file(self):
+        argument = ['-y', 'test.yml', '-t', 'test.j2,output']
+        env = dict(os.environ, SONIC_CFGGEN_SOCKET=self.socket_path)
+        subprocess.check_call(self.client_file + argument, cwd=self.test_dir, env=env)
+        with open(self.output_file) as tf:
+            self.assertEqual(tf.read().strip(), 'value1\nvalue2')
+
+    def test_error_exit_code(self):
+        argument = ['--no-such-option']
+        local, served = self.run_both(argument)
+        self.assertEqual(local.returncode, served.returncode)
+        self.assertEqual(local.stderr, served.stderr)
+
+    def test_fallback_without_server(self):
+        argument = ['-y', os.path.join(self.test_dir, 'test.yml'), '-t', os.path.join(self.test_dir, 'test.j2')]
+        env = dict(os.environ, SONIC_CFGGEN_SOCKET=os.path.join(self.socket_dir, 'missing.sock'),
+                   PATH=os.path.join(self.test_dir, '..') + os.pathsep + os.environ.get('PATH', ''))
+        output = subprocess.check_output(self.client_file + argument, env=env)
+        self.assertEqual(output.strip(), b'value1\nvalue2')
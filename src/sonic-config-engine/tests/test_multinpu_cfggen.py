@@ -1,9 +1,11 @@
 import filecmp
 import json
 import os
+import pickle
 import shutil
 import subprocess
 import sys
+import tempfile
 import unittest
 import yaml
 import tests.common_utils as utils
@@ -114,6 +116,53 @@ class TestMultiNpuCfgGen(TestCase):
             output = self.run_script_for_asic(argument, asic, self.port_config[asic])
             self.assertGreater(len(output.strip()) , 0)
 
+    def test_parallel_namespaces(self):
+        argument = ["-m", self.sample_graph, "-p", self.sample_port_config, "--var-json", "DEVICE_METADATA"]
+        expected = ''
+        for asic in range(NUM_ASIC):
+            expected += self.run_script(argument + ["-n", "asic{}".format(asic)], validateYang=False)
+        namespaces = ','.join("asic{}".format(asic) for asic in range(NUM_ASIC))
+        output = self.run_script(argument + ["--namespaces", namespaces], validateYang=False)
+        self.assertEqual(output, expected)
+
+    def test_minigraph_cache_namespaces(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            argument = ["-m", self.sample_graph, "--print-data"]
+            for asic in range(NUM_ASIC):
+                expected = self.run_script_for_asic(argument, asic, self.port_config[asic])
+                output = self.run_script_for_asic(argument + ["--minigraph-cache-dir", cache_dir], asic, self.port_config[asic])
+                self.assertEqual(output, expected)
+            # One entry shared by every namespace and one per namespace
+            (minigraph_digest,) = os.listdir(cache_dir)
+            entry_dir = os.path.join(cache_dir, minigraph_digest)
+            device_entries = [entry for entry in os.listdir(entry_dir) if entry.startswith('device-')]
+            self.assertEqual(len(device_entries), 1)
+            self.assertEqual(len(os.listdir(entry_dir)), NUM_ASIC + 1)
+
+            device_entry = os.path.join(entry_dir, device_entries[0])
+            with open(device_entry, 'rb') as f:
+                device = pickle.load(f)
+            device['docker_routing_config_mode'] = 'unified'
+            with open(device_entry, 'wb') as f:
+                pickle.dump(device, f)
+
+            def run_uncached_namespace():
+                for entry in os.listdir(entry_dir):
+                    if entry not in device_entries:
+                        os.remove(os.path.join(entry_dir, entry))
+                argument = ["-m", self.sample_graph, "-v", "DEVICE_METADATA['localhost']['docker_routing_config_mode']",
+                            "-n", "asic1", "-p", self.port_config[1], "--minigraph-cache-dir", cache_dir]
+                return self.run_script(argument, check_stderr=False).strip()
+
+            # A namespace missing from the cache is built from the shared entry
+            self.assertEqual(run_uncached_namespace(), 'unified')
+            # unless other users could have written it
+            os.chmod(device_entry, 0o666)
+            self.assertEqual(run_uncached_namespace(), 'separated')
+        finally:
+            shutil.rmtree(cache_dir)
+
     def test_additional_json_data(self):
         argument = ['-a', '{"key1":"value1"}', '-v', 'key1']
         output = self.run_script(argument)
@@ -1,6 +1,9 @@
 import ipaddress
+import os
 import psutil
+import select
 import string
+import time
 from swsscommon import swsscommon
 
 DEFAULT_REDIS_HOST = "127.0.0.1"
@@ -70,6 +73,182 @@ def terminate_proc(proc):
     proc.wait()
 
 
+class TrackedProcess(object):
+    def __init__(self, name, proc, cmdline, ppid, popen=None):
+        self.name = name
+        self.pid = proc.pid
+        self.proc = proc
+        self.cmdline = cmdline
+        self.ppid = ppid
+        # Popen handle if the process is spawned by ourselves, None if it is found by pidfile or scanning
+        self.popen = popen
+
+
+class ProcessRegistry(object):
+    """
+    Track processes by name, so that they can be found and checked without scanning all processes in system.
+    Processes spawned by ourselves are added with their Popen handles, others (i.e. started by supervisord) are
+    found by pidfile or by scanning psutil.process_iter() once and cached until one of them exits. Processes which
+    are not started by ourselves can appear at any time, a check which has to find them needs to rescan.
+    """
+    def __init__(self):
+        self.procs = {}
+
+    def add(self, name, popen, cmdline):
+        """
+        Track a process spawned by ourselves.
+        Args:
+            name: Name of process
+            popen: Popen handle of process
+            cmdline: List of cmd used to spawn process
+        Returns:
+            TrackedProcess object
+        """
+        entry = TrackedProcess(name, psutil.Process(popen.pid), cmdline, os.getpid(), popen)
+        self.procs[entry.pid] = entry
+        return entry
+
+    def remove(self, pid):
+        self.procs.pop(pid, None)
+
+    def is_alive(self, entry):
+        """
+        Check whether tracked process is still running, exited child processes are not reaped here.
+        Args:
+            entry: TrackedProcess object
+        Returns:
+            If process is running, return True. Else, return False
+        """
+        try:
+            if entry.popen is not None:
+                return os.waitid(os.P_PID, entry.pid, os.WEXITED | os.WNOHANG | os.WNOWAIT) is None
+            return entry.proc.is_running() and entry.proc.status() != psutil.STATUS_ZOMBIE
+        except (ChildProcessError, psutil.NoSuchProcess):
+            return False
+
+    def wait_exited(self, entries, timeout):
+        """
+        Wait until all processes exit or timeout, return as soon as all of them exit.
+        Args:
+            entries: List of TrackedProcess objects
+            timeout: Timeout in seconds
+        Returns:
+            Set of pids of exited processes
+        """
+        if not hasattr(os, "pidfd_open"):
+            time.sleep(timeout)
+            return set([entry.pid for entry in entries if not self.is_alive(entry)])
+        exited = set()
+        fds = {}
+        poller = select.poll()
+        try:
+            for entry in entries:
+                try:
+                    fd = os.pidfd_open(entry.pid)
+                except ProcessLookupError:
+                    exited.add(entry.pid)
+                    continue
+                fds[fd] = entry.pid
+                poller.register(fd, select.POLLIN)
+            deadline = time.monotonic() + timeout
+            while len(exited) < len(entries):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for fd, _ in poller.poll(remaining * 1000):
+                    poller.unregister(fd)
+                    exited.add(fds[fd])
+        finally:
+            for fd in fds:
+                os.close(fd)
+        return exited
+
+    def find(self, name, pidfile=None, rescan=False):
+        """
+        Find running processes by name. Cached processes are returned if all of them are still running, else
+        processes are found by pidfile, and by scanning all processes as fallback.
+        Args:
+            name: Name of process
+            pidfile: Path of pidfile written by process
+            rescan: Scan all processes even if cached processes are still running
+        Returns:
+            List of TrackedProcess objects
+        """
+        tracked = [entry for entry in self.procs.values() if entry.name == name]
+        procs = None
+        if not rescan:
+            if len(tracked) != 0 and all(self.is_alive(entry) for entry in tracked):
+                return tracked
+            if pidfile is not None:
+                procs = self._read_pidfile(name, pidfile)
+        if procs is None:
+            procs = self._scan(name)
+        found_pids = set([proc.pid for proc, _, _ in procs])
+        for entry in tracked:
+            if entry.pid not in found_pids:
+                self.remove(entry.pid)
+        res = []
+        for proc, ppid, cmdline in procs:
+            if proc.pid not in self.procs or self.procs[proc.pid].name != name:
+                self.procs[proc.pid] = TrackedProcess(name, proc, cmdline, ppid)
+            res.append(self.procs[proc.pid])
+        return res
+
+    def find_children(self, entries):
+        """
+        Find child processes with the same name of tracked processes, they are not tracked if processes are spawned
+        by ourselves.
+        Args:
+            entries: List of TrackedProcess objects
+        Returns:
+            List of Process objects in psutil
+        """
+        pids = set([entry.pid for entry in entries])
+        res = []
+        for entry in entries:
+            try:
+                children = entry.proc.children(recursive=True)
+            except psutil.NoSuchProcess:
+                continue
+            for child in children:
+                try:
+                    if child.pid not in pids and child.name() == entry.name:
+                        pids.add(child.pid)
+                        res.append(child)
+                except psutil.NoSuchProcess:
+                    continue
+        return res
+
+    def _read_pidfile(self, name, pidfile):
+        try:
+            with open(pidfile, "r") as file:
+                proc = psutil.Process(int(file.read().strip()))
+            if proc.name() == name:
+                return [(proc, proc.ppid(), proc.cmdline())]
+        except (OSError, ValueError, psutil.NoSuchProcess):
+            pass
+        return None
+
+    def _scan(self, name):
+        procs = []
+        for proc in psutil.process_iter():
+            err = None
+            for _ in range(5):
+                err = None
+                try:
+                    if proc.name() == name:
+                        procs.append((proc, proc.ppid(), proc.cmdline()))
+                except psutil.NoSuchProcess:
+                    pass
+                except Exception as e:
+                    err = e
+                if err is None:
+                    break
+            if err:
+                raise err
+        return procs
+
+
 def merge_intervals(intervals):
     """
     Merge ip range intervals.
@@ -1,14 +1,13 @@
 # TODO Add support for running different dhcrelay processes for each dhcp interface
 # Currently if we run multiple dhcrelay processes, except for the last running process,
 # others will not relay dhcp_release packet.
-import psutil
 import re
 import subprocess
 import sys
 import syslog
 import time
 from swsscommon import swsscommon
-from dhcp_utilities.common.utils import DhcpDbConnector, terminate_proc, is_smart_switch
+from dhcp_utilities.common.utils import DhcpDbConnector, ProcessRegistry, terminate_proc, is_smart_switch
 from dhcp_utilities.common.dhcp_db_monitor import DhcpRelaydDbMonitor, DhcpServerTableIntfEnablementEventChecker, \
      VlanTableEventChecker, VlanIntfTableEventChecker, DhcpServerFeatureStateChecker, MidPlaneTableEventChecker
 
@@ -30,6 +29,8 @@ VLAN_CHECKERS = [VLAN_CHECKER, VLAN_INTF_CHECKER]
 KILLED_OLD = 1
 NOT_KILLED = 2
 NOT_FOUND_PROC = 3
+# Seconds to wait for spawned process exiting, if it exits in this period, it's regarded as failed to start
+START_CHECK_TIMEOUT = 1
 
 
 class DhcpRelayd(object):
@@ -54,6 +55,7 @@ class DhcpRelayd(object):
         self.dhcp_server_feature_enabled = None
         self.supervisord_conf_path = supervisord_conf_path
         self.enabled_checkers = set(enabled_checkers)
+        self.proc_registry = ProcessRegistry()
 
     def start(self):
         """
@@ -228,31 +230,12 @@ class DhcpRelayd(object):
         """
         Check whether dhcrelay running as expected, if not, dhcprelayd will exit with code 1
         """
-        procs = {}
-        for proc in psutil.process_iter():
-            err = None
-            for i in range(5):
-                err = None
-                try:
-                    if proc.name() == "dhcrelay":
-                        procs[proc.pid] = [proc.ppid(), proc.cmdline()]
-                except psutil.NoSuchProcess:
-                    pass
-                except Exception as e:
-                    err = e
-                if err is None:
-                    break
-            if err:
-                raise err
-
+        # dhcrelay processes are started by supervisord in this state, rescan to find unexpected ones
+        entries = self.proc_registry.find("dhcrelay", rescan=True)
+        pids = set([entry.pid for entry in entries])
         # When there is network io, dhcrelay would create child process to proceed them, psutil has chance to get
         # duplicated cmdline. Hence ignore chlid process in here
-        running_cmds = []
-        for _, (parent_pid, cmdline) in procs.items():
-            if parent_pid in procs:
-                continue
-            running_cmds.append(cmdline)
-
+        running_cmds = [entry.cmdline for entry in entries if entry.ppid not in pids]
         running_cmds.sort()
         expected_cmds = [value for key, value in self.dhcp_relay_supervisor_config.items() if "isc-dhcpv4-relay" in key]
         expected_cmds.sort()
@@ -304,12 +287,12 @@ class DhcpRelayd(object):
             cmds += ["-id", dhcp_interface]
         cmds += ["-iu", "docker0", dhcp_server_ip]
         popen_res = subprocess.Popen(cmds)
-        # To make sure process start successfully not in zombie status
-        proc = psutil.Process(popen_res.pid)
-        time.sleep(1)
-        if proc.status() == psutil.STATUS_ZOMBIE:
+        # To make sure process start successfully not exit immediately
+        entry = self.proc_registry.add("dhcrelay", popen_res, cmds)
+        if self.proc_registry.wait_exited([entry], START_CHECK_TIMEOUT):
             syslog.syslog(syslog.LOG_ERR, "Failed to start dhcrelay process with: {}".format(cmds))
-            terminate_proc(proc)
+            terminate_proc(entry.proc)
+            self.proc_registry.remove(entry.pid)
             sys.exit(1)
 
         syslog.syslog(syslog.LOG_INFO, "dhcrelay process started successfully, cmds: {}".format(cmds))
@@ -325,20 +308,20 @@ class DhcpRelayd(object):
         if len(new_dhcp_interfaces) == 0:
             return
 
-        pids_cmds = {}
+        entries = []
         for dhcp_interface in new_dhcp_interfaces:
             cmds = ["/usr/sbin/dhcpmon", "-id", dhcp_interface, "-iu", "docker0", "-im", "eth0"]
             popen_res = subprocess.Popen(cmds)
-            pids_cmds[popen_res.pid] = cmds
-        time.sleep(1)
-        # To make sure process start successfully not in zombie status
-        for pid, cmds in pids_cmds.items():
-            proc = psutil.Process(pid)
-            if proc.status() == psutil.STATUS_ZOMBIE:
-                syslog.syslog(syslog.LOG_ERR, "Failed to start dhcpmon process: {}".format(cmds))
-                terminate_proc(proc)
+            entries.append(self.proc_registry.add("dhcpmon", popen_res, cmds))
+        # To make sure process start successfully not exit immediately
+        exited_pids = self.proc_registry.wait_exited(entries, START_CHECK_TIMEOUT)
+        for entry in entries:
+            if entry.pid in exited_pids:
+                syslog.syslog(syslog.LOG_ERR, "Failed to start dhcpmon process: {}".format(entry.cmdline))
+                terminate_proc(entry.proc)
+                self.proc_registry.remove(entry.pid)
             else:
-                syslog.syslog(syslog.LOG_INFO, "dhcpmon process started successfully, cmds: {}".format(cmds))
+                syslog.syslog(syslog.LOG_INFO, "dhcpmon process started successfully, cmds: {}".format(entry.cmdline))
 
     def _kill_exist_relay_releated_process(self, new_dhcp_interfaces, process_name, force_kill):
         old_dhcp_interfaces = set()
@@ -346,20 +329,16 @@ class DhcpRelayd(object):
         target_procs = []
 
         # Get old dhcrelay process and get old dhcp interfaces
-        for proc in psutil.process_iter():
-            try:
-                if proc.name() == process_name:
-                    cmds = proc.cmdline()
-                    index = 0
-                    target_procs.append(proc)
-                    while index < len(cmds):
-                        if cmds[index] == "-id":
-                            old_dhcp_interfaces.add(cmds[index + 1])
-                            index += 2
-                        else:
-                            index += 1
-            except psutil.NoSuchProcess:
-                continue
+        for entry in self.proc_registry.find(process_name):
+            cmds = entry.cmdline
+            index = 0
+            target_procs.append(entry)
+            while index < len(cmds):
+                if cmds[index] == "-id":
+                    old_dhcp_interfaces.add(cmds[index + 1])
+                    index += 2
+                else:
+                    index += 1
         if len(target_procs) == 0:
             return NOT_FOUND_PROC
 
@@ -367,9 +346,14 @@ class DhcpRelayd(object):
         if not force_kill and (process_name == "dhcrelay" and old_dhcp_interfaces == new_dhcp_interfaces or
            process_name == "dhcpmon" and old_dhcp_interfaces == (new_dhcp_interfaces)):
             return NOT_KILLED
-        for proc in target_procs:
+        # Child processes are killed before their parents exit
+        for proc in self.proc_registry.find_children(target_procs):
             terminate_proc(proc)
             syslog.syslog(syslog.LOG_INFO, "Kill process: {}".format(process_name))
+        for entry in target_procs:
+            terminate_proc(entry.proc)
+            self.proc_registry.remove(entry.pid)
+            syslog.syslog(syslog.LOG_INFO, "Kill process: {}".format(process_name))
         return KILLED_OLD
 
     def _get_dhcp_server_ip(self):
@@ -1,11 +1,12 @@
+import os
 import signal
 import syslog
 import threading
 import time
 from abc import abstractmethod
-from collections import deque
 from datetime import datetime
 from dhcp_utilities.common.utils import is_smart_switch
+from swsscommon import swsscommon
 
 DHCP_SERVER_IPV4_LEASE = "DHCP_SERVER_IPV4_LEASE"
 KEA_LEASE_FILE_PATH = "/tmp/kea-lease.csv"
@@ -30,6 +31,11 @@ class LeaseHanlder(object):
         self.lease_update_interval = lease_update_interval
         self.last_update_time = None
         self.lock = threading.Lock()
+        # Set by signal handler, lease table is updated by worker thread
+        self.update_event = threading.Event()
+        self.update_thread = None
+        # Lease entries in STATE_DB, None means they haven't been read from STATE_DB
+        self.db_lease = None
         device_metadata = self.db_connector.get_config_db_table("DEVICE_METADATA")
         self.is_smart_switch = is_smart_switch(device_metadata)
 
@@ -52,57 +58,83 @@ class LeaseHanlder(object):
         """
         raise NotImplementedError
 
+    def start_update_thread(self):
+        """
+        Start worker thread which updates lease table when update is requested
+        """
+        if self.update_thread is None:
+            self.update_thread = threading.Thread(target=self._update_lease_worker, name="lease-update", daemon=True)
+            self.update_thread.start()
+
+    def request_update(self):
+        """
+        Request to update lease table, it can be called in signal handler
+        """
+        self.update_event.set()
+
+    def _update_lease_worker(self):
+        while True:
+            self.update_event.wait()
+            # Requests received in self.lease_update_interval after last update are handled by one update
+            if self.last_update_time is not None:
+                elapsed = (datetime.now() - self.last_update_time).total_seconds()
+                if elapsed < self.lease_update_interval:
+                    time.sleep(self.lease_update_interval - elapsed)
+            self.update_event.clear()
+            try:
+                self.update_lease()
+            except Exception as err:
+                syslog.syslog(syslog.LOG_ERR, "Failed to update lease: {}".format(err))
+
     def update_lease(self):
         """
-        Update lease table in STATE_DB
+        Update lease table in STATE_DB, only changed entries are written
         """
-        last_update_time = self.last_update_time
-        curr_time = datetime.now()
-        # If the time since the last update is less than self.lease_update_interval, then wait for a
-        # self.lease_update_interval
-        if last_update_time is not None and (curr_time - last_update_time).seconds < self.lease_update_interval:
-            time.sleep(self.lease_update_interval)
-            if self.last_update_time != last_update_time:
-                # Means lease has been updated during sleep, no need to update this lease
-                return
-        if not self.lock.acquire(False):
-            return
-        new_lease = self._read()
-        # Store old lease key
-        old_lease_table = self.db_connector.get_state_db_table(DHCP_SERVER_IPV4_LEASE)
-        old_lease_key = set(old_lease_table.keys())
-
-        # 1.1 If start time equal to end time or lease expired, means lease has been released
-        #     1.1.1 If current lease table has this old lease, delete it
-        #     1.1.2 Else skip
-        # 1.2 Else, means lease valid, save it.
-        for key, value in new_lease.items():
+        with self.lock:
+            new_lease = self._read()
+            if self.db_lease is None:
+                self.db_lease = self.db_connector.get_state_db_table(DHCP_SERVER_IPV4_LEASE)
+            pipeline = swsscommon.RedisPipeline(self.db_connector.state_db)
+            lease_table = swsscommon.Table(pipeline, DHCP_SERVER_IPV4_LEASE, True)
+
+            # 1.1 If start time equal to end time or lease expired, means lease has been released
+            #     1.1.1 If current lease table has this old lease, delete it
+            #     1.1.2 Else skip
+            # 1.2 Else, means lease valid, save it if it's different from current lease table.
             unix_time = datetime.now().timestamp()
-            if value["lease_start"] == value["lease_end"] or unix_time >= int(value["lease_end"]):
-                if key in old_lease_key:
-                    self.db_connector.state_db.delete("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
-                continue
-            new_key = "{}|{}".format(DHCP_SERVER_IPV4_LEASE, key)
-            for k, v in new_lease[key].items():
-                self.db_connector.state_db.hset(new_key, k, v)
-        # Delete old lease not in new lease set
-        for key in old_lease_key:
-            if key not in new_lease.keys():
-                # Delete entry
-                self.db_connector.state_db.delete("{}|{}".format(DHCP_SERVER_IPV4_LEASE, key))
-        self.last_update_time = datetime.now()
-        self.lock.release()
+            for key, value in new_lease.items():
+                if value["lease_start"] == value["lease_end"] or unix_time >= int(value["lease_end"]):
+                    if key in self.db_lease:
+                        lease_table.delete(key)
+                        del self.db_lease[key]
+                    continue
+                if self.db_lease.get(key) != value:
+                    lease_table.set(key, swsscommon.FieldValuePairs(list(value.items())))
+                    self.db_lease[key] = dict(value)
+            # Delete old lease not in new lease set
+            for key in [key for key in self.db_lease if key not in new_lease]:
+                lease_table.delete(key)
+                del self.db_lease[key]
+            pipeline.flush()
+            self.last_update_time = datetime.now()
 
 
 class KeaDhcp4LeaseHandler(LeaseHanlder):
     def __init__(self, db_connector, lease_file=KEA_LEASE_FILE_PATH):
         LeaseHanlder.__init__(self, db_connector)
         self.lease_file = lease_file
+        # Newest lease of each client in rows which have been read
+        self.lease_index = {}
+        # Lease file and position in it which has been read, next read starts from here
+        self.lease_file_inode = None
+        self.lease_file_offset = 0
+        self.lease_file_columns = 0
 
     def register(self):
         """
         Register callback function of signal
         """
+        self.start_update_thread()
         signal.signal(signal.SIGUSR1, self._update_lease)
 
     def _lease_key(self, subnet_id, mac_address):
@@ -112,37 +144,49 @@ class KeaDhcp4LeaseHandler(LeaseHanlder):
             return f"Vlan{subnet_id}|{mac_address}"
 
     def _read(self):
-        # Read lease file generated by kea-dhcp4
+        # Read rows appended to lease file generated by kea-dhcp4 since last read
         try:
-            with open(self.lease_file, "r", encoding="utf-8") as fb:
-                dq = deque(fb)
+            with open(self.lease_file, "rb") as fb:
+                file_stat = os.fstat(fb.fileno())
+                if file_stat.st_ino != self.lease_file_inode or file_stat.st_size < self.lease_file_offset:
+                    # Lease file has been replaced or truncated by lease file cleanup, read it from beginning
+                    self.lease_index = {}
+                    self.lease_file_inode = file_stat.st_ino
+                    self.lease_file_offset = 0
+                    self.lease_file_columns = 0
+                fb.seek(self.lease_file_offset)
+                for raw_row in fb:
+                    row = raw_row.decode("utf-8")
+                    # Row without line end may be being written by kea-dhcp4, read it next time unless it is complete
+                    if not row.endswith("\n") and len(row.split(",")) < max(self.lease_file_columns, 6):
+                        break
+                    self._parse_row(row)
+                    self.lease_file_offset += len(raw_row)
         except FileNotFoundError as err:
             syslog.syslog(syslog.LOG_ERR, "Cannot find lease file: {}".format(self.lease_file))
             raise err
+        return self.lease_index
 
-        new_lease = {}
-        # Get newest lease information of each client
-        while dq:
-            last_row = dq.pop()
-            splits = last_row.split(",")
-            # Skip header
-            if splits[0] == "address":
-                break
-            ip_str = splits[0]
-            mac_address = splits[1]
-            valid_lifetime = splits[3]
-            lease_end = splits[4]
-            subnet_id = splits[5]
-
-            new_key = self._lease_key(subnet_id, mac_address)
-            if new_key in new_lease:
-                continue
-            new_lease[new_key] = {
-                "lease_start": str(int(lease_end) - int(valid_lifetime)),
-                "lease_end": lease_end,
-                "ip": ip_str
-            }
-        return new_lease
+    def _parse_row(self, row):
+        splits = row.split(",")
+        # Skip header
+        if splits[0] == "address":
+            self.lease_file_columns = len(splits)
+            return
+        if len(splits) < 6:
+            return
+        ip_str = splits[0]
+        mac_address = splits[1]
+        valid_lifetime = splits[3]
+        lease_end = splits[4]
+        subnet_id = splits[5]
+
+        # Later row of the same client has newer lease information
+        self.lease_index[self._lease_key(subnet_id, mac_address)] = {
+            "lease_start": str(int(lease_end) - int(valid_lifetime)),
+            "lease_end": lease_end,
+            "ip": ip_str
+        }
 
     def _update_lease(self, signum, frame):
-        self.update_lease()
+        self.request_update()
@@ -8,7 +8,7 @@ import syslog
 import os
 from .dhcp_cfggen import DhcpServCfgGenerator
 from .dhcp_lease import LeaseManager
-from dhcp_utilities.common.utils import DhcpDbConnector
+from dhcp_utilities.common.utils import DhcpDbConnector, ProcessRegistry
 from dhcp_utilities.common.dhcp_db_monitor import DhcpServdDbMonitor, DhcpServerTableCfgChangeEventChecker, \
     DhcpOptionTableEventChecker, DhcpRangeTableEventChecker, DhcpPortTableEventChecker, VlanIntfTableEventChecker, \
     VlanMemberTableEventChecker, VlanTableEventChecker, MidPlaneTableEventChecker, DpusTableEventChecker
@@ -16,6 +16,7 @@ from swsscommon import swsscommon
 
 KEA_DHCP4_CONFIG = "/etc/kea/kea-dhcp4.conf"
 KEA_DHCP4_PROC_NAME = "kea-dhcp4"
+KEA_DHCP4_PID_FILE = "/run/kea/kea-dhcp4.kea-dhcp4.pid"
 KEA_LEASE_FILE_PATH = "/tmp/kea-lease.csv"
 DHCPSERVD_READY_FLAG = "/tmp/dhcpservd_ready"
 REDIS_SOCK_PATH = "/var/run/redis/redis.sock"
@@ -35,18 +36,18 @@ class DhcpServd(object):
         self.kea_dhcp4_config_path = kea_dhcp4_config_path
         self.dhcp_servd_monitor = monitor
         self.enabled_checker = None
+        self.proc_registry = ProcessRegistry()
 
     def _notify_kea_dhcp4_proc(self):
         """
         Send SIGHUP signal to kea-dhcp4 process
         """
-        for proc in psutil.process_iter():
+        for entry in self.proc_registry.find(KEA_DHCP4_PROC_NAME, KEA_DHCP4_PID_FILE):
             try:
-                if KEA_DHCP4_PROC_NAME in proc.name():
-                    proc.send_signal(signal.SIGHUP)
-                    break
+                entry.proc.send_signal(signal.SIGHUP)
+                break
             except psutil.NoSuchProcess:
-                continue
+                self.proc_registry.remove(entry.pid)
 
     def dump_dhcp4_config(self):
         """
@@ -100,6 +100,9 @@ class MockProc(object):
     def ppid(self):
         return self.parent_id
 
+    def children(self, recursive=False):
+        return []
+
 
 class MockPopen(object):
     def __init__(self, pid):
@@ -1,3 +1,6 @@
+import signal
+import threading
+from datetime import datetime
 from dhcp_utilities.common.utils import DhcpDbConnector
 from dhcp_utilities.dhcpservd.dhcp_lease import KeaDhcp4LeaseHandler, LeaseHanlder
 from freezegun import freeze_time
@@ -64,30 +67,83 @@ def test_update_kea_lease(mock_swsscommon_dbconnector_init, mock_swsscommon_tabl
         "Vlan1000|10:70:fd:b6:13:18": {}
     }
     with patch.object(swsscommon.Table, "getKeys"), \
-         patch.object(swsscommon.DBConnector, "hset") as mock_hset, \
+         patch.object(swsscommon, "RedisPipeline") as mock_pipeline, \
+         patch.object(swsscommon, "FieldValuePairs", side_effect=lambda fvs: fvs), \
          patch.object(KeaDhcp4LeaseHandler, "_read", MagicMock(return_value=tested_lease)), \
          patch.object(DhcpDbConnector, "get_state_db_table",
-                      return_value=mock_lease_table), \
-         patch.object(swsscommon.DBConnector, "delete") as mock_delete, \
-         patch("time.sleep", return_value=None) as mock_sleep:
+                      return_value=mock_lease_table) as mock_get_state_db_table:
         db_connector = DhcpDbConnector()
         kea_lease_handler = KeaDhcp4LeaseHandler(db_connector)
-        kea_lease_handler.update_lease()
+        with patch.object(swsscommon, "Table") as mock_table:
+            kea_lease_handler.update_lease()
+        mock_table.assert_called_once_with(mock_pipeline.return_value, "DHCP_SERVER_IPV4_LEASE", True)
         # Verify that old key was deleted
-        mock_delete.assert_has_calls([
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:00"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:17"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|aa:bb:cc:dd:ee:ff")
+        mock_table.return_value.delete.assert_has_calls([
+            call("Vlan1000|10:70:fd:b6:13:00"),
+            call("Vlan1000|10:70:fd:b6:13:17"),
+            call("Vlan1000|aa:bb:cc:dd:ee:ff")
         ])
         # Verify that lease has been updated, to be noted that lease for "192.168.0.2" didn't been updated because
         # lease_start equals to lease_end
-        mock_hset.assert_has_calls([
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "lease_start", "1697607205"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "lease_end", "1697610805"),
-            call("DHCP_SERVER_IPV4_LEASE|Vlan1000|10:70:fd:b6:13:18", "ip", "193.168.0.132")
+        mock_table.return_value.set.assert_called_once_with("Vlan1000|10:70:fd:b6:13:18", [
+            ("lease_start", "1697607205"), ("lease_end", "1697610805"), ("ip", "193.168.0.132")
         ])
-        kea_lease_handler.update_lease()
-        mock_sleep.assert_called_once_with(2)
+        mock_pipeline.return_value.flush.assert_called_once_with()
+        # Verify that nothing is written if lease isn't changed, lease table in STATE_DB is only read once
+        with patch.object(swsscommon, "Table") as mock_table:
+            kea_lease_handler.update_lease()
+        mock_table.return_value.set.assert_not_called()
+        mock_table.return_value.delete.assert_not_called()
+        mock_get_state_db_table.assert_called_once_with("DHCP_SERVER_IPV4_LEASE")
+
+
+def test_read_kea_lease_appended(mock_swsscommon_dbconnector_init, tmp_path):
+    header = "address,hwaddr,client_id,valid_lifetime,expire,subnet_id,fqdn_fwd,fqdn_rev,hostname,state," \
+             "user_context,pool_id\n"
+    row = "{},10:70:fd:b6:13:{},,3600,{},1000,0,0,7626dced293e,0,,0\n"
+    lease_file = tmp_path / "kea-lease.csv"
+    lease_file.write_text(header + row.format("192.168.0.2", "00", "1694000905"))
+    with patch.object(DhcpDbConnector, "get_config_db_table", side_effect=mock_get_config_db_table):
+        db_connector = DhcpDbConnector()
+        kea_lease_handler = KeaDhcp4LeaseHandler(db_connector, lease_file=str(lease_file))
+        assert kea_lease_handler._read() == {
+            "Vlan1000|10:70:fd:b6:13:00": {"lease_start": "1693997305", "lease_end": "1694000905", "ip": "192.168.0.2"}
+        }
+        # Only appended rows are parsed, row being written is left to next read
+        with open(lease_file, "a") as f:
+            f.write(row.format("192.168.0.3", "00", "1694000915") + "192.168.0.4,10:70:fd")
+        with patch.object(KeaDhcp4LeaseHandler, "_parse_row",
+                          side_effect=kea_lease_handler._parse_row) as mock_parse_row:
+            lease = kea_lease_handler._read()
+        mock_parse_row.assert_called_once_with(row.format("192.168.0.3", "00", "1694000915"))
+        assert lease == {
+            "Vlan1000|10:70:fd:b6:13:00": {"lease_start": "1693997315", "lease_end": "1694000915", "ip": "192.168.0.3"}
+        }
+        # Lease file rewritten by lease file cleanup is read from beginning
+        new_lease_file = tmp_path / "kea-lease.csv.new"
+        new_lease_file.write_text(header + row.format("192.168.0.5", "01", "1694000925"))
+        new_lease_file.replace(lease_file)
+        assert kea_lease_handler._read() == {
+            "Vlan1000|10:70:fd:b6:13:01": {"lease_start": "1693997325", "lease_end": "1694000925", "ip": "192.168.0.5"}
+        }
+
+
+def test_update_lease_worker(mock_swsscommon_dbconnector_init):
+    with patch.object(DhcpDbConnector, "get_config_db_table", side_effect=mock_get_config_db_table):
+        db_connector = DhcpDbConnector()
+        kea_lease_handler = KeaDhcp4LeaseHandler(db_connector)
+    updated = threading.Event()
+    kea_lease_handler.last_update_time = datetime.now()
+    with patch.object(KeaDhcp4LeaseHandler, "update_lease", side_effect=updated.set) as mock_update_lease, \
+         patch("time.sleep") as mock_sleep:
+        # Signals received during lease_update_interval are handled by one update
+        for _ in range(3):
+            kea_lease_handler._update_lease(signal.SIGUSR1, None)
+        kea_lease_handler.start_update_thread()
+        assert updated.wait(10)
+        mock_update_lease.assert_called_once_with()
+        mock_sleep.assert_called_once()
+        assert 0 < mock_sleep.call_args[0][0] <= 2
 
 
 def test_no_implement(mock_swsscommon_dbconnector_init):
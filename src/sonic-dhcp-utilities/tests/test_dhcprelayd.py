@@ -5,7 +5,7 @@ import sys
 import time
 from common_utils import mock_get_config_db_table, MockProc, MockPopen, MockSubprocessRes, mock_exit_func, \
     dhcprelayd_refresh_dhcrelay_test, dhcprelayd_proceed_with_check_res_test
-from dhcp_utilities.common.utils import DhcpDbConnector
+from dhcp_utilities.common.utils import DhcpDbConnector, ProcessRegistry
 from dhcp_utilities.common.dhcp_db_monitor import ConfigDbEventChecker, DhcpRelaydDbMonitor
 from dhcp_utilities.dhcprelayd.dhcprelayd import DhcpRelayd, KILLED_OLD, NOT_KILLED, NOT_FOUND_PROC, \
     DHCP_SERVER_CHECKER, VLAN_CHECKERS
@@ -46,10 +46,11 @@ def test_refresh_dhcrelay(mock_swsscommon_dbconnector_init):
 def test_start_dhcrelay_process(mock_swsscommon_dbconnector_init, new_dhcp_interfaces, kill_res, proc_status,):
     with patch.object(DhcpRelayd, "_kill_exist_relay_releated_process", return_value=kill_res), \
          patch.object(subprocess, "Popen", return_value=MockPopen(999)) as mock_popen, \
-         patch.object(time, "sleep"), \
          patch("dhcp_utilities.dhcprelayd.dhcprelayd.terminate_proc", return_value=None) as mock_terminate, \
          patch.object(psutil.Process, "__init__", return_value=None), \
-         patch.object(psutil.Process, "status", return_value=proc_status), \
+         patch.object(psutil.Process, "pid", 999), \
+         patch.object(ProcessRegistry, "wait_exited",
+                      return_value=set([999]) if proc_status == psutil.STATUS_ZOMBIE else set()) as mock_wait, \
          patch.object(sys, "exit") as mock_exit, \
          patch.object(ConfigDbEventChecker, "enable"):
         dhcp_db_connector = DhcpDbConnector()
@@ -79,10 +80,11 @@ def test_start_dhcpmon_process(mock_swsscommon_dbconnector_init, new_dhcp_interf
     new_dhcp_interfaces = set(new_dhcp_interfaces_list)
     with patch.object(DhcpRelayd, "_kill_exist_relay_releated_process", return_value=kill_res), \
          patch.object(subprocess, "Popen", return_value=MockPopen(999)) as mock_popen, \
-         patch.object(time, "sleep"), \
          patch("dhcp_utilities.dhcprelayd.dhcprelayd.terminate_proc", return_value=None) as mock_terminate, \
          patch.object(psutil.Process, "__init__", return_value=None), \
-         patch.object(psutil.Process, "status", return_value=proc_status), \
+         patch.object(psutil.Process, "pid", 999), \
+         patch.object(ProcessRegistry, "wait_exited",
+                      return_value=set([999]) if proc_status == psutil.STATUS_ZOMBIE else set()) as mock_wait, \
          patch.object(ConfigDbEventChecker, "enable"):
         dhcp_db_connector = DhcpDbConnector()
         dhcprelayd = DhcpRelayd(dhcp_db_connector, None)
@@ -95,8 +97,11 @@ def test_start_dhcpmon_process(mock_swsscommon_dbconnector_init, new_dhcp_interf
                 call_param = ["/usr/sbin/dhcpmon", "-id", interface, "-iu", "docker0", "-im", "eth0"]
                 calls.append(call(call_param))
             mock_popen.assert_has_calls(calls)
+        if len(new_dhcp_interfaces) != 0 and kill_res != NOT_KILLED:
+            mock_wait.assert_called_once()
         if len(new_dhcp_interfaces) != 0 and kill_res != NOT_KILLED and proc_status == psutil.STATUS_ZOMBIE:
-            mock_terminate.assert_called_once()
+            assert mock_terminate.call_count == len(new_dhcp_interfaces)
+            assert len(dhcprelayd.proc_registry.procs) == 0
         else:
             mock_terminate.assert_not_called()
 
@@ -127,6 +132,27 @@ def test_kill_exist_relay_releated_process(mock_swsscommon_dbconnector_init, new
             assert res == KILLED_OLD
 
 
+
+def test_kill_exist_relay_releated_process_children(mock_swsscommon_dbconnector_init):
+    parent = MockProc("dhcrelay", pid=2, ppid=1)
+    child = MockProc("dhcrelay", pid=3, ppid=2)
+    with patch.object(subprocess, "Popen", return_value=MockPopen(2)), \
+         patch.object(psutil, "Process", return_value=parent), \
+         patch.object(parent, "children", return_value=[child]), \
+         patch.object(ProcessRegistry, "is_alive", return_value=True), \
+         patch.object(psutil, "process_iter") as mock_iter, \
+         patch("dhcp_utilities.dhcprelayd.dhcprelayd.terminate_proc", return_value=None) as mock_terminate, \
+         patch.object(ConfigDbEventChecker, "enable"):
+        dhcp_db_connector = DhcpDbConnector()
+        dhcprelayd = DhcpRelayd(dhcp_db_connector, None)
+        dhcprelayd.proc_registry.add("dhcrelay", subprocess.Popen([]), parent.cmdline())
+        res = dhcprelayd._kill_exist_relay_releated_process(set(["Vlan2000"]), "dhcrelay", False)
+        assert res == KILLED_OLD
+        # Child process forked by the spawned dhcrelay is killed as well, without scanning all processes
+        mock_terminate.assert_has_calls([call(child), call(parent)])
+        mock_iter.assert_not_called()
+        assert len(dhcprelayd.proc_registry.procs) == 0
+
 @pytest.mark.parametrize("get_res", [(1, "240.127.1.2"), (0, None)])
 def test_get_dhcp_server_ip(mock_swsscommon_dbconnector_init, mock_swsscommon_table_init, get_res):
     with patch.object(swsscommon.Table, "hget", return_value=get_res), \
@@ -224,6 +250,25 @@ def test_check_dhcp_relay_process(mock_swsscommon_dbconnector_init, mock_swsscom
             assert any(process[0] == "dhcrelay" for process in iter_process)
 
 
+
+def test_check_dhcp_relay_process_rescan(mock_swsscommon_dbconnector_init, mock_swsscommon_table_init):
+    exp_config = {
+        "isc-dhcpv4-relay-Vlan1000": MockProc("dhcrelay").cmdline()
+    }
+    process_iter_ret = [MockProc("dhcrelay", pid=2, ppid=1)]
+    with patch.object(DhcpRelayd, "dhcp_relay_supervisor_config",
+                      return_value=exp_config, new_callable=PropertyMock), \
+         patch.object(sys, "exit", mock_exit_func), \
+         patch.object(ProcessRegistry, "is_alive", return_value=True), \
+         patch.object(psutil, "process_iter", return_value=process_iter_ret):
+        dhcp_db_connector = DhcpDbConnector()
+        dhcprelayd = DhcpRelayd(dhcp_db_connector, None)
+        dhcprelayd._check_dhcp_relay_processes()
+        # Extra dhcrelay started while cached one is still running
+        process_iter_ret.append(MockProc("dhcrelay", pid=4, ppid=1))
+        with pytest.raises(SystemExit):
+            dhcprelayd._check_dhcp_relay_processes()
+
 def test_get_dhcp_relay_config(mock_swsscommon_dbconnector_init, mock_swsscommon_table_init):
     with patch.object(DhcpRelayd, "supervisord_conf_path", return_value="tests/test_data/supervisor.conf",
                       new_callable=PropertyMock):
@@ -2,6 +2,8 @@ import dhcp_utilities.common.utils as utils
 import ipaddress
 import psutil
 import pytest
+import subprocess
+import time
 from swsscommon import swsscommon
 from common_utils import MockProc
 from unittest.mock import patch, call, PropertyMock
@@ -145,3 +147,70 @@ def test_validate_ttr_type(test_data):
 def test_is_smart_switch(is_smart_switch):
     device_metadata = {"localhost": {"subtype": "SmartSwitch"}} if is_smart_switch else {"localhost": {}}
     assert utils.is_smart_switch(device_metadata) == is_smart_switch
+
+
+def test_process_registry_wait_exited():
+    registry = utils.ProcessRegistry()
+    running = registry.add("sleep", subprocess.Popen(["sleep", "10"]), ["sleep", "10"])
+    exited = registry.add("false", subprocess.Popen(["false"]), ["false"])
+    try:
+        start = time.monotonic()
+        assert registry.wait_exited([exited], 10) == set([exited.pid])
+        assert time.monotonic() - start < 10
+        assert registry.wait_exited([running, exited], 0.2) == set([exited.pid])
+        assert registry.is_alive(running)
+        assert not registry.is_alive(exited)
+    finally:
+        utils.terminate_proc(running.proc)
+        utils.terminate_proc(exited.proc)
+    assert not registry.is_alive(running)
+
+
+def test_process_registry_find(tmpdir):
+    registry = utils.ProcessRegistry()
+    proc_list = [MockProc("dhcrelay", pid=2, ppid=1), MockProc("dhcrelay", pid=3, ppid=2),
+                 MockProc("dhcpmon", pid=4, ppid=1), MockProc("exited_proc", pid=5, exited=True, ppid=1)]
+    with patch.object(psutil, "process_iter", return_value=proc_list) as mock_iter, \
+         patch.object(utils.ProcessRegistry, "is_alive", return_value=True) as mock_alive:
+        res = registry.find("dhcrelay")
+        assert [(entry.pid, entry.ppid) for entry in res] == [(2, 1), (3, 2)]
+        assert res[0].cmdline == proc_list[0].cmdline()
+        # Cached processes are still running, no need to scan
+        assert registry.find("dhcrelay") == res
+        mock_iter.assert_called_once_with()
+        # Processes not started by ourselves are found by rescan
+        proc_list.append(MockProc("dhcrelay", pid=6, ppid=1))
+        assert [entry.pid for entry in registry.find("dhcrelay", rescan=True)] == [2, 3, 6]
+        assert mock_iter.call_count == 2
+        # Cached process exited, scan again
+        mock_alive.return_value = False
+        del proc_list[0:2]
+        assert [entry.pid for entry in registry.find("dhcrelay")] == [6]
+        assert mock_iter.call_count == 3
+        assert sorted(registry.procs.keys()) == [6]
+
+    registry = utils.ProcessRegistry()
+    popen = subprocess.Popen(["sleep", "10"])
+    pidfile = tmpdir.join("sleep.pid")
+    pidfile.write("{}\n".format(popen.pid))
+    try:
+        with patch.object(psutil, "process_iter", return_value=[]) as mock_iter:
+            res = registry.find("sleep", str(pidfile))
+            assert [entry.pid for entry in res] == [popen.pid]
+            assert res[0].cmdline == ["sleep", "10"]
+            assert registry.find("sleep", str(tmpdir.join("not_exist.pid"))) == res
+            mock_iter.assert_not_called()
+    finally:
+        popen.terminate()
+        popen.wait()
+
+
+def test_process_registry_find_children():
+    registry = utils.ProcessRegistry()
+    parent = MockProc("dhcrelay", pid=2, ppid=1)
+    entries = [utils.TrackedProcess("dhcrelay", parent, parent.cmdline(), 1),
+               utils.TrackedProcess("dhcrelay", MockProc("dhcrelay", pid=3, ppid=2), parent.cmdline(), 2)]
+    children = [MockProc("dhcrelay", pid=3, ppid=2), MockProc("dhcrelay", pid=4, ppid=2),
+                MockProc("sh", pid=5, ppid=2), MockProc("dhcrelay", pid=6, exited=True, ppid=2)]
+    with patch.object(parent, "children", return_value=children):
+        assert [proc.pid for proc in registry.find_children(entries)] == [4]
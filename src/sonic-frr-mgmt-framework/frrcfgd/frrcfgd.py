@@ -1,11 +1,14 @@
 #!/usr/bin/env python
 
+import argparse
+import concurrent.futures
 import copy
+import selectors
 import subprocess
 import time
 import syslog
 import os
-from swsscommon.swsscommon import ConfigDBConnector
+from swsscommon.swsscommon import ConfigDBConnector, SonicDBConfig, SonicV2Connector
 import socket
 import threading
 import queue
@@ -15,6 +18,7 @@ import logging
 import netaddr
 import io
 import struct
+import redis
 
 class CachedDataWithOp:
     OP_NONE = 0
@@ -44,8 +48,17 @@ class CachedDataWithOp:
 
 bgpd_client = None
 
+def syslog_enabled(priority):
+    # syslog() drops messages with priority masked out by setlogmask(), setlogmask(0) only reads the mask
+    return (syslog.setlogmask(0) & syslog.LOG_MASK(priority)) != 0
+
+def syslog_lazy(priority, msg, *args):
+    # message is only formatted if it would be sent
+    if syslog_enabled(priority):
+        syslog.syslog(priority, msg.format(*args) if args else msg)
+
 def g_run_command(table, command, use_bgpd_client, daemons, ignore_fail = False):
-    syslog.syslog(syslog.LOG_DEBUG, "execute command {} for table {}.".format(command, table))
+    syslog_lazy(syslog.LOG_DEBUG, "execute command {} for table {}.", command, table)
     if not command.startswith('vtysh '):
         use_bgpd_client = False
     if use_bgpd_client:
@@ -72,9 +85,49 @@ def extract_cmd_daemons(cmd_str):
         daemons = None
     return (daemons, cmd_str)
 
+class VtyshDaemonStats:
+    def __init__(self):
+        self.commands = 0
+        self.failures = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_last = 0.0
+        # commands waiting for or being processed by the daemon
+        self.queue_depth = 0
+        self.queue_depth_max = 0
+
+    def add_queued(self, count):
+        self.queue_depth += count
+        self.queue_depth_max = max(self.queue_depth_max, self.queue_depth)
+
+    def add_latency(self, latency, succ):
+        self.commands += 1
+        if not succ:
+            self.failures += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_last = latency
+
+    def to_dict(self):
+        return {'commands': str(self.commands),
+                'failures': str(self.failures),
+                'latency_sum': '{:.6f}'.format(self.latency_sum),
+                'latency_max': '{:.6f}'.format(self.latency_max),
+                'latency_last': '{:.6f}'.format(self.latency_last),
+                'queue_depth': str(self.queue_depth),
+                'queue_depth_max': str(self.queue_depth_max)}
+
 class BgpdClientMgr(threading.Thread):
     VTYSH_MARK = 'vtysh '
     PROXY_SERVER_ADDR = '/etc/frr/bgpd_client_sock'
+    # proxy requests which are processed at the same time
+    PROXY_MAX_CLIENTS = 8
+    # commands sent to a daemon socket before their replies are read
+    PIPELINE_MAX_CMDS = 64
+    # connect retries when connection to a daemon is re-created while commands are waiting
+    RECONNECT_MAX_RETRY = 3
+    STATS_TABLE = 'FRR_VTYSH_STATS'
+    STATS_INTERVAL = 10
     ALL_DAEMONS = ['bgpd', 'zebra', 'staticd', 'bfdd', 'ospfd', 'pimd', 'mgmtd']
     TABLE_DAEMON = {
             'DEVICE_METADATA': ['bgpd'],
@@ -146,7 +199,7 @@ class BgpdClientMgr(threading.Thread):
                 raise
         sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         sock.bind(BgpdClientMgr.PROXY_SERVER_ADDR)
-        sock.listen(1)
+        sock.listen(BgpdClientMgr.PROXY_MAX_CLIENTS)
         return sock
     @staticmethod
     def __get_reply(sock):
@@ -173,56 +226,98 @@ class BgpdClientMgr(threading.Thread):
                 break
         msg_buf.close()
         return (ret_code, reply_msg)
+    def __get_next_reply(self, daemon):
+        # replies of pipelined commands could be read together, each of them ends with \0\0\0<ret_code>
+        sock = self.client_socks[daemon]
+        buf = self.reply_bufs[daemon]
+        while True:
+            tail_idx = buf.find(b'\0\0\0')
+            if tail_idx >= 0 and len(buf) > tail_idx + 3:
+                self.reply_bufs[daemon] = buf[tail_idx + 4:]
+                return (buf[tail_idx + 3], buf[:tail_idx].decode(errors = 'replace'))
+            try:
+                rd_msg = sock.recv(16384)
+            except socket.timeout:
+                syslog.syslog(syslog.LOG_ERR, 'socket reading timeout')
+                return (None, None)
+            if len(rd_msg) == 0:
+                syslog.syslog(syslog.LOG_ERR, 'connection closed by frr daemon %s' % daemon)
+                return (None, None)
+            buf += rd_msg
     @staticmethod
     def __send_data(sock, data):
         if isinstance(data, str):
             data = bytes(data, 'utf-8')
         sock.sendall(data)
+    def __connect_frr_daemon(self, daemon, max_retry):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        serv_addr = '/run/frr/%s.vty' % daemon
+        retry_cnt = 0
+        while True:
+            try:
+                sock.connect(serv_addr)
+                break
+            except socket.error as msg:
+                syslog.syslog(syslog.LOG_ERR, 'failed to connect to frr daemon %s: %s' % (daemon, msg))
+                retry_cnt += 1
+                if retry_cnt > max_retry or not main_loop:
+                    syslog.syslog(syslog.LOG_ERR, 're-tried too many times, give up')
+                    sock.close()
+                    return None
+                time.sleep(2)
+                continue
+        sock.settimeout(120)
+        syslog.syslog(syslog.LOG_DEBUG, 'send initial enable command to %s' % daemon)
+        try:
+            self.__send_data(sock, 'enable\0')
+        except socket.error as msg:
+            syslog.syslog(syslog.LOG_ERR, 'failed to send initial enable command to %s' % daemon)
+            sock.close()
+            return None
+        ret_code, reply = self.__get_reply(sock)
+        if ret_code is None:
+            syslog.syslog(syslog.LOG_ERR, 'failed to get command response for enable command from %s' % daemon)
+            sock.close()
+            return None
+        if ret_code != 0:
+            syslog.syslog(syslog.LOG_ERR, 'enable command failed: ret_code=%d' % ret_code)
+            syslog.syslog(syslog.LOG_ERR, reply)
+            sock.close()
+            return None
+        return sock
     def __create_frr_client(self):
         self.client_socks = {}
         for daemon in self.ALL_DAEMONS:
-            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            serv_addr = '/run/frr/%s.vty' % daemon
-            retry_cnt = 0
-            while True:
-                try:
-                    sock.connect(serv_addr)
-                    break
-                except socket.error as msg:
-                    syslog.syslog(syslog.LOG_ERR, 'failed to connect to frr daemon %s: %s' % (daemon, msg))
-                    retry_cnt += 1
-                    if retry_cnt > 100 or not main_loop:
-                        syslog.syslog(syslog.LOG_ERR, 're-tried too many times, give up')
-                        for _, sock in self.client_socks.items():
-                            sock.close()
-                        return False
-                    time.sleep(2)
-                    continue
-            sock.settimeout(120)
-            self.client_socks[daemon] = sock
-        for daemon, sock in self.client_socks.items():
-            syslog.syslog(syslog.LOG_DEBUG, 'send initial enable command to %s' % daemon)
-            try:
-                self.__send_data(sock, 'enable\0')
-            except socket.error as msg:
-                syslog.syslog(syslog.LOG_ERR, 'failed to send initial enable command to %s' % daemon)
-                return False
-            ret_code, reply = self.__get_reply(sock)
-            if ret_code is None:
-                syslog.syslog(syslog.LOG_ERR, 'failed to get command response for enable command from %s' % daemon)
-                return False
-            if ret_code != 0:
-                syslog.syslog(syslog.LOG_ERR, 'enable command failed: ret_code=%d' % ret_code)
-                syslog.syslog(syslog.LOG_ERR, reply)
+            sock = self.__connect_frr_daemon(daemon, 100)
+            if sock is None:
+                for _, sock in self.client_socks.items():
+                    sock.close()
                 return False
+            self.client_socks[daemon] = sock
         return True
+    def __reconnect_frr_daemon(self, daemon):
+        # replies of commands sent on the old connection could still come, so they are dropped with
+        # the connection instead of being taken as replies of the next commands
+        if self.client_socks[daemon] is not None:
+            self.client_socks[daemon].close()
+        self.reply_bufs[daemon] = b''
+        syslog.syslog(syslog.LOG_INFO, 'reconnect to frr daemon %s' % daemon)
+        self.client_socks[daemon] = self.__connect_frr_daemon(daemon, self.RECONNECT_MAX_RETRY)
+        return self.client_socks[daemon]
     def __init__(self):
         super(BgpdClientMgr, self).__init__(name = 'VTYSH sub-process manager')
         if not self.__create_frr_client():
             syslog.syslog(syslog.LOG_ERR, 'failed to create socket to FRR daemon')
             raise RuntimeError('connect to FRR daemon failed')
         self.proxy_running = True
-        self.lock = threading.Lock()
+        # commands of a block are not interleaved with other blocks on a daemon socket, blocks to
+        # different daemons are run at the same time
+        self.daemon_locks = {daemon: threading.Lock() for daemon in self.client_socks}
+        self.reply_bufs = {daemon: b'' for daemon in self.client_socks}
+        self.stats_lock = threading.Lock()
+        self.daemon_stats = {daemon: VtyshDaemonStats() for daemon in self.client_socks}
+        self.stats_time = 0
+        self.state_db = None
         self.proxy_sock = self.__create_proxy_socket()
         self.cmd_to_daemon = []
         for pat, daemons in self.VTYSH_CMD_DAEMON:
@@ -249,33 +344,97 @@ class BgpdClientMgr(threading.Thread):
                 if len(cmn_daemons) == 0:
                     return []
         return list(cmn_daemons)
-    def __proc_command(self, command, daemons):
-        syslog.syslog(syslog.LOG_DEBUG, 'VTYSH CMD: %s daemons: %s' % (command, daemons))
-        resp = ''
-        ret_val = False
+    def __proc_commands(self, cmd_list, daemons):
+        syslog_lazy(syslog.LOG_DEBUG, 'VTYSH CMD: {} daemons: {}', cmd_list, daemons)
+        # (ret_val, resp) of each command, resp is None if command could not be sent
+        results = [[False, ''] for _ in cmd_list]
+        conn_daemons = []
         for daemon in daemons:
-            sock = self.client_socks.get(daemon, None)
-            if sock is None:
+            if daemon not in self.client_socks:
                 syslog.syslog(syslog.LOG_ERR, 'daemon %s is not connected' % daemon)
-                continue
-            try:
-                self.__send_data(sock, command + '\0')
-            except socket.error as msg:
-                syslog.syslog(syslog.LOG_ERR, 'failed to send command to frr daemon: %s' % msg)
-                return (False, None)
-            ret_code, reply = self.__get_reply(sock)
-            if ret_code is None or ret_code != 0:
-                if ret_code is None:
-                    syslog.syslog(syslog.LOG_ERR, 'failed to get reply from frr daemon')
-                    continue
-                else:
-                    syslog.syslog(syslog.LOG_DEBUG, '[%s] command return code: %d' % (daemon, ret_code))
-                    syslog.syslog(syslog.LOG_DEBUG, reply)
-            else:
-                # command is running successfully by at least one daemon
-                ret_val = True
-            resp += reply
-        return (ret_val, resp)
+            elif daemon not in conn_daemons:
+                conn_daemons.append(daemon)
+        with self.stats_lock:
+            for daemon in conn_daemons:
+                self.daemon_stats[daemon].add_queued(len(cmd_list))
+        # locks are always taken in the same order to avoid dead lock between concurrent blocks
+        lock_daemons = sorted(conn_daemons)
+        for daemon in lock_daemons:
+            self.daemon_locks[daemon].acquire()
+        try:
+            for blk_start in range(0, len(cmd_list), self.PIPELINE_MAX_CMDS):
+                block = cmd_list[blk_start:blk_start + self.PIPELINE_MAX_CMDS]
+                # send the whole block to every daemon before reading replies, so that daemons
+                # run commands at the same time
+                send_time = {}
+                for daemon in conn_daemons:
+                    sock = self.client_socks[daemon]
+                    if sock is None:
+                        sock = self.__reconnect_frr_daemon(daemon)
+                    try:
+                        if sock is None:
+                            raise socket.error('frr daemon %s is not connected' % daemon)
+                        self.__send_data(sock, ''.join(cmd + '\0' for cmd in block))
+                        send_time[daemon] = time.time()
+                    except socket.error as msg:
+                        syslog.syslog(syslog.LOG_ERR, 'failed to send command to frr daemon: %s' % msg)
+                        if sock is not None:
+                            self.__reconnect_frr_daemon(daemon)
+                        for idx in range(len(block)):
+                            results[blk_start + idx] = [False, None]
+                for daemon in conn_daemons:
+                    if daemon not in send_time:
+                        continue
+                    for idx in range(len(block)):
+                        ret_code, reply = self.__get_next_reply(daemon)
+                        with self.stats_lock:
+                            stats = self.daemon_stats[daemon]
+                            stats.add_latency(time.time() - send_time[daemon], ret_code == 0)
+                            stats.queue_depth -= 1
+                        result = results[blk_start + idx]
+                        if ret_code is None:
+                            syslog.syslog(syslog.LOG_ERR, 'failed to get reply from frr daemon')
+                            # replies of the rest commands in block are not expected any more
+                            with self.stats_lock:
+                                self.daemon_stats[daemon].queue_depth -= len(block) - idx - 1
+                            self.__reconnect_frr_daemon(daemon)
+                            break
+                        if ret_code != 0:
+                            syslog.syslog(syslog.LOG_DEBUG, '[%s] command return code: %d' % (daemon, ret_code))
+                            syslog.syslog(syslog.LOG_DEBUG, reply)
+                        else:
+                            # command is running successfully by at least one daemon
+                            result[0] = True
+                        if result[1] is not None:
+                            result[1] += reply
+                if len(send_time) < len(conn_daemons):
+                    with self.stats_lock:
+                        for daemon in conn_daemons:
+                            if daemon not in send_time:
+                                self.daemon_stats[daemon].queue_depth -= len(block)
+        finally:
+            for daemon in reversed(lock_daemons):
+                self.daemon_locks[daemon].release()
+        self.__publish_stats()
+        return results
+    def get_stats(self):
+        with self.stats_lock:
+            return {daemon: stats.to_dict() for daemon, stats in self.daemon_stats.items()}
+    def __publish_stats(self):
+        with self.stats_lock:
+            now = time.time()
+            if now - self.stats_time < self.STATS_INTERVAL:
+                return
+            self.stats_time = now
+        try:
+            if self.state_db is None:
+                self.state_db = SonicV2Connector(use_unix_socket_path = True)
+                self.state_db.connect(self.state_db.STATE_DB, False)
+            for daemon, data in self.get_stats().items():
+                self.state_db.hmset(self.state_db.STATE_DB, '%s|%s' % (self.STATS_TABLE, daemon), data)
+        except Exception as e:
+            syslog.syslog(syslog.LOG_ERR, 'failed to write VTYSH statistics to STATE_DB: %s' % e)
+            self.state_db = None
     def run_vtysh_command(self, table, command, daemons):
         if not command.startswith(self.VTYSH_MARK):
             syslog.syslog(syslog.LOG_ERR, 'command %s is not for vtysh config' % command)
@@ -290,24 +449,8 @@ class BgpdClientMgr(threading.Thread):
         if daemons is None or len(daemons) == 0:
             syslog.syslog(syslog.LOG_ERR, 'no common daemon list found for given commands')
             return False
-        ret_val = True
-        with self.lock:
-            for cmd in cmd_list:
-                succ, _ = self.__proc_command(cmd.strip(), daemons)
-                if not succ:
-                    ret_val = False
-        return ret_val
-    @staticmethod
-    def __read_all(sock, data_len):
-        in_buf = io.StringIO()
-        left_len = data_len
-        while left_len > 0:
-            data = sock.recv(left_len)
-            if data is None:
-                break
-            in_buf.write(data)
-            left_len -= len(data)
-        return in_buf.getvalue()
+        results = self.__proc_commands([cmd.strip() for cmd in cmd_list], daemons)
+        return all(succ for succ, _ in results)
     def shutdown(self):
         syslog.syslog(syslog.LOG_DEBUG, 'terminate bgpd client manager')
         if self.is_alive():
@@ -319,45 +462,77 @@ class BgpdClientMgr(threading.Thread):
                 sock.close()
             self.join()
         for _, sock in self.client_socks.items():
-            sock.close()
+            if sock is not None:
+                sock.close()
+    def __serve_client(self, conn_sock, in_cmd):
+        try:
+            daemons, in_cmd = extract_cmd_daemons(in_cmd)
+            in_lines = in_cmd.splitlines()
+            if daemons is None:
+                daemons = self.__get_cmd_daemons(in_lines)
+            if daemons is not None and len(daemons) > 0:
+                for _, reply in self.__proc_commands([line.strip() for line in in_lines], daemons):
+                    if reply is not None:
+                        self.__send_data(conn_sock, reply)
+                    else:
+                        syslog.syslog(syslog.LOG_ERR, 'failed running VTYSH command')
+            else:
+                syslog.syslog(syslog.LOG_ERR, 'could not find common daemons for input commands')
+        except socket.error as msg:
+            syslog.syslog(syslog.LOG_ERR, 'socket writing failed: %s' % msg)
+        finally:
+            syslog.syslog(syslog.LOG_DEBUG, 'closing data socket from client')
+            conn_sock.close()
+    def __read_request(self, sel, executor, key):
+        # request is 4 bytes data length followed by commands, it is handled by worker once fully read
+        conn_sock = key.fileobj
+        try:
+            data = conn_sock.recv(16384)
+        except (BlockingIOError, InterruptedError):
+            return
+        except socket.error as msg:
+            syslog.syslog(syslog.LOG_ERR, 'socket reading failed: %s' % msg)
+            data = b''
+        in_buf = key.data
+        in_buf.extend(data)
+        data_len = struct.unpack('>I', in_buf[:4])[0] if len(in_buf) >= 4 else None
+        if data_len is not None and len(in_buf) >= data_len + 4:
+            sel.unregister(conn_sock)
+            conn_sock.setblocking(True)
+            executor.submit(self.__serve_client, conn_sock, in_buf[4:data_len + 4].decode(errors = 'replace'))
+        elif len(data) == 0:
+            if data_len is None:
+                syslog.syslog(syslog.LOG_ERR, 'invalid data length %d' % len(in_buf))
+            else:
+                syslog.syslog(syslog.LOG_ERR, 'read data of length %d is not expected length %d' % (data_len, len(in_buf) - 4))
+            sel.unregister(conn_sock)
+            syslog.syslog(syslog.LOG_DEBUG, 'closing data socket from client')
+            conn_sock.close()
     def run(self):
         syslog.syslog(syslog.LOG_DEBUG, 'entering VTYSH proxy thread')
-        while self.proxy_running:
-            syslog.syslog(syslog.LOG_DEBUG, 'waiting for client connection ...')
-            conn_sock, clnt_addr = self.proxy_sock.accept()
-            if not self.proxy_running:
-                conn_sock.close()
-                break
-            try:
-                syslog.syslog(syslog.LOG_DEBUG, 'client connection from %s' % clnt_addr)
-                data = self.__read_all(conn_sock, 4)
-                if len(data) == 4:
-                    data_len = struct.unpack('>I', data)[0]
-                    in_cmd = self.__read_all(conn_sock, data_len)
-                    if len(in_cmd) == data_len:
-                        daemons, in_cmd = extract_cmd_daemons(in_cmd)
-                        in_lines = in_cmd.splitlines()
-                        if daemons is None:
-                            daemons = self.__get_cmd_daemons(in_lines)
-                        if daemons is not None and len(daemons) > 0:
-                            with self.lock:
-                                for line in in_lines:
-                                    _, reply = self.__proc_command(line.strip(), daemons)
-                                    if reply is not None:
-                                        self.__send_data(conn_sock, reply)
-                                    else:
-                                        syslog.syslog(syslog.LOG_ERR, 'failed running VTYSH command')
-                        else:
-                            syslog.syslog(syslog.LOG_ERR, 'could not find common daemons for input commands')
-                    else:
-                        syslog.syslog(syslog.LOG_ERR, 'read data of length %d is not expected length %d' % (data_len, len(in_cmd)))
-                else:
-                    syslog.syslog(syslog.LOG_ERR, 'invalid data length %d' % len(data))
-            except socket.error as msg:
-                syslog.syslog(syslog.LOG_ERR, 'socket writing failed: %s' % msg)
-            finally:
-                syslog.syslog(syslog.LOG_DEBUG, 'closing data socket from client')
-                conn_sock.close()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers = self.PROXY_MAX_CLIENTS,
+                                                         thread_name_prefix = 'vtysh-proxy')
+        sel = selectors.DefaultSelector()
+        sel.register(self.proxy_sock, selectors.EVENT_READ)
+        try:
+            while self.proxy_running:
+                for key, _ in sel.select():
+                    if key.fileobj is not self.proxy_sock:
+                        self.__read_request(sel, executor, key)
+                        continue
+                    conn_sock, clnt_addr = self.proxy_sock.accept()
+                    if not self.proxy_running:
+                        conn_sock.close()
+                        break
+                    syslog.syslog(syslog.LOG_DEBUG, 'client connection from %s' % clnt_addr)
+                    conn_sock.setblocking(False)
+                    sel.register(conn_sock, selectors.EVENT_READ, bytearray())
+        finally:
+            for key in list(sel.get_map().values()):
+                if key.fileobj is not self.proxy_sock:
+                    key.fileobj.close()
+            sel.close()
+            executor.shutdown(wait = True)
         syslog.syslog(syslog.LOG_DEBUG, 'leaving VTYSH proxy thread')
 class BGPPeerGroup:
     def __init__(self, vrf):
@@ -460,8 +635,8 @@ def hdl_set_pim_hello_parms (daemon, cmd_str, op, st_idx, args, data):
 def handle_rmap_set_metric(daemon, cmd_str, op, st_idx, args, data):
     cmd_list = []
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_rmap_set_metric cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_rmap_set_metric cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
 
     no_op = 'no ' if op == CachedDataWithOp.OP_DELETE else ''
 
@@ -533,6 +708,10 @@ class BGPKeyMapList(list):
         super(BGPKeyMapList, self).__init__()
         self.table_name = table_name
         self.table_key = table_key
+        # parsed db_field of each key map, built once instead of for every row
+        self.cmd_fields = []
+        # data field name to index of key maps using it
+        self.field_index = {}
         for key_map in key_map_list:
             if len(key_map) < 2:
                 continue
@@ -563,11 +742,39 @@ class BGPKeyMapList(list):
                     except ValueError:
                         pass
             super(BGPKeyMapList, self).append((db_field, BGPKeyMapInfo(cmd_str, hdl_func, hdl_data)))
+            self.cmd_fields.append(self.compile_db_field(db_field))
+            for k in self.cmd_fields[-1][1]:
+                self.field_index.setdefault(k, []).append(len(self.cmd_fields) - 1)
     def __eq__(self, other):
         return super(BGPKeyMapList, self).__eq__(other) and self.table_name == other.table_name and self.table_key == other.table_key
     def __ne__(self, other):
         return super(BGPKeyMapList, self).__ne__(other) or self.table_name != other.table_name or self.table_key != other.table_key
     @staticmethod
+    def compile_db_field(db_field):
+        merge_vals = False
+        if type(db_field) is not list and type(db_field) is not tuple:
+            db_field = [db_field]
+        elif type(db_field) is tuple:
+            db_field = list(db_field)
+            merge_vals = True
+        field_keys = []
+        req_idx_list = []
+        opt_idx_list = set()
+        for idx, dkey in enumerate(db_field):
+            optional = False
+            if len(dkey) > 0 and dkey[0] == '+':
+                if len(dkey) > 1 and dkey[1] == '+':
+                    opt_idx_list.add(idx)
+                    dkey = dkey[2:]
+                else:
+                    dkey = dkey[1:]
+                optional = True
+            else:
+                req_idx_list.append(idx)
+            field_keys.append((dkey.split('&'), optional))
+        all_keys = set(k for keys, _ in field_keys for k in keys)
+        return (field_keys, all_keys, req_idx_list, opt_idx_list, merge_vals)
+    @staticmethod
     def get_map_field_key(field):
         if type(field) is str:
             field = [field]
@@ -582,7 +789,7 @@ class BGPKeyMapList(list):
     def get_cmd_data(key_list, req_idx_list, opt_idx_list, data, chg_list, no_chg_list, merge_data, is_del):
         for idx in req_idx_list:
             if idx not in chg_list and idx not in no_chg_list:
-                syslog.syslog(syslog.LOG_DEBUG, 'mandatory key %s of idx %d not found in list' % (key_list[idx], idx))
+                syslog_lazy(syslog.LOG_DEBUG, 'mandatory key {} of idx {} not found in list', key_list[idx], idx)
                 return None
         if merge_data:
             op = CachedDataWithOp.OP_DELETE if is_del else CachedDataWithOp.OP_UPDATE
@@ -649,32 +856,18 @@ class BGPKeyMapList(list):
         start_idx = len(upper_vals)
         ret_val = False
         run_cmd_cnt = 0
-        for db_field, key_map in self:
-            merge_vals = False
-            if type(db_field) is not list and type(db_field) is not tuple:
-                db_field = [db_field]
-            elif type(db_field) is tuple:
-                db_field = list(db_field)
-                merge_vals = True
-
-            idx = 0
-            req_idx_list = []
+        # no command for a key map without any of its fields in data
+        map_idx_set = set()
+        for k in data:
+            map_idx_set.update(self.field_index.get(k, ()))
+        for map_idx in sorted(map_idx_set):
+            key_map = self[map_idx][1]
+            field_keys, _, req_idx_list, opt_idx_list, merge_vals = self.cmd_fields[map_idx]
             key_list_list = []
-            opt_idx_list = set()
             run_cmd = True
-            for dkey in db_field:
-                optional = False
-                if len(dkey) > 0 and dkey[0] == '+':
-                    if len(dkey) > 1 and dkey[1] == '+':
-                        opt_idx_list.add(idx)
-                        dkey = dkey[2:]
-                    else:
-                        dkey = dkey[1:]
-                    optional = True
-                else:
-                    req_idx_list.append(idx)
+            for keys, optional in field_keys:
                 key_list = []
-                for k in dkey.split('&'):
+                for k in keys:
                     if k in data and isinstance(data[k], CachedDataWithOp):
                         key_list.append(k)
                 if not optional and len(key_list) == 0:
@@ -700,7 +893,6 @@ class BGPKeyMapList(list):
                                     new_list.append(k_lst + [k])
                     if len(new_list) > 0:
                         key_list_list = new_list
-                idx += 1
             if not run_cmd:
                 continue
 
@@ -1134,8 +1326,8 @@ def handle_ospf_if_common(daemon, cmd_str, op, st_idx, args, data):
     no_op = 'no ' if op == CachedDataWithOp.OP_DELETE else ''
     param_value = args[2]
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_ospf_if_common cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_ospf_if_common cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
 
     cmd_list.append(cmd_str.format(CommandArgument(daemon, True, no_op),
                                    CommandArgument(daemon, True, param_value),
@@ -1158,8 +1350,8 @@ def handle_ospf_if_authtype(daemon, cmd_str, op, st_idx, args, data):
     else :
         syslog.syslog(syslog.LOG_ERR, 'handle_ospf_if_nwtype invalid auth type args {}'.format(args))
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_ospf_if_authtype cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_ospf_if_authtype cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
 
     cmd_list.append(cmd_str.format(CommandArgument(daemon, True, no_op),
                                    CommandArgument(daemon, True, authtype),
@@ -1175,8 +1367,8 @@ def handle_ospf_if_md5key(daemon, cmd_str, op, st_idx, args, data):
     md5key_id = args[2]
     md5key = args[3]
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_ospf_if_md5key cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_ospf_if_md5key cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
 
     cmd_list.append(cmd_str.format(CommandArgument(daemon, True, no_op),
                                    CommandArgument(daemon, True, md5key_id),
@@ -1190,8 +1382,8 @@ def handle_ospf_if_mtu_ignore(daemon, cmd_str, op, st_idx, args, data):
     if_addr = "" if args[1] == '0.0.0.0' else args[1]
     no_op = 'no ' if op == CachedDataWithOp.OP_DELETE else ''
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_ospf_if_mtu_ignore cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_ospf_if_mtu_ignore cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
 
     cmd_list.append(cmd_str.format(CommandArgument(daemon, True, no_op),
                                    CommandArgument(daemon, True, if_addr)))
@@ -1210,8 +1402,8 @@ def handle_ospf_if_nwtype(daemon, cmd_str, op, st_idx, args, data):
     else :
         syslog.syslog(syslog.LOG_ERR, 'handle_ospf_if_nwtype invalid nw type args {}'.format(args))
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_ospf_if_nwtype cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_ospf_if_nwtype cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
 
     cmd_list.append(cmd_str.format(CommandArgument(daemon, True, no_op),
                                    CommandArgument(daemon, True, nwtype)))
@@ -1223,15 +1415,15 @@ def handle_igmp_if_common(daemon, cmd_str, op, st_idx, args, data):
     cmd_list = []
     param_value = args[0]
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_igmp_if_common cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_igmp_if_common cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
 
     if op != CachedDataWithOp.OP_DELETE:
         cmd_list.append(cmd_str.format(CommandArgument(daemon, True, param_value)))
     else:
         cmd_list.append('no ' + cmd_str.format(CommandArgument(daemon, True, '')))
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_igmp_if_common param {}, cmd_list {}'.format(param_value, cmd_list))
+    syslog_lazy(syslog.LOG_INFO, 'handle_igmp_if_common param {}, cmd_list {}', param_value, cmd_list)
     return cmd_list
 
 def handle_igmp_if_enable(daemon, cmd_str, op, st_idx, args, data):
@@ -1240,8 +1432,8 @@ def handle_igmp_if_enable(daemon, cmd_str, op, st_idx, args, data):
     cmd_list = []
     param_value = args[0]
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_igmp_if_enable cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_igmp_if_enable cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
 
     if op != CachedDataWithOp.OP_DELETE:
         if param_value == 'false':
@@ -1251,14 +1443,14 @@ def handle_igmp_if_enable(daemon, cmd_str, op, st_idx, args, data):
     else:
         cmd_list.append('no ' + cmd_str.format(CommandArgument(daemon, True, '')))
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_igmp_if_enable param {}, cmd_list {}'.format(param_value, cmd_list))
+    syslog_lazy(syslog.LOG_INFO, 'handle_igmp_if_enable param {}, cmd_list {}', param_value, cmd_list)
     return cmd_list
 
 def handle_ip_sla_common(daemon, cmd_str, op, st_idx, args, data):
     cmd_list = []
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_ip_sla cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_ip_sla cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
 
     if op != CachedDataWithOp.OP_DELETE:
         cmd_list.append(cmd_str.format(CommandArgument(daemon, True, args[1])))
@@ -1270,8 +1462,8 @@ def handle_ip_sla_common(daemon, cmd_str, op, st_idx, args, data):
 def handle_ip_sla_tcp_connect(daemon, cmd_str, op, st_idx, args, data):
     cmd_list = []
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_ip_sla_tcp_connect cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_ip_sla_tcp_connect cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
     tcp_cmd_token = ("tcp", "connect")
     tcp_cmd_str = "-".join(tcp_cmd_token)
     tcp_cmd_deconfig = ' no ' + tcp_cmd_str
@@ -1286,19 +1478,19 @@ def handle_ip_sla_tcp_connect(daemon, cmd_str, op, st_idx, args, data):
 def handle_ip_sla_icmp_echo(daemon, cmd_str, op, st_idx, args, data):
     cmd_list = []
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_ip_sla_icmp_echo cmd_str {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_INFO, 'handle_ip_sla_icmp_echo cmd_str {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
     icmp_cmd_token = ("icmp", "echo")
     icmp_cmd_str = "-".join(icmp_cmd_token)
     icmp_cmd_deconfig = ' no ' + icmp_cmd_str
 
     if op != CachedDataWithOp.OP_DELETE:
         cmd_list.append(' ')
-        syslog.syslog(syslog.LOG_INFO, 'handle_ip_sla_icmp_echo cmd_list {}'.format(cmd_list))
+        syslog_lazy(syslog.LOG_INFO, 'handle_ip_sla_icmp_echo cmd_list {}', cmd_list)
     else:
         cmd_list.append(icmp_cmd_deconfig)
 
-    syslog.syslog(syslog.LOG_INFO, 'handle_ip_sla_icmp_echo cmd_list {}'.format(cmd_list))
+    syslog_lazy(syslog.LOG_INFO, 'handle_ip_sla_icmp_echo cmd_list {}', cmd_list)
     return cmd_list
 
 
@@ -1354,8 +1546,8 @@ def hdl_leaf_list_expansion(daemon, cmd_str, op, st_idx, args, data, table_key,
     else:
         new_list = []
 
-    syslog.syslog(syslog.LOG_DEBUG, 'handle_leaf_list_expansion {} op {} st_idx {} args {} data {} table_key {} item_key {}'.format(
-                                    cmd_str, op, st_idx, args, data, table_key, item_key))
+    syslog_lazy(syslog.LOG_DEBUG, 'handle_leaf_list_expansion {} op {} st_idx {} args {} data {} table_key {} item_key {}',
+                cmd_str, op, st_idx, args, data, table_key, item_key)
 
     if table_key in daemon.table_data_cache.keys():
         cache_tbl_data = daemon.table_data_cache[table_key]
@@ -1370,7 +1562,7 @@ def hdl_leaf_list_expansion(daemon, cmd_str, op, st_idx, args, data, table_key,
     for value in del_list:
         cmd_list.append(cmd_str.format(CommandArgument(daemon, True, value), no = CommandArgument(daemon, False)))
 
-    syslog.syslog(syslog.LOG_DEBUG, 'cmd_list {}'.format(cmd_list))
+    syslog_lazy(syslog.LOG_DEBUG, 'cmd_list {}', cmd_list)
     return cmd_list
 
 def hdl_import_list(daemon, cmd_str, op, st_idx, args, data):
@@ -1381,11 +1573,11 @@ def hdl_export_list(daemon, cmd_str, op, st_idx, args, data):
 
 def hdl_enum_conversion(daemon, cmd_str, op, st_idx, args, data):
     cmd_list = []
-    syslog.syslog(syslog.LOG_DEBUG, 'handle_enum_conversion {} op {} st_idx {} args {} data {}'.format(
-                                    cmd_str, op, st_idx, args, data))
+    syslog_lazy(syslog.LOG_DEBUG, 'handle_enum_conversion {} op {} st_idx {} args {} data {}',
+                cmd_str, op, st_idx, args, data)
     cmd_list.append(cmd_str.format(CommandArgument(daemon, True, args[st_idx].lower().replace('_','-')),
         no = CommandArgument(daemon, (op != CachedDataWithOp.OP_DELETE))))
-    syslog.syslog(syslog.LOG_DEBUG, 'cmd_list {}'.format(cmd_list))
+    syslog_lazy(syslog.LOG_DEBUG, 'cmd_list {}', cmd_list)
     return cmd_list
 
 def hdl_confed_peers(daemon, cmd_str, op, st_idx, args, data):
@@ -1497,10 +1689,14 @@ def hdl_admin_status_shutdown_msg(daemon, cmd_str, op, st_idx, args, data):
     return cmd_list
 
 class ExtConfigDBConnector(ConfigDBConnector):
+    # max number of pending keyspace notifications handled as one batch
+    BATCH_MAX_SIZE = 1000
     def __init__(self, ns_attrs = None):
         super(ExtConfigDBConnector, self).__init__()
         self.nosort_attrs = ns_attrs if ns_attrs is not None else {}
         self.__listen_thread_running = False
+        self.batch_handler = None
+        self.__pipeline_client = None
     def raw_to_typed(self, raw_data, table = ''):
         if len(raw_data) == 0:
             raw_data = None
@@ -1526,14 +1722,69 @@ class ExtConfigDBConnector(ConfigDBConnector):
                 syslog.syslog(syslog.LOG_ERR, '[bgp cfgd] Failed handling config DB update with exception:' + str(e))
                 logging.exception(e)
 
+    def sub_batch_handler(self, msg_list):
+        # collapse repeated notifications of a key, the key keeps the position of its first notification
+        key_list = {}
+        for msg_item in msg_list:
+            if msg_item['type'] != 'pmessage':
+                continue
+            key = msg_item['channel'].split(':', 1)[1]
+            try:
+                (table, row) = key.split(self.TABLE_NAME_SEPARATOR, 1)
+            except ValueError:
+                continue    #Ignore non table-formated redis entries
+            if table in self.handlers:
+                key_list.setdefault(key, (table, row))
+        if len(key_list) == 0:
+            return
+        try:
+            raw_data_list = self.__hgetall_batch(list(key_list.keys()))
+            entries = [(table, row, self.raw_to_typed(raw_data, table))
+                       for (table, row), raw_data in zip(key_list.values(), raw_data_list)]
+            self.batch_handler(entries)
+        except Exception as e:
+            syslog.syslog(syslog.LOG_ERR, '[bgp cfgd] Failed handling config DB update with exception:' + str(e))
+            logging.exception(e)
+
+    def __get_pipeline_client(self):
+        # swsscommon DBConnector has no pipeline, keys are read in one round trip by redis-py
+        if self.__pipeline_client is None:
+            self.__pipeline_client = redis.Redis(unix_socket_path = SonicDBConfig.getDbSock(self.db_name),
+                                                 db = self.get_dbid(self.db_name), decode_responses = True)
+        return self.__pipeline_client
+
+    def __hgetall_batch(self, key_list):
+        pipe = self.__get_pipeline_client().pipeline(transaction = False)
+        for key in key_list:
+            pipe.hgetall(key)
+        return pipe.execute()
+
+    def subscribe_batch(self, handler):
+        """Handle the updates of subscribed tables in batches instead of calling the table handlers.
+           handler: called with the list of (table, key, data) read after all pending keyspace
+                    notifications are drained. data is None if the key was deleted.
+        """
+        self.batch_handler = handler
+
     def listen_thread(self, timeout):
         self.__listen_thread_running = True
         sub_key_space = "__keyspace@{}__:*".format(self.get_dbid(self.db_name))
         self.pubsub.psubscribe(sub_key_space)
         while self.__listen_thread_running:
             msg = self.pubsub.get_message(timeout, True)
-            if msg:
+            if not msg:
+                continue
+            if self.batch_handler is None:
                 self.sub_msg_handler(msg)
+                continue
+            # drain pending notifications without waiting
+            msg_list = [msg]
+            while len(msg_list) < self.BATCH_MAX_SIZE:
+                msg = self.pubsub.get_message(0, True)
+                if not msg:
+                    break
+                msg_list.append(msg)
+            self.sub_batch_handler(msg_list)
 
         self.pubsub.punsubscribe(sub_key_space)
 
@@ -1771,6 +2022,28 @@ class IpNextHopSet(set):
                 return (af_id, new_prefix)
         return (None, None)
 
+class BGPTableHandler:
+    def __init__(self, table, key_map_list, vrf_based, tbl_key_hdlr = None, update_hdlr = None):
+        self.table = table
+        self.vrf_based = vrf_based
+        self.key_map_list = key_map_list
+        # returns (key, tbl_key) to select table key map variant of a row
+        self.tbl_key_hdlr = tbl_key_hdlr
+        # called with (table, prefix, key, data, del_table, key_map, vrf, local_asn) to configure FRR with a row update
+        self.update_hdlr = update_hdlr
+        self.key_maps = {}
+        if key_map_list is not None:
+            self.key_maps[None] = BGPKeyMapList(key_map_list, table)
+    def get_key_map(self, tbl_key):
+        if self.key_map_list is None:
+            return None
+        map_key = None if tbl_key is None else tuple(sorted(tbl_key.items()))
+        key_map = self.key_maps.get(map_key)
+        if key_map is None:
+            key_map = BGPKeyMapList(self.key_map_list, self.table, tbl_key)
+            self.key_maps[map_key] = key_map
+        return key_map
+
 class BGPConfigDaemon:
     DEFAULT_VRF = 'default'
 
@@ -2329,7 +2602,61 @@ class BGPConfigDaemon:
             ('SRV6_MY_SOURCE', self.bgp_table_handler_common),
             ('SRV6_MY_SIDS', self.bgp_table_handler_common),
         ]
+        tbl_key_hdlrs = {'BGP_NEIGHBOR_AF': self.__nbr_af_tbl_key,
+                         'BGP_PEER_GROUP_AF': self.__nbr_af_tbl_key,
+                         'ROUTE_MAP': self.__route_map_tbl_key,
+                         'STATIC_ROUTE': self.__static_route_tbl_key}
+        # configure FRR with the update of a table row
+        tbl_update_hdlrs = {'BGP_GLOBALS': self.__update_bgp_globals,
+                            'SRV6_MY_LOCATORS': self.__update_srv6_locator,
+                            'SRV6_MY_SOURCE': self.__update_srv6_source,
+                            'SRV6_MY_SIDS': self.__update_srv6_sid,
+                            'BGP_GLOBALS_AF': self.__update_bgp_globals_af,
+                            'BGP_GLOBALS_LISTEN_PREFIX': self.__update_bgp_listen_prefix,
+                            'BGP_NEIGHBOR': self.__update_bgp_neighbor,
+                            'BGP_PEER_GROUP': self.__update_bgp_neighbor,
+                            'BGP_NEIGHBOR_AF': self.__update_bgp_neighbor_af,
+                            'BGP_PEER_GROUP_AF': self.__update_bgp_neighbor_af,
+                            'COMMUNITY_SET': self.__update_community_set,
+                            'EXTENDED_COMMUNITY_SET': self.__update_community_set,
+                            'PREFIX_SET': self.__update_prefix_set,
+                            'PREFIX': self.__update_prefix,
+                            'NEIGHBOR_SET': self.__update_prefix,
+                            'NEXTHOP_SET': self.__update_prefix,
+                            'AS_PATH_SET': self.__update_as_path_set,
+                            'TAG_SET': self.__update_tag_set,
+                            'BGP_GLOBALS_EVPN_VNI': self.__update_bgp_evpn_vni,
+                            'BGP_GLOBALS_EVPN_RT': self.__update_bgp_evpn_rt,
+                            'BGP_GLOBALS_EVPN_VNI_RT': self.__update_bgp_evpn_vni_rt,
+                            'ROUTE_MAP': self.__update_route_map,
+                            'ROUTE_REDISTRIBUTE': self.__update_route_redist,
+                            'BGP_GLOBALS_AF_AGGREGATE_ADDR': self.__update_bgp_af_prefix,
+                            'BGP_GLOBALS_AF_NETWORK': self.__update_bgp_af_prefix,
+                            'BFD_PEER_SINGLE_HOP': self.__update_bfd_shop_peer,
+                            'BFD_PEER_MULTI_HOP': self.__update_bfd_mhop_peer,
+                            'IP_SLA': self.__update_ip_sla,
+                            'OSPFV2_ROUTER': self.__update_ospf_router,
+                            'OSPFV2_ROUTER_AREA': self.__update_ospf_area,
+                            'OSPFV2_ROUTER_AREA_VIRTUAL_LINK': self.__update_ospf_vlink,
+                            'OSPFV2_ROUTER_AREA_NETWORK': self.__update_ospf_area_network,
+                            'OSPFV2_ROUTER_AREA_POLICY_ADDRESS_RANGE': self.__update_ospf_area_range,
+                            'OSPFV2_ROUTER_DISTRIBUTE_ROUTE': self.__update_ospf_distribute_route,
+                            'OSPFV2_INTERFACE': self.__update_ospf_interface,
+                            'OSPFV2_ROUTER_PASSIVE_INTERFACE': self.__update_ospf_passive_interface,
+                            'STATIC_ROUTE': self.__update_static_route,
+                            'PIM_INTERFACE': self.__update_pim_interface,
+                            'PIM_GLOBALS': self.__update_pim_globals,
+                            'IGMP_INTERFACE': self.__update_igmp_interface,
+                            'IGMP_INTERFACE_QUERY': self.__update_igmp_interface_query}
+        self.table_hdlr_map = {}
+        for table in set([tbl for tbl, _ in self.table_handler_list]) | set(self.tbl_to_key_map) | set(tbl_update_hdlrs):
+            self.table_hdlr_map[table] = BGPTableHandler(table, self.tbl_to_key_map.get(table), self.__vrf_based_table(table),
+                                                         tbl_key_hdlrs.get(table), tbl_update_hdlrs.get(table))
         self.bgp_message = queue.Queue(0)
+        # set while a batch is handled, table updates are queued and applied at the end of the batch
+        self.__update_deferred = False
+        # handlers which configure FRR directly instead of queueing the update
+        self.direct_handlers = [self.vrf_handler, self.metadata_handler, self.bfd_handler]
         self.table_data_cache = self.config_db.get_table_data([tbl for tbl, _ in self.table_handler_list])
         syslog.syslog(syslog.LOG_DEBUG, 'Init Cached DB data')
         for key, entry in self.table_data_cache.items():
@@ -2338,7 +2665,7 @@ class BGPConfigDaemon:
             for table, _ in self.table_handler_list:
                 table_list = self.config_db.get_table(table)
                 for key, data in table_list.items():
-                    syslog.syslog(syslog.LOG_DEBUG, 'config replay for table {} key {}'.format(table, key))
+                    syslog_lazy(syslog.LOG_DEBUG, 'config replay for table {} key {}', table, key)
                     upd_data = {}
                     for upd_key, upd_val in data.items():
                         upd_data[upd_key] = CachedDataWithOp(upd_val, CachedDataWithOp.OP_ADD)
@@ -2367,7 +2694,7 @@ class BGPConfigDaemon:
             self.metadata_asn = data['bgp_asn']
 
     def bfd_handler(self, table, key, data):
-        syslog.syslog(syslog.LOG_INFO, '[bgp cfgd](bfd) value for {} changed to {}'.format(key, data))
+        syslog_lazy(syslog.LOG_INFO, '[bgp cfgd](bfd) value for {} changed to {}', key, data)
         #get frr bfd session key
         key_params = key.split('|')
         cmd = 'peer {}'.format(key_params[0])
@@ -2404,7 +2731,7 @@ class BGPConfigDaemon:
             self.__run_command(table, command)
 
     def vrf_handler(self, table, key, data):
-        syslog.syslog(syslog.LOG_INFO, '[bgp cfgd](vrf) value for {} changed to {}'.format(key, data))
+        syslog_lazy(syslog.LOG_INFO, '[bgp cfgd](vrf) value for {} changed to {}', key, data)
         #get vrf key
         key_params = key.split('|')
         cmd = 'vrf {}'.format(key_params[0])
@@ -2533,7 +2860,7 @@ class BGPConfigDaemon:
                 continue
             if match_fn is not None and not match_fn(data):
                 continue
-            syslog.syslog(syslog.LOG_DEBUG, 'attr re-apply for vrf {} table {} key {} data {}'.format(vrf, table_name, key, data))
+            syslog_lazy(syslog.LOG_DEBUG, 'attr re-apply for vrf {} table {} key {} data {}', vrf, table_name, key, data)
             upd_data = {}
             for upd_key, upd_val in data.items():
                 upd_data[upd_key] = CachedDataWithOp(upd_val, CachedDataWithOp.OP_ADD)
@@ -2566,11 +2893,11 @@ class BGPConfigDaemon:
             for dkey, dval in data.items():
                 if dkey in cfg_data.keys():
                     if cfg_data[dkey] not in op_list :
-                        syslog.syslog(syslog.LOG_INFO, 'Invalid op {} received'.format(cfg_data[dkey]))
+                        syslog_lazy(syslog.LOG_INFO, 'Invalid op {} received', cfg_data[dkey])
                         continue
                     dval.status = CachedDataWithOp.STAT_SUCC
                     dval.op = cfg_data[dkey]
-        syslog.syslog(syslog.LOG_INFO, 'apply_config_op_success on {}.'.format(data))
+        syslog_lazy(syslog.LOG_INFO, 'apply_config_op_success on {}.', data)
 
     def __apply_config_delete_success(self, data):
         for dkey, dval in data.items():
@@ -2631,6 +2958,31 @@ class BGPConfigDaemon:
 
         return cmd_suffix, None
 
+    @staticmethod
+    def __nbr_af_tbl_key(key, data):
+        if key is None:
+            return (key, None)
+        _, af_ip_type = key.split('|')
+        tbl_key, _ = af_ip_type.lower().split('_')
+        return (key, {'admin_status': tbl_key})
+
+    def __route_map_tbl_key(self, key, data):
+        tbl_key = {}
+        for attr_name, table_name in {'match_prefix_set': 'PREFIX', 'match_next_hop_set': 'PREFIX'}.items():
+            if attr_name in data:
+                pfx_set_name = self.get_prefix_set_name(data[attr_name].data, table_name)
+                if pfx_set_name in self.prefix_set_list:
+                    af_mode = self.prefix_set_list[pfx_set_name].af
+                    tbl_key[attr_name] = 'ipv4' if af_mode == socket.AF_INET else 'ipv6'
+        return (key, tbl_key)
+
+    @staticmethod
+    def __static_route_tbl_key(key, data):
+        af_id, new_key = IpNextHopSet.get_af_norm_prefix(key)
+        if new_key is None:
+            return (key, None)
+        return (new_key, {'ip_prefix': ('ipv4' if af_id == socket.AF_INET else 'ipv6')})
+
     def __update_bgp(self, data_list):
         while not self.bgp_message.empty():
             key, del_table, table, data = self.bgp_message.get()
@@ -2646,1178 +2998,1187 @@ class BGPConfigDaemon:
             else:
                 key = None
             prefix = key_list[0]
-            syslog.syslog(syslog.LOG_INFO, 'value for table {} prefix {} key {} changed to {}'.format(table, prefix, key, data))
-            if self.__vrf_based_table(table):
+            syslog_lazy(syslog.LOG_INFO, 'value for table {} prefix {} key {} changed to {}', table, prefix, key, data)
+            tbl_hdlr = self.table_hdlr_map.get(table)
+            if tbl_hdlr is None:
+                tbl_hdlr = BGPTableHandler(table, None, self.__vrf_based_table(table))
+                self.table_hdlr_map[table] = tbl_hdlr
+            vrf = None
+            local_asn = None
+            if tbl_hdlr.vrf_based:
                 vrf = prefix
                 local_asn = self.__get_vrf_asn(vrf)
                 if local_asn is None and (table != 'BGP_GLOBALS' or 'local_asn' not in data):
                     syslog.syslog(syslog.LOG_DEBUG, 'ignore table {} update because local_asn for VRF {} was not configured'.\
                             format(table, vrf))
                     continue
-            if table in self.tbl_to_key_map:
-                tbl_key = None
-                if table == 'BGP_NEIGHBOR_AF' or table == 'BGP_PEER_GROUP_AF' and key is not None:
-                    _, af_ip_type = key.split('|')
-                    tbl_key, _ = af_ip_type.lower().split('_')
-                    tbl_key = {'admin_status': tbl_key}
-                elif table == 'ROUTE_MAP':
-                    tbl_key = {}
-                    for attr_name, table_name in {'match_prefix_set': 'PREFIX', 'match_next_hop_set': 'PREFIX'}.items():
-                        if attr_name in data:
-                            pfx_set_name = self.get_prefix_set_name(data[attr_name].data, table_name)
-                            if pfx_set_name in self.prefix_set_list:
-                                af_mode = self.prefix_set_list[pfx_set_name].af
-                                tbl_key[attr_name] = 'ipv4' if af_mode == socket.AF_INET else 'ipv6'
-                elif table == 'STATIC_ROUTE':
-                    af_id, new_key = IpNextHopSet.get_af_norm_prefix(key)
-                    if new_key is not None:
-                        key = new_key
-                        tbl_key = {'ip_prefix': ('ipv4' if af_id == socket.AF_INET else 'ipv6')}
-                key_map = BGPKeyMapList(self.tbl_to_key_map[table], table, tbl_key)
-            else:
-                key_map = None
-            if table == 'BGP_GLOBALS':
-                if not del_table:
-                    if 'local_asn' in data:
-                        dval = data['local_asn']
-                        if dval.op == CachedDataWithOp.OP_DELETE:
-                            # delete local_asn will delete whole VRF instance
-                            self.__delete_vrf_asn(vrf, table, data)
-                            continue
-                        prog_asn = True
-                        if dval.op == CachedDataWithOp.OP_UPDATE:
-                            syslog.syslog(syslog.LOG_ERR, 'local_asn could not be modified')
-                            prog_asn = False
-                        if dval.op == CachedDataWithOp.OP_NONE:
-                            prog_asn = False
-                        if prog_asn:
-                            command = "vtysh -c 'configure terminal' -c 'router bgp {} vrf {}' -c 'no bgp default ipv4-unicast'".format(dval.data, vrf)
-                            if self.__run_command(table, command):
-                                syslog.syslog(syslog.LOG_DEBUG, 'set local_asn %s to VRF %s, re-apply all VRF related tables' % (dval.data, vrf))
-                                self.bgp_asn[vrf] = dval.data
-                                self.__apply_dep_vrf_table(vrf, 'ROUTE_REDISTRIBUTE')
-                                dval.status = CachedDataWithOp.STAT_SUCC
-                            else:
-                                syslog.syslog(syslog.LOG_ERR, 'failed to set local_asn %s to VRF %s' % (dval.data, vrf))
-                        else:
-                            dval.status = CachedDataWithOp.STAT_SUCC
-                    if 'confed_peers' in data:
-                        self.upd_confed_peers = copy.copy(self.bgp_confed_peers.get(vrf, set()))
-                    local_asn = self.__get_vrf_asn(vrf)
-                    if local_asn is None:
-                        syslog.syslog(syslog.LOG_ERR, 'local ASN for VRF %s was not configured' % vrf)
-                        continue
-                    cmd_prefix = ['configure terminal', 'router bgp {} vrf {}'.format(local_asn, vrf)]
-                    if 'srv6_locator' in data:
-                        cmd =  "vtysh -c 'configure terminal' "
-                        cmd += " -c 'router bgp {} vrf {}' ".format(local_asn, vrf)
-                        cmd += " -c 'segment-routing srv6' "
-                        cmd += " -c 'locator {}' ".format(data['srv6_locator'].data)
-                        if not self.__run_command(table, cmd):
-                            syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 POLICY config command')
-                            continue
-                    if not key_map.run_command(self, table, data, cmd_prefix):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running BGP global config command')
-                        continue
-                    if 'confed_peers' in data:
-                        self.bgp_confed_peers[vrf] = copy.copy(self.upd_confed_peers)
-                else:
+            tbl_key = None
+            if tbl_hdlr.tbl_key_hdlr is not None:
+                key, tbl_key = tbl_hdlr.tbl_key_hdlr(key, data)
+            key_map = tbl_hdlr.get_key_map(tbl_key)
+            if tbl_hdlr.update_hdlr is not None:
+                tbl_hdlr.update_hdlr(table, prefix, key, data, del_table, key_map, vrf, local_asn)
+
+    def __update_bgp_globals(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        if not del_table:
+            if 'local_asn' in data:
+                dval = data['local_asn']
+                if dval.op == CachedDataWithOp.OP_DELETE:
+                    # delete local_asn will delete whole VRF instance
                     self.__delete_vrf_asn(vrf, table, data)
-            elif table == 'SRV6_MY_LOCATORS':
-                if not del_table:
-                    locator_name = prefix
-                    prefix = data['prefix']
-                    cmd = "vtysh -c 'configure terminal' -c 'segment-routing' -c 'srv6' -c 'locators' "
-                    cmd += " -c 'locator {}' ".format(locator_name)
-                    cmd += " -c 'prefix {} block-len {} node-len {} func-bits {}' ".format(prefix.data, data['block_len'].data, data['node_len'].data, data['func_len'].data)
-                    if not self.__run_command(table, cmd):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 LOCATORS config command')
-                        continue
-            elif table == 'SRV6_MY_SOURCE':
-                source = data['source-address']
-                cmd =  "vtysh -c 'configure terminal' -c 'segment-routing' -c 'srv6' -c 'encapsulation' "
-                cmd += " -c 'source-address {}' ".format(source.data)
-                if not self.__run_command(table, cmd):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 encap config command {}'.format(cmd))
-                    continue
-            elif table == 'SRV6_MY_SIDS':
-                if key is None:
-                    syslog.syslog(syslog.LOG_ERR, 'invalid key for SRV6_MY_SIDS table')
-                    continue
-                if not del_table:
-                    cmd = "vtysh -c 'configure terminal' -c 'segment-routing' -c 'srv6' "
-                    cmd +="-c 'static-sids' "
-                    uDTAction = ["uDT46", "uDT4", "uDT6"]
-                    if data['action'].data in uDTAction:
-                        cmd +="-c 'sid {} locator {} behavior {} vrf {}' ".format(key, prefix, data['action'].data, data['decap_vrf'].data)
-                    elif data['action'].data == 'uN':
-                        cmd +="-c 'sid {} locator {} behavior {} ' ".format(key, prefix, data['action'].data)
+                    return
+                prog_asn = True
+                if dval.op == CachedDataWithOp.OP_UPDATE:
+                    syslog.syslog(syslog.LOG_ERR, 'local_asn could not be modified')
+                    prog_asn = False
+                if dval.op == CachedDataWithOp.OP_NONE:
+                    prog_asn = False
+                if prog_asn:
+                    command = "vtysh -c 'configure terminal' -c 'router bgp {} vrf {}' -c 'no bgp default ipv4-unicast'".format(dval.data, vrf)
+                    if self.__run_command(table, command):
+                        syslog.syslog(syslog.LOG_DEBUG, 'set local_asn %s to VRF %s, re-apply all VRF related tables' % (dval.data, vrf))
+                        self.bgp_asn[vrf] = dval.data
+                        self.__apply_dep_vrf_table(vrf, 'ROUTE_REDISTRIBUTE')
+                        dval.status = CachedDataWithOp.STAT_SUCC
                     else:
-                        syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 POLICY config command, not support action %s'.format(data['action'].data))
-                        continue
-                    if not self.__run_command(table, cmd):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 SRV6_MY_SIDS config command')
-                        continue
-
-            elif table == 'BGP_GLOBALS_AF':
-                af, ip_type = key.lower().split('_')
-                #this is to temporarily make table cache key accessible to key_map handler function
-                self.tmp_cache_key = 'BGP_GLOBALS_AF&&{}|{}'.format(vrf, key.lower())
-                syslog.syslog(syslog.LOG_INFO, 'Set address family global to {} {} cache-key to {}'.format(af, ip_type, self.tmp_cache_key))
-                cmd_prefix = ['configure terminal',
-                              'router bgp {} vrf {}'.format(local_asn, vrf),
-                              'address-family {} {}'.format(af, ip_type)]
-                if not key_map.run_command(self, table, data, cmd_prefix):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP global AF config command')
-                    continue
-                self.tmp_cache_key = ''
-            elif table == 'BGP_GLOBALS_LISTEN_PREFIX':
-                syslog.syslog(syslog.LOG_INFO, 'Set BGP listen prefix {}'.format(key))
-                cmd_prefix = ['configure terminal',
-                              'router bgp {} vrf {}'.format(local_asn, vrf)]
-                if not key_map.run_command(self, table, data, cmd_prefix, key):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP global listen prefix config command')
-                    continue
-            elif table == 'BGP_NEIGHBOR' or table == 'BGP_PEER_GROUP':
-                is_peer_group = table == 'BGP_PEER_GROUP'
-                if not del_table:
-                    if is_peer_group:
-                        # if peer group is not created, create it before setting other attributes
-                        if key not in self.bgp_peer_group.setdefault(vrf, {}):
-                            command = "vtysh -c 'configure terminal' -c 'router bgp {} vrf {}' ".format(local_asn, vrf)
-                            command += "-c 'neighbor {} peer-group'".format(key)
-                            if not self.__run_command(table, command):
-                                syslog.syslog(syslog.LOG_ERR, 'failed to create peer-group %s for VRF %s' % (key, vrf))
-                                continue
-                            self.bgp_peer_group[vrf][key] = BGPPeerGroup(vrf)
-                    elif not self.__peer_is_ip(key):
-                        if key not in self.bgp_intf_nbr.setdefault(vrf, set()):
-                            command = "vtysh -c 'configure terminal' -c 'router bgp {} vrf {}' ".format(local_asn, vrf)
-                            command += "-c 'neighbor {} interface'".format(key)
-                            if not self.__run_command(table, command):
-                                syslog.syslog(syslog.LOG_ERR, 'failed to create neighbor of interface %s for VRF %s' % (key, vrf))
-                                continue
-                            self.bgp_intf_nbr[vrf].add(key)
-                    bfd_val = data.get('bfd', None)
-                    if (bfd_val is not None and (bfd_val.op == CachedDataWithOp.OP_ADD or bfd_val.op == CachedDataWithOp.OP_UPDATE) and
-                        bfd_val.data == 'true'):
-                        cp_chk_val = data.get('bfd_check_ctrl_plane_failure', None)
-                        if cp_chk_val is not None and cp_chk_val.op == CachedDataWithOp.OP_NONE and cp_chk_val.data == 'true':
-                            cp_chk_val.op = CachedDataWithOp.OP_ADD
-                    cmd_prefix = ['configure terminal', 'router bgp {} vrf {}'.format(local_asn, vrf)]
-                    if not key_map.run_command(self, table, data, cmd_prefix, key):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running BGP neighbor config command')
-                        continue
-                    if ('peer_group_name' in data and
-                        (data['peer_group_name'].op == CachedDataWithOp.OP_ADD or
-                         data['peer_group_name'].op == CachedDataWithOp.OP_DELETE)):
-                        dval = data['peer_group_name']
-                        if vrf not in self.bgp_peer_group or dval.data not in self.bgp_peer_group[vrf]:
-                            # should not happen because vtysh command will fail if peer_group not exists
-                            syslog.syslog(syslog.LOG_ERR, 'invalid peer-group %s was referenced' % dval.data)
-                            continue
-                        peer_grp = self.bgp_peer_group[vrf][dval.data]
-                        if dval.op == CachedDataWithOp.OP_ADD:
-                            peer_grp.ref_nbrs.add(key)
-                        else:
-                            peer_grp.ref_nbrs.discard(key)
-                    nbr_action = self.__nbr_impl_action(data, key, is_peer_group)
-                    if nbr_action == 'delete':
-                        if not is_peer_group and self.__peer_is_ip(key):
-                            # delete asn or peer_group will delete all neighbor
-                            self.__delete_vrf_neighbor(vrf, key, data, False)
-                        elif is_peer_group:
-                            # clear associated neighbor list in cache
-                            self.__delete_pg_neighbors(vrf, key)
-                    elif nbr_action == 'apply':
-                        if is_peer_group:
-                            syslog.syslog(syslog.LOG_DEBUG, 'apply attributes to FRR for vrf %s peer_group %s' % (vrf, key))
-                            match_pg = lambda data: data.get('peer_group', None) == key
-                            self.__apply_dep_vrf_table(vrf, 'BGP_GLOBALS_LISTEN_PREFIX', match = match_pg)
-                            match_nbr = lambda data: data.get('peer_group_name', None) == key
-                            self.__apply_dep_vrf_table(vrf, 'BGP_NEIGHBOR', match = match_nbr)
-                        else:
-                            for af in ['ipv4_unicast', 'ipv6_unicast']:
-                                syslog.syslog(syslog.LOG_DEBUG, 'apply attributes to FRR for vrf %s neighbor %s af %s' % (vrf, key, af))
-                                self.__apply_dep_vrf_table(vrf, 'BGP_NEIGHBOR_AF', key, af)
+                        syslog.syslog(syslog.LOG_ERR, 'failed to set local_asn %s to VRF %s' % (dval.data, vrf))
                 else:
-                    # Neighbor is deleted
-                    if is_peer_group:
-                        # clear associated neighbor list in cache
-                        self.__delete_pg_neighbors(vrf, key)
-                    command = "vtysh -c 'configure terminal' -c 'router bgp {} vrf {}' -c 'no neighbor {}'".\
-                        format(local_asn, vrf, key)
+                    dval.status = CachedDataWithOp.STAT_SUCC
+            if 'confed_peers' in data:
+                self.upd_confed_peers = copy.copy(self.bgp_confed_peers.get(vrf, set()))
+            local_asn = self.__get_vrf_asn(vrf)
+            if local_asn is None:
+                syslog.syslog(syslog.LOG_ERR, 'local ASN for VRF %s was not configured' % vrf)
+                return
+            cmd_prefix = ['configure terminal', 'router bgp {} vrf {}'.format(local_asn, vrf)]
+            if 'srv6_locator' in data:
+                cmd =  "vtysh -c 'configure terminal' "
+                cmd += " -c 'router bgp {} vrf {}' ".format(local_asn, vrf)
+                cmd += " -c 'segment-routing srv6' "
+                cmd += " -c 'locator {}' ".format(data['srv6_locator'].data)
+                if not self.__run_command(table, cmd):
+                    syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 POLICY config command')
+                    return
+            if not key_map.run_command(self, table, data, cmd_prefix):
+                syslog.syslog(syslog.LOG_ERR, 'failed running BGP global config command')
+                return
+            if 'confed_peers' in data:
+                self.bgp_confed_peers[vrf] = copy.copy(self.upd_confed_peers)
+        else:
+            self.__delete_vrf_asn(vrf, table, data)
+
+    def __update_srv6_locator(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        if not del_table:
+            locator_name = prefix
+            prefix = data['prefix']
+            cmd = "vtysh -c 'configure terminal' -c 'segment-routing' -c 'srv6' -c 'locators' "
+            cmd += " -c 'locator {}' ".format(locator_name)
+            cmd += " -c 'prefix {} block-len {} node-len {} func-bits {}' ".format(prefix.data, data['block_len'].data, data['node_len'].data, data['func_len'].data)
+            if not self.__run_command(table, cmd):
+                syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 LOCATORS config command')
+                return
+
+    def __update_srv6_source(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        source = data['source-address']
+        cmd =  "vtysh -c 'configure terminal' -c 'segment-routing' -c 'srv6' -c 'encapsulation' "
+        cmd += " -c 'source-address {}' ".format(source.data)
+        if not self.__run_command(table, cmd):
+            syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 encap config command {}'.format(cmd))
+            return
+
+    def __update_srv6_sid(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        if key is None:
+            syslog.syslog(syslog.LOG_ERR, 'invalid key for SRV6_MY_SIDS table')
+            return
+        if not del_table:
+            cmd = "vtysh -c 'configure terminal' -c 'segment-routing' -c 'srv6' "
+            cmd +="-c 'static-sids' "
+            uDTAction = ["uDT46", "uDT4", "uDT6"]
+            if data['action'].data in uDTAction:
+                cmd +="-c 'sid {} locator {} behavior {} vrf {}' ".format(key, prefix, data['action'].data, data['decap_vrf'].data)
+            elif data['action'].data == 'uN':
+                cmd +="-c 'sid {} locator {} behavior {} ' ".format(key, prefix, data['action'].data)
+            else:
+                syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 POLICY config command, not support action %s'.format(data['action'].data))
+                return
+            if not self.__run_command(table, cmd):
+                syslog.syslog(syslog.LOG_ERR, 'failed running SRV6 SRV6_MY_SIDS config command')
+                return
+
+    def __update_bgp_globals_af(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        af, ip_type = key.lower().split('_')
+        #this is to temporarily make table cache key accessible to key_map handler function
+        self.tmp_cache_key = 'BGP_GLOBALS_AF&&{}|{}'.format(vrf, key.lower())
+        syslog_lazy(syslog.LOG_INFO, 'Set address family global to {} {} cache-key to {}', af, ip_type, self.tmp_cache_key)
+        cmd_prefix = ['configure terminal',
+                      'router bgp {} vrf {}'.format(local_asn, vrf),
+                      'address-family {} {}'.format(af, ip_type)]
+        if not key_map.run_command(self, table, data, cmd_prefix):
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP global AF config command')
+            return
+        self.tmp_cache_key = ''
+
+    def __update_bgp_listen_prefix(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        syslog_lazy(syslog.LOG_INFO, 'Set BGP listen prefix {}', key)
+        cmd_prefix = ['configure terminal',
+                      'router bgp {} vrf {}'.format(local_asn, vrf)]
+        if not key_map.run_command(self, table, data, cmd_prefix, key):
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP global listen prefix config command')
+            return
+
+    def __update_bgp_neighbor(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        is_peer_group = table == 'BGP_PEER_GROUP'
+        if not del_table:
+            if is_peer_group:
+                # if peer group is not created, create it before setting other attributes
+                if key not in self.bgp_peer_group.setdefault(vrf, {}):
+                    command = "vtysh -c 'configure terminal' -c 'router bgp {} vrf {}' ".format(local_asn, vrf)
+                    command += "-c 'neighbor {} peer-group'".format(key)
                     if not self.__run_command(table, command):
-                        syslog.syslog(syslog.LOG_ERR, 'failed to delete VRF %s bgp neigbor %s' % (vrf, key))
-                    self.__delete_vrf_neighbor(vrf, key, data, is_peer_group)
-            elif table == 'BGP_NEIGHBOR_AF' or table == 'BGP_PEER_GROUP_AF':
-                nbr, af_type = key.split('|')
-                af, ip_type = af_type.lower().split('_')
-                syslog.syslog(syslog.LOG_INFO, 'Set address family for neighbor {} to {} {}'.format(nbr, af, ip_type))
-                cmd_prefix = ['configure terminal',
-                              'router bgp {} vrf {}'.format(local_asn, vrf),
-                              'address-family {} {}'.format(af, ip_type)]
-                if not key_map.run_command(self, table, data, cmd_prefix, nbr):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP neighbor AF config command')
-                    continue
-            elif table == 'COMMUNITY_SET' or table == 'EXTENDED_COMMUNITY_SET':
-                comm_set_name = prefix
-                syslog.syslog(syslog.LOG_INFO, 'Set community set {} for table {}'.format(comm_set_name, table))
-                cmd_prefix = ['configure terminal']
-                if not key_map.run_command(self, table, data, cmd_prefix, comm_set_name):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP community config command')
-                    continue
-                extended = (table != 'COMMUNITY_SET')
-                comm_set = (self.comm_set_list if not extended else self.extcomm_set_list).setdefault(comm_set_name,
-                    CommunityList(comm_set_name, extended))
-                if del_table:
-                    del((self.comm_set_list if not extended else self.extcomm_set_list)[comm_set_name])
+                        syslog.syslog(syslog.LOG_ERR, 'failed to create peer-group %s for VRF %s' % (key, vrf))
+                        return
+                    self.bgp_peer_group[vrf][key] = BGPPeerGroup(vrf)
+            elif not self.__peer_is_ip(key):
+                if key not in self.bgp_intf_nbr.setdefault(vrf, set()):
+                    command = "vtysh -c 'configure terminal' -c 'router bgp {} vrf {}' ".format(local_asn, vrf)
+                    command += "-c 'neighbor {} interface'".format(key)
+                    if not self.__run_command(table, command):
+                        syslog.syslog(syslog.LOG_ERR, 'failed to create neighbor of interface %s for VRF %s' % (key, vrf))
+                        return
+                    self.bgp_intf_nbr[vrf].add(key)
+            bfd_val = data.get('bfd', None)
+            if (bfd_val is not None and (bfd_val.op == CachedDataWithOp.OP_ADD or bfd_val.op == CachedDataWithOp.OP_UPDATE) and
+                bfd_val.data == 'true'):
+                cp_chk_val = data.get('bfd_check_ctrl_plane_failure', None)
+                if cp_chk_val is not None and cp_chk_val.op == CachedDataWithOp.OP_NONE and cp_chk_val.data == 'true':
+                    cp_chk_val.op = CachedDataWithOp.OP_ADD
+            cmd_prefix = ['configure terminal', 'router bgp {} vrf {}'.format(local_asn, vrf)]
+            if not key_map.run_command(self, table, data, cmd_prefix, key):
+                syslog.syslog(syslog.LOG_ERR, 'failed running BGP neighbor config command')
+                return
+            if ('peer_group_name' in data and
+                (data['peer_group_name'].op == CachedDataWithOp.OP_ADD or
+                 data['peer_group_name'].op == CachedDataWithOp.OP_DELETE)):
+                dval = data['peer_group_name']
+                if vrf not in self.bgp_peer_group or dval.data not in self.bgp_peer_group[vrf]:
+                    # should not happen because vtysh command will fail if peer_group not exists
+                    syslog.syslog(syslog.LOG_ERR, 'invalid peer-group %s was referenced' % dval.data)
+                    return
+                peer_grp = self.bgp_peer_group[vrf][dval.data]
+                if dval.op == CachedDataWithOp.OP_ADD:
+                    peer_grp.ref_nbrs.add(key)
                 else:
-                    for dkey, dval in data.items():
-                        if dval.op == CachedDataWithOp.OP_DELETE:
-                            upd_val = None
-                        else:
-                            upd_val = dval.data
-                        comm_set.db_data_to_attr(dkey, upd_val)
-            elif table == 'PREFIX_SET':
-                pfx_set_name = prefix
-                if not del_table:
-                    if pfx_set_name in self.prefix_set_list:
-                        syslog.syslog(syslog.LOG_DEBUG, 'prefix-set %s exists with af %d' %
-                                (pfx_set_name, self.prefix_set_list[pfx_set_name].af))
-                        continue
-                    if 'mode' not in data:
-                        syslog.syslog(syslog.LOG_ERR, 'no mode given for prefix-set %s' % pfx_set_name)
-                        continue
-                    set_mode = data['mode'].data.lower()
-                    self.prefix_set_list[pfx_set_name] = MatchPrefixList(set_mode)
+                    peer_grp.ref_nbrs.discard(key)
+            nbr_action = self.__nbr_impl_action(data, key, is_peer_group)
+            if nbr_action == 'delete':
+                if not is_peer_group and self.__peer_is_ip(key):
+                    # delete asn or peer_group will delete all neighbor
+                    self.__delete_vrf_neighbor(vrf, key, data, False)
+                elif is_peer_group:
+                    # clear associated neighbor list in cache
+                    self.__delete_pg_neighbors(vrf, key)
+            elif nbr_action == 'apply':
+                if is_peer_group:
+                    syslog.syslog(syslog.LOG_DEBUG, 'apply attributes to FRR for vrf %s peer_group %s' % (vrf, key))
+                    match_pg = lambda data: data.get('peer_group', None) == key
+                    self.__apply_dep_vrf_table(vrf, 'BGP_GLOBALS_LISTEN_PREFIX', match = match_pg)
+                    match_nbr = lambda data: data.get('peer_group_name', None) == key
+                    self.__apply_dep_vrf_table(vrf, 'BGP_NEIGHBOR', match = match_nbr)
                 else:
-                    if pfx_set_name in self.prefix_set_list:
-                        del(self.prefix_set_list[pfx_set_name])
-                for _, dval in data.items():
-                    dval.status = CachedDataWithOp.STAT_SUCC
-            elif table == 'PREFIX' or table == 'NEIGHBOR_SET' or table == 'NEXTHOP_SET':
-                pfx_set_name = self.get_prefix_set_name(prefix, table)
-                if table == 'PREFIX':
-                    if pfx_set_name not in self.prefix_set_list:
-                        syslog.syslog(syslog.LOG_ERR, 'could not find prefix-set %s from cache' % pfx_set_name)
-                        continue
-                    keys = key.split('|')
-                    if len(keys) == 3:
-                        seq = keys[0]
-                        ip_pfx = keys[1]
-                        len_range = keys[2]
-                    else:
-                        ip_pfx = keys[0]
-                        len_range = keys[1]
-                        seq = None
-                    if len_range == 'exact':
-                        len_range = None
-                    pfx_action = data.get('action', None)
-                    if pfx_action is None or pfx_action.op == CachedDataWithOp.OP_NONE:
-                        continue
-                    af = self.prefix_set_list[pfx_set_name].af
-                    if af == socket.AF_INET:
-                        # use table daemons setting
-                        daemons = None
-                    else:
-                        daemons = ['bgpd', 'zebra']
-                    if pfx_action.op == CachedDataWithOp.OP_DELETE or pfx_action.op == CachedDataWithOp.OP_UPDATE:
-                        del_pfx, pfx_idx = self.prefix_set_list[pfx_set_name].get_prefix(ip_pfx, len_range,
-                                                                                         pfx_action.data, seq)
-                        if del_pfx is None:
-                            syslog.syslog(syslog.LOG_ERR, 'prefix of {} with range {} not found from prefix-set {}'.\
-                                            format(ip_pfx, len_range, pfx_set_name))
-                            continue
-                        command = "vtysh -c 'configure terminal' -c 'no {} prefix-list {} {}'".\
-                                    format(('ip' if af == socket.AF_INET else 'ipv6'), pfx_set_name, str(del_pfx))
-                        if not self.__run_command(table, command, daemons):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to delete prefix %s with range %s from set %s' %
-                                          (ip_pfx, len_range, pfx_set_name))
-                            continue
-                        del(self.prefix_set_list[pfx_set_name][pfx_idx])
-                    if pfx_action.op == CachedDataWithOp.OP_ADD or pfx_action.op == CachedDataWithOp.OP_UPDATE:
-                        try:
-                            add_pfx = self.prefix_set_list[pfx_set_name].add_prefix(ip_pfx, len_range, pfx_action.data,
-                                                                                    seq)
-                        except ValueError:
-                            syslog.syslog(syslog.LOG_ERR, 'failed to update prefix-set %s in cache with prefix %s range %s' %
-                                    (pfx_set_name, ip_pfx, len_range))
-                            continue
-                        command = "vtysh -c 'configure terminal' -c '{} prefix-list {} {}'".\
-                                    format(('ip' if af == socket.AF_INET else 'ipv6'), pfx_set_name, str(add_pfx))
-                        if not self.__run_command(table, command, daemons):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to add prefix %s with range %s to set %s' %
-                                          (ip_pfx, len_range, pfx_set_name))
-                            # revert cached update on failure
-                            del_pfx, pfx_idx = self.prefix_set_list[pfx_set_name].get_prefix(ip_pfx, len_range,
-                                                                                             pfx_action.data, seq)
-                            if del_pfx is not None:
-                                del(self.prefix_set_list[pfx_set_name][pfx_idx])
-                            continue
+                    for af in ['ipv4_unicast', 'ipv6_unicast']:
+                        syslog.syslog(syslog.LOG_DEBUG, 'apply attributes to FRR for vrf %s neighbor %s af %s' % (vrf, key, af))
+                        self.__apply_dep_vrf_table(vrf, 'BGP_NEIGHBOR_AF', key, af)
+        else:
+            # Neighbor is deleted
+            if is_peer_group:
+                # clear associated neighbor list in cache
+                self.__delete_pg_neighbors(vrf, key)
+            command = "vtysh -c 'configure terminal' -c 'router bgp {} vrf {}' -c 'no neighbor {}'".\
+                format(local_asn, vrf, key)
+            if not self.__run_command(table, command):
+                syslog.syslog(syslog.LOG_ERR, 'failed to delete VRF %s bgp neigbor %s' % (vrf, key))
+            self.__delete_vrf_neighbor(vrf, key, data, is_peer_group)
+
+    def __update_bgp_neighbor_af(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        nbr, af_type = key.split('|')
+        af, ip_type = af_type.lower().split('_')
+        syslog_lazy(syslog.LOG_INFO, 'Set address family for neighbor {} to {} {}', nbr, af, ip_type)
+        cmd_prefix = ['configure terminal',
+                      'router bgp {} vrf {}'.format(local_asn, vrf),
+                      'address-family {} {}'.format(af, ip_type)]
+        if not key_map.run_command(self, table, data, cmd_prefix, nbr):
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP neighbor AF config command')
+            return
+
+    def __update_community_set(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        comm_set_name = prefix
+        syslog_lazy(syslog.LOG_INFO, 'Set community set {} for table {}', comm_set_name, table)
+        cmd_prefix = ['configure terminal']
+        if not key_map.run_command(self, table, data, cmd_prefix, comm_set_name):
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP community config command')
+            return
+        extended = (table != 'COMMUNITY_SET')
+        comm_set = (self.comm_set_list if not extended else self.extcomm_set_list).setdefault(comm_set_name,
+            CommunityList(comm_set_name, extended))
+        if del_table:
+            del((self.comm_set_list if not extended else self.extcomm_set_list)[comm_set_name])
+        else:
+            for dkey, dval in data.items():
+                if dval.op == CachedDataWithOp.OP_DELETE:
+                    upd_val = None
                 else:
-                    if 'address' not in data or data['address'].op == CachedDataWithOp.OP_NONE:
+                    upd_val = dval.data
+                comm_set.db_data_to_attr(dkey, upd_val)
+
+    def __update_prefix_set(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        pfx_set_name = prefix
+        if not del_table:
+            if pfx_set_name in self.prefix_set_list:
+                syslog.syslog(syslog.LOG_DEBUG, 'prefix-set %s exists with af %d' %
+                        (pfx_set_name, self.prefix_set_list[pfx_set_name].af))
+                return
+            if 'mode' not in data:
+                syslog.syslog(syslog.LOG_ERR, 'no mode given for prefix-set %s' % pfx_set_name)
+                return
+            set_mode = data['mode'].data.lower()
+            self.prefix_set_list[pfx_set_name] = MatchPrefixList(set_mode)
+        else:
+            if pfx_set_name in self.prefix_set_list:
+                del(self.prefix_set_list[pfx_set_name])
+        for _, dval in data.items():
+            dval.status = CachedDataWithOp.STAT_SUCC
+
+    def __update_prefix(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        pfx_set_name = self.get_prefix_set_name(prefix, table)
+        if table == 'PREFIX':
+            if pfx_set_name not in self.prefix_set_list:
+                syslog.syslog(syslog.LOG_ERR, 'could not find prefix-set %s from cache' % pfx_set_name)
+                return
+            keys = key.split('|')
+            if len(keys) == 3:
+                seq = keys[0]
+                ip_pfx = keys[1]
+                len_range = keys[2]
+            else:
+                ip_pfx = keys[0]
+                len_range = keys[1]
+                seq = None
+            if len_range == 'exact':
+                len_range = None
+            pfx_action = data.get('action', None)
+            if pfx_action is None or pfx_action.op == CachedDataWithOp.OP_NONE:
+                return
+            af = self.prefix_set_list[pfx_set_name].af
+            if af == socket.AF_INET:
+                # use table daemons setting
+                daemons = None
+            else:
+                daemons = ['bgpd', 'zebra']
+            if pfx_action.op == CachedDataWithOp.OP_DELETE or pfx_action.op == CachedDataWithOp.OP_UPDATE:
+                del_pfx, pfx_idx = self.prefix_set_list[pfx_set_name].get_prefix(ip_pfx, len_range,
+                                                                                 pfx_action.data, seq)
+                if del_pfx is None:
+                    syslog.syslog(syslog.LOG_ERR, 'prefix of {} with range {} not found from prefix-set {}'.\
+                                    format(ip_pfx, len_range, pfx_set_name))
+                    return
+                command = "vtysh -c 'configure terminal' -c 'no {} prefix-list {} {}'".\
+                            format(('ip' if af == socket.AF_INET else 'ipv6'), pfx_set_name, str(del_pfx))
+                if not self.__run_command(table, command, daemons):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to delete prefix %s with range %s from set %s' %
+                                  (ip_pfx, len_range, pfx_set_name))
+                    return
+                del(self.prefix_set_list[pfx_set_name][pfx_idx])
+            if pfx_action.op == CachedDataWithOp.OP_ADD or pfx_action.op == CachedDataWithOp.OP_UPDATE:
+                try:
+                    add_pfx = self.prefix_set_list[pfx_set_name].add_prefix(ip_pfx, len_range, pfx_action.data,
+                                                                            seq)
+                except ValueError:
+                    syslog.syslog(syslog.LOG_ERR, 'failed to update prefix-set %s in cache with prefix %s range %s' %
+                            (pfx_set_name, ip_pfx, len_range))
+                    return
+                command = "vtysh -c 'configure terminal' -c '{} prefix-list {} {}'".\
+                            format(('ip' if af == socket.AF_INET else 'ipv6'), pfx_set_name, str(add_pfx))
+                if not self.__run_command(table, command, daemons):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to add prefix %s with range %s to set %s' %
+                                  (ip_pfx, len_range, pfx_set_name))
+                    # revert cached update on failure
+                    del_pfx, pfx_idx = self.prefix_set_list[pfx_set_name].get_prefix(ip_pfx, len_range,
+                                                                                     pfx_action.data, seq)
+                    if del_pfx is not None:
+                        del(self.prefix_set_list[pfx_set_name][pfx_idx])
+                    return
+        else:
+            if 'address' not in data or data['address'].op == CachedDataWithOp.OP_NONE:
+                return
+            ip_addr_list = data['address'].data
+            if pfx_set_name in self.prefix_set_list:
+                af = self.prefix_set_list[pfx_set_name].af
+                command = "vtysh -c 'configure terminal' -c 'no {} prefix-list {}'".\
+                           format(('ip' if af == socket.AF_INET else 'ipv6'), pfx_set_name)
+                if not self.__run_command(table, command):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to delete existing prefix-set {}'.format(pfx_set_name))
+                    return
+                del(self.prefix_set_list[pfx_set_name])
+            if not del_table:
+                prefix_set = MatchPrefixList()
+                for ip_addr in ip_addr_list:
+                    try:
+                        prefix_set.add_prefix(ip_addr)
+                    except ValueError:
                         continue
-                    ip_addr_list = data['address'].data
-                    if pfx_set_name in self.prefix_set_list:
-                        af = self.prefix_set_list[pfx_set_name].af
-                        command = "vtysh -c 'configure terminal' -c 'no {} prefix-list {}'".\
-                                   format(('ip' if af == socket.AF_INET else 'ipv6'), pfx_set_name)
-                        if not self.__run_command(table, command):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to delete existing prefix-set {}'.format(pfx_set_name))
-                            continue
-                        del(self.prefix_set_list[pfx_set_name])
-                    if not del_table:
-                        prefix_set = MatchPrefixList()
-                        for ip_addr in ip_addr_list:
-                            try:
-                                prefix_set.add_prefix(ip_addr)
-                            except ValueError:
-                                continue
-                        for prefix in prefix_set:
-                            command = "vtysh -c 'configure terminal' -c '{} prefix-list {} {}'".\
-                                       format(('ip' if prefix_set.af == socket.AF_INET else 'ipv6'), pfx_set_name, str(prefix))
-                            if not self.__run_command(table, command):
-                                syslog.syslog(syslog.LOG_ERR, 'failed to delete existing prefix-set {}'.format(pfx_set_name))
-                                continue
-                        self.prefix_set_list[pfx_set_name] = prefix_set
-                for _, dval in data.items():
-                    dval.status = CachedDataWithOp.STAT_SUCC
-            elif table == 'AS_PATH_SET':
-                as_set_name = prefix
-                syslog.syslog(syslog.LOG_INFO, 'Set AS path set {} for table {}'.format(as_set_name, table))
-                cmd_prefix = ['configure terminal']
-                if not key_map.run_command(self, table, data, cmd_prefix, as_set_name):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP AS path set config command')
-                    continue
-                as_set_data = data.get('as_path_set_member', None)
-                if as_set_data is not None and (as_set_data.op == CachedDataWithOp.OP_DELETE or len(as_set_data.data) == 0):
-                    del_table = True
-                if del_table:
-                    self.as_path_set_list.pop(as_set_name, None)
-                elif as_set_data is not None:
-                    self.as_path_set_list[as_set_name] = as_set_data.data[:]
-            elif table == 'TAG_SET':
-                tag_set_name = prefix
-                if not del_table and 'tag_value' not in data:
-                    continue
-                tag_set_data = data.get('tag_value', None)
-                if tag_set_data is not None and (tag_set_data.op == CachedDataWithOp.OP_DELETE or len(tag_set_data.data) == 0):
-                    del_table = True
-                if not del_table:
-                    self.tag_set_list[tag_set_name] = set(tag_set_data.data)
-                else:
-                    self.tag_set_list.pop(tag_set_name, None)
-                for _, dval in data.items():
-                    dval.status = CachedDataWithOp.STAT_SUCC
-            elif table == 'BGP_GLOBALS_EVPN_VNI':
-                af_type, vni = key.split('|')
-                af, ip_type = af_type.lower().split('_')
-                #this is to temporarily make table cache key accessible to key_map handler function
-                self.tmp_cache_key = 'BGP_GLOBALS_EVPN_VNI&&{}|{}|{}'.format(vrf, af_type, vni)
-                syslog.syslog(syslog.LOG_INFO, 'Set address family for VNI {} to {} {} cache-key to {}'.format(vni, af, ip_type, self.tmp_cache_key))
-                cmd_prefix = ['configure terminal',
-                              'router bgp {} vrf {}'.format(local_asn, vrf),
-                              'address-family {} {}'.format(af, ip_type),
-                              'vni {}'.format(vni)]
-                if not key_map.run_command(self, table, data, cmd_prefix):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN VNI config command')
-                    continue
-                self.tmp_cache_key = ''
-                if del_table:
-                    cmd = "vtysh -c 'configure terminal'"
-                    cmd += " -c 'router bgp {} vrf {}'".format(local_asn, vrf)
-                    cmd += " -c 'address-family {} {}'".format(af, ip_type)
-                    cmd += " -c 'no vni {}'".format(vni)
-                    if not self.__run_command(table, cmd):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN VNI unconfig command')
+                for prefix in prefix_set:
+                    command = "vtysh -c 'configure terminal' -c '{} prefix-list {} {}'".\
+                               format(('ip' if prefix_set.af == socket.AF_INET else 'ipv6'), pfx_set_name, str(prefix))
+                    if not self.__run_command(table, command):
+                        syslog.syslog(syslog.LOG_ERR, 'failed to delete existing prefix-set {}'.format(pfx_set_name))
                         continue
-                else:
-                    if not data:
-                        cmd = "vtysh -c 'configure terminal'"
-                        cmd += " -c 'router bgp {} vrf {}'".format(local_asn, vrf)
-                        cmd += " -c 'address-family {} {}'".format(af, ip_type)
-                        cmd += " -c 'vni {}'".format(vni)
-                        if not self.__run_command(table, cmd):
-                            syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN VNI config command')
-                            continue
-            elif table == 'BGP_GLOBALS_EVPN_RT':
-                af_type, rt = key.split('|')
-                af, ip_type = af_type.lower().split('_')
-                nostr = "no " if del_table else ""
-                syslog.syslog(syslog.LOG_INFO, 'Set address family for RT {} to {} {}'.format(rt, af, ip_type))
-                cmd = "vtysh -c 'configure terminal'"
-                cmd += " -c 'router bgp {} vrf {}'".format(local_asn, vrf)
-                cmd += " -c 'address-family {} {}'".format(af, ip_type)
-                cmd += " -c '{}route-target {} {}'".format(nostr,data['route-target-type'].data, rt)
-                cache_tbl_key = 'BGP_GLOBALS_EVPN_RT&&{}|L2VPN_EVPN|{}'.format(vrf, rt)
-                if not del_table and cache_tbl_key in self.table_data_cache.keys():
-                    new_rttype = data['route-target-type'].data
-                    cache_tbl_data = self.table_data_cache[cache_tbl_key]
-                    if 'route-target-type' in cache_tbl_data:
-                        old_rttype = cache_tbl_data['route-target-type']
-                        if new_rttype == "export":
-                            if old_rttype == "import" or old_rttype == "both":
-                                cmd += " -c 'no route-target import {}'".format(rt)
-                        if new_rttype == "import":
-                            if old_rttype == "export" or old_rttype == "both":
-                                cmd += " -c 'no route-target export {}'".format(rt)
-                if not self.__run_command(table, cmd):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN RT config command')
-                    continue
-                else:
-                    data['route-target-type'].status = CachedDataWithOp.STAT_SUCC
-            elif table == 'BGP_GLOBALS_EVPN_VNI_RT':
-                af_type, vni, rt = key.split('|')
-                af, ip_type = af_type.lower().split('_')
-                nostr = "no " if del_table else ""
-                syslog.syslog(syslog.LOG_INFO, 'Set address family for VNI {} RT {} to {} {}'.format(vni, rt, af, ip_type))
+                self.prefix_set_list[pfx_set_name] = prefix_set
+        for _, dval in data.items():
+            dval.status = CachedDataWithOp.STAT_SUCC
+
+    def __update_as_path_set(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        as_set_name = prefix
+        syslog_lazy(syslog.LOG_INFO, 'Set AS path set {} for table {}', as_set_name, table)
+        cmd_prefix = ['configure terminal']
+        if not key_map.run_command(self, table, data, cmd_prefix, as_set_name):
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP AS path set config command')
+            return
+        as_set_data = data.get('as_path_set_member', None)
+        if as_set_data is not None and (as_set_data.op == CachedDataWithOp.OP_DELETE or len(as_set_data.data) == 0):
+            del_table = True
+        if del_table:
+            self.as_path_set_list.pop(as_set_name, None)
+        elif as_set_data is not None:
+            self.as_path_set_list[as_set_name] = as_set_data.data[:]
+
+    def __update_tag_set(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        tag_set_name = prefix
+        if not del_table and 'tag_value' not in data:
+            return
+        tag_set_data = data.get('tag_value', None)
+        if tag_set_data is not None and (tag_set_data.op == CachedDataWithOp.OP_DELETE or len(tag_set_data.data) == 0):
+            del_table = True
+        if not del_table:
+            self.tag_set_list[tag_set_name] = set(tag_set_data.data)
+        else:
+            self.tag_set_list.pop(tag_set_name, None)
+        for _, dval in data.items():
+            dval.status = CachedDataWithOp.STAT_SUCC
+
+    def __update_bgp_evpn_vni(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        af_type, vni = key.split('|')
+        af, ip_type = af_type.lower().split('_')
+        #this is to temporarily make table cache key accessible to key_map handler function
+        self.tmp_cache_key = 'BGP_GLOBALS_EVPN_VNI&&{}|{}|{}'.format(vrf, af_type, vni)
+        syslog_lazy(syslog.LOG_INFO, 'Set address family for VNI {} to {} {} cache-key to {}', vni, af, ip_type, self.tmp_cache_key)
+        cmd_prefix = ['configure terminal',
+                      'router bgp {} vrf {}'.format(local_asn, vrf),
+                      'address-family {} {}'.format(af, ip_type),
+                      'vni {}'.format(vni)]
+        if not key_map.run_command(self, table, data, cmd_prefix):
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN VNI config command')
+            return
+        self.tmp_cache_key = ''
+        if del_table:
+            cmd = "vtysh -c 'configure terminal'"
+            cmd += " -c 'router bgp {} vrf {}'".format(local_asn, vrf)
+            cmd += " -c 'address-family {} {}'".format(af, ip_type)
+            cmd += " -c 'no vni {}'".format(vni)
+            if not self.__run_command(table, cmd):
+                syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN VNI unconfig command')
+                return
+        else:
+            if not data:
                 cmd = "vtysh -c 'configure terminal'"
                 cmd += " -c 'router bgp {} vrf {}'".format(local_asn, vrf)
                 cmd += " -c 'address-family {} {}'".format(af, ip_type)
                 cmd += " -c 'vni {}'".format(vni)
-                cmd += " -c '{}route-target {} {}'".format(nostr,data['route-target-type'].data, rt)
-                cache_tbl_key = 'BGP_GLOBALS_EVPN_VNI_RT&&{}|L2VPN_EVPN|{}|{}'.format(vrf, vni, rt)
-                if not del_table and cache_tbl_key in self.table_data_cache.keys():
-                    new_rttype = data['route-target-type'].data
-                    cache_tbl_data = self.table_data_cache[cache_tbl_key]
-                    if 'route-target-type' in cache_tbl_data:
-                        old_rttype = cache_tbl_data['route-target-type']
-                        if new_rttype == "export":
-                            if old_rttype == "import" or old_rttype == "both":
-                                cmd += " -c 'no route-target import {}'".format(rt)
-                        if new_rttype == "import":
-                            if old_rttype == "export" or old_rttype == "both":
-                                cmd += " -c 'no route-target export {}'".format(rt)
                 if not self.__run_command(table, cmd):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN VNI RT config command')
-                    continue
-                else:
-                    data['route-target-type'].status = CachedDataWithOp.STAT_SUCC
-            elif table == 'ROUTE_MAP':
-                map_name = prefix
-                seq_no = key
-                if not del_table:
-                    if 'route_operation' in data:
-                        dval = data['route_operation']
-                        if dval.op != CachedDataWithOp.OP_NONE:
-                            enable = (dval.op != CachedDataWithOp.OP_DELETE)
-                            no_arg = CommandArgument(self, enable)
-                            command = "vtysh -c 'configure terminal' -c '{:no-prefix}route-map {} {} {}'".\
-                                       format(no_arg, map_name, dval.data, seq_no)
-                            if not self.__run_command(table, command):
-                                syslog.syslog(syslog.LOG_ERR, 'failed to configure route-map {} seq {}'.format(map_name, seq_no))
-                                continue
-                            if dval.op == CachedDataWithOp.OP_DELETE:
-                                self.__delete_route_map(map_name, seq_no, data)
-                                continue
-                            self.route_map.setdefault(map_name, {})[seq_no] = dval.data
-                            for k, v in data.items():
-                                if v.op == CachedDataWithOp.OP_NONE:
-                                    v.op = CachedDataWithOp.OP_UPDATE
-                        dval.status = CachedDataWithOp.STAT_SUCC
-                    if map_name not in self.route_map or seq_no not in self.route_map[map_name]:
-                        syslog.syslog(syslog.LOG_ERR, 'route-map {} seq {} not found for update'.format(map_name, seq_no))
-                        continue
-                    cmd_prefix = ['configure terminal',
-                                  'route-map {} {} {}'.format(map_name, self.route_map[map_name][seq_no], seq_no)]
-                    if not key_map.run_command(self, table, data, cmd_prefix):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running route-map config command')
-                        continue
-                else:
-                    if map_name not in self.route_map or seq_no not in self.route_map[map_name]:
-                        syslog.syslog(syslog.LOG_ERR, 'route-map {} seq {} not found for delete'.format(map_name, seq_no))
-                        continue
-                    command = "vtysh -c 'configure terminal' -c 'no route-map {} {} {}'".\
-                               format(map_name, self.route_map[map_name][seq_no], seq_no)
+                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN VNI config command')
+                    return
+
+    def __update_bgp_evpn_rt(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        af_type, rt = key.split('|')
+        af, ip_type = af_type.lower().split('_')
+        nostr = "no " if del_table else ""
+        syslog_lazy(syslog.LOG_INFO, 'Set address family for RT {} to {} {}', rt, af, ip_type)
+        cmd = "vtysh -c 'configure terminal'"
+        cmd += " -c 'router bgp {} vrf {}'".format(local_asn, vrf)
+        cmd += " -c 'address-family {} {}'".format(af, ip_type)
+        cmd += " -c '{}route-target {} {}'".format(nostr,data['route-target-type'].data, rt)
+        cache_tbl_key = 'BGP_GLOBALS_EVPN_RT&&{}|L2VPN_EVPN|{}'.format(vrf, rt)
+        if not del_table and cache_tbl_key in self.table_data_cache.keys():
+            new_rttype = data['route-target-type'].data
+            cache_tbl_data = self.table_data_cache[cache_tbl_key]
+            if 'route-target-type' in cache_tbl_data:
+                old_rttype = cache_tbl_data['route-target-type']
+                if new_rttype == "export":
+                    if old_rttype == "import" or old_rttype == "both":
+                        cmd += " -c 'no route-target import {}'".format(rt)
+                if new_rttype == "import":
+                    if old_rttype == "export" or old_rttype == "both":
+                        cmd += " -c 'no route-target export {}'".format(rt)
+        if not self.__run_command(table, cmd):
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN RT config command')
+            return
+        else:
+            data['route-target-type'].status = CachedDataWithOp.STAT_SUCC
+
+    def __update_bgp_evpn_vni_rt(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        af_type, vni, rt = key.split('|')
+        af, ip_type = af_type.lower().split('_')
+        nostr = "no " if del_table else ""
+        syslog_lazy(syslog.LOG_INFO, 'Set address family for VNI {} RT {} to {} {}', vni, rt, af, ip_type)
+        cmd = "vtysh -c 'configure terminal'"
+        cmd += " -c 'router bgp {} vrf {}'".format(local_asn, vrf)
+        cmd += " -c 'address-family {} {}'".format(af, ip_type)
+        cmd += " -c 'vni {}'".format(vni)
+        cmd += " -c '{}route-target {} {}'".format(nostr,data['route-target-type'].data, rt)
+        cache_tbl_key = 'BGP_GLOBALS_EVPN_VNI_RT&&{}|L2VPN_EVPN|{}|{}'.format(vrf, vni, rt)
+        if not del_table and cache_tbl_key in self.table_data_cache.keys():
+            new_rttype = data['route-target-type'].data
+            cache_tbl_data = self.table_data_cache[cache_tbl_key]
+            if 'route-target-type' in cache_tbl_data:
+                old_rttype = cache_tbl_data['route-target-type']
+                if new_rttype == "export":
+                    if old_rttype == "import" or old_rttype == "both":
+                        cmd += " -c 'no route-target import {}'".format(rt)
+                if new_rttype == "import":
+                    if old_rttype == "export" or old_rttype == "both":
+                        cmd += " -c 'no route-target export {}'".format(rt)
+        if not self.__run_command(table, cmd):
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP L2VPN_EVPN VNI RT config command')
+            return
+        else:
+            data['route-target-type'].status = CachedDataWithOp.STAT_SUCC
+
+    def __update_route_map(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        map_name = prefix
+        seq_no = key
+        if not del_table:
+            if 'route_operation' in data:
+                dval = data['route_operation']
+                if dval.op != CachedDataWithOp.OP_NONE:
+                    enable = (dval.op != CachedDataWithOp.OP_DELETE)
+                    no_arg = CommandArgument(self, enable)
+                    command = "vtysh -c 'configure terminal' -c '{:no-prefix}route-map {} {} {}'".\
+                               format(no_arg, map_name, dval.data, seq_no)
                     if not self.__run_command(table, command):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running route-map delete command')
-                        continue
-                    self.__delete_route_map(map_name, seq_no, data)
-            elif table == 'ROUTE_REDISTRIBUTE':
-                src_proto, dst_proto, af = key.split('|')
-                if af == 'ipv6' and src_proto == 'ospf3':
-                    src_proto = 'ospf6'
-                ip_type = 'unicast'
-                syslog.syslog(syslog.LOG_INFO, 'Set route distribute for src_proto {} dst_proto {} {}'.\
-                                format(src_proto, dst_proto, af, ip_type))
-                if dst_proto != 'bgp':
-                    syslog.syslog(syslog.LOG_ERR, 'only bgp could be used as dst protocol, but {} was given'.format(dst_proto))
-                    continue
-                op = CachedDataWithOp.OP_DELETE if del_table else CachedDataWithOp.OP_UPDATE
-                data['protocol'] = CachedDataWithOp(src_proto, op)
-                cmd_prefix = ['configure terminal',
-                              'router bgp {} vrf {}'.format(local_asn, vrf),
-                              'address-family {} {}'.format(af, ip_type)]
-                ret_val = key_map.run_command(self, table, data, cmd_prefix)
-                del(data['protocol'])
-                if not ret_val:
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP route redistribute config command')
-                    continue
-            elif table == 'BGP_GLOBALS_AF_AGGREGATE_ADDR' or table == 'BGP_GLOBALS_AF_NETWORK':
-                af_type, ip_prefix = key.split('|')
-                af, ip_type = af_type.lower().split('_')
-                norm_ip_prefix = MatchPrefix.normalize_ip_prefix((socket.AF_INET if af == 'ipv4' else socket.AF_INET6), ip_prefix)
-                if norm_ip_prefix is None:
-                    syslog.syslog(syslog.LOG_ERR, 'invalid IP prefix format %s for af %s' % (ip_prefix, af))
-                    continue
-                syslog.syslog(syslog.LOG_INFO, 'Set address family for IP prefix {} to {} {}'.format(norm_ip_prefix, af, ip_type))
-                op = CachedDataWithOp.OP_DELETE if del_table else CachedDataWithOp.OP_UPDATE
-                data['ip_prefix'] = CachedDataWithOp(norm_ip_prefix, op)
-                cmd_prefix = ['configure terminal',
-                              'router bgp {} vrf {}'.format(local_asn, vrf),
-                              'address-family {} {}'.format(af, ip_type)]
-                ret_val = key_map.run_command(self, table, data, cmd_prefix, vrf, af)
-                del(data['ip_prefix'])
-                if not ret_val:
-                    syslog.syslog(syslog.LOG_ERR, 'failed running BGP IP prefix AF config command')
-                    continue
-                if table == 'BGP_GLOBALS_AF_AGGREGATE_ADDR':
-                    if not del_table:
-                        aggr_obj = AggregateAddr()
-                        for attr in ['as_set', 'summary_only']:
-                            if attr in data and data[attr].op != CachedDataWithOp.OP_DELETE and data[attr].data == 'true':
-                                setattr(aggr_obj, attr, True)
-                        self.af_aggr_list.setdefault(vrf, {})[norm_ip_prefix] = aggr_obj
-                    else:
-                        if vrf in self.af_aggr_list:
-                            self.af_aggr_list[vrf].pop(norm_ip_prefix, None)
-
-            elif table == 'BFD_PEER_SINGLE_HOP':
-                key = prefix + '|' + key
-                remoteaddr, interface, vrf, localaddr = key.split('|')
-                if not del_table:
-                    if not 'null' in localaddr:
-                        syslog.syslog(syslog.LOG_INFO, 'Set BFD single hop peer {} {} {} {}'.format(remoteaddr, vrf, interface, localaddr))
-
-                        suffix_cmd, oper = self.__bfd_handle_delete (data)
-                        if suffix_cmd and oper == CachedDataWithOp.OP_DELETE:
-                            command = "vtysh -c 'configure terminal' -c 'bfd' -c 'peer {} local-address {} vrf {} interface {}' -c '{}'".\
-                            format(remoteaddr, localaddr, vrf, interface, suffix_cmd)
-
-                            if not self.__run_command(table, command):
-                                syslog.syslog(syslog.LOG_ERR, 'failed to delete single-hop peer {}'.format(key))
-                                continue
-                        else:
-                            cmd_prefix = ['configure terminal',
-                                          'bfd',
-                                          'peer {} local-address {} vrf {} interface {}'.format(remoteaddr, localaddr, vrf, interface)]
-                            if not key_map.run_command(self, table, data, cmd_prefix):
-                                syslog.syslog(syslog.LOG_ERR, 'failed running BFD single-hop config command')
-                                continue
+                        syslog.syslog(syslog.LOG_ERR, 'failed to configure route-map {} seq {}'.format(map_name, seq_no))
+                        return
+                    if dval.op == CachedDataWithOp.OP_DELETE:
+                        self.__delete_route_map(map_name, seq_no, data)
+                        return
+                    self.route_map.setdefault(map_name, {})[seq_no] = dval.data
+                    for k, v in data.items():
+                        if v.op == CachedDataWithOp.OP_NONE:
+                            v.op = CachedDataWithOp.OP_UPDATE
+                dval.status = CachedDataWithOp.STAT_SUCC
+            if map_name not in self.route_map or seq_no not in self.route_map[map_name]:
+                syslog.syslog(syslog.LOG_ERR, 'route-map {} seq {} not found for update'.format(map_name, seq_no))
+                return
+            cmd_prefix = ['configure terminal',
+                          'route-map {} {} {}'.format(map_name, self.route_map[map_name][seq_no], seq_no)]
+            if not key_map.run_command(self, table, data, cmd_prefix):
+                syslog.syslog(syslog.LOG_ERR, 'failed running route-map config command')
+                return
+        else:
+            if map_name not in self.route_map or seq_no not in self.route_map[map_name]:
+                syslog.syslog(syslog.LOG_ERR, 'route-map {} seq {} not found for delete'.format(map_name, seq_no))
+                return
+            command = "vtysh -c 'configure terminal' -c 'no route-map {} {} {}'".\
+                       format(map_name, self.route_map[map_name][seq_no], seq_no)
+            if not self.__run_command(table, command):
+                syslog.syslog(syslog.LOG_ERR, 'failed running route-map delete command')
+                return
+            self.__delete_route_map(map_name, seq_no, data)
+
+    def __update_route_redist(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        src_proto, dst_proto, af = key.split('|')
+        if af == 'ipv6' and src_proto == 'ospf3':
+            src_proto = 'ospf6'
+        ip_type = 'unicast'
+        syslog.syslog(syslog.LOG_INFO, 'Set route distribute for src_proto {} dst_proto {} {}'.\
+                        format(src_proto, dst_proto, af, ip_type))
+        if dst_proto != 'bgp':
+            syslog.syslog(syslog.LOG_ERR, 'only bgp could be used as dst protocol, but {} was given'.format(dst_proto))
+            return
+        op = CachedDataWithOp.OP_DELETE if del_table else CachedDataWithOp.OP_UPDATE
+        data['protocol'] = CachedDataWithOp(src_proto, op)
+        cmd_prefix = ['configure terminal',
+                      'router bgp {} vrf {}'.format(local_asn, vrf),
+                      'address-family {} {}'.format(af, ip_type)]
+        ret_val = key_map.run_command(self, table, data, cmd_prefix)
+        del(data['protocol'])
+        if not ret_val:
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP route redistribute config command')
+            return
 
-                    else:
-                        syslog.syslog(syslog.LOG_INFO, 'Set BFD single hop peer {} {} {}'.format(remoteaddr, vrf, interface))
+    def __update_bgp_af_prefix(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        af_type, ip_prefix = key.split('|')
+        af, ip_type = af_type.lower().split('_')
+        norm_ip_prefix = MatchPrefix.normalize_ip_prefix((socket.AF_INET if af == 'ipv4' else socket.AF_INET6), ip_prefix)
+        if norm_ip_prefix is None:
+            syslog.syslog(syslog.LOG_ERR, 'invalid IP prefix format %s for af %s' % (ip_prefix, af))
+            return
+        syslog_lazy(syslog.LOG_INFO, 'Set address family for IP prefix {} to {} {}', norm_ip_prefix, af, ip_type)
+        op = CachedDataWithOp.OP_DELETE if del_table else CachedDataWithOp.OP_UPDATE
+        data['ip_prefix'] = CachedDataWithOp(norm_ip_prefix, op)
+        cmd_prefix = ['configure terminal',
+                      'router bgp {} vrf {}'.format(local_asn, vrf),
+                      'address-family {} {}'.format(af, ip_type)]
+        ret_val = key_map.run_command(self, table, data, cmd_prefix, vrf, af)
+        del(data['ip_prefix'])
+        if not ret_val:
+            syslog.syslog(syslog.LOG_ERR, 'failed running BGP IP prefix AF config command')
+            return
+        if table == 'BGP_GLOBALS_AF_AGGREGATE_ADDR':
+            if not del_table:
+                aggr_obj = AggregateAddr()
+                for attr in ['as_set', 'summary_only']:
+                    if attr in data and data[attr].op != CachedDataWithOp.OP_DELETE and data[attr].data == 'true':
+                        setattr(aggr_obj, attr, True)
+                self.af_aggr_list.setdefault(vrf, {})[norm_ip_prefix] = aggr_obj
+            else:
+                if vrf in self.af_aggr_list:
+                    self.af_aggr_list[vrf].pop(norm_ip_prefix, None)
 
-                        suffix_cmd, oper = self.__bfd_handle_delete (data)
+    def __update_bfd_shop_peer(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        key = prefix + '|' + key
+        remoteaddr, interface, vrf, localaddr = key.split('|')
+        if not del_table:
+            if not 'null' in localaddr:
+                syslog_lazy(syslog.LOG_INFO, 'Set BFD single hop peer {} {} {} {}', remoteaddr, vrf, interface, localaddr)
 
-                        if suffix_cmd and oper == CachedDataWithOp.OP_DELETE:
-                            command = "vtysh -c 'configure terminal' -c 'bfd' -c 'peer {} vrf {} interface {}' -c '{}'".\
-                            format(remoteaddr, vrf, interface, suffix_cmd)
+                suffix_cmd, oper = self.__bfd_handle_delete (data)
+                if suffix_cmd and oper == CachedDataWithOp.OP_DELETE:
+                    command = "vtysh -c 'configure terminal' -c 'bfd' -c 'peer {} local-address {} vrf {} interface {}' -c '{}'".\
+                    format(remoteaddr, localaddr, vrf, interface, suffix_cmd)
 
-                            if not self.__run_command(table, command):
-                                syslog.syslog(syslog.LOG_ERR, 'failed to delete single-hop peer {}'.format(key))
-                                continue
-                        else:
-                            syslog.syslog(syslog.LOG_INFO, 'Set BFD single hop peer {} {} {}'.format(remoteaddr, vrf, interface))
-                            cmd_prefix = ['configure terminal',
-                                          'bfd',
-                                          'peer {} vrf {} interface {}'.format(remoteaddr, vrf, interface)]
-                            if not key_map.run_command(self, table, data, cmd_prefix):
-                                syslog.syslog(syslog.LOG_ERR, 'failed running BFD single-hop config command')
-                                continue
-                else:
-                    if 'local-address' in data:
-                        dval = data['local-address']
-                        localaddr = dval.data
-                        syslog.syslog(syslog.LOG_INFO, 'Delete BFD single hop to {} {} {}'.format(remoteaddr, vrf, interface, localaddr))
-                        command = "vtysh -c 'configure terminal' -c 'bfd' -c 'no peer {} local-address {} vrf {} interface {}'".\
-                            format(remoteaddr, localaddr, vrf, interface)
-                    else:
-                        syslog.syslog(syslog.LOG_INFO, 'Delete BFD single hop to {} {} {}'.format(remoteaddr, vrf, interface))
-                        command = "vtysh -c 'configure terminal' -c 'bfd' -c 'no peer {} vrf {} interface {}'".\
-                            format(remoteaddr, vrf, interface)
                     if not self.__run_command(table, command):
                         syslog.syslog(syslog.LOG_ERR, 'failed to delete single-hop peer {}'.format(key))
-                        continue
-                    self.__delete_bfd_peer(data)
-            elif table == 'BFD_PEER_MULTI_HOP':
-                key = prefix + '|' + key
-                remoteaddr, interface, vrf, localaddr = key.split('|')
-                if not del_table:
-                    syslog.syslog(syslog.LOG_INFO, 'Set BFD multi hop to {} {} {} {}'.format(remoteaddr, interface, vrf, localaddr))
-                    suffix_cmd, oper = self.__bfd_handle_delete (data)
-                    if suffix_cmd and oper == CachedDataWithOp.OP_DELETE:
-                        if not 'null' in interface:
-                            command = "vtysh -c 'configure terminal' -c 'bfd' -c 'peer {} local-address {} vrf {} interface {}' -c '{}'".\
-                            format(remoteaddr, localaddr, vrf, interface, suffix_cmd)
-                        else:
-                            command = "vtysh -c 'configure terminal' -c 'bfd' -c 'peer {} local-address {} vrf {}' -c '{}'".\
-                            format(remoteaddr, localaddr, vrf, suffix_cmd)
-
-                        if not self.__run_command(table, command):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to delete single-hop peer {}'.format(key))
-                            continue
-                    else:
-                        if not 'null' in interface:
-                            cmd_prefix = ['configure terminal',
-                                          'bfd',
-                                                'peer {} vrf {} multihop local-address {} interface {}'.format(remoteaddr, vrf, localaddr, interface)]
-                        else:
-                            cmd_prefix = ['configure terminal',
-                                          'bfd',
-                                          'peer {} vrf {} multihop local-address {}'.format(remoteaddr, vrf, localaddr)]
-
-                        if not key_map.run_command(self, table, data, cmd_prefix):
-                            syslog.syslog(syslog.LOG_ERR, 'failed running BFD multi-hop config command')
-                            continue
+                        return
                 else:
-                    syslog.syslog(syslog.LOG_INFO, 'Delete BFD multi hop to {} {} {} {}'.format(remoteaddr, vrf, localaddr, interface))
-                    if not 'null' in interface:
-                        command = "vtysh -c 'configure terminal' -c 'bfd' -c 'no peer {} vrf {} multihop local-address {} interface {}'".\
-                        format(remoteaddr, vrf, localaddr, interface)
-                    else:
-                        command = "vtysh -c 'configure terminal' -c 'bfd' -c 'no peer {} vrf {} multihop local-address {}'".\
-                        format(remoteaddr, vrf, localaddr)
+                    cmd_prefix = ['configure terminal',
+                                  'bfd',
+                                  'peer {} local-address {} vrf {} interface {}'.format(remoteaddr, localaddr, vrf, interface)]
+                    if not key_map.run_command(self, table, data, cmd_prefix):
+                        syslog.syslog(syslog.LOG_ERR, 'failed running BFD single-hop config command')
+                        return
 
-                    if not self.__run_command(table, command):
-                        syslog.syslog(syslog.LOG_ERR, 'failed to delete multihop peer {}'.format(key))
-                        continue
-                    self.__delete_bfd_peer(data)
-            elif table == 'IP_SLA':
-                sla_id = prefix
-                icmp_config = False
-                tcp_config = False
-                cmd_prefix = ['configure terminal']
-                ipsla_table = self.config_db.get_table('IP_SLA')
-                syslog.syslog(syslog.LOG_INFO, 'Config ip sla data {}'.format(data))
-                found_in_configdb = False
-                for key, entry in ipsla_table.items():
-                    ipsla_id = key
-                    if sla_id == ipsla_id:
-                        found_in_configdb = True
-                        break
-                syslog.syslog(syslog.LOG_INFO, 'Config ip sla found_in_configdb {}'.format(found_in_configdb))
-                if 'icmp_source_interface' in data or 'icmp_source_ip' in data or  'icmp_size' in data or 'icmp_dst_ip' in data or 'icmp_vrf' in data or 'icmp_ttl' in data or 'icmp_tos' in data:
-                    cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id)]
-                    icmp_config = True
-                    for key, entry in ipsla_table.items():
-                        ipsla_id = key
-                        if sla_id == ipsla_id:
-                            if 'icmp_dst_ip' in entry:
-                                icmp_cmd = ("icmp", "echo")
-                                icmp_cmd_str = "-".join(icmp_cmd)
-                                icmp_cmd_mode = icmp_cmd_str + " " + entry['icmp_dst_ip']
-                                syslog.syslog(syslog.LOG_INFO, 'Data: icmp_cmd_str %s icmp_cmd_mode %s' % (icmp_cmd_str, icmp_cmd_mode))
-
-                                cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id), icmp_cmd_mode]
-                                chk_icmp_attrs = ['icmp_source_interface', 'icmp_source_ip', 'icmp_size', 'icmp_vrf', 'icmp_tos', 'icmp_ttl']
-                                chk_icmp_attrs_dict = {'icmp_source_interface':'source-interface ', 'icmp_source_ip':'source-address ', 'icmp_size':'request-data-size ', 'icmp_vrf':'source-vrf ', 'icmp_tos':'tos ', 'icmp_ttl':'ttl '}
-                                for attr in chk_icmp_attrs:
-                                    if attr in data and data[attr].op != CachedDataWithOp.OP_DELETE:
-                                        command = "vtysh -c 'configure terminal' -c 'ip sla {}' -c '{}' -c '{} {}'".\
-                                        format(sla_id, icmp_cmd_mode, chk_icmp_attrs_dict[attr], data[attr].data)
-                                        syslog.syslog(syslog.LOG_INFO, 'Execute Icmp Cmd {}'.format(command))
-                                        if not self.__run_command(table, command):
-                                            syslog.syslog(syslog.LOG_ERR, 'failed to add icmp config for  ip sla {}'.format(sla_id))
-                                            continue
-
-                    syslog.syslog(syslog.LOG_INFO, 'Done with Icmp {}'.format(sla_id))
-                    if not key_map.run_command(self, table, data, cmd_prefix, sla_id):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running ip sla command')
-                        continue
-                if 'tcp_source_interface' in data or 'tcp_source_port' in data or 'tcp_source_ip' in data or 'tcp_dst_ip' in data or 'tcp_dst_port' in data or 'tcp_vrf' in data or 'tcp_ttl' in data or 'tcp_tos' in data:
-                    cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id)]
-                    tcp_config = True
-                    for key, entry in ipsla_table.items():
-                        ipsla_id = key
-                        if sla_id == ipsla_id:
-                            if 'tcp_dst_ip' in entry and 'tcp_dst_port' in entry:
-                                tcp_cmd = ("tcp", "connect")
-                                tcp_cmd_str = "-".join(tcp_cmd)
-                                tcp_cmd_mode = tcp_cmd_str + " " + entry['tcp_dst_ip'] + " port " + entry['tcp_dst_port']
-                                syslog.syslog(syslog.LOG_INFO, 'Init Config DB Data: tcp_cmd_str %s tcp_cmd_mode %s' % (tcp_cmd_str, tcp_cmd_mode))
-                                cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id), tcp_cmd_mode]
-                                chk_tcp_attrs = ['tcp_source_interface', 'tcp_source_ip', 'tcp_source_port', 'tcp_vrf', 'tcp_tos', 'tcp_ttl']
-                                chk_tcp_attrs_dict = {'tcp_source_interface':'source-interface ', 'tcp_source_ip':'source-address ', 'tcp_source_port':'source-port ', 'tcp_vrf':'source-vrf ', 'tcp_tos':'tos ', 'tcp_ttl':'ttl '}
-                                for attr in chk_tcp_attrs:
-                                    if attr in data and data[attr].op != CachedDataWithOp.OP_DELETE:
-                                        command = "vtysh -c 'configure terminal' -c 'ip sla {}' -c '{}' -c '{} {}'".\
-                                        format(sla_id, tcp_cmd_mode, chk_tcp_attrs_dict[attr], data[attr].data)
-                                        syslog.syslog(syslog.LOG_INFO, 'Execute Tcp Cmd {}'.format(command))
-                                        if not self.__run_command(table, command):
-                                            syslog.syslog(syslog.LOG_ERR, 'failed to add Tcp config for  ip sla {}'.format(sla_id))
-                                            continue
-
-                    syslog.syslog(syslog.LOG_INFO, 'Done with Tcp {}'.format(sla_id))
-                    if not key_map.run_command(self, table, data, cmd_prefix, sla_id):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running ip sla command')
-                        continue
-                if 'frequency' in data or 'threshold' in data or 'timeout' in data:
-                    syslog.syslog(syslog.LOG_INFO, 'ip sla mode Configure freq/thresh/timeout for sla {}'.format(sla_id))
-                    cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id)]
-                    if not key_map.run_command(self, table, data, cmd_prefix, sla_id):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running ip sla command')
-                        continue
+            else:
+                syslog_lazy(syslog.LOG_INFO, 'Set BFD single hop peer {} {} {}', remoteaddr, vrf, interface)
 
-                elif icmp_config == False or tcp_config == False:
-                    syslog.syslog(syslog.LOG_INFO, 'Basic mode Configure for ip sla {}'.format(sla_id))
-                    cmd_prefix = ['configure terminal']
+                suffix_cmd, oper = self.__bfd_handle_delete (data)
 
-                # Always delete ip sla if it is not found in configdb
-                if not found_in_configdb:
-                    command = "vtysh -c 'configure terminal' -c 'no ip sla {}'".format(sla_id)
-                    syslog.syslog(syslog.LOG_ERR, 'Entry deleted in ip sla config db')
-                    if not self.__run_command(table, command):
-                        syslog.syslog(syslog.LOG_ERR, 'failed to delete router ip sla {}'.format(sla_id))
-                        continue
-                elif not key_map.run_command(self, table, data, cmd_prefix, sla_id):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running ip sla command')
-                    continue
-
-            elif table == 'OSPFV2_ROUTER':
-                vrf = prefix
-                if not del_table:
-                    syslog.syslog(syslog.LOG_INFO, 'Create router ospf vrf {}'.format(vrf))
+                if suffix_cmd and oper == CachedDataWithOp.OP_DELETE:
+                    command = "vtysh -c 'configure terminal' -c 'bfd' -c 'peer {} vrf {} interface {}' -c '{}'".\
+                    format(remoteaddr, vrf, interface, suffix_cmd)
 
+                    if not self.__run_command(table, command):
+                        syslog.syslog(syslog.LOG_ERR, 'failed to delete single-hop peer {}'.format(key))
+                        return
+                else:
+                    syslog_lazy(syslog.LOG_INFO, 'Set BFD single hop peer {} {} {}', remoteaddr, vrf, interface)
                     cmd_prefix = ['configure terminal',
-                                  'router ospf vrf {}'.format(vrf)]
-
+                                  'bfd',
+                                  'peer {} vrf {} interface {}'.format(remoteaddr, vrf, interface)]
                     if not key_map.run_command(self, table, data, cmd_prefix):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running ospf config command')
-                        continue
+                        syslog.syslog(syslog.LOG_ERR, 'failed running BFD single-hop config command')
+                        return
+        else:
+            if 'local-address' in data:
+                dval = data['local-address']
+                localaddr = dval.data
+                syslog_lazy(syslog.LOG_INFO, 'Delete BFD single hop to {} {} {}', remoteaddr, vrf, interface, localaddr)
+                command = "vtysh -c 'configure terminal' -c 'bfd' -c 'no peer {} local-address {} vrf {} interface {}'".\
+                    format(remoteaddr, localaddr, vrf, interface)
+            else:
+                syslog_lazy(syslog.LOG_INFO, 'Delete BFD single hop to {} {} {}', remoteaddr, vrf, interface)
+                command = "vtysh -c 'configure terminal' -c 'bfd' -c 'no peer {} vrf {} interface {}'".\
+                    format(remoteaddr, vrf, interface)
+            if not self.__run_command(table, command):
+                syslog.syslog(syslog.LOG_ERR, 'failed to delete single-hop peer {}'.format(key))
+                return
+            self.__delete_bfd_peer(data)
+
+    def __update_bfd_mhop_peer(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        key = prefix + '|' + key
+        remoteaddr, interface, vrf, localaddr = key.split('|')
+        if not del_table:
+            syslog_lazy(syslog.LOG_INFO, 'Set BFD multi hop to {} {} {} {}', remoteaddr, interface, vrf, localaddr)
+            suffix_cmd, oper = self.__bfd_handle_delete (data)
+            if suffix_cmd and oper == CachedDataWithOp.OP_DELETE:
+                if not 'null' in interface:
+                    command = "vtysh -c 'configure terminal' -c 'bfd' -c 'peer {} local-address {} vrf {} interface {}' -c '{}'".\
+                    format(remoteaddr, localaddr, vrf, interface, suffix_cmd)
                 else:
-                    command = "vtysh -c 'configure terminal' -c 'no router ospf vrf {}'".format(vrf)
+                    command = "vtysh -c 'configure terminal' -c 'bfd' -c 'peer {} local-address {} vrf {}' -c '{}'".\
+                    format(remoteaddr, localaddr, vrf, suffix_cmd)
 
-                    if not self.__run_command(table, command):
-                        syslog.syslog(syslog.LOG_ERR, 'failed to delete router ospf vrf {}'.format(vrf))
-                        continue
-                    else:
-                        self.__ospf_delete(data)
-
-            elif table == 'OSPFV2_ROUTER_AREA':
-                vrf = prefix
-                syslog.syslog(syslog.LOG_INFO, 'Create router ospf vrf {}'.format(vrf))
-
-                cmd_prefix = ['configure terminal',
-                              'router ospf vrf {}'.format(vrf)]
-
-                if not key_map.run_command(self, table, data, cmd_prefix, key):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running ospf config command')
-                    continue
-            elif table == 'OSPFV2_ROUTER_AREA_VIRTUAL_LINK':
-                vrf = prefix
-
-                keyvals = key.split('|')
-                area = keyvals[0]
-                vlinkid = keyvals[1]
-
-                syslog.syslog(syslog.LOG_INFO, 'Create router ospf vrf {}, Vlink: {}, tableop {}'.format(vrf, data, del_table))
-
-                if data == {}:
-                    command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no area {} virtual-link {}'".\
-                    format(vrf, area, vlinkid)
-
-                    if not self.__run_command(table, command):
-                        syslog.syslog(syslog.LOG_ERR, 'failed to delete vlink {} {}'.format(area, vlinkid))
-                        continue
-                    else:
-                        self.__ospf_delete(data)
+                if not self.__run_command(table, command):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to delete single-hop peer {}'.format(key))
+                    return
+            else:
+                if not 'null' in interface:
+                    cmd_prefix = ['configure terminal',
+                                  'bfd',
+                                        'peer {} vrf {} multihop local-address {} interface {}'.format(remoteaddr, vrf, localaddr, interface)]
                 else:
                     cmd_prefix = ['configure terminal',
-                                  'router ospf vrf {}'.format(vrf)]
+                                  'bfd',
+                                  'peer {} vrf {} multihop local-address {}'.format(remoteaddr, vrf, localaddr)]
 
-                    if not key_map.run_command(self, table, data, cmd_prefix, area, vlinkid):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running ospf config command')
-                        continue
+                if not key_map.run_command(self, table, data, cmd_prefix):
+                    syslog.syslog(syslog.LOG_ERR, 'failed running BFD multi-hop config command')
+                    return
+        else:
+            syslog_lazy(syslog.LOG_INFO, 'Delete BFD multi hop to {} {} {} {}', remoteaddr, vrf, localaddr, interface)
+            if not 'null' in interface:
+                command = "vtysh -c 'configure terminal' -c 'bfd' -c 'no peer {} vrf {} multihop local-address {} interface {}'".\
+                format(remoteaddr, vrf, localaddr, interface)
+            else:
+                command = "vtysh -c 'configure terminal' -c 'bfd' -c 'no peer {} vrf {} multihop local-address {}'".\
+                format(remoteaddr, vrf, localaddr)
+
+            if not self.__run_command(table, command):
+                syslog.syslog(syslog.LOG_ERR, 'failed to delete multihop peer {}'.format(key))
+                return
+            self.__delete_bfd_peer(data)
+
+    def __update_ip_sla(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        sla_id = prefix
+        icmp_config = False
+        tcp_config = False
+        cmd_prefix = ['configure terminal']
+        ipsla_table = self.config_db.get_table('IP_SLA')
+        syslog_lazy(syslog.LOG_INFO, 'Config ip sla data {}', data)
+        found_in_configdb = False
+        for key, entry in ipsla_table.items():
+            ipsla_id = key
+            if sla_id == ipsla_id:
+                found_in_configdb = True
+                break
+        syslog_lazy(syslog.LOG_INFO, 'Config ip sla found_in_configdb {}', found_in_configdb)
+        if 'icmp_source_interface' in data or 'icmp_source_ip' in data or  'icmp_size' in data or 'icmp_dst_ip' in data or 'icmp_vrf' in data or 'icmp_ttl' in data or 'icmp_tos' in data:
+            cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id)]
+            icmp_config = True
+            for key, entry in ipsla_table.items():
+                ipsla_id = key
+                if sla_id == ipsla_id:
+                    if 'icmp_dst_ip' in entry:
+                        icmp_cmd = ("icmp", "echo")
+                        icmp_cmd_str = "-".join(icmp_cmd)
+                        icmp_cmd_mode = icmp_cmd_str + " " + entry['icmp_dst_ip']
+                        syslog.syslog(syslog.LOG_INFO, 'Data: icmp_cmd_str %s icmp_cmd_mode %s' % (icmp_cmd_str, icmp_cmd_mode))
+
+                        cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id), icmp_cmd_mode]
+                        chk_icmp_attrs = ['icmp_source_interface', 'icmp_source_ip', 'icmp_size', 'icmp_vrf', 'icmp_tos', 'icmp_ttl']
+                        chk_icmp_attrs_dict = {'icmp_source_interface':'source-interface ', 'icmp_source_ip':'source-address ', 'icmp_size':'request-data-size ', 'icmp_vrf':'source-vrf ', 'icmp_tos':'tos ', 'icmp_ttl':'ttl '}
+                        for attr in chk_icmp_attrs:
+                            if attr in data and data[attr].op != CachedDataWithOp.OP_DELETE:
+                                command = "vtysh -c 'configure terminal' -c 'ip sla {}' -c '{}' -c '{} {}'".\
+                                format(sla_id, icmp_cmd_mode, chk_icmp_attrs_dict[attr], data[attr].data)
+                                syslog_lazy(syslog.LOG_INFO, 'Execute Icmp Cmd {}', command)
+                                if not self.__run_command(table, command):
+                                    syslog.syslog(syslog.LOG_ERR, 'failed to add icmp config for  ip sla {}'.format(sla_id))
+                                    continue
+
+            syslog_lazy(syslog.LOG_INFO, 'Done with Icmp {}', sla_id)
+            if not key_map.run_command(self, table, data, cmd_prefix, sla_id):
+                syslog.syslog(syslog.LOG_ERR, 'failed running ip sla command')
+                return
+        if 'tcp_source_interface' in data or 'tcp_source_port' in data or 'tcp_source_ip' in data or 'tcp_dst_ip' in data or 'tcp_dst_port' in data or 'tcp_vrf' in data or 'tcp_ttl' in data or 'tcp_tos' in data:
+            cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id)]
+            tcp_config = True
+            for key, entry in ipsla_table.items():
+                ipsla_id = key
+                if sla_id == ipsla_id:
+                    if 'tcp_dst_ip' in entry and 'tcp_dst_port' in entry:
+                        tcp_cmd = ("tcp", "connect")
+                        tcp_cmd_str = "-".join(tcp_cmd)
+                        tcp_cmd_mode = tcp_cmd_str + " " + entry['tcp_dst_ip'] + " port " + entry['tcp_dst_port']
+                        syslog.syslog(syslog.LOG_INFO, 'Init Config DB Data: tcp_cmd_str %s tcp_cmd_mode %s' % (tcp_cmd_str, tcp_cmd_mode))
+                        cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id), tcp_cmd_mode]
+                        chk_tcp_attrs = ['tcp_source_interface', 'tcp_source_ip', 'tcp_source_port', 'tcp_vrf', 'tcp_tos', 'tcp_ttl']
+                        chk_tcp_attrs_dict = {'tcp_source_interface':'source-interface ', 'tcp_source_ip':'source-address ', 'tcp_source_port':'source-port ', 'tcp_vrf':'source-vrf ', 'tcp_tos':'tos ', 'tcp_ttl':'ttl '}
+                        for attr in chk_tcp_attrs:
+                            if attr in data and data[attr].op != CachedDataWithOp.OP_DELETE:
+                                command = "vtysh -c 'configure terminal' -c 'ip sla {}' -c '{}' -c '{} {}'".\
+                                format(sla_id, tcp_cmd_mode, chk_tcp_attrs_dict[attr], data[attr].data)
+                                syslog_lazy(syslog.LOG_INFO, 'Execute Tcp Cmd {}', command)
+                                if not self.__run_command(table, command):
+                                    syslog.syslog(syslog.LOG_ERR, 'failed to add Tcp config for  ip sla {}'.format(sla_id))
+                                    continue
+
+            syslog_lazy(syslog.LOG_INFO, 'Done with Tcp {}', sla_id)
+            if not key_map.run_command(self, table, data, cmd_prefix, sla_id):
+                syslog.syslog(syslog.LOG_ERR, 'failed running ip sla command')
+                return
+        if 'frequency' in data or 'threshold' in data or 'timeout' in data:
+            syslog_lazy(syslog.LOG_INFO, 'ip sla mode Configure freq/thresh/timeout for sla {}', sla_id)
+            cmd_prefix = ['configure terminal','ip sla {}'.format(sla_id)]
+            if not key_map.run_command(self, table, data, cmd_prefix, sla_id):
+                syslog.syslog(syslog.LOG_ERR, 'failed running ip sla command')
+                return
+
+        elif icmp_config == False or tcp_config == False:
+            syslog_lazy(syslog.LOG_INFO, 'Basic mode Configure for ip sla {}', sla_id)
+            cmd_prefix = ['configure terminal']
+
+        # Always delete ip sla if it is not found in configdb
+        if not found_in_configdb:
+            command = "vtysh -c 'configure terminal' -c 'no ip sla {}'".format(sla_id)
+            syslog.syslog(syslog.LOG_ERR, 'Entry deleted in ip sla config db')
+            if not self.__run_command(table, command):
+                syslog.syslog(syslog.LOG_ERR, 'failed to delete router ip sla {}'.format(sla_id))
+                return
+        elif not key_map.run_command(self, table, data, cmd_prefix, sla_id):
+            syslog.syslog(syslog.LOG_ERR, 'failed running ip sla command')
+            return
 
-                    if del_table:
-                        command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no area {} virtual-link {}'".\
-                        format(vrf, area, vlinkid)
+    def __update_ospf_router(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        vrf = prefix
+        if not del_table:
+            syslog_lazy(syslog.LOG_INFO, 'Create router ospf vrf {}', vrf)
 
-                        if not self.__run_command(table, command):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to delete vlink {} {}'.format(area, vlinkid))
-                            continue
-                        else:
-                            self.__ospf_delete(data)
+            cmd_prefix = ['configure terminal',
+                          'router ospf vrf {}'.format(vrf)]
 
-            elif table == 'OSPFV2_ROUTER_AREA_NETWORK':
-                vrf = prefix
-                syslog.syslog(syslog.LOG_INFO, 'Create router ospf vrf {}'.format(vrf))
+            if not key_map.run_command(self, table, data, cmd_prefix):
+                syslog.syslog(syslog.LOG_ERR, 'failed running ospf config command')
+                return
+        else:
+            command = "vtysh -c 'configure terminal' -c 'no router ospf vrf {}'".format(vrf)
 
-                keyvals = key.split('|')
-                area = keyvals[0]
-                network = keyvals[1]
+            if not self.__run_command(table, command):
+                syslog.syslog(syslog.LOG_ERR, 'failed to delete router ospf vrf {}'.format(vrf))
+                return
+            else:
+                self.__ospf_delete(data)
 
-                if not del_table:
-                    command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'network {} area {}'".\
-                    format(vrf, network, area)
+    def __update_ospf_area(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        vrf = prefix
+        syslog_lazy(syslog.LOG_INFO, 'Create router ospf vrf {}', vrf)
 
-                    if not self.__run_command(table, command):
-                        syslog.syslog(syslog.LOG_ERR, 'failed to create network {} {}'.format(area, network))
-                        continue
-                else:
-                    command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no network {} area {}'".\
-                    format(vrf, network, area)
+        cmd_prefix = ['configure terminal',
+                      'router ospf vrf {}'.format(vrf)]
 
-                    if not self.__run_command(table, command):
-                        syslog.syslog(syslog.LOG_ERR, 'failed to delete network {} {}'.format(area, network))
-                        continue
-                    else:
-                        self.__ospf_delete(data)
+        if not key_map.run_command(self, table, data, cmd_prefix, key):
+            syslog.syslog(syslog.LOG_ERR, 'failed running ospf config command')
+            return
 
-            elif table == 'OSPFV2_ROUTER_AREA_POLICY_ADDRESS_RANGE':
-                vrf = prefix
+    def __update_ospf_vlink(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        vrf = prefix
 
-                keyvals = key.split('|')
-                area = keyvals[0]
-                range = keyvals[1]
+        keyvals = key.split('|')
+        area = keyvals[0]
+        vlinkid = keyvals[1]
 
-                syslog.syslog(syslog.LOG_INFO, 'Create router ospf vrf {}'.format(vrf))
+        syslog_lazy(syslog.LOG_INFO, 'Create router ospf vrf {}, Vlink: {}, tableop {}', vrf, data, del_table)
 
-                if data == {}:
-                   if not del_table:
-                        command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'area {} range {}'".\
-                        format(vrf, area, range)
+        if data == {}:
+            command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no area {} virtual-link {}'".\
+            format(vrf, area, vlinkid)
 
-                        if not self.__run_command(table, command):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to create range {} {}'.format(area, range))
-                            continue
-                   else:
-                        command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no area {} range {}'".\
-                        format(vrf, area, range)
+            if not self.__run_command(table, command):
+                syslog.syslog(syslog.LOG_ERR, 'failed to delete vlink {} {}'.format(area, vlinkid))
+                return
+            else:
+                self.__ospf_delete(data)
+        else:
+            cmd_prefix = ['configure terminal',
+                          'router ospf vrf {}'.format(vrf)]
 
-                        if not self.__run_command(table, command):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to delete range {} {}'.format(area, range))
-                            continue
-                        else:
-                            self.__ospf_delete(data)
+            if not key_map.run_command(self, table, data, cmd_prefix, area, vlinkid):
+                syslog.syslog(syslog.LOG_ERR, 'failed running ospf config command')
+                return
+
+            if del_table:
+                command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no area {} virtual-link {}'".\
+                format(vrf, area, vlinkid)
+
+                if not self.__run_command(table, command):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to delete vlink {} {}'.format(area, vlinkid))
+                    return
                 else:
-                    cmd_prefix = ['configure terminal',
-                              'router ospf vrf {}'.format(vrf)]
+                    self.__ospf_delete(data)
 
-                    if not key_map.run_command(self, table, data, cmd_prefix, area, range):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running ospf config command')
-                        continue
+    def __update_ospf_area_network(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        vrf = prefix
+        syslog_lazy(syslog.LOG_INFO, 'Create router ospf vrf {}', vrf)
 
-            elif table == 'OSPFV2_ROUTER_DISTRIBUTE_ROUTE':
-                vrf = prefix
+        keyvals = key.split('|')
+        area = keyvals[0]
+        network = keyvals[1]
 
-                keyvals = key.split('|')
-                protocol = keyvals[0]
-                direction = keyvals[1]
-
-                if (protocol == "DIRECTLY_CONNECTED"):
-                    protocol = "CONNECTED"
-
-                syslog.syslog(syslog.LOG_INFO, 'Create redistribute-list {} {}'.format(protocol, direction))
-
-                cmd_suffix = ""
-                del_cmd_suffix = ""
-                cmd_oper = ""
-                rmapcmd = ""
-                metriccmd = ""
-                metrictypecmd = ""
-                alwayscmd = ""
-                acclistname = ""
-                rmapoper = ""
-                metricoper = ""
-                metrictypeoper = ""
-                alwaysoper = ""
-                acclistoper = ""
-
-                if 'route-map' in data:
-                    dval = data['route-map']
-                    rmapoper = dval.op
-                    rmapcmd = " route-map {}".format(dval.data)
-
-                if 'access-list' in data:
-                    dval = data['access-list']
-                    acclistoper = dval.op
-                    acclistname = dval.data
-
-                if 'metric' in data:
-                    dval = data['metric']
-                    metricoper = dval.op
-                    metriccmd = " metric {}".format(dval.data)
-
-                if 'metric-type' in data:
-                    dval = data['metric-type']
-                    metrictypeoper = dval.op
-
-                    if dval.data == "TYPE_1":
-                        metrictypecmd = " metric-type 1"
-                    else:
-                        metrictypecmd = " metric-type 2"
-
-                if 'always' in data:
-                    dval = data['always']
-                    alwaysoper = dval.op
-                    alwayscmd = " always"
-
-                if not del_table:
-
-                    if ((rmapoper == CachedDataWithOp.OP_DELETE) or
-                        (metricoper == CachedDataWithOp.OP_DELETE) or
-                        (metrictypeoper == CachedDataWithOp.OP_DELETE) or
-                        (alwaysoper == CachedDataWithOp.OP_DELETE) or
-                        (acclistoper == CachedDataWithOp.OP_DELETE)):
-
-                        cmd_oper = "no"
-
-                        if (alwaysoper == CachedDataWithOp.OP_DELETE):
-                            del_cmd_suffix = alwayscmd
-                        if (rmapoper == CachedDataWithOp.OP_DELETE):
-                            del_cmd_suffix = rmapcmd
-                        if (metricoper == CachedDataWithOp.OP_DELETE):
-                            del_cmd_suffix = metriccmd
-                        if (metrictypeoper == CachedDataWithOp.OP_DELETE):
-                            del_cmd_suffix = metrictypecmd
-
-                    if (direction == "EXPORT"):
-                        if (cmd_oper != "no"):
-                            cmd_suffix = "distribute-list {} out {}".format(acclistname, protocol.lower())
-                        else:
-                            cmd_suffix = "no distribute-list {} out {}".format(acclistname, protocol.lower())
+        if not del_table:
+            command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'network {} area {}'".\
+            format(vrf, network, area)
 
-                        command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c '{}'".\
-                            format(vrf, cmd_suffix)
+            if not self.__run_command(table, command):
+                syslog.syslog(syslog.LOG_ERR, 'failed to create network {} {}'.format(area, network))
+                return
+        else:
+            command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no network {} area {}'".\
+            format(vrf, network, area)
 
-                        if not self.__run_command(table, command):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to create distribute-list {} {}'.format(protocol, direction))
-                            continue
-                        else:
-                            self.__ospf_apply_config(data, rmapoper, metricoper, metrictypeoper, alwaysoper, acclistoper)
-                    elif (direction == "IMPORT"):
-                        if (cmd_oper != "no"):
-                            if (protocol == "DEFAULT_ROUTE"):
-                                cmd_suffix = cmd_suffix + "default-information originate" + alwayscmd + rmapcmd + metriccmd + metrictypecmd
-                            else:
-                                cmd_suffix = cmd_suffix + "redistribute {}".format(protocol.lower()) + rmapcmd + metriccmd + metrictypecmd
-                        else:
-                            if (protocol == "DEFAULT_ROUTE"):
-                                cmd_suffix = "no default-information originate" + del_cmd_suffix
-                            else:
-                                cmd_suffix = "no redistribute {}".format(protocol.lower()) + del_cmd_suffix
+            if not self.__run_command(table, command):
+                syslog.syslog(syslog.LOG_ERR, 'failed to delete network {} {}'.format(area, network))
+                return
+            else:
+                self.__ospf_delete(data)
 
-                        command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c '{}'".\
-                            format(vrf, cmd_suffix)
+    def __update_ospf_area_range(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        vrf = prefix
 
-                        if not self.__run_command(table, command):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to create default-info/redistribute {} {}'.format(protocol, direction))
-                            continue
-                        else:
-                            self.__ospf_apply_config(data, rmapoper, metricoper, metrictypeoper, alwaysoper, acclistoper)
-                else:
-                    if (direction == "IMPORT"):
-                        command = ""
-                        if (protocol == "DEFAULT_ROUTE"):
-                            command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no default-information originate'".\
-                            format(vrf)
-                        else:
-                            command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no redistribute {}'".\
-                            format(vrf, protocol.lower())
+        keyvals = key.split('|')
+        area = keyvals[0]
+        range = keyvals[1]
 
-                        if (command != ""):
-                            if not self.__run_command(table, command):
-                                syslog.syslog(syslog.LOG_ERR, 'failed to delete default-info/redistribute {}'.format(protocol.lower()))
-                                continue
-                            else:
-                                self.__ospf_delete(data)
-                    else:
-                        if (acclistname != ""):
-                            command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no distribute-list {} out {}'".\
-                            format(vrf, acclistname, protocol.lower())
+        syslog_lazy(syslog.LOG_INFO, 'Create router ospf vrf {}', vrf)
 
-                            if not self.__run_command(table, command):
-                                syslog.syslog(syslog.LOG_ERR, 'failed to delete distribute-list {} {}'.format(protocol, direction))
-                                continue
+        if data == {}:
+           if not del_table:
+                command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'area {} range {}'".\
+                format(vrf, area, range)
 
-                        self.__ospf_delete(data)
+                if not self.__run_command(table, command):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to create range {} {}'.format(area, range))
+                    return
+           else:
+                command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no area {} range {}'".\
+                format(vrf, area, range)
 
-            elif table == 'OSPFV2_INTERFACE':
+                if not self.__run_command(table, command):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to delete range {} {}'.format(area, range))
+                    return
+                else:
+                    self.__ospf_delete(data)
+        else:
+            cmd_prefix = ['configure terminal',
+                      'router ospf vrf {}'.format(vrf)]
 
-                key = prefix + '|' + key
-                if_name, if_addr = key.split('|')
+            if not key_map.run_command(self, table, data, cmd_prefix, area, range):
+                syslog.syslog(syslog.LOG_ERR, 'failed running ospf config command')
+                return
 
-                vrf = ""
-                if 'vrf_name' in data :
-                   vrf = 'vrf {}'.format(data['vrf_name'].data)
+    def __update_ospf_distribute_route(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        vrf = prefix
 
-                cmd_prefix = ['configure terminal',
-                              'interface {} {}'.format(if_name, vrf) ]
+        keyvals = key.split('|')
+        protocol = keyvals[0]
+        direction = keyvals[1]
 
-                if del_table and len(data) == 0:
-                    syslog.syslog(syslog.LOG_INFO, 'Delete table {} {} data {}'.format(key, vrf, data))
+        if (protocol == "DIRECTLY_CONNECTED"):
+            protocol = "CONNECTED"
 
-                    cmd_data = {}
-                    cache_tbl_key = 'OSPFV2_INTERFACE&&{}|{}'.format(if_name, if_addr)
-                    syslog.syslog(syslog.LOG_INFO, 'Row delete key {}'.format(cache_tbl_key))
+        syslog_lazy(syslog.LOG_INFO, 'Create redistribute-list {} {}', protocol, direction)
 
-                    if cache_tbl_key in self.table_data_cache.keys():
-                        cache_tbl_data = self.table_data_cache[cache_tbl_key]
-                        syslog.syslog(syslog.LOG_INFO, 'Row delete cached data {} '.format(cache_tbl_data))
+        cmd_suffix = ""
+        del_cmd_suffix = ""
+        cmd_oper = ""
+        rmapcmd = ""
+        metriccmd = ""
+        metrictypecmd = ""
+        alwayscmd = ""
+        acclistname = ""
+        rmapoper = ""
+        metricoper = ""
+        metrictypeoper = ""
+        alwaysoper = ""
+        acclistoper = ""
+
+        if 'route-map' in data:
+            dval = data['route-map']
+            rmapoper = dval.op
+            rmapcmd = " route-map {}".format(dval.data)
+
+        if 'access-list' in data:
+            dval = data['access-list']
+            acclistoper = dval.op
+            acclistname = dval.data
+
+        if 'metric' in data:
+            dval = data['metric']
+            metricoper = dval.op
+            metriccmd = " metric {}".format(dval.data)
+
+        if 'metric-type' in data:
+            dval = data['metric-type']
+            metrictypeoper = dval.op
+
+            if dval.data == "TYPE_1":
+                metrictypecmd = " metric-type 1"
+            else:
+                metrictypecmd = " metric-type 2"
+
+        if 'always' in data:
+            dval = data['always']
+            alwaysoper = dval.op
+            alwayscmd = " always"
+
+        if not del_table:
+
+            if ((rmapoper == CachedDataWithOp.OP_DELETE) or
+                (metricoper == CachedDataWithOp.OP_DELETE) or
+                (metrictypeoper == CachedDataWithOp.OP_DELETE) or
+                (alwaysoper == CachedDataWithOp.OP_DELETE) or
+                (acclistoper == CachedDataWithOp.OP_DELETE)):
+
+                cmd_oper = "no"
+
+                if (alwaysoper == CachedDataWithOp.OP_DELETE):
+                    del_cmd_suffix = alwayscmd
+                if (rmapoper == CachedDataWithOp.OP_DELETE):
+                    del_cmd_suffix = rmapcmd
+                if (metricoper == CachedDataWithOp.OP_DELETE):
+                    del_cmd_suffix = metriccmd
+                if (metrictypeoper == CachedDataWithOp.OP_DELETE):
+                    del_cmd_suffix = metrictypecmd
+
+            if (direction == "EXPORT"):
+                if (cmd_oper != "no"):
+                    cmd_suffix = "distribute-list {} out {}".format(acclistname, protocol.lower())
+                else:
+                    cmd_suffix = "no distribute-list {} out {}".format(acclistname, protocol.lower())
 
-                        for key, data in cache_tbl_data.items() :
-                            cached_op_data = CachedDataWithOp(data, CachedDataWithOp.OP_DELETE)
-                            cmd_data.update({ key : cached_op_data } )
+                command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c '{}'".\
+                    format(vrf, cmd_suffix)
 
-                    syslog.syslog(syslog.LOG_INFO, 'Row delete cmd data {} '.format(cmd_data))
+                if not self.__run_command(table, command):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to create distribute-list {} {}'.format(protocol, direction))
+                    return
+                else:
+                    self.__ospf_apply_config(data, rmapoper, metricoper, metrictypeoper, alwaysoper, acclistoper)
+            elif (direction == "IMPORT"):
+                if (cmd_oper != "no"):
+                    if (protocol == "DEFAULT_ROUTE"):
+                        cmd_suffix = cmd_suffix + "default-information originate" + alwayscmd + rmapcmd + metriccmd + metrictypecmd
+                    else:
+                        cmd_suffix = cmd_suffix + "redistribute {}".format(protocol.lower()) + rmapcmd + metriccmd + metrictypecmd
+                else:
+                    if (protocol == "DEFAULT_ROUTE"):
+                        cmd_suffix = "no default-information originate" + del_cmd_suffix
+                    else:
+                        cmd_suffix = "no redistribute {}".format(protocol.lower()) + del_cmd_suffix
 
-                    if len(cmd_data) :
-                        if not key_map.run_command(self, table, cmd_data, cmd_prefix, if_name, if_addr):
-                            syslog.syslog(syslog.LOG_INFO, 'failed running interface no ip ospf config command')
-                            self.__apply_config_delete_success(cmd_data)
-                            continue
-                    else :
-                        self.__apply_config_delete_success(cmd_data)
+                command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c '{}'".\
+                    format(vrf, cmd_suffix)
 
-                else :
-                    syslog.syslog(syslog.LOG_INFO, 'Create/update ospf {} interface {} in {}'.format(key, if_name, vrf))
+                if not self.__run_command(table, command):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to create default-info/redistribute {} {}'.format(protocol, direction))
+                    return
+                else:
+                    self.__ospf_apply_config(data, rmapoper, metricoper, metrictypeoper, alwaysoper, acclistoper)
+        else:
+            if (direction == "IMPORT"):
+                command = ""
+                if (protocol == "DEFAULT_ROUTE"):
+                    command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no default-information originate'".\
+                    format(vrf)
+                else:
+                    command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no redistribute {}'".\
+                    format(vrf, protocol.lower())
 
-                    #Work arround for router area config fail, update area every time
-                    if 'area-id' in data.keys():
-                        dval = data['area-id']
-                        if dval.op == CachedDataWithOp.OP_NONE :
-                            dval.op = CachedDataWithOp.OP_ADD
+                if (command != ""):
+                    if not self.__run_command(table, command):
+                        syslog.syslog(syslog.LOG_ERR, 'failed to delete default-info/redistribute {}'.format(protocol.lower()))
+                        return
+                    else:
+                        self.__ospf_delete(data)
+            else:
+                if (acclistname != ""):
+                    command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no distribute-list {} out {}'".\
+                    format(vrf, acclistname, protocol.lower())
 
-                    if not key_map.run_command(self, table, data, cmd_prefix, if_name, if_addr):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running interface ip ospf config command')
-                        if 'area-id' in data.keys():
-                            dval = data['area-id']
-                            if dval.op == CachedDataWithOp.OP_DELETE:
-                                #Work arround for router area config delete fail
-                                self.__apply_config_op_success(data, {'area-id': dval.op } )
-                                syslog.syslog(syslog.LOG_INFO, 'area-id delete enforced')
-                        continue
-                    else :
-                        self.__apply_config_op_success(data)
+                    if not self.__run_command(table, command):
+                        syslog.syslog(syslog.LOG_ERR, 'failed to delete distribute-list {} {}'.format(protocol, direction))
+                        return
 
-            elif table == 'OSPFV2_ROUTER_PASSIVE_INTERFACE':
-                syslog.syslog(syslog.LOG_INFO, 'Create passive interface')
+                self.__ospf_delete(data)
 
-                vrf = prefix
+    def __update_ospf_interface(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        key = prefix + '|' + key
+        if_name, if_addr = key.split('|')
 
-                keyvals = key.split('|')
-                if_name = keyvals[0]
-                if_addr = keyvals[1]
+        vrf = ""
+        if 'vrf_name' in data :
+           vrf = 'vrf {}'.format(data['vrf_name'].data)
 
-                syslog.syslog(syslog.LOG_INFO, 'Create passive interface vrf {}'.format(vrf))
+        cmd_prefix = ['configure terminal',
+                      'interface {} {}'.format(if_name, vrf) ]
 
-                if (if_addr == "0.0.0.0"):
-                    if_addr = ""
+        if del_table and len(data) == 0:
+            syslog_lazy(syslog.LOG_INFO, 'Delete table {} {} data {}', key, vrf, data)
 
-                if data == {}:
-                   if not del_table:
+            cmd_data = {}
+            cache_tbl_key = 'OSPFV2_INTERFACE&&{}|{}'.format(if_name, if_addr)
+            syslog_lazy(syslog.LOG_INFO, 'Row delete key {}', cache_tbl_key)
 
-                        command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'passive-interface {} {}'".\
-                        format(vrf, if_name, if_addr)
+            if cache_tbl_key in self.table_data_cache.keys():
+                cache_tbl_data = self.table_data_cache[cache_tbl_key]
+                syslog_lazy(syslog.LOG_INFO, 'Row delete cached data {} ', cache_tbl_data)
 
-                        if not self.__run_command(table, command):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to create passive interface {} {}'.format(if_name, if_addr))
-                            continue
-                   else:
-                        command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no passive-interface {} {}'".\
-                        format(vrf, if_name, if_addr)
+                for key, data in cache_tbl_data.items() :
+                    cached_op_data = CachedDataWithOp(data, CachedDataWithOp.OP_DELETE)
+                    cmd_data.update({ key : cached_op_data } )
 
-                        if not self.__run_command(table, command):
-                            syslog.syslog(syslog.LOG_ERR, 'failed to delete passive interface {} {}'.format(if_name, if_addr))
-                            continue
+            syslog_lazy(syslog.LOG_INFO, 'Row delete cmd data {} ', cmd_data)
 
-            elif table == 'STATIC_ROUTE':
-                vrf = prefix
-                syslog.syslog(syslog.LOG_INFO, 'Set static IP route for vrf {} prefix {}'.format(vrf, key))
-                op = CachedDataWithOp.OP_DELETE if del_table else CachedDataWithOp.OP_UPDATE
-                data['ip_prefix'] = CachedDataWithOp(key, op)
-                cmd_prefix = ['configure terminal', 'vrf {}'.format(vrf)]
-                ret_val = key_map.run_command(self, table, data, cmd_prefix, vrf)
-                del(data['ip_prefix'])
-                if not ret_val:
-                    syslog.syslog(syslog.LOG_ERR, 'failed running static route config command')
-                    continue
-                self.static_route_list.setdefault(vrf, {})[key] = self.upd_nh_set
-            elif table == 'PIM_INTERFACE':
+            if len(cmd_data) :
+                if not key_map.run_command(self, table, cmd_data, cmd_prefix, if_name, if_addr):
+                    syslog.syslog(syslog.LOG_INFO, 'failed running interface no ip ospf config command')
+                    self.__apply_config_delete_success(cmd_data)
+                    return
+            else :
+                self.__apply_config_delete_success(cmd_data)
 
-                vrf = prefix
-                af, if_name = key.split('|')
-                syslog.syslog(syslog.LOG_INFO,
-                              'PIM interface update for vrf {}, af: {}, interface {}'.format(vrf, af, if_name))
-                cmd_prefix = ['configure terminal',
-                              'interface {}'.format(if_name)]
+        else :
+            syslog_lazy(syslog.LOG_INFO, 'Create/update ospf {} interface {} in {}', key, if_name, vrf)
+
+            #Work arround for router area config fail, update area every time
+            if 'area-id' in data.keys():
+                dval = data['area-id']
+                if dval.op == CachedDataWithOp.OP_NONE :
+                    dval.op = CachedDataWithOp.OP_ADD
+
+            if not key_map.run_command(self, table, data, cmd_prefix, if_name, if_addr):
+                syslog.syslog(syslog.LOG_ERR, 'failed running interface ip ospf config command')
+                if 'area-id' in data.keys():
+                    dval = data['area-id']
+                    if dval.op == CachedDataWithOp.OP_DELETE:
+                        #Work arround for router area config delete fail
+                        self.__apply_config_op_success(data, {'area-id': dval.op } )
+                        syslog.syslog(syslog.LOG_INFO, 'area-id delete enforced')
+                return
+            else :
+                self.__apply_config_op_success(data)
+
+    def __update_ospf_passive_interface(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        syslog.syslog(syslog.LOG_INFO, 'Create passive interface')
+
+        vrf = prefix
+
+        keyvals = key.split('|')
+        if_name = keyvals[0]
+        if_addr = keyvals[1]
+
+        syslog_lazy(syslog.LOG_INFO, 'Create passive interface vrf {}', vrf)
+
+        if (if_addr == "0.0.0.0"):
+            if_addr = ""
+
+        if data == {}:
+           if not del_table:
+
+                command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'passive-interface {} {}'".\
+                format(vrf, if_name, if_addr)
+
+                if not self.__run_command(table, command):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to create passive interface {} {}'.format(if_name, if_addr))
+                    return
+           else:
+                command = "vtysh -c 'configure terminal' -c 'router ospf vrf {}' -c 'no passive-interface {} {}'".\
+                format(vrf, if_name, if_addr)
+
+                if not self.__run_command(table, command):
+                    syslog.syslog(syslog.LOG_ERR, 'failed to delete passive interface {} {}'.format(if_name, if_addr))
+                    return
+
+    def __update_static_route(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        vrf = prefix
+        syslog_lazy(syslog.LOG_INFO, 'Set static IP route for vrf {} prefix {}', vrf, key)
+        op = CachedDataWithOp.OP_DELETE if del_table else CachedDataWithOp.OP_UPDATE
+        data['ip_prefix'] = CachedDataWithOp(key, op)
+        cmd_prefix = ['configure terminal', 'vrf {}'.format(vrf)]
+        ret_val = key_map.run_command(self, table, data, cmd_prefix, vrf)
+        del(data['ip_prefix'])
+        if not ret_val:
+            syslog.syslog(syslog.LOG_ERR, 'failed running static route config command')
+            return
+        self.static_route_list.setdefault(vrf, {})[key] = self.upd_nh_set
+
+    def __update_pim_interface(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        vrf = prefix
+        af, if_name = key.split('|')
+        syslog.syslog(syslog.LOG_INFO,
+                      'PIM interface update for vrf {}, af: {}, interface {}'.format(vrf, af, if_name))
+        cmd_prefix = ['configure terminal',
+                      'interface {}'.format(if_name)]
+        syslog.syslog(syslog.LOG_INFO,
+                      'Create/update PIM interface: key {} interface {} in {}'.format(key, if_name, vrf))
+
+        # If sparse-mode has been disabled, clear other interface
+        # entries in cache so that they will be re-programmed in FRR
+        # on re-enabling of sparse-mode.
+
+        if 'mode' in data:
+            modeval = data['mode']
+            modeval_pim_mode = modeval.data
+            modeval_op = modeval.op
+            if (modeval_op == CachedDataWithOp.OP_DELETE):
                 syslog.syslog(syslog.LOG_INFO,
-                              'Create/update PIM interface: key {} interface {} in {}'.format(key, if_name, vrf))
-
-                # If sparse-mode has been disabled, clear other interface
-                # entries in cache so that they will be re-programmed in FRR
-                # on re-enabling of sparse-mode.
-
-                if 'mode' in data:
-                    modeval = data['mode']
-                    modeval_pim_mode = modeval.data
-                    modeval_op = modeval.op
-                    if (modeval_op == CachedDataWithOp.OP_DELETE):
-                        syslog.syslog(syslog.LOG_INFO,
-                                      "Flushing PIM interface cache for deletion "
-                                      "of PIM sparse-mode")
-                        for dkey, dval in data.items():
-                            dval.status = CachedDataWithOp.STAT_SUCC
-                            dval.op = CachedDataWithOp.OP_DELETE
-
-                    # Only send the VTYSH command to FRR if the PIM interface mode
-                    # is present in the update.
-                    if not key_map.run_command(self, table, data, cmd_prefix):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running PIM config command')
-                        continue
+                              "Flushing PIM interface cache for deletion "
+                              "of PIM sparse-mode")
+                for dkey, dval in data.items():
+                    dval.status = CachedDataWithOp.STAT_SUCC
+                    dval.op = CachedDataWithOp.OP_DELETE
 
-            elif table == 'PIM_GLOBALS':
+            # Only send the VTYSH command to FRR if the PIM interface mode
+            # is present in the update.
+            if not key_map.run_command(self, table, data, cmd_prefix):
+                syslog.syslog(syslog.LOG_ERR, 'failed running PIM config command')
+                return
 
-                vrf = prefix
+    def __update_pim_globals(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        vrf = prefix
 
-                af = key.split('|')
-                syslog.syslog(syslog.LOG_INFO,
-                              'PIM global update for vrf {}, af: {}'.format(vrf, af))
+        af = key.split('|')
+        syslog.syslog(syslog.LOG_INFO,
+                      'PIM global update for vrf {}, af: {}'.format(vrf, af))
 
-                cmd_prefix = ['configure terminal',
-                              'vrf {}'.format(vrf)]
+        cmd_prefix = ['configure terminal',
+                      'vrf {}'.format(vrf)]
 
-                syslog.syslog(syslog.LOG_INFO,
-                              'Create/update PIM global {} af {} in {}'.format(key, af, vrf))
+        syslog.syslog(syslog.LOG_INFO,
+                      'Create/update PIM global {} af {} in {}'.format(key, af, vrf))
 
-                # if not key_map.run_command(self, table, data, cmd_prefix, vrf, af):
-                if not key_map.run_command(self, table, data, cmd_prefix):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running PIM config command')
-                    continue
+        # if not key_map.run_command(self, table, data, cmd_prefix, vrf, af):
+        if not key_map.run_command(self, table, data, cmd_prefix):
+            syslog.syslog(syslog.LOG_ERR, 'failed running PIM config command')
+            return
 
-            elif table == 'IGMP_INTERFACE':
-                ifname = prefix
+    def __update_igmp_interface(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        ifname = prefix
 
-                syslog.syslog(syslog.LOG_INFO, 'IGMP Interface MCast Grp ifname {} prefix {}'.format(ifname, key))
+        syslog_lazy(syslog.LOG_INFO, 'IGMP Interface MCast Grp ifname {} prefix {}', ifname, key)
 
-                keyvals = key.split('|')
-                mcast_grp = keyvals[0]
-                source_ip = keyvals[1]
+        keyvals = key.split('|')
+        mcast_grp = keyvals[0]
+        source_ip = keyvals[1]
 
-                syslog.syslog(syslog.LOG_INFO, 'Configure ip igmp join interface {}, mcast_grp {}, source_ip {}'.format(ifname, mcast_grp, source_ip))
+        syslog_lazy(syslog.LOG_INFO, 'Configure ip igmp join interface {}, mcast_grp {}, source_ip {}', ifname, mcast_grp, source_ip)
 
-                cmd_prefix = ['configure terminal',
-                          'interface {}'.format(ifname)]
+        cmd_prefix = ['configure terminal',
+                  'interface {}'.format(ifname)]
 
-                if not key_map.run_command(self, table, data, cmd_prefix, mcast_grp, source_ip):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running ip igmp join config command')
-                    continue
+        if not key_map.run_command(self, table, data, cmd_prefix, mcast_grp, source_ip):
+            syslog.syslog(syslog.LOG_ERR, 'failed running ip igmp join config command')
+            return
 
+    def __update_igmp_interface_query(self, table, prefix, key, data, del_table, key_map, vrf, local_asn):
+        ifname = prefix
 
-            elif table == 'IGMP_INTERFACE_QUERY':
-                ifname = prefix
+        syslog_lazy(syslog.LOG_INFO, 'IGMP Interface {} Config prefix {}', ifname, key)
 
-                syslog.syslog(syslog.LOG_INFO, 'IGMP Interface {} Config prefix {}'.format(ifname, key))
+        cmd_prefix = ['configure terminal',
+                  'interface {}'.format(ifname)]
 
-                cmd_prefix = ['configure terminal',
-                          'interface {}'.format(ifname)]
+        if not key_map.run_command(self, table, data, cmd_prefix):
+            syslog.syslog(syslog.LOG_ERR, 'failed running ip igmp interface config command')
+            return
 
-                if not key_map.run_command(self, table, data, cmd_prefix):
-                    syslog.syslog(syslog.LOG_ERR, 'failed running ip igmp interface config command')
-                    continue
 
 
     def __add_op_to_data(self, table_key, data, comb_attr_list):
@@ -3858,47 +4219,73 @@ class BGPConfigDaemon:
         cached_data = self.table_data_cache.setdefault(table_key, {})
         for key, val in data.items():
             if not isinstance(val, CachedDataWithOp) or val.op == CachedDataWithOp.OP_NONE or val.status == CachedDataWithOp.STAT_FAIL:
-                syslog.syslog(syslog.LOG_DEBUG, 'ignore cache update for %s because of %s%s%s' %
-                        (key, ('' if isinstance(val, CachedDataWithOp) else 'INV_DATA '),
-                              ('NO_OP ' if isinstance(val, CachedDataWithOp) and val.op == CachedDataWithOp.OP_NONE else ''),
-                              ('STAT_FAIL ' if isinstance(val, CachedDataWithOp) and val.status == CachedDataWithOp.STAT_FAIL else '')))
+                syslog_lazy(syslog.LOG_DEBUG, 'ignore cache update for {} because of {}{}{}',
+                            key, ('' if isinstance(val, CachedDataWithOp) else 'INV_DATA '),
+                            ('NO_OP ' if isinstance(val, CachedDataWithOp) and val.op == CachedDataWithOp.OP_NONE else ''),
+                            ('STAT_FAIL ' if isinstance(val, CachedDataWithOp) and val.status == CachedDataWithOp.STAT_FAIL else ''))
                 continue
             if val.op == CachedDataWithOp.OP_ADD or val.op == CachedDataWithOp.OP_UPDATE:
                 cached_data[key] = val.data
-                syslog.syslog(syslog.LOG_INFO, 'Add {} data {} to cache'.format(key, cached_data[key]))
+                syslog_lazy(syslog.LOG_INFO, 'Add {} data {} to cache', key, cached_data[key])
             elif val.op == CachedDataWithOp.OP_DELETE:
-                syslog.syslog(syslog.LOG_INFO, 'delete {} data {} from cache'.format(key, cached_data.get(key, '')))
+                syslog_lazy(syslog.LOG_INFO, 'delete {} data {} from cache', key, cached_data.get(key, ''))
                 cached_data.pop(key, None)
         if len(cached_data) == 0:
-            syslog.syslog(syslog.LOG_INFO, 'delete table row {} from cache'.format(table_key))
+            syslog_lazy(syslog.LOG_INFO, 'delete table row {} from cache', table_key)
             del(self.table_data_cache[table_key])
 
 
     def bgp_table_handler_common(self, table, key, data, comb_attr_list = []):
-        syslog.syslog(syslog.LOG_DEBUG, '----------------------------------')
-        syslog.syslog(syslog.LOG_DEBUG, ' BGP table handling')
-        syslog.syslog(syslog.LOG_DEBUG, '----------------------------------')
-        syslog.syslog(syslog.LOG_DEBUG, 'table : %s' % table)
-        syslog.syslog(syslog.LOG_DEBUG, 'key   : %s' % key)
-        op_str = ('DELETE' if data is None else 'SET')
         del_table = False
         if data is None:
             data = {}
             del_table = True
-        syslog.syslog(syslog.LOG_DEBUG, 'op    : %s' % op_str)
-        syslog.syslog(syslog.LOG_DEBUG, 'data  :')
-        for dkey, dval in data.items():
-            syslog.syslog(syslog.LOG_DEBUG, '        %-10s - %s' % (dkey, dval))
-        syslog.syslog(syslog.LOG_DEBUG, '')
+        if syslog_enabled(syslog.LOG_DEBUG):
+            syslog.syslog(syslog.LOG_DEBUG, '----------------------------------')
+            syslog.syslog(syslog.LOG_DEBUG, ' BGP table handling')
+            syslog.syslog(syslog.LOG_DEBUG, '----------------------------------')
+            syslog.syslog(syslog.LOG_DEBUG, 'table : %s' % table)
+            syslog.syslog(syslog.LOG_DEBUG, 'key   : %s' % key)
+            syslog.syslog(syslog.LOG_DEBUG, 'op    : %s' % ('SET' if not del_table else 'DELETE'))
+            syslog.syslog(syslog.LOG_DEBUG, 'data  :')
+            for dkey, dval in data.items():
+                syslog.syslog(syslog.LOG_DEBUG, '        %-10s - %s' % (dkey, dval))
+            syslog.syslog(syslog.LOG_DEBUG, '')
         table_key = ExtConfigDBConnector.get_table_key(table, key)
         self.__add_op_to_data(table_key, data, comb_attr_list)
         self.bgp_message.put((key, del_table, table, data))
+        if not self.__update_deferred:
+            self.__apply_bgp_update()
+
+    def __apply_bgp_update(self):
         upd_data_list = []
         self.__update_bgp(upd_data_list)
         for table, key, data in upd_data_list:
             table_key = ExtConfigDBConnector.get_table_key(table, key)
             self.__update_cache_data(table_key, data)
 
+    def bgp_batch_handler(self, entries):
+        handlers = dict(self.table_handler_list)
+        for table, key, data in entries:
+            hdlr = handlers.get(table)
+            if hdlr is None:
+                continue
+            try:
+                if hdlr in self.direct_handlers:
+                    # keep the order of updates
+                    self.__apply_bgp_update()
+                    hdlr(table, key, data)
+                    continue
+                self.__update_deferred = True
+                try:
+                    hdlr(table, key, data)
+                finally:
+                    self.__update_deferred = False
+            except Exception as e:
+                syslog.syslog(syslog.LOG_ERR, '[bgp cfgd] Failed handling config DB update with exception:' + str(e))
+                logging.exception(e)
+        self.__apply_bgp_update()
+
     def bgp_global_handler(self, table, key, data):
         self.bgp_table_handler_common(table, key, data, [{'keepalive', 'holdtime'}])
 
@@ -3920,6 +4307,7 @@ class BGPConfigDaemon:
 
     def start(self):
         self.subscribe_all()
+        self.config_db.subscribe_batch(self.bgp_batch_handler)
         self.config_db.listen()
     def stop(self):
         self.config_db.stop_listen()
@@ -3933,8 +4321,16 @@ def sig_handler(signum, frame):
     syslog.syslog(syslog.LOG_DEBUG, 'entering signal handler')
     main_loop = False
 
+LOG_LEVELS = {'err': syslog.LOG_ERR, 'warning': syslog.LOG_WARNING, 'notice': syslog.LOG_NOTICE,
+              'info': syslog.LOG_INFO, 'debug': syslog.LOG_DEBUG}
+
 def main():
     global bgpd_client
+    parser = argparse.ArgumentParser(description = 'configure FRR daemons from config DB')
+    parser.add_argument('-l', '--log-level', choices = list(LOG_LEVELS), default = 'debug',
+                        help = 'lowest priority of messages sent to syslog')
+    args = parser.parse_args()
+    syslog.setlogmask(syslog.LOG_UPTO(LOG_LEVELS[args.log_level]))
     for sig_num in [signal.SIGTERM, signal.SIGINT]:
         signal.signal(sig_num, sig_handler)
     syslog.syslog(syslog.LOG_DEBUG, 'entering BGP configuration daemon')
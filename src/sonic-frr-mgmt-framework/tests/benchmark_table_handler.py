@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Measure how many config DB rows per second BGPConfigDaemon.bgp_table_handler_common() handles.
+
+vtysh is replaced by a stub which accepts every command, so only the time spent in frrcfgd
+is measured. Every round adds --rows BGP neighbors and an IPv4 unicast AF of each of them,
+then updates a field of every neighbor.
+    python3 tests/benchmark_table_handler.py --rows 10000 --log-level info
+"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+import syslog
+import time
+from unittest.mock import MagicMock, NonCallableMagicMock
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+
+class StubVtysh(object):
+    def __init__(self):
+        self.commands = 0
+
+    def run_vtysh_command(self, table, command, daemons):
+        self.commands += 1
+        return True
+
+
+def make_rows(args):
+    rows = [('BGP_GLOBALS', 'default', {'local_asn': '100', 'router_id': '10.255.0.1'})]
+    peers = ['10.{}.{}.1'.format(i // 256 % 256, i % 256) for i in range(args.rows)]
+    for peer in peers:
+        rows.append(('BGP_NEIGHBOR', 'default|' + peer,
+                     {'asn': '200', 'admin_status': 'up', 'local_addr': '10.255.0.1', 'name': 'peer',
+                      'keepalive': '30', 'holdtime': '90', 'ebgp_multihop': 'true', 'ebgp_multihop_ttl': '2'}))
+    for peer in peers:
+        rows.append(('BGP_NEIGHBOR_AF', 'default|{}|ipv4_unicast'.format(peer),
+                     {'admin_status': 'true', 'send_community': 'both', 'route_map_in': ['RM_IN']}))
+    for peer in peers:
+        rows.append(('BGP_NEIGHBOR', 'default|' + peer,
+                     {'asn': '200', 'admin_status': 'up', 'local_addr': '10.255.0.1', 'name': 'updated',
+                      'keepalive': '30', 'holdtime': '90', 'ebgp_multihop': 'true', 'ebgp_multihop_ttl': '2'}))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='BGP neighbors')
+    parser.add_argument('--log-level', default='debug', help='lowest priority of messages sent to syslog')
+    parser.add_argument('--profile', action='store_true', help='print the functions which take most time')
+    args = parser.parse_args()
+
+    swsscommon = MagicMock(ConfigDBConnector=NonCallableMagicMock)
+    sys.modules['swsscommon'] = MagicMock(swsscommon=swsscommon)
+    sys.modules['swsscommon.swsscommon'] = swsscommon
+    from frrcfgd import frrcfgd
+    syslog.setlogmask(syslog.LOG_UPTO(frrcfgd.LOG_LEVELS[args.log_level]))
+    vtysh = StubVtysh()
+    frrcfgd.bgpd_client = vtysh
+    daemon = frrcfgd.BGPConfigDaemon()
+    # config DB is empty apart from the rows handled
+    daemon.config_db.get_table = lambda table: {}
+    daemon.config_db.get_entry = lambda table, key: {}
+    daemon.config_db.serialize_key = lambda key: key if isinstance(key, str) else '|'.join(key)
+    rows = make_rows(args)
+
+    profiler = cProfile.Profile() if args.profile else None
+    start = time.time()
+    if profiler:
+        profiler.enable()
+    for table, key, data in rows:
+        daemon.bgp_table_handler_common(table, key, dict(data))
+    if profiler:
+        profiler.disable()
+    elapsed = time.time() - start
+    print('{} rows, {} vtysh commands: {:.1f} s, {:.0f} rows per second'.format(
+        len(rows), vtysh.commands, elapsed, len(rows) / elapsed))
+    if profiler:
+        pstats.Stats(profiler).sort_stats('tottime').print_stats(15)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,9 @@
 import copy
 import re
+import socket
+import struct
+import threading
+import time
 from unittest.mock import MagicMock, NonCallableMagicMock, patch
 
 swsscommon_module_mock = MagicMock(ConfigDBConnector = NonCallableMagicMock)
@@ -266,3 +270,229 @@ def test_bgp_neighbor_shutdown():
     # The neighbor shutdown msg test cases explicitly verify delete behavior, so skip the delete
     # verification data_set_del_test (else it would try the del of 'no ' commands as well and fail)
     data_set_del_test(neighbor_shutdown_data, skip_del=True)
+
+@patch.dict('sys.modules', **mockmapping)
+@patch('frrcfgd.frrcfgd.g_run_command')
+def test_bgp_batch_handler(run_cmd):
+    from frrcfgd.frrcfgd import BGPConfigDaemon
+    daemon = BGPConfigDaemon()
+    update_bgp = MagicMock(wraps=daemon._BGPConfigDaemon__update_bgp)
+    daemon._BGPConfigDaemon__update_bgp = update_bgp
+    daemon.bgp_batch_handler([(test.table_name, test.key, copy.deepcopy(test.data)) for test in neighbor_shutdown_data])
+    # all updates are applied together, in the order of the batch
+    update_bgp.assert_called_once()
+    cmds = [c[0][1] for c in run_cmd.call_args_list]
+    assert(cmds[0] == CmdMapTestInfo.compose_vtysh_cmd(conf_bgp_dft_cmd('default', 100)))
+    assert(cmds[1:] == [CmdMapTestInfo.compose_vtysh_cmd(test.vtysh_cmd) for test in neighbor_shutdown_data[1:]])
+
+@patch.dict('sys.modules', **mockmapping)
+def test_sub_batch_handler():
+    from frrcfgd.frrcfgd import ExtConfigDBConnector
+    config_db = ExtConfigDBConnector()
+    config_db.TABLE_NAME_SEPARATOR = '|'
+    config_db.handlers = {'BGP_NEIGHBOR': MagicMock(), 'BGP_GLOBALS': MagicMock()}
+    config_db.raw_to_typed = lambda raw_data, table: dict(raw_data) if raw_data else None
+    db = {'BGP_GLOBALS|default': {'local_asn': '100'},
+          'BGP_NEIGHBOR|default|10.1.1.1': {'asn': '200'}}
+    pipe = MagicMock()
+    pipe.execute.side_effect = lambda: [db.get(c[0][0], {}) for c in pipe.hgetall.call_args_list]
+    client = MagicMock()
+    client.pipeline.return_value = pipe
+    config_db._ExtConfigDBConnector__get_pipeline_client = MagicMock(return_value=client)
+    config_db.subscribe_batch(MagicMock())
+    msg = lambda key: {'type': 'pmessage', 'channel': '__keyspace@4__:' + key, 'data': 'hset'}
+    config_db.sub_batch_handler([msg('BGP_GLOBALS|default'), msg('BGP_NEIGHBOR|default|10.1.1.1'),
+                                 msg('BGP_GLOBALS|default'), msg('BGP_NEIGHBOR|default|10.1.1.2'),
+                                 msg('PORT|Ethernet0'), msg('NO_SEPARATOR'), {'type': 'psubscribe', 'channel': 'x'}])
+    # one pipelined read of every updated key
+    pipe.execute.assert_called_once()
+    assert([c[0][0] for c in pipe.hgetall.call_args_list] ==
+           ['BGP_GLOBALS|default', 'BGP_NEIGHBOR|default|10.1.1.1', 'BGP_NEIGHBOR|default|10.1.1.2'])
+    config_db.batch_handler.assert_called_once_with([('BGP_GLOBALS', 'default', {'local_asn': '100'}),
+                                                     ('BGP_NEIGHBOR', 'default|10.1.1.1', {'asn': '200'}),
+                                                     ('BGP_NEIGHBOR', 'default|10.1.1.2', None)])
+
+class FakeFrrDaemon(threading.Thread):
+    """ Reply to vtysh commands like a FRR daemon vty socket, replies are held until batch commands are read """
+    def __init__(self, name, batch=1, timeout=10):
+        super(FakeFrrDaemon, self).__init__(daemon=True)
+        self.daemon_name = name
+        self.batch = batch
+        self.commands = []
+        self.client_sock, self.sock = socket.socketpair()
+        self.client_sock.settimeout(timeout)
+
+    def run(self):
+        in_buf = b''
+        replies = b''
+        pending = 0
+        while True:
+            data = self.sock.recv(4096)
+            if not data:
+                break
+            in_buf += data
+            cmds = in_buf.split(b'\0')
+            in_buf = cmds.pop()
+            for cmd in cmds:
+                cmd = cmd.decode()
+                self.commands.append(cmd)
+                if cmd.startswith('slow'):
+                    # replies before the slow command are sent, the rest come after client timed out
+                    self.sock.sendall(replies)
+                    replies = b''
+                    pending = 0
+                    time.sleep(1)
+                ret_code = 1 if cmd.startswith('bad') else 0
+                replies += '{}: {}\n'.format(self.daemon_name, cmd).encode() + bytes([0, 0, 0, ret_code])
+                pending += 1
+            if pending >= self.batch:
+                try:
+                    self.sock.sendall(replies)
+                except OSError:
+                    break
+                replies = b''
+                pending = 0
+
+def create_bgpd_client(tmp_path, daemons, reconnects=()):
+    from frrcfgd.frrcfgd import BgpdClientMgr
+    # daemons connected by each connect call, connection is re-created by the next one of same name
+    connects = list(daemons) + list(reconnects)
+    def connect_frr_daemon(mgr, name, max_retry):
+        daemon = next((daemon for daemon in connects if daemon.daemon_name == name), None)
+        if daemon is None:
+            return None
+        connects.remove(daemon)
+        daemon.start()
+        return daemon.client_sock
+    BgpdClientMgr.PROXY_SERVER_ADDR = str(tmp_path / 'bgpd_client_sock')
+    with patch.object(BgpdClientMgr, 'ALL_DAEMONS', [daemon.daemon_name for daemon in daemons]):
+        with patch.object(BgpdClientMgr, '_BgpdClientMgr__connect_frr_daemon', connect_frr_daemon):
+            mgr = BgpdClientMgr()
+    mgr._BgpdClientMgr__connect_frr_daemon = lambda name, max_retry: connect_frr_daemon(mgr, name, max_retry)
+    return mgr
+
+@patch.dict('sys.modules', **mockmapping)
+def test_bgpd_client_pipeline(tmp_path):
+    bgpd = FakeFrrDaemon('bgpd', batch=4)
+    zebra = FakeFrrDaemon('zebra', batch=4)
+    mgr = create_bgpd_client(tmp_path, [bgpd, zebra])
+    # replies are only sent once the daemons got the whole block
+    assert(mgr.run_vtysh_command('ROUTE_MAP', "vtysh -c 'configure terminal' -c 'route-map a permit 10' -c 'exit'", None))
+    assert(bgpd.commands == ['configure terminal', 'route-map a permit 10', 'exit', 'end'])
+    assert(zebra.commands == bgpd.commands)
+    bgpd.batch = 1
+    assert(not mgr.run_vtysh_command('BGP_GLOBALS', "vtysh -c 'bad command'", None))
+    assert(bgpd.commands[4:] == ['bad command', 'end'])
+    stats = mgr.get_stats()
+    assert(stats['bgpd']['commands'] == '6')
+    assert(stats['bgpd']['failures'] == '1')
+    assert(stats['bgpd']['queue_depth'] == '0')
+    assert(stats['bgpd']['queue_depth_max'] == '4')
+    assert(stats['zebra']['commands'] == '4')
+    # published at most once per interval
+    assert([c[0][1] for c in mgr.state_db.hmset.call_args_list] == ['FRR_VTYSH_STATS|bgpd', 'FRR_VTYSH_STATS|zebra'])
+    mgr.shutdown()
+
+@patch.dict('sys.modules', **mockmapping)
+def test_bgpd_client_reply_timeout(tmp_path):
+    bgpd = FakeFrrDaemon('bgpd', timeout=0.2)
+    new_bgpd = FakeFrrDaemon('bgpd')
+    mgr = create_bgpd_client(tmp_path, [bgpd], [new_bgpd])
+    # reply of the slow command times out in the middle of the block
+    results = mgr._BgpdClientMgr__proc_commands(['configure terminal', 'slow command', 'exit', 'end'], ['bgpd'])
+    assert(results == [[True, 'bgpd: configure terminal\n'], [False, ''], [False, ''], [False, '']])
+    assert(mgr.get_stats()['bgpd']['queue_depth'] == '0')
+    # late replies on the old connection are not taken as replies of the next commands
+    time.sleep(1)
+    results = mgr._BgpdClientMgr__proc_commands(['show version', 'end'], ['bgpd'])
+    assert(results == [[True, 'bgpd: show version\n'], [True, 'bgpd: end\n']])
+    assert(new_bgpd.commands == ['show version', 'end'])
+    # daemon which could not be connected again fails the commands
+    mgr.client_socks['bgpd'] = None
+    assert(not mgr.run_vtysh_command('BGP_GLOBALS', "vtysh -c 'show version'", None))
+    mgr.shutdown()
+
+@patch.dict('sys.modules', **mockmapping)
+def test_bgpd_client_proxy(tmp_path):
+    mgr = create_bgpd_client(tmp_path, [FakeFrrDaemon('bgpd'), FakeFrrDaemon('zebra')])
+    mgr.start()
+    # a client which does not send the whole request does not block the others
+    stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stalled.connect(mgr.PROXY_SERVER_ADDR)
+    stalled.sendall(b'\0\0')
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(10)
+    client.connect(mgr.PROXY_SERVER_ADDR)
+    request = b'[zebra]show ip route\nshow version'
+    client.sendall(struct.pack('>I', len(request)) + request)
+    reply = b''
+    while True:
+        data = client.recv(4096)
+        if not data:
+            break
+        reply += data
+    assert(reply == b'zebra: show ip route\nzebra: show version\n')
+    client.close()
+    stalled.close()
+    mgr.shutdown()
+    assert(not mgr.is_alive())
+
+@patch.dict('sys.modules', **mockmapping)
+@patch('frrcfgd.frrcfgd.g_run_command')
+def test_table_key_map_cache(run_cmd):
+    from frrcfgd import frrcfgd
+    daemon = frrcfgd.BGPConfigDaemon()
+    handlers = dict(daemon.table_handler_list)
+    key_map_init = frrcfgd.BGPKeyMapList.__init__
+    table_keys = []
+    def init_key_map(self, key_map_list, table_name, table_key=None):
+        table_keys.append(table_key)
+        key_map_init(self, key_map_list, table_name, table_key)
+    with patch.object(frrcfgd.BGPKeyMapList, '__init__', init_key_map):
+        for rnd in range(2):
+            for test in neighbor_af_data:
+                run_cmd.reset_mock()
+                handlers[test.table_name](test.table_name, test.key, copy.deepcopy(test.data))
+                if rnd == 0:
+                    test.check_running_cmd(run_cmd, False)
+    # key maps are built once for each address family
+    assert(sorted(table_key['admin_status'] for table_key in table_keys) == ['ipv4', 'ipv6', 'l2vpn'])
+
+@patch.dict('sys.modules', **mockmapping)
+@patch('frrcfgd.frrcfgd.g_run_command')
+def test_table_update_hdlr(run_cmd):
+    from frrcfgd.frrcfgd import BGPConfigDaemon
+    daemon = BGPConfigDaemon()
+    handlers = dict(daemon.table_handler_list)
+    # tables sharing a branch of the update share the handler
+    assert(daemon.table_hdlr_map['BGP_NEIGHBOR'].update_hdlr == daemon.table_hdlr_map['BGP_PEER_GROUP'].update_hdlr)
+    for table in ['BGP_GLOBALS', 'BGP_NEIGHBOR', 'ROUTE_MAP', 'OSPFV2_INTERFACE', 'STATIC_ROUTE']:
+        assert(daemon.table_hdlr_map[table].update_hdlr is not None)
+    tbl_hdlr = daemon.table_hdlr_map['BGP_GLOBALS']
+    update_hdlr = MagicMock(wraps=tbl_hdlr.update_hdlr)
+    tbl_hdlr.update_hdlr = update_hdlr
+    handlers['BGP_GLOBALS']('BGP_GLOBALS', 'default', {'local_asn': '100'})
+    # only the handler of the table is called, VRF based tables get the VRF
+    update_hdlr.assert_called_once()
+    table, prefix, key, data, del_table, key_map, vrf, local_asn = update_hdlr.call_args[0]
+    assert((table, prefix, key, del_table, vrf, local_asn) == ('BGP_GLOBALS', 'default', None, False, 'default', None))
+    assert(key_map is tbl_hdlr.get_key_map(None))
+    assert(run_cmd.call_args_list[0][0][1] == CmdMapTestInfo.compose_vtysh_cmd(conf_bgp_dft_cmd('default', 100)))
+
+@patch.dict('sys.modules', **mockmapping)
+def test_syslog_lazy():
+    import syslog
+    from frrcfgd.frrcfgd import syslog_lazy
+    class Arg:
+        formatted = 0
+        def __format__(self, spec):
+            Arg.formatted += 1
+            return 'arg'
+    old_mask = syslog.setlogmask(syslog.LOG_UPTO(syslog.LOG_INFO))
+    try:
+        syslog_lazy(syslog.LOG_DEBUG, 'data {}', Arg())
+        assert(Arg.formatted == 0)
+        syslog_lazy(syslog.LOG_INFO, 'data {}', Arg())
+        assert(Arg.formatted == 1)
+    finally:
+        syslog.setlogmask(old_mask)
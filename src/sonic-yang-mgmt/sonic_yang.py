@@ -3,7 +3,7 @@ import syslog
 
 from json import dump
 from glob import glob
-from sonic_yang_ext import SonicYangExtMixin, SonicYangException
+from sonic_yang_ext import SonicYangExtMixin, SonicYangException, DEFAULT_YANG_CACHE_DIR
 from sonic_yang_path import SonicYangPathMixin
 
 """
@@ -13,8 +13,11 @@ i.e. it is mixin not parent class.
 """
 class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
 
-    def __init__(self, yang_dir, debug=False, print_log_enabled=True, sonic_yang_options=0):
+    def __init__(self, yang_dir, debug=False, print_log_enabled=True, sonic_yang_options=0,
+                 cache_dir=DEFAULT_YANG_CACHE_DIR):
         self.yang_dir = yang_dir
+        # directory of preprocessed yang model cache, None disables the cache
+        self.cache_dir = cache_dir
         self.ctx = None
         self.module = None
         self.root = None
@@ -50,6 +53,10 @@ class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
         self.mustCache = dict()
         # Lazy caching for configdb to xpath
         self.configPathCache = dict()
+        # Lazy index of data backlinks, updated with the nodes added to or removed
+        # from the data tree, reset when the data tree is loaded:
+        # leafref schema xpath -> {value: [data xpath of the leafref nodes]}
+        self.dataBacklinkIndex = dict()
         # element path for CONFIG DB. An example for this list could be:
         # ['PORT', 'Ethernet0', 'speed']
         self.elementPath = []
@@ -150,6 +157,7 @@ class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
            self.fail(e)
        else:
            self.root = data_node
+           self._reset_data_backlink_index()
 
     """
     get module name from xpath
@@ -337,6 +345,8 @@ class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
         val = str(value)
         try:
             data_node = self.root.new_path(self.ctx, xpath, val, 0, 0)
+            if data_node is not None:
+                self._update_data_backlink_index([data_node], True)
         except Exception as e:
             self.sysLog(msg="Failed to add data node for path: " + str(xpath), debug=syslog.LOG_ERR, doPrint=True)
             self.fail(e)
@@ -433,8 +443,14 @@ class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
             #source data node
             source_node = ctx.parse_data_path(str(data_file), ly.LYD_JSON, ly.LYD_OPT_CONFIG | ly.LYD_OPT_STRICT)
 
-            #merge
+            #merge, values of the existing nodes are replaced by the source ones
+            source_nodes = source_node.tree_for() if source_node is not None else []
+            if self.dataBacklinkIndex:
+                nodes = [self._find_data_node(dnode.path()) for top_node in source_nodes \
+                         for dnode in top_node.tree_dfs() if dnode.subtype() is not None]
+                self._update_data_backlink_index([node for node in nodes if node is not None], False)
             self.root.merge(source_node, 0)
+            self._update_data_backlink_index(source_nodes, True)
         except Exception as e:
             self.fail(e)
 
@@ -448,6 +464,7 @@ class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
             node = self._find_data_node(xpath)
 
         if (node):
+            self._update_data_backlink_index([node], False)
             node.unlink()
             dnode = self._find_data_node(xpath)
             if (dnode is None):
@@ -488,8 +505,17 @@ class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
     """
     def _set_data_node_value(self, data_xpath, value):
         try:
-            self.root.new_path(self.ctx, data_xpath, str(value), ly.LYD_ANYDATA_STRING, ly.LYD_PATH_OPT_UPDATE)
+            node = self._find_data_node(data_xpath) if self.dataBacklinkIndex else None
+            if node is not None:
+                self._update_data_backlink_index([node], False)
+            # returns the first created node, or the updated node if its value changed
+            node = self.root.new_path(self.ctx, data_xpath, str(value), ly.LYD_ANYDATA_STRING, ly.LYD_PATH_OPT_UPDATE)
+            if node is None and self.dataBacklinkIndex:
+                node = self._find_data_node(data_xpath)
+            if node is not None:
+                self._update_data_backlink_index([node], True)
         except Exception as e:
+            self._reset_data_backlink_index()
             self.sysLog(msg="set data node value failed for xpath: " + str(data_xpath), debug=syslog.LOG_ERR, doPrint=True)
             self.fail(e)
 
@@ -743,19 +769,68 @@ class SonicYang(SonicYangExtMixin, SonicYangPathMixin):
     def _resolve_backlink_data(self, lreflist, required_value, ref_list, ref_set):
         for lref in lreflist:
             try:
-                data_set = self.root.find_path(lref).data()
-                for dnode in data_set:
-                    if required_value is not None:
-                        subtype = dnode.subtype()
-                        if subtype is None or subtype.value_str() != required_value:
-                            continue
-                    path = dnode.path()
+                if required_value is not None:
+                    paths = self._get_data_backlink_index(lref).get(required_value, [])
+                else:
+                    paths = [dnode.path() for dnode in self.root.find_path(lref).data()]
+                for path in paths:
                     if path not in ref_set:
                         ref_set.add(path)
                         ref_list.append(path)
             except Exception as e:
                 pass
 
+    """
+    get_data_backlink_index(): index the data nodes of a leafref schema xpath
+                               by value, the index is built on first use
+    input:    lref - schema xpath of the leafref
+    returns:  dict of value to list of data xpath
+    """
+    def _get_data_backlink_index(self, lref):
+        index = self.dataBacklinkIndex.get(lref)
+        if index is None:
+            index = dict()
+            for dnode in self.root.find_path(lref).data():
+                subtype = dnode.subtype()
+                if subtype is not None:
+                    index.setdefault(subtype.value_str(), []).append(dnode.path())
+            self.dataBacklinkIndex[lref] = index
+        return index
+
+    """
+    update_data_backlink_index(): add or remove the leafref data nodes of the
+                                  subtrees to or from the data backlink index
+    input:    nodes - list of Data_Node, roots of the subtrees
+              add - True if the subtrees are added to the data tree, False if
+                    they are going to be removed from it
+    """
+    def _update_data_backlink_index(self, nodes, add):
+        if not self.dataBacklinkIndex:
+            return
+
+        for node in nodes:
+            for dnode in node.tree_dfs():
+                index = self.dataBacklinkIndex.get(dnode.schema().path())
+                subtype = dnode.subtype() if index is not None else None
+                if subtype is None:
+                    continue
+                value = subtype.value_str()
+                path = dnode.path()
+                paths = index.setdefault(value, [])
+                if add and path not in paths:
+                    paths.append(path)
+                elif not add and path in paths:
+                    paths.remove(path)
+                if not paths:
+                    del index[value]
+
+    """
+    reset_data_backlink_index(): drop the data backlink index after a new data
+                                 tree is loaded
+    """
+    def _reset_data_backlink_index(self):
+        self.dataBacklinkIndex = dict()
+
     """
     get_module_prefix:   get the prefix of a Yang module
     input:    name of the Yang module
@@ -4,6 +4,13 @@
 from __future__ import print_function
 import yang as ly
 import syslog
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import xmltodict
+from functools import lru_cache
 from json import dump, dumps, loads
 from xmltodict import parse
 from glob import glob
@@ -37,6 +44,38 @@ LEAF_LIST_WITH_STRING_VALUE_DICT = {
     ('PORT', 'adv_interface_types'): ',',
 }
 
+# Preprocessed yang models are cached in this directory, keyed by a hash of the yang files.
+DEFAULT_YANG_CACHE_DIR = '/var/cache/sonic-yang'
+# Bump when the preprocessing of yang models changes
+YANG_CACHE_VERSION = 1
+
+def _fileDigest(file):
+    with open(file, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+"""
+Digest of the code which shapes the cached yang models: this module, the
+libyang python binding and shared library, and xmltodict.
+"""
+@lru_cache(maxsize=None)
+def _yangCacheCodeDigest():
+
+    digest = hashlib.sha256()
+    digest.update("{}:{}".format(getattr(ly, 'LY_VERSION', ''), \
+        getattr(xmltodict, '__version__', '')).encode())
+    files = [os.path.splitext(__file__)[0] + '.py', ly.__file__, xmltodict.__file__]
+    # libyang shared library loaded by the binding
+    try:
+        with open('/proc/self/maps') as f:
+            files.extend(sorted(set(line.split()[-1] for line in f \
+                if os.path.basename(line.split()[-1]).startswith('libyang.so'))))
+    except OSError:
+        pass
+    for file in files:
+        digest.update(file.encode())
+        digest.update(_fileDigest(file).encode())
+    return digest.hexdigest()
+
 """
 This is the Exception thrown out of all public function of this class.
 """
@@ -68,12 +107,15 @@ class SonicYangExtMixin(SonicYangPathMixin):
             self.sysLog(syslog.LOG_DEBUG,'Loaded below Yang Models')
             self.sysLog(syslog.LOG_DEBUG,str(self.yangFiles))
 
-            # load json for each yang model
-            self._loadJsonYangModel()
-            # create a map from config DB table to yang container
-            self._createDBTableToModuleMap()
-            # compile uses clause (embed into schema)
-            self._compileUsesClause()
+            cacheFile = self._getYangCacheFile()
+            if not self._loadYangCache(cacheFile):
+                # load json for each yang model
+                self._loadJsonYangModel()
+                # create a map from config DB table to yang container
+                self._createDBTableToModuleMap()
+                # compile uses clause (embed into schema)
+                self._compileUsesClause()
+                self._saveYangCache(cacheFile)
         except Exception as e:
             self.sysLog(msg="Yang Models Load failed:{}".format(str(e)), \
                 debug=syslog.LOG_ERR, doPrint=True)
@@ -81,6 +123,92 @@ class SonicYangExtMixin(SonicYangPathMixin):
 
         return True
 
+    """
+    Get the cache file of preprocessed yang models, named by a hash of all yang
+    files in yang_dir and of the code which preprocesses them. Returns None if
+    the cache is disabled.
+    """
+    def _getYangCacheFile(self):
+
+        if not self.cache_dir:
+            return None
+        digest = hashlib.sha256()
+        digest.update("{}:{}:{}:{}".format(YANG_CACHE_VERSION, sys.version_info[0], \
+            sys.version_info[1], _yangCacheCodeDigest()).encode())
+        for file in sorted(glob(self.yang_dir + "/*.yang")):
+            with open(file, 'rb') as f:
+                content = f.read()
+            digest.update(os.path.basename(file).encode())
+            digest.update(str(len(content)).encode())
+            digest.update(content)
+        return os.path.join(self.cache_dir, "yang-{}.pickle".format(digest.hexdigest()))
+
+    """
+    Load yJson, confDbYangMap and preProcessedYang from the cache file.
+    Returns True if they are loaded, False if the cache can not be used.
+    """
+    def _loadYangCache(self, cacheFile):
+
+        if cacheFile is None:
+            return False
+        try:
+            with open(cacheFile, 'rb') as f:
+                st = os.fstat(f.fileno())
+                # only trust a cache which could not be written by other users
+                if st.st_uid not in (0, os.getuid()) or st.st_mode & 0o022:
+                    self.sysLog(syslog.LOG_WARNING, "Ignore yang cache {} owned by uid {} mode {:o}".\
+                        format(cacheFile, st.st_uid, st.st_mode))
+                    return False
+                cache = pickle.load(f)
+            if cache['yangFiles'] != self.yangFiles:
+                return False
+            # confDbYangMap refers to modules in yJson, they are pickled together
+            self.yJson = cache['yJson']
+            self.confDbYangMap = cache['confDbYangMap']
+            self.preProcessedYang = cache['preProcessedYang']
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.sysLog(syslog.LOG_WARNING, "Failed to load yang cache {}:{}".\
+                format(cacheFile, str(e)))
+            return False
+
+        self.sysLog(msg="Loaded yang models from cache {}".format(cacheFile))
+        return True
+
+    """
+    Store yJson, confDbYangMap and preProcessedYang to the cache file. Failures
+    are logged only, the yang models are loaded without cache next time.
+    """
+    def _saveYangCache(self, cacheFile):
+
+        if cacheFile is None:
+            return
+        cache = {
+            'yangFiles': self.yangFiles,
+            'yJson': self.yJson,
+            'confDbYangMap': self.confDbYangMap,
+            'preProcessedYang': self.preProcessedYang
+        }
+        tmpFile = None
+        try:
+            os.makedirs(self.cache_dir, mode=0o755, exist_ok=True)
+            fd, tmpFile = tempfile.mkstemp(dir=self.cache_dir, prefix='.yang-')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.chmod(tmpFile, 0o644)
+            # readers see either no cache or the complete one
+            os.replace(tmpFile, cacheFile)
+            tmpFile = None
+        except Exception as e:
+            self.sysLog(syslog.LOG_WARNING, "Failed to save yang cache {}:{}".\
+                format(cacheFile, str(e)))
+        finally:
+            if tmpFile is not None:
+                os.unlink(tmpFile)
+
+        return
+
     """
     load JSON schema format from yang models
     """
@@ -1251,6 +1379,7 @@ class SonicYangExtMixin(SonicYangPathMixin):
           self.sysLog(msg="Try to load Data in the tree")
           self.root = self.ctx.parse_data_mem(dumps(self.xlateJson), \
                         ly.LYD_JSON, ly.LYD_OPT_CONFIG|ly.LYD_OPT_STRICT)
+          self._reset_data_backlink_index()
 
        except Exception as e:
            self.root = None
@@ -1260,6 +1389,177 @@ class SonicYangExtMixin(SonicYangPathMixin):
 
        return True
 
+    """
+    Update the data tree loaded by loadData() to configdbJson. Only the tables
+    and keys which differ from the previously loaded config are translated and
+    replaced in the data tree, then the tree is validated. On failure the changes
+    of the data tree are undone, the config is rolled back and
+    SonicYangException is raised. (Public)
+    configdbJson is kept to find the changes of the next update, it must not be
+    modified in place afterwards. self.xlateJson holds the translation of the
+    changed entries only.
+    """
+    def updateData(self, configdbJson):
+
+        if self.root is None:
+            return self.loadData(configdbJson)
+
+        # cropped config, tables are shared with configdbJson
+        jIn = dict()
+        tablesWithOutYang = dict()
+        for table, value in configdbJson.items():
+            if table in self.confDbYangMap:
+                jIn[table] = value
+            else:
+                tablesWithOutYang[table] = value
+
+        xlateJson = self.xlateJson
+        # changes of the data tree, undone in reverse order on failure
+        changes = list()
+        try:
+            self.xlateJson = dict()
+            for table in set(self.jIn) | set(jIn):
+                oldTable = self.jIn.get(table)
+                newTable = jIn.get(table)
+                if oldTable != newTable:
+                    self._updateTable(table, oldTable, newTable, changes)
+            if self.root is not None:
+                self._validate_data(self.root, self.ctx)
+        except Exception as e:
+            try:
+                self._undoDataTreeChanges(changes)
+            except Exception as undoErr:
+                self.sysLog(msg="Data Update Undo Failed:{}".format(str(undoErr)), \
+                    debug=syslog.LOG_ERR, doPrint=True)
+                # rebuild the data tree from the previously loaded config
+                tablesWithOutYang = self.tablesWithOutYang
+                self.loadData(self.jIn)
+                self.tablesWithOutYang = tablesWithOutYang
+            self.xlateJson = xlateJson
+            self.sysLog(msg="Data Update Failed:{}".format(str(e)), \
+                debug=syslog.LOG_ERR, doPrint=True)
+            raise SonicYangException("Data Update Failed\n{}".format(str(e)))
+
+        self.jIn = jIn
+        self.tablesWithOutYang = tablesWithOutYang
+        return True
+
+    """
+    Replace the changed keys of a table in the data tree. The whole table is
+    replaced if it is added or removed, or if a key has no data xpath. The
+    changes of the data tree are appended to changes.
+    """
+    def _updateTable(self, table, oldTable, newTable, changes):
+
+        nodes = None
+        if isinstance(oldTable, dict) and isinstance(newTable, dict):
+            keys = [key for key in set(oldTable) | set(newTable) \
+                if oldTable.get(key) != newTable.get(key)]
+            try:
+                nodes = [self._find_data_node(self.configdb_path_to_xpath( \
+                    self.configdb_path_join([table, key]))) \
+                    for key in keys if key in oldTable]
+                newTable = {key: newTable[key] for key in keys if key in newTable}
+            except Exception as e:
+                self.sysLog(syslog.LOG_DEBUG, "Replace table {}:{}".format(table, str(e)))
+                nodes = None
+        if nodes is None:
+            nodes = [self._find_data_node(self.configdb_path_to_xpath( \
+                self.configdb_path_join([table])))]
+
+        for node in nodes:
+            if node is not None:
+                self._update_data_backlink_index([node], False)
+                changes.append(('unlink',) + self._unlinkDataNode(node))
+
+        if not newTable:
+            return
+        yangJ = dict()
+        self._xlateConfigDBtoYang({table: newTable}, yangJ)
+        for key, value in yangJ.items():
+            self.xlateJson.setdefault(key, dict()).update(value)
+        # parsed as edit content, without default nodes which would overwrite
+        # the values of other tables on merge. The entries are validated with
+        # the whole data tree
+        node = self.ctx.parse_data_mem(dumps(yangJ), ly.LYD_JSON, \
+            ly.LYD_OPT_EDIT|ly.LYD_OPT_STRICT)
+        changes.extend(('add', path) for path in self._findNewDataPaths(node))
+        if self.root is None:
+            self.root = node
+        elif node is not None:
+            self.root.merge(node, 0)
+        # the changed keys were unlinked above, so all the merged nodes are new
+        if node is not None:
+            self._update_data_backlink_index(node.tree_for(), True)
+
+        return
+
+    """
+    Unlink a node from the data tree, and its table and top level containers
+    if they are left empty. Returns the data xpath of the parent of the
+    unlinked node (None for a top level node), the unlinked node and its xpath.
+    """
+    def _unlinkDataNode(self, node):
+
+        parent = node.parent()
+        while parent is not None and node.next() is None and \
+            parent.child().path() == node.path():
+            # node is the only child of its parent
+            node = parent
+            parent = node.parent()
+        path = node.path()
+        if path == self.root.path():
+            self.root = node.next()
+        node.unlink()
+
+        return (parent.path() if parent is not None else None, node, path)
+
+    """
+    Get the data xpath of the top most nodes of a data tree which are not in
+    the data tree yet, they are added by merging the data tree.
+    """
+    def _findNewDataPaths(self, node):
+
+        paths = list()
+        nodes = node.tree_for() if node is not None else []
+        while nodes:
+            node = nodes.pop()
+            path = node.path()
+            if self.root is None or self._find_data_node(path) is None:
+                paths.append(path)
+                continue
+            child = node.child()
+            while child is not None:
+                nodes.append(child)
+                child = child.next()
+
+        return paths
+
+    """
+    Undo the changes of the data tree made by _updateTable().
+    """
+    def _undoDataTreeChanges(self, changes):
+
+        for change in reversed(changes):
+            if change[0] == 'add':
+                node = self._find_data_node(change[1])
+                if node is not None:
+                    self._update_data_backlink_index([node], False)
+                    self._unlinkDataNode(node)
+                continue
+            _, parentPath, node, path = change
+            # parents are found by xpath, they may have been unlinked and
+            # inserted again
+            if parentPath is not None:
+                self._find_data_node(parentPath).insert(node)
+            elif self.root is None:
+                self.root = node
+            else:
+                self.root.insert_sibling(node)
+            self._update_data_backlink_index([self._find_data_node(path)], True)
+
+        return
+
     """
     Get data from Data tree, data tree will be assigned in self.xlateJson. (Public)
     """
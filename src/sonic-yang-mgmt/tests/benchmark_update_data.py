@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Replay a multi-step patch on a large config and validate every step like Generic Config Updater does.
+
+The config is the sample config of sonic-yang-models with --rules ACL rules added. Every step of the
+patch changes --changes rules and removes one. The modes are:
+    load    loadData() of the whole config for every step
+    update  updateData() with the config of every step
+The data tree of the last step is checked to be the same in both modes.
+    python3 tests/benchmark_update_data.py --rules 50000 --steps 20
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+SAMPLE_CONFIG = os.path.join(TESTS_DIR, '..', '..', 'sonic-yang-models', 'tests', 'files', 'sample_config_db.json')
+
+
+def make_config(args):
+    with open(SAMPLE_CONFIG) as f:
+        config = json.load(f)['SAMPLE_CONFIG_DB_JSON']
+    for i in range(args.rules):
+        config['ACL_RULE']['V4-ACL-TABLE|BENCH_{}'.format(i)] = {
+            'PACKET_ACTION': 'FORWARD',
+            'SRC_IP': '10.{}.{}.0/24'.format(i // 256 % 256, i % 256),
+            'PRIORITY': str(1000 + i),
+            'IP_TYPE': 'IPv4ANY'
+        }
+    return config
+
+
+def make_steps(config, args):
+    """ Configs after every step of the patch, every step starts from the config of the previous one """
+    steps = []
+    for step in range(args.steps):
+        config = dict(config)
+        config['ACL_RULE'] = dict(config['ACL_RULE'])
+        for i in range(args.changes):
+            key = 'V4-ACL-TABLE|BENCH_{}'.format((step * args.changes + i) % args.rules)
+            config['ACL_RULE'][key] = dict(config['ACL_RULE'][key], PACKET_ACTION='DROP')
+        config['ACL_RULE'].pop('V4-ACL-TABLE|BENCH_{}'.format(args.rules - 1 - step), None)
+        steps.append(config)
+    return steps
+
+
+def run(mode, yang_s, config, steps):
+    yang_s.loadData(config)
+    start = time.time()
+    for step in steps:
+        if mode == 'load':
+            yang_s.loadData(step)
+            yang_s.validate_data_tree()
+        else:
+            yang_s.updateData(step)
+    elapsed = time.time() - start
+    print('{:>6}: {:>8.1f} ms per step'.format(mode, 1000 * elapsed / len(steps)))
+    return copy.deepcopy(yang_s.getData())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--yang-dir', default='/usr/local/yang-models')
+    parser.add_argument('--rules', type=int, default=50000, help='ACL rules added to the sample config')
+    parser.add_argument('--steps', type=int, default=20, help='steps of the patch')
+    parser.add_argument('--changes', type=int, default=5, help='rules changed by every step')
+    parser.add_argument('--modes', default='load,update', help='comma separated modes')
+    args = parser.parse_args()
+
+    import sonic_yang
+    yang_s = sonic_yang.SonicYang(args.yang_dir, print_log_enabled=False)
+    yang_s.loadYangModel()
+    config = make_config(args)
+    steps = make_steps(config, args)
+    print('{} config entries, {} steps'.format(sum(len(table) for table in config.values()), args.steps))
+    results = [run(mode, yang_s, config, steps) for mode in args.modes.split(',')]
+    assert all(result == results[0] for result in results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Measure SonicYang.loadYangModel() with a cold and a warm cache of preprocessed yang models.
+
+Every load runs in a new process like a config CLI invocation does. The modes are:
+    nocache  the cache is disabled
+    cold     the cache directory is empty, the load writes the cache
+    warm     the cache written by the cold load is used
+Max RSS is the peak resident set size of the loading process.
+    python3 tests/benchmark_yang_cache.py --yang-dir /usr/local/yang-models --loads 5
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+
+def load(args):
+    """ Load the yang models once and print the load time and max RSS """
+    import sonic_yang
+    yang_s = sonic_yang.SonicYang(args.yang_dir, print_log_enabled=False, cache_dir=args.load or None)
+    start = time.time()
+    yang_s.loadYangModel()
+    elapsed = time.time() - start
+    print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def run(mode, cache_dir, args):
+    if mode == 'cold':
+        for name in os.listdir(cache_dir):
+            os.unlink(os.path.join(cache_dir, name))
+    times, rss = [], []
+    loads = 1 if mode == 'cold' else args.loads
+    for _ in range(loads):
+        output = subprocess.check_output([sys.executable, __file__, '--yang-dir', args.yang_dir,
+                                          '--load', '' if mode == 'nocache' else cache_dir],
+                                         universal_newlines=True)
+        elapsed, maxrss = output.split()[-2:]
+        times.append(float(elapsed))
+        rss.append(int(maxrss))
+    print('{:>8}: {:>8.1f} ms per load, {:>7} KB max RSS'.format(
+        mode, 1000 * sum(times) / len(times), max(rss)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--yang-dir', default='/usr/local/yang-models')
+    parser.add_argument('--loads', type=int, default=5, help='loads per mode')
+    parser.add_argument('--modes', default='nocache,cold,warm', help='comma separated modes')
+    parser.add_argument('--load', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load is not None:
+        load(args)
+        return
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        print('{} yang files in {}'.format(len([f for f in os.listdir(args.yang_dir) if f.endswith('.yang')]),
+                                          args.yang_dir))
+        for mode in args.modes.split(','):
+            run(mode, cache_dir, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,11 @@ import os
 import pytest
 import sonic_yang as sy
 import json
+import copy
 import glob
 import logging
+import shutil
+from unittest import mock
 from ijson import items as ijson_itmes
 
 test_path = os.path.dirname(os.path.abspath(__file__))
@@ -260,6 +263,76 @@ class Test_SonicYang_UsesCompilation(object):
             "'event-data' leaf should remain in notification"
 
 
+class Test_SonicYang_Cache(object):
+    """Tests for the on-disk cache of preprocessed yang models."""
+
+    @pytest.fixture(autouse=True)
+    def yang_dir(self, tmp_path):
+        data = _load_test_data()
+        yang_dir = tmp_path / 'yang'
+        shutil.copytree(str(data['yang_dir']), str(yang_dir))
+        return str(yang_dir)
+
+    def _load(self, yang_dir, cache_dir):
+        yang_s = sy.SonicYang(yang_dir, cache_dir=cache_dir)
+        yang_s.loadYangModel()
+        return yang_s
+
+    def test_warm_load_matches_cold_load(self, yang_dir, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        cold = self._load(yang_dir, cache_dir)
+        assert len(os.listdir(cache_dir)) == 1
+
+        with mock.patch.object(sy.SonicYang, '_loadJsonYangModel') as load_json:
+            warm = self._load(yang_dir, cache_dir)
+            assert not load_json.called
+        assert warm.yangFiles == cold.yangFiles
+        assert warm.yJson == cold.yJson
+        assert warm.confDbYangMap == cold.confDbYangMap
+        assert warm.preProcessedYang == cold.preProcessedYang
+        # the map refers to the modules in yJson like after a cold load
+        for table, entry in warm.confDbYangMap.items():
+            if 'yangModule' in entry:
+                assert any(entry['yangModule'] is j['module'] for j in warm.yJson)
+
+    def test_cache_follows_yang_files(self, yang_dir, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        self._load(yang_dir, cache_dir)
+        yang_file = sorted(glob.glob(yang_dir + "/*.yang"))[0]
+        with open(yang_file, 'a') as f:
+            f.write("\n// changed\n")
+        with mock.patch.object(sy.SonicYang, '_loadJsonYangModel',
+                               autospec=True, side_effect=sy.SonicYang._loadJsonYangModel) as load_json:
+            self._load(yang_dir, cache_dir)
+            assert load_json.called
+        assert len(os.listdir(cache_dir)) == 2
+
+    def test_cache_follows_code(self, yang_dir, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        self._load(yang_dir, cache_dir)
+        # e.g. sonic_yang_ext.py, libyang or xmltodict is upgraded
+        with mock.patch('sonic_yang_ext._yangCacheCodeDigest', return_value='changed'):
+            with mock.patch.object(sy.SonicYang, '_loadJsonYangModel',
+                                   autospec=True, side_effect=sy.SonicYang._loadJsonYangModel) as load_json:
+                self._load(yang_dir, cache_dir)
+                assert load_json.called
+        assert len(os.listdir(cache_dir)) == 2
+
+    def test_corrupted_cache_is_ignored(self, yang_dir, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        cold = self._load(yang_dir, cache_dir)
+        cache_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+        with open(cache_file, 'wb') as f:
+            f.write(b'garbage')
+        yang_s = self._load(yang_dir, cache_dir)
+        assert yang_s.yJson == cold.yJson
+
+    def test_cache_disabled(self, yang_dir, tmp_path):
+        yang_s = self._load(yang_dir, None)
+        assert yang_s._getYangCacheFile() is None
+        assert len(yang_s.yJson) > 0
+
+
 class Test_SonicYang(object):
     """Tests that query or manipulate an already-loaded data tree.
 
@@ -383,6 +456,49 @@ class Test_SonicYang(object):
             depend = yang_s.find_data_dependencies(xpath)
             assert set(depend) == set(list)
 
+    #test data dependencies index follows data tree changes
+    def test_find_data_dependencies_index(self, yang_s, data):
+        xpath = "/test-port:test-port/PORT/PORT_LIST[port_name='Ethernet8']/port_name"
+        interface = "/test-interface:test-interface/INTERFACE/INTERFACE_LIST[interface='Ethernet8'][ip-prefix='10.1.1.64/26']"
+        depend = yang_s.find_data_dependencies(xpath)
+        assert interface + "/interface" in depend
+        assert len(yang_s.dataBacklinkIndex) > 0
+
+        yang_s._deleteNode(interface)
+        depend = yang_s.find_data_dependencies(xpath)
+        assert interface + "/interface" not in depend
+        assert len(depend) == 2
+
+    #test data dependencies index is updated by the changes of data tree
+    def test_find_data_dependencies_interleaved(self, yang_s, data):
+        xpath = "/test-port:test-port/PORT/PORT_LIST[port_name='Ethernet8']/port_name"
+        interface = "/test-interface:test-interface/INTERFACE/INTERFACE_LIST[interface='Ethernet8'][ip-prefix='10.1.2.0/24']"
+
+        def find_data_dependencies(xpath):
+            depend = yang_s.find_data_dependencies(xpath)
+            # same as the dependencies found by the index built from the data tree
+            index = yang_s.dataBacklinkIndex
+            yang_s._reset_data_backlink_index()
+            assert set(depend) == set(yang_s.find_data_dependencies(xpath))
+            yang_s.dataBacklinkIndex = index
+            return depend
+
+        assert len(find_data_dependencies(xpath)) == 3
+        yang_s._add_data_node(interface + "/ip-prefix", "10.1.2.0/24")
+        assert interface + "/interface" in find_data_dependencies(xpath)
+
+        for node in data['set_nodes']:
+            yang_s._set_data_node_value(str(node['xpath']), node['value'])
+            find_data_dependencies(xpath)
+
+        yang_s._merge_data(data['data_merge_file'], str(data['yang_dir']))
+        for node in data['dependencies']:
+            find_data_dependencies(str(node['xpath']))
+
+        yang_s._deleteNode(interface)
+        assert interface + "/interface" not in find_data_dependencies(xpath)
+        assert len(find_data_dependencies(xpath)) == 3
+
     #test data dependencies
     def test_find_schema_dependencies(self, yang_s, data):
         for node in data['schema_dependencies']:
@@ -576,6 +692,125 @@ class Test_SonicYang(object):
 
         return
 
+    def test_update_data(self, sonic_yang_data):
+        # in this test, the data tree updated incrementally must be the same
+        # as the data tree loaded from the whole config
+        test_file = sonic_yang_data['test_file']
+        syc = sonic_yang_data['syc']
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syc.loadData(jIn)
+
+        steps = []
+        config = copy.deepcopy(jIn)
+        config['PORT']['Ethernet0']['description'] = 'changed'
+        steps.append(copy.deepcopy(config))
+        del config['VLAN_MEMBER']['Vlan111|Ethernet0']
+        config['DEVICE_METADATA']['localhost']['hostname'] = 'changed-host'
+        steps.append(copy.deepcopy(config))
+        del config['SFLOW_COLLECTOR']
+        config['UNKNOWN_TABLE'] = {'key': {'field': 'value'}}
+        steps.append(copy.deepcopy(config))
+
+        port = "/sonic-port:sonic-port/PORT/PORT_LIST[name='Ethernet0']/name"
+        assert len(syc.find_data_dependencies(port)) > 0
+        updated = []
+        for config in steps:
+            syc.updateData(config)
+            assert 'UNKNOWN_TABLE' not in syc.jIn
+            updated.append(copy.deepcopy(syc.getData()))
+            # data backlink index is updated with the changed entries
+            depend = syc.find_data_dependencies(port)
+            index = syc.dataBacklinkIndex
+            syc._reset_data_backlink_index()
+            assert depend == syc.find_data_dependencies(port)
+            syc.dataBacklinkIndex = index
+
+        for config, data in zip(steps, updated):
+            syc.loadData(config)
+            assert data == syc.getData()
+
+        return
+
+    def test_update_data_rollback(self, sonic_yang_data):
+        # in this test, an invalid update must leave the data tree unchanged
+        test_file = sonic_yang_data['test_file']
+        syc = sonic_yang_data['syc']
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syc.loadData(jIn)
+        before = syc.getData()
+        port = "/sonic-port:sonic-port/PORT/PORT_LIST[name='Ethernet0']/name"
+        depend = syc.find_data_dependencies(port)
+
+        config = copy.deepcopy(jIn)
+        config['PORT']['Ethernet0']['description'] = 'changed'
+        del config['VLAN_MEMBER']['Vlan111|Ethernet0']
+        del config['SFLOW_COLLECTOR']
+        del config['DEVICE_METADATA']
+        # leafref to a VLAN which does not exist
+        config['VLAN_MEMBER']['Vlan999|Ethernet0'] = {'tagging_mode': 'tagged'}
+        # only the changed entries are restored, the data tree is not copied
+        with mock.patch.object(type(syc.root), 'dup_withsiblings') as dup:
+            with pytest.raises(sy.SonicYangException):
+                syc.updateData(config)
+            assert not dup.called
+
+        assert syc.jIn == jIn
+        assert syc.getData() == before
+        assert syc.find_data_dependencies(port) == depend
+        syc._reset_data_backlink_index()
+        assert syc.find_data_dependencies(port) == depend
+
+        return
+
+    def test_update_data_mandatory(self, sonic_yang_data):
+        # in this test, an updated entry without a mandatory leaf must fail
+        test_file = sonic_yang_data['test_file']
+        syc = sonic_yang_data['syc']
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syc.loadData(jIn)
+        before = syc.getData()
+        xlateJson = syc.xlateJson
+
+        config = copy.deepcopy(jIn)
+        del config['PORT']['Ethernet0']['speed']
+        with pytest.raises(sy.SonicYangException):
+            syc.updateData(config)
+
+        assert syc.xlateJson is xlateJson
+        assert syc.getData() == before
+
+        return
+
+    def test_update_data_unique(self, sonic_yang_data):
+        # in this test, an updated entry which violates a unique statement
+        # together with an unchanged entry must fail
+        test_file = sonic_yang_data['test_file']
+        syc = sonic_yang_data['syc']
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        jIn['SNMP_AGENT_ADDRESS_CONFIG'] = {'10.1.1.1|161|Vrf_blue': {}}
+        syc.loadData(jIn)
+        before = syc.getData()
+
+        config = copy.deepcopy(jIn)
+        config['SNMP_AGENT_ADDRESS_CONFIG']['10.1.1.1|161|Vrf_red'] = {}
+        with pytest.raises(sy.SonicYangException):
+            syc.updateData(config)
+
+        assert syc.getData() == before
+
+        config['SNMP_AGENT_ADDRESS_CONFIG']['10.1.1.1|162|Vrf_red'] = \
+            config['SNMP_AGENT_ADDRESS_CONFIG'].pop('10.1.1.1|161|Vrf_red')
+        syc.updateData(config)
+        updated = syc.getData()
+        syc.loadData(config)
+        assert updated == syc.getData()
+
+        return
+
     def test_table_with_no_yang(self, sonic_yang_data):
         # in this test, tables with no YANG models must be stored seperately
         # by this library.
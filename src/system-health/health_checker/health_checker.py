@@ -1,3 +1,6 @@
+import threading
+
+
 class HealthChecker(object):
     """
     Base class for health checker. A checker is an object that performs system health check for a particular category,
@@ -10,10 +13,13 @@ class HealthChecker(object):
     STATUS_OK = 'OK'
     STATUS_NOT_OK = 'Not OK'
 
+    # Set by HealthCheckerManager from the collected check results of all checkers
     summary = STATUS_OK
 
     def __init__(self):
         self._info = {}
+        # Check results are read by the manager while a check that exceeded its time budget is still running
+        self._info_lock = threading.Lock()
 
     def reset(self):
         """
@@ -37,6 +43,14 @@ class HealthChecker(object):
         """
         return self._info
 
+    def copy_info(self):
+        """
+        Get a copy of the information of the checker, it is safe to call it while the check is running.
+        :return: Check result.
+        """
+        with self._info_lock:
+            return {object_name: dict(data) for object_name, data in self.get_info().items()}
+
     def check(self, config):
         """
         Perform the check.
@@ -56,10 +70,11 @@ class HealthChecker(object):
         :param value: Object attribute value.
         :return:
         """
-        if object_name not in self._info:
-            self._info[object_name] = {}
+        with self._info_lock:
+            if object_name not in self._info:
+                self._info[object_name] = {}
 
-        self._info[object_name][key] = value
+            self._info[object_name][key] = value
 
     def set_object_not_ok(self, object_type, object_name, message):
         """
@@ -72,7 +87,6 @@ class HealthChecker(object):
         self.add_info(object_name, self.INFO_FIELD_OBJECT_TYPE, object_type)
         self.add_info(object_name, self.INFO_FIELD_OBJECT_MSG, message)
         self.add_info(object_name, self.INFO_FIELD_OBJECT_STATUS, self.STATUS_NOT_OK)
-        HealthChecker.summary = HealthChecker.STATUS_NOT_OK
 
     def set_object_ok(self, object_type, object_name):
         """
@@ -1,3 +1,8 @@
+import concurrent.futures
+import threading
+import time
+
+from sonic_py_common.logger import Logger
 from .config import Config
 from .health_checker import HealthChecker
 from .service_checker import ServiceChecker
@@ -5,6 +10,55 @@ from .hardware_checker import HardwareChecker
 from .user_defined_checker import UserDefinedChecker
 from . import utils
 
+SYSLOG_IDENTIFIER = 'health_checker_manager'
+logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
+
+
+class LatencyHistogram(object):
+    """
+    Cumulative histogram of check latencies of a checker.
+    """
+    # Upper bounds of the buckets in seconds
+    BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.last = 0.0
+        self.timeouts = 0
+
+    def add(self, latency):
+        """
+        Add a latency sample.
+        :param latency: Latency in seconds.
+        :return:
+        """
+        index = 0
+        while index < len(self.BUCKETS) and latency > self.BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += latency
+        self.last = latency
+
+    def to_dict(self):
+        """
+        Get the histogram as STATE_DB fields. Bucket le_<bound> counts the samples not greater than the bound.
+        :return: A dictionary of field name and string value.
+        """
+        data = {}
+        total = 0
+        for bound, count in zip(self.BUCKETS, self.counts):
+            total += count
+            data['le_{}'.format(bound)] = str(total)
+        data['le_inf'] = str(self.count)
+        data['count'] = str(self.count)
+        data['sum'] = '{:.3f}'.format(self.sum)
+        data['last'] = '{:.3f}'.format(self.last)
+        data['timeouts'] = str(self.timeouts)
+        return data
+
 
 class HealthCheckerManager(object):
     """
@@ -13,6 +67,12 @@ class HealthCheckerManager(object):
     def __init__(self):
         self._checkers = []
         self.config = Config()
+        # Checkers are run concurrently, a checker that exceeds its time budget keeps running in the background
+        self._executor = None
+        self._executor_workers = None
+        self._running = {}  # checker name -> (checker, future) of its unfinished check
+        self._lock = threading.Lock()
+        self.latency = {}  # checker name -> LatencyHistogram
         self.initialize()
 
     def initialize(self):
@@ -26,51 +86,120 @@ class HealthCheckerManager(object):
     def check(self, chassis):
         """
         Load new configuration if any and perform the system health check for all existing checkers.
+        The checkers run concurrently, each of them must finish in config.checker_timeout seconds.
         :param chassis: A chassis object.
         :return: A dictionary that contains the status for all objects that was checked.
         """
-        HealthChecker.summary = HealthChecker.STATUS_OK
         stats = {}
         self.config.load_config()
 
-        for checker in self._checkers:
-            self._do_check(checker, stats)
-
+        checkers = list(self._checkers)
         if self.config.user_defined_checkers:
             for udc in self.config.user_defined_checkers:
-                checker = UserDefinedChecker(udc)
-                self._do_check(checker, stats)
+                checkers.append(UserDefinedChecker(udc))
+
+        # Checks which finished after their time budget in a previous run are dropped, their checkers are run again
+        self._running = {name: running for name, running in self._running.items() if not running[1].done()}
+        futures = [self._submit(checker) for checker in checkers]
+        concurrent.futures.wait([future for _, future in futures], timeout=self.config.checker_timeout)
+
+        for checker, future in futures:
+            self._collect(checker, future, stats)
 
+        # Computed from the collected results, checks still running in the background do not change it
+        HealthChecker.summary = self._get_summary(stats)
         self._set_system_led(chassis)
         return stats
 
-    def _do_check(self, checker, stats):
+    def _get_executor(self):
+        if self._executor is None or self._executor_workers != self.config.max_workers:
+            if self._executor is not None:
+                # Unfinished checks still run to the end
+                self._executor.shutdown(wait=False)
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.config.max_workers,
+                                                                   thread_name_prefix='healthd-checker')
+            self._executor_workers = self.config.max_workers
+        return self._executor
+
+    def _submit(self, checker):
+        """
+        Start the check of a checker unless its previous check is still running.
+        :param checker: A checker object.
+        :return: Tuple of the checker which result is reported and the future of its check.
+        """
+        name = str(checker)
+        if name in self._running:
+            return self._running[name]
+        future = self._get_executor().submit(self._do_check, checker)
+        self._running[name] = (checker, future)
+        return checker, future
+
+    def _do_check(self, checker):
+        """
+        Do check for a particular checker and record its latency.
+        :param checker: A checker object.
+        :return: Copy of the check result of the checker.
+        """
+        begin = time.time()
+        try:
+            checker.check(self.config)
+            return checker.copy_info()
+        finally:
+            self._get_latency(str(checker)).add(time.time() - begin)
+
+    def _get_latency(self, name):
+        with self._lock:
+            if name not in self.latency:
+                self.latency[name] = LatencyHistogram()
+            return self.latency[name]
+
+    def _collect(self, checker, future, stats):
         """
-        Do check for a particular checker and collect the check statistic.
+        Collect the check statistic of a particular checker.
         :param checker: A checker object.
+        :param future: Future of the check.
         :param stats: Check statistic.
         :return:
         """
+        if not future.done():
+            self._get_latency(str(checker)).timeouts += 1
+            # Report the objects the checker has finished so far
+            try:
+                info = {name: data for name, data in checker.copy_info().items()
+                        if HealthChecker.INFO_FIELD_OBJECT_STATUS in data}
+                self._add_stats(stats, checker.get_category(), info)
+            except Exception as e:
+                logger.log_warning('Failed to get partial result of {} - {}'.format(checker, repr(e)))
+            self._set_internal_error(stats, checker, 'Health check for {} did not finish in {} seconds, results are partial'.format(
+                checker, self.config.checker_timeout))
+            return
+
+        self._running.pop(str(checker), None)
         try:
-            checker.check(self.config)
-            category = checker.get_category()
-            info = checker.get_info()
-            if category not in stats:
-                stats[category] = info
-            else:
-                stats[category].update(info)
+            self._add_stats(stats, checker.get_category(), future.result())
         except Exception as e:
-            HealthChecker.summary = HealthChecker.STATUS_NOT_OK
-            error_msg = 'Failed to perform health check for {} due to exception - {}'.format(checker, repr(e))
-            entry = {str(checker): {
-                HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
-                HealthChecker.INFO_FIELD_OBJECT_MSG: error_msg,
-                HealthChecker.INFO_FIELD_OBJECT_TYPE: "Internal"
-            }}
-            if 'Internal' not in stats:
-                stats['Internal'] = entry
-            else:
-                stats['Internal'].update(entry)
+            self._set_internal_error(stats, checker, 'Failed to perform health check for {} due to exception - {}'.format(checker, repr(e)))
+
+    def _add_stats(self, stats, category, info):
+        if category not in stats:
+            stats[category] = info
+        else:
+            stats[category].update(info)
+
+    def _get_summary(self, stats):
+        for info in stats.values():
+            for data in info.values():
+                if data.get(HealthChecker.INFO_FIELD_OBJECT_STATUS) == HealthChecker.STATUS_NOT_OK:
+                    return HealthChecker.STATUS_NOT_OK
+        return HealthChecker.STATUS_OK
+
+    def _set_internal_error(self, stats, checker, error_msg):
+        entry = {str(checker): {
+            HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
+            HealthChecker.INFO_FIELD_OBJECT_MSG: error_msg,
+            HealthChecker.INFO_FIELD_OBJECT_TYPE: "Internal"
+        }}
+        self._add_stats(stats, 'Internal', entry)
 
     def _set_system_led(self, chassis):
         try:
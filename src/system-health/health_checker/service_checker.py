@@ -1,3 +1,4 @@
+import concurrent.futures
 import docker
 import os
 import pickle
@@ -6,6 +7,7 @@ import re
 from swsscommon import swsscommon
 from sonic_py_common import multi_asic, device_info
 from sonic_py_common.logger import Logger
+from .config import Config
 from .health_checker import HealthChecker
 from . import utils
 
@@ -15,13 +17,13 @@ logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
 EVENTS_PUBLISHER_SOURCE = "sonic-events-host"
 EVENTS_PUBLISHER_TAG = "process-not-running"
 
-def check_docker_image(image_name):
+def check_docker_image(image_name, docker_client=None):
     """
     @summary: This function will check if docker image exists.
     @return:  True if the image exists, otherwise False.
     """
     try:
-        DOCKER_CLIENT = docker.DockerClient(base_url='unix://var/run/docker.sock')
+        DOCKER_CLIENT = docker_client or docker.DockerClient(base_url='unix://var/run/docker.sock')
         DOCKER_CLIENT.images.get(image_name)
         return True
     except (docker.errors.ImageNotFound, docker.errors.APIError) as err:
@@ -37,6 +39,12 @@ class ServiceChecker(HealthChecker):
 
     CRITICAL_PROCESSES_PATH = 'etc/supervisor/critical_processes'
 
+    # Paths of the supervisord socket relative to the root of a container. /var/run is a link to /run on Debian
+    SUPERVISOR_SOCKET_PATHS = ['run/supervisor.sock', 'var/run/supervisor.sock']
+
+    # Timeout in seconds of a supervisord XML-RPC call
+    SUPERVISOR_RPC_TIMEOUT = 5
+
     # Command to get merged directory of a container
     GET_CONTAINER_FOLDER_CMD = 'docker inspect {} --format "{{{{.GraphDriver.Data.MergedDir}}}}"'
 
@@ -67,6 +75,10 @@ class ServiceChecker(HealthChecker):
 
         self.config_db = None
 
+        # One docker client for all queries, and the details of the running containers it listed
+        self.docker_client = None
+        self.container_attrs = {}
+
         self.load_critical_process_cache()
 
     def get_expected_running_containers(self, feature_table):
@@ -105,12 +117,12 @@ class ServiceChecker(HealthChecker):
                 continue
             # slim image does not have telemetry container and corresponding docker image
             if container_name == "telemetry":
-                ret = check_docker_image("docker-sonic-telemetry")
+                ret = check_docker_image("docker-sonic-telemetry", self._get_docker_client())
                 if not ret:
                     # If telemetry container image is not present, check gnmi container image
                     # If gnmi container image is not present, ignore telemetry container check
                     # if gnmi container image is present, check gnmi container instead of telemetry
-                    ret = check_docker_image("docker-sonic-gnmi")
+                    ret = check_docker_image("docker-sonic-gnmi", self._get_docker_client())
                     if not ret:
                         logger.log_debug("Ignoring telemetry container check on image which has no corresponding docker image")
                     else:
@@ -118,7 +130,7 @@ class ServiceChecker(HealthChecker):
                     continue
             # Some platforms may not include the OTEL container; skip expecting it when image absent
             if container_name == "otel":
-                if not check_docker_image("docker-sonic-otel"):
+                if not check_docker_image("docker-sonic-otel", self._get_docker_client()):
                     logger.log_debug("Ignoring otel container check on image which has no corresponding docker image")
                     continue
 
@@ -153,10 +165,11 @@ class ServiceChecker(HealthChecker):
         Returns:
             running_containers: A set of running container names
         """
-        DOCKER_CLIENT = docker.DockerClient(base_url='unix://var/run/docker.sock')
         running_containers = set()
-        ctrs = DOCKER_CLIENT.containers
+        ctrs = self._get_docker_client().containers
+        self.container_attrs = {}
         try:
+            # The containers are listed with the same details as "docker inspect" shows
             lst = ctrs.list(filters={"status": "running"})
 
             for ctr in lst:
@@ -169,6 +182,7 @@ class ServiceChecker(HealthChecker):
                 if ctr.name in ServiceChecker.CONTAINER_K8S_WHITELIST:
                     continue
                 running_containers.add(ctr.name)
+                self.container_attrs[ctr.name] = ctr.attrs
                 if ctr.name not in self.container_critical_processes:
                     self.fill_critical_process_by_container(ctr.name)
         except docker.errors.APIError as err:
@@ -237,7 +251,19 @@ class ServiceChecker(HealthChecker):
         self.container_critical_processes[container] = critical_process_list
         self.need_save_cache = True
 
+    def _get_docker_client(self):
+        if self.docker_client is None:
+            self.docker_client = docker.DockerClient(base_url='unix://var/run/docker.sock')
+        return self.docker_client
+
     def _get_container_folder(self, container):
+        try:
+            container_folder = self.container_attrs[container]['GraphDriver']['Data']['MergedDir']
+            if isinstance(container_folder, str):
+                return container_folder
+        except (KeyError, TypeError):
+            pass
+
         container_folder = utils.run_command(ServiceChecker.GET_CONTAINER_FOLDER_CMD.format(container))
         if container_folder is None:
             return container_folder
@@ -339,8 +365,15 @@ class ServiceChecker(HealthChecker):
             self.set_object_not_ok('Service', 'system', 'no critical process found')
             return
 
-        for container, critical_process_list in self.container_critical_processes.items():
-            self.check_process_existence(container, critical_process_list, config, feature_table)
+        # Query supervisor of all containers concurrently, handle the results in this thread as they arrive
+        containers = {container: critical_process_list for container, critical_process_list in self.container_critical_processes.items()
+                      if self._is_feature_enabled(container, feature_table)}
+        max_workers = config.max_workers if config else Config.DEFAULT_MAX_WORKERS
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='healthd-probe') as executor:
+            futures = {executor.submit(self._get_process_status, container): container for container in containers}
+            for future in concurrent.futures.as_completed(futures):
+                container = futures[future]
+                self._check_process_status(container, containers[container], config, future.result())
 
         for bad_container in self.bad_containers:
             self.set_object_not_ok('Service', bad_container, 'Syntax of critical_processes file is incorrect')
@@ -383,42 +416,88 @@ class ServiceChecker(HealthChecker):
             swsscommon.event_publish(events_handle, EVENTS_PUBLISHER_TAG, params)
         swsscommon.events_deinit_publisher(events_handle)
 
-    def check_process_existence(self, container_name, critical_process_list, config, feature_table):
-        """Check whether the process in the specified container is running or not.
+    def _is_feature_enabled(self, container_name, feature_table):
+        """Check whether the feature of the container is enabled in FEATURE table
 
         Args:
             container_name (str): Container name
-            critical_process_list (list): Critical processes
-            config (object): Health checker configuration.
             feature_table (object): Feature table
         """
         feature_name = self.container_feature_dict[container_name]
-        if feature_name in feature_table:
-            # We look into the 'FEATURE' table to verify whether the container is disabled or not.
-            # If the container is diabled, we exit.
-            if ("state" in feature_table[feature_name]
-                    and feature_table[feature_name]["state"] not in ["disabled", "always_disabled"]):
-
-                # We are using supervisorctl status to check the critical process status. We cannot leverage psutil here because
-                # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
-                # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
-                cmd = 'docker exec {} bash -c "supervisorctl status"'.format(container_name)
-                process_status = utils.run_command(cmd, timeout=15)
-                if process_status is None:
-                    for process_name in critical_process_list:
-                        self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
-                    self.publish_events(container_name, critical_process_list)
-                    return
-
-                process_status = self._parse_supervisorctl_status(process_status.strip().splitlines())
-                for process_name in critical_process_list:
-                    if config and config.ignore_services and process_name in config.ignore_services:
-                        continue
-
-                    # Sometimes process_name is in critical_processes file, but it is not in supervisor.conf, such process will not run in container.
-                    # and it is safe to ignore such process. E.g, radv. So here we only check those processes which are in process_status.
-                    if process_name in process_status:
-                        if process_status[process_name] != 'RUNNING':
-                            self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
-                        else:
-                            self.set_object_ok('Process', '{}:{}'.format(container_name, process_name))
\ No newline at end of file
+        # We look into the 'FEATURE' table to verify whether the container is disabled or not.
+        return (feature_name in feature_table
+                and "state" in feature_table[feature_name]
+                and feature_table[feature_name]["state"] not in ["disabled", "always_disabled"])
+
+    def _get_supervisor_socket(self, container_name):
+        """Get path of the supervisord socket of a container on the host
+
+        Args:
+            container_name (str): Container name
+
+        Returns:
+            str: Socket path, None if the socket is not found
+        """
+        container_folder = self._get_container_folder(container_name)
+        if not container_folder:
+            return None
+        for socket_path in ServiceChecker.SUPERVISOR_SOCKET_PATHS:
+            # A link in the container must not be followed on the host
+            if os.path.islink(os.path.join(container_folder, os.path.dirname(socket_path))):
+                continue
+            path = os.path.join(container_folder, socket_path)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _get_process_status(self, container_name):
+        """Get state of the processes in a container from its supervisord
+
+        Args:
+            container_name (str): Container name
+
+        Returns:
+            dict: Process name and state like "RUNNING", None if supervisord can not be queried
+        """
+        # We are using supervisord to check the critical process status. We cannot leverage psutil here because
+        # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
+        # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
+        socket_path = self._get_supervisor_socket(container_name)
+        if socket_path:
+            try:
+                return utils.get_supervisor_process_states(socket_path, ServiceChecker.SUPERVISOR_RPC_TIMEOUT)
+            except Exception as e:
+                logger.log_debug('Failed to query supervisord of {} via {}: {}'.format(container_name, socket_path, repr(e)))
+
+        cmd = 'docker exec {} bash -c "supervisorctl status"'.format(container_name)
+        process_status = utils.run_command(cmd, timeout=15)
+        if process_status is None:
+            return None
+        return self._parse_supervisorctl_status(process_status.strip().splitlines())
+
+    def _check_process_status(self, container_name, critical_process_list, config, process_status):
+        """Check the critical processes of a container in the output of supervisorctl status
+
+        Args:
+            container_name (str): Container name
+            critical_process_list (list): Critical processes
+            config (object): Health checker configuration.
+            process_status (dict): Process name and state, None if supervisord can not be queried
+        """
+        if process_status is None:
+            for process_name in critical_process_list:
+                self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
+            self.publish_events(container_name, critical_process_list)
+            return
+
+        for process_name in critical_process_list:
+            if config and config.ignore_services and process_name in config.ignore_services:
+                continue
+
+            # Sometimes process_name is in critical_processes file, but it is not in supervisor.conf, such process will not run in container.
+            # and it is safe to ignore such process. E.g, radv. So here we only check those processes which are in process_status.
+            if process_name in process_status:
+                if process_status[process_name] != 'RUNNING':
+                    self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
+                else:
+                    self.set_object_ok('Process', '{}:{}'.format(container_name, process_name))
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 import os
+import re
 import sys
 import time
 import glob
@@ -26,6 +27,25 @@ QUEUE_TIMEOUT = 15
 TASK_STOP_TIMEOUT = 10
 logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
 exclude_srv_list = ['ztp.service']
+#Unit properties read by "systemctl show" and tracked from systemd PropertiesChanged signals
+UNIT_PROPERTIES = ['Id', 'LoadState', 'UnitFileState', 'Type', 'ActiveState', 'SubState', 'Result']
+SYSTEMD_UNIT_INTERFACES = ['org.freedesktop.systemd1.Unit', 'org.freedesktop.systemd1.Service']
+SYSTEMD_UNIT_PATH_PREFIX = '/org/freedesktop/systemd1/unit/'
+
+def unit_name_from_path(path):
+    """ Get unit name from systemd object path, e.g. /org/freedesktop/systemd1/unit/bgp_2eservice -> bgp.service """
+    if not path or not path.startswith(SYSTEMD_UNIT_PATH_PREFIX):
+        return None
+    return re.sub(r'_([0-9a-f]{2})', lambda m: chr(int(m.group(1), 16)), path[len(SYSTEMD_UNIT_PATH_PREFIX):])
+
+def parse_systemctl_show(output):
+    """ Parse the property lines of one unit printed by "systemctl show" """
+    prop_dict = {}
+    for prop in output.split('\n'):
+        kv = prop.split("=", 1)
+        if len(kv) == 2:
+            prop_dict[kv[0]] = kv[1]
+    return prop_dict
 
 #Thread which subscribes to STATE_DB FEATURE table for any update
 #and push service events to main thread via queue
@@ -76,6 +96,8 @@ class MonitorSystemBusTask(ThreadTaskBase):
     def __init__(self,myQ):
         ThreadTaskBase.__init__(self)
         self.task_queue = myQ
+        #Set while unit property changes are pushed to the queue
+        self.properties_subscribed = threading.Event()
 
     def on_job_removed(self, id, job, unit, result):
         if result == "done" or result == "failed":
@@ -84,6 +106,25 @@ class MonitorSystemBusTask(ThreadTaskBase):
             self.task_notify(msg)
             return
 
+    def on_properties_changed(self, interface, changed, invalidated, path=None):
+        if interface not in SYSTEMD_UNIT_INTERFACES:
+            return
+        unit = unit_name_from_path(path)
+        properties = {str(k): str(v) for k, v in changed.items() if str(k) in UNIT_PROPERTIES}
+        invalidated = [str(k) for k in invalidated if str(k) in UNIT_PROPERTIES]
+        if unit is None or (not properties and not invalidated):
+            return
+        timestamp = "{}".format(datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"))
+        msg = {"unit": unit, "evt_src": "properties", "time": timestamp, "properties": properties, "invalidated": invalidated}
+        self.task_notify(msg)
+
+    def on_reloading(self, active):
+        #Unit files may change on daemon-reload, UnitFileState is not signaled
+        if not active:
+            timestamp = "{}".format(datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"))
+            msg = {"unit": "", "evt_src": "reload", "time": timestamp}
+            self.task_notify(msg)
+
     #Function for listening the systemd event on dbus
     def subscribe_sysbus(self):
         import dbus
@@ -96,6 +137,12 @@ class MonitorSystemBusTask(ThreadTaskBase):
         manager = dbus.Interface(systemd, 'org.freedesktop.systemd1.Manager')
         manager.Subscribe()
         manager.connect_to_signal('JobRemoved', self.on_job_removed)
+        manager.connect_to_signal('Reloading', self.on_reloading)
+        #systemd sends the PropertiesChanged signal of a unit before the JobRemoved signal of its job
+        bus.add_signal_receiver(self.on_properties_changed, signal_name='PropertiesChanged',
+                                dbus_interface='org.freedesktop.DBus.Properties',
+                                bus_name='org.freedesktop.systemd1', path_keyword='path')
+        self.properties_subscribed.set()
 
         loop = GLib.MainLoop()
         loop.run()
@@ -104,7 +151,10 @@ class MonitorSystemBusTask(ThreadTaskBase):
         if self.task_stopping_event.is_set():
             return
         logger.log_info("Start Listening to systemd bus (pid {0})".format(os.getpid()))
-        self.subscribe_sysbus()
+        try:
+            self.subscribe_sysbus()
+        finally:
+            self.properties_subscribed.clear()
 
     def task_stop(self):
         # Signal the thread to stop
@@ -131,6 +181,12 @@ class Sysmonitor(ThreadTaskBase):
         self.config_db = None
         self.config = Config()
         self.myQ = queue.Queue()
+        self.monitor_system_bus = None
+        #unit -> properties, kept up to date by PropertiesChanged signals while they are subscribed
+        self.unit_properties = {}
+        self.unit_properties_tracked = False
+        #service name -> ALL_SERVICE_STATUS entry, while the entries are written by one pipeline
+        self.status_batch = None
 
     #Sets system ready status to state db
     def post_system_status(self, state):
@@ -280,17 +336,62 @@ class Sysmonitor(ThreadTaskBase):
 
     #Gets the service properties
     def run_systemctl_show(self, service):
-        command = ('systemctl show {} --property=Id,LoadState,UnitFileState,Type,ActiveState,SubState,Result'.format(service))
+        command = ('systemctl show {} --property={}'.format(service, ','.join(UNIT_PROPERTIES)))
         output = utils.run_command(command)
-        srv_properties = output.split('\n')
-        prop_dict = {}
-        for prop in srv_properties:
-            kv = prop.split("=", 1)
-            if len(kv) == 2:
-                prop_dict[kv[0]] = kv[1]
+        return parse_systemctl_show(output)
 
+    #Gets the properties of several services by one systemctl call
+    def run_systemctl_show_units(self, services):
+        if not services:
+            return {}
+        command = ('systemctl show {} --property={}'.format(' '.join(services), ','.join(UNIT_PROPERTIES)))
+        output = utils.run_command(command)
+        if not output:
+            return {}
+        #the units are printed in the order of the arguments, separated by an empty line
+        blocks = output.strip('\n').split('\n\n')
+        if len(blocks) != len(services):
+            logger.log_warning("systemctl show printed {} units for {} services".format(len(blocks), len(services)))
+            return {}
+        return {service: parse_systemctl_show(block) for service, block in zip(services, blocks)}
+
+    #Checks whether the cached unit properties are kept up to date by PropertiesChanged signals
+    def is_unit_properties_tracked(self):
+        tracked = self.monitor_system_bus is not None and self.monitor_system_bus.properties_subscribed.is_set()
+        if tracked != self.unit_properties_tracked:
+            #properties read before the subscription may have changed without a signal
+            self.unit_properties = {}
+            self.unit_properties_tracked = tracked
+        return tracked
+
+    #Gets the service properties from the cache if possible
+    def get_unit_properties(self, service):
+        if self.is_unit_properties_tracked() and service in self.unit_properties:
+            return self.unit_properties[service]
+        prop_dict = self.run_systemctl_show(service)
+        self.unit_properties[service] = prop_dict
         return prop_dict
 
+    #Gets the properties of all services, the services which are not in the cache are read by one systemctl call
+    def get_units_properties(self, services):
+        tracked = self.is_unit_properties_tracked()
+        result = {service: self.unit_properties[service] for service in services if tracked and service in self.unit_properties}
+        missing = [service for service in services if service not in result]
+        props = self.run_systemctl_show_units(missing)
+        self.unit_properties.update(props)
+        result.update(props)
+        return result
+
+    #Updates the cached service properties from a PropertiesChanged signal
+    def update_unit_properties(self, service, properties, invalidated):
+        prop_dict = self.unit_properties.get(service)
+        if prop_dict is None:
+            return
+        if invalidated:
+            self.unit_properties.pop(service)
+        else:
+            prop_dict.update(properties)
+
     #Sets the service status to state db
     def post_unit_status(self, srv_name, srv_status, app_status, fail_reason, update_time):
         if not self.state_db:
@@ -303,10 +404,25 @@ class Sysmonitor(ThreadTaskBase):
         statusvalue['app_ready_status'] = app_status
         statusvalue['fail_reason'] = fail_reason
         statusvalue['update_time'] = update_time
+        if self.status_batch is not None:
+            self.status_batch[srv_name] = statusvalue
+            return
         self.state_db.hmset(self.state_db.STATE_DB, key, statusvalue)
 
+    #Writes the batched service status to state db by one pipeline
+    def flush_unit_status(self):
+        status_batch, self.status_batch = self.status_batch, None
+        if not status_batch:
+            return
+        db = swsscommon.DBConnector("STATE_DB", REDIS_TIMEOUT_MS, True)
+        pipeline = swsscommon.RedisPipeline(db)
+        table = swsscommon.Table(pipeline, "ALL_SERVICE_STATUS", True)
+        for srv_name, statusvalue in status_batch.items():
+            table.set(srv_name, swsscommon.FieldValuePairs(list(statusvalue.items())))
+        pipeline.flush()
+
     #Reads the current status of the service and posts it to state db
-    def get_unit_status(self, event):
+    def get_unit_status(self, event, sysctl_show=None):
         """ Get a unit status"""
         global spl_srv_list
         unit_status = "NOT OK"
@@ -317,7 +433,8 @@ class Sysmonitor(ThreadTaskBase):
             service_up_status = "Down"
             service_name,last_name = event.rsplit('.', 1)
 
-            sysctl_show = self.run_systemctl_show(event)
+            if sysctl_show is None:
+                sysctl_show = self.get_unit_properties(event)
 
             load_state = sysctl_show.get('LoadState')
             if load_state == "loaded":
@@ -384,11 +501,16 @@ class Sysmonitor(ThreadTaskBase):
         scan_srv_list = []
 
         scan_srv_list = self.get_all_service_list()
-        for service in scan_srv_list:
-            ustate = self.get_unit_status(service)
-            if ustate == "NOT OK":
-                if service not in self.dnsrvs_name:
-                    self.dnsrvs_name.add(service)
+        srv_properties = self.get_units_properties(scan_srv_list)
+        self.status_batch = {}
+        try:
+            for service in scan_srv_list:
+                ustate = self.get_unit_status(service, srv_properties.get(service))
+                if ustate == "NOT OK":
+                    if service not in self.dnsrvs_name:
+                        self.dnsrvs_name.add(service)
+        finally:
+            self.flush_unit_status()
 
         if len(self.dnsrvs_name) == 0:
             return "UP"
@@ -479,6 +601,7 @@ class Sysmonitor(ThreadTaskBase):
         try:
             monitor_system_bus = MonitorSystemBusTask(self.myQ)
             monitor_system_bus.task_run()
+            self.monitor_system_bus = monitor_system_bus
 
             monitor_statedb_table = MonitorStateDbTask(self.myQ)
             monitor_statedb_table.task_run()
@@ -500,6 +623,12 @@ class Sysmonitor(ThreadTaskBase):
                 event = msg["unit"]
                 event_src = msg["evt_src"]
                 event_time = msg["time"]
+                if event_src == "properties":
+                    self.update_unit_properties(event, msg["properties"], msg["invalidated"])
+                    continue
+                if event_src == "reload":
+                    self.unit_properties = {}
+                    continue
                 logger.log_debug("Main process- received event:{} from source:{} time:{}".format(event,event_src,event_time))
                 logger.log_info("check_unit_status for [ "+event+" ] ")
                 self.check_unit_status(event)
@@ -1,7 +1,10 @@
 import os
 import signal
+import socket
 import logging
 import subprocess
+import http.client
+import xmlrpc.client
 
 from logging.handlers import SysLogHandler
 from sonic_py_common.syslogger import SysLogger
@@ -66,3 +69,46 @@ def get_uptime():
         uptime_seconds = float(f.readline().split()[0])
 
     return uptime_seconds
+
+
+class UnixStreamHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a unix socket.
+    """
+    def __init__(self, socket_path, timeout):
+        http.client.HTTPConnection.__init__(self, 'localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class UnixStreamTransport(xmlrpc.client.Transport):
+    """
+    XML-RPC transport over a unix socket.
+    """
+    def __init__(self, socket_path, timeout):
+        xmlrpc.client.Transport.__init__(self)
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        return UnixStreamHTTPConnection(self.socket_path, self.timeout)
+
+
+def get_supervisor_process_states(socket_path, timeout):
+    """
+    Utility to get the state of all processes of a supervisord through its XML-RPC interface.
+    :param socket_path: Path of the unix socket of supervisord.
+    :param timeout: Timeout in seconds.
+    :return: A dictionary of process name and state name like "RUNNING", in the same format as "supervisorctl status".
+    """
+    proxy = xmlrpc.client.ServerProxy('http://localhost', transport=UnixStreamTransport(socket_path, timeout))
+    states = {}
+    for info in proxy.supervisor.getAllProcessInfo():
+        # supervisorctl shows group:name for the processes of a group with more than one process
+        name = info['name'] if info['group'] == info['name'] else '{}:{}'.format(info['group'], info['name'])
+        states[name] = info['statename']
+    return states
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Measure the CPU cost of the per-container probes of one ServiceChecker cycle.
+
+A server process emulates --containers containers: every container has a root folder
+with a supervisord XML-RPC socket in it and --processes processes. The modes are:
+    shell  "docker inspect" and "docker exec ... supervisorctl status" per container, run by
+           a fake docker script which prints the answer, so real docker exec costs more
+    rpc    the root folder comes from the container list, supervisord is asked over its socket
+CPU time includes the forked children, the emulated containers are not counted.
+    PYTHONPATH=../sonic-py-common python3 tests/benchmark_service_checker.py --containers 20 --cycles 20
+"""
+
+import argparse
+import os
+import resource
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock
+from xmlrpc.server import SimpleXMLRPCDispatcher, SimpleXMLRPCRequestHandler
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+
+class UnixXMLRPCRequestHandler(SimpleXMLRPCRequestHandler):
+    disable_nagle_algorithm = False
+
+
+class UnixXMLRPCServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer, SimpleXMLRPCDispatcher):
+    daemon_threads = True
+
+    def __init__(self, path):
+        SimpleXMLRPCDispatcher.__init__(self, allow_none=True)
+        socketserver.UnixStreamServer.__init__(self, path, UnixXMLRPCRequestHandler)
+        self.logRequests = False
+
+
+def process_names(processes):
+    return ['process{}'.format(i) for i in range(processes)]
+
+
+def serve(args):
+    """ Emulate the supervisord of every container until stdin is closed """
+    processes = [{'name': name, 'group': name, 'statename': 'RUNNING'} for name in process_names(args.processes)]
+    for i in range(args.containers):
+        server = UnixXMLRPCServer(os.path.join(args.serve, 'ctr{}'.format(i), 'run', 'supervisor.sock'))
+        server.register_function(lambda: processes, 'supervisor.getAllProcessInfo')
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    print('ready', flush=True)
+    sys.stdin.read()
+
+
+def make_containers(root, args):
+    status = ''.join('{:<32} RUNNING   pid {}, uptime 1:03:56\n'.format(name, i) for i, name in enumerate(process_names(args.processes)))
+    for i in range(args.containers):
+        os.makedirs(os.path.join(root, 'ctr{}'.format(i), 'run'))
+        with open(os.path.join(root, 'ctr{}.status'.format(i)), 'w') as f:
+            f.write(status)
+    bin_dir = os.path.join(root, 'bin')
+    os.makedirs(bin_dir)
+    with open(os.path.join(bin_dir, 'docker'), 'w') as f:
+        f.write('#!/bin/sh\n'
+                'if [ "$1" = inspect ]; then echo {root}/$2; else cat {root}/$2.status; fi\n'.format(root=root))
+    os.chmod(os.path.join(bin_dir, 'docker'), 0o755)
+    os.environ['PATH'] = bin_dir + os.pathsep + os.environ['PATH']
+
+
+def cpu_time():
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+
+def run(mode, root, args):
+    from health_checker.service_checker import ServiceChecker
+    checker = ServiceChecker()
+    containers = ['ctr{}'.format(i) for i in range(args.containers)]
+    if mode == 'shell':
+        checker.SUPERVISOR_SOCKET_PATHS = []
+    cpu_start, start = cpu_time(), time.time()
+    for _ in range(args.cycles):
+        if mode == 'rpc':
+            # What get_current_running_containers() keeps from the container list
+            checker.container_attrs = {ctr: {'GraphDriver': {'Data': {'MergedDir': os.path.join(root, ctr)}}} for ctr in containers}
+        else:
+            checker.container_attrs = {}
+        for ctr in containers:
+            checker._get_container_folder(ctr)
+            assert len(checker._get_process_status(ctr)) == args.processes
+    cpu, elapsed = cpu_time() - cpu_start, time.time() - start
+    print('{:>5}: {:>7.1f} ms CPU per cycle, {:>7.1f} ms per cycle'.format(
+        mode, 1000 * cpu / args.cycles, 1000 * elapsed / args.cycles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--containers', type=int, default=20)
+    parser.add_argument('--processes', type=int, default=10, help='processes in every container')
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--modes', default='shell,rpc', help='comma separated modes')
+    parser.add_argument('--serve', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    swsscommon = MagicMock()
+    sys.modules['swsscommon'] = MagicMock(swsscommon=swsscommon)
+    sys.modules['swsscommon.swsscommon'] = swsscommon
+    with tempfile.TemporaryDirectory() as root:
+        make_containers(root, args)
+        server = subprocess.Popen([sys.executable, __file__, '--serve', root, '--containers', str(args.containers),
+                                   '--processes', str(args.processes)], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                  universal_newlines=True)
+        server.stdout.readline()
+        try:
+            print('{} containers, {} processes each, {} cycles'.format(args.containers, args.processes, args.cycles))
+            for mode in args.modes.split(','):
+                run(mode, root, args)
+        finally:
+            server.stdin.close()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -11,10 +11,15 @@
 """
 import copy
 import os
+import shutil
+import socketserver
 import sys
+import tempfile
+import threading
 import docker
 import importlib.util
 import importlib.machinery
+from xmlrpc.server import SimpleXMLRPCDispatcher, SimpleXMLRPCRequestHandler
 from swsscommon import swsscommon
 
 from mock import Mock, MagicMock, patch, call
@@ -35,7 +40,7 @@ from health_checker import utils
 from health_checker.config import Config
 from health_checker.hardware_checker import HardwareChecker
 from health_checker.health_checker import HealthChecker
-from health_checker.manager import HealthCheckerManager
+from health_checker.manager import HealthCheckerManager, LatencyHistogram
 from health_checker.service_checker import ServiceChecker
 from health_checker.user_defined_checker import UserDefinedChecker
 from health_checker.sysmonitor import Sysmonitor
@@ -354,6 +359,48 @@ def test_service_checker_check_by_monit(mock_run):
     assert checker._info['diskCheck'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
 
 
+class UnixXMLRPCRequestHandler(SimpleXMLRPCRequestHandler):
+    disable_nagle_algorithm = False
+
+
+class UnixXMLRPCServer(socketserver.UnixStreamServer, SimpleXMLRPCDispatcher):
+    """ XML-RPC server on a unix socket like supervisord """
+    def __init__(self, path):
+        SimpleXMLRPCDispatcher.__init__(self, allow_none=True)
+        socketserver.UnixStreamServer.__init__(self, path, UnixXMLRPCRequestHandler)
+        self.logRequests = False
+
+
+@patch('health_checker.utils.run_command')
+def test_service_checker_supervisor_rpc(mock_run):
+    tmp_dir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(tmp_dir, 'run'))
+    server = UnixXMLRPCServer(os.path.join(tmp_dir, 'run', 'supervisor.sock'))
+    server.register_function(lambda: [
+        {'name': 'snmpd', 'group': 'snmpd', 'statename': 'RUNNING'},
+        {'name': 'snmp-subagent', 'group': 'snmp-subagent', 'statename': 'EXITED'},
+        {'name': 'ipv4', 'group': 'dhcp-relay', 'statename': 'RUNNING'},
+    ], 'supervisor.getAllProcessInfo')
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        checker = ServiceChecker()
+        checker.container_attrs = {'snmp': {'GraphDriver': {'Data': {'MergedDir': tmp_dir}}}}
+        assert checker._get_process_status('snmp') == {'snmpd': 'RUNNING', 'snmp-subagent': 'EXITED', 'dhcp-relay:ipv4': 'RUNNING'}
+        mock_run.assert_not_called()
+
+        # Fall back to supervisorctl in the container when the socket is not found
+        checker.container_attrs = {}
+        mock_run.side_effect = [os.path.join(tmp_dir, 'notExist'), mock_supervisorctl_output]
+        assert checker._get_process_status('snmp') == {'snmpd': 'RUNNING', 'snmp-subagent': 'EXITED'}
+        assert mock_run.call_args[0][0] == 'docker exec snmp bash -c "supervisorctl status"'
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+        shutil.rmtree(tmp_dir)
+
+
 @patch('swsscommon.swsscommon.ConfigDBConnector.connect', MagicMock())
 @patch('health_checker.service_checker.ServiceChecker._get_container_folder', MagicMock(return_value=test_path))
 @patch('sonic_py_common.multi_asic.is_multi_asic', MagicMock(return_value=False))
@@ -827,6 +874,76 @@ def test_manager(mock_hw_info, mock_service_info, mock_udc_info):
     chassis.set_status_led.side_effect = RuntimeError()
     manager._set_system_led(chassis)
 
+@patch('swsscommon.swsscommon.ConfigDBConnector', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.check', MagicMock())
+@patch('health_checker.service_checker.ServiceChecker.get_info', MagicMock(return_value={}))
+@patch('health_checker.hardware_checker.HardwareChecker.check')
+def test_manager_checker_timeout(mock_hw_check):
+    chassis = MagicMock()
+    manager = HealthCheckerManager()
+    manager.config.checker_timeout = 0.1
+    release = threading.Event()
+
+    def slow_check(config):
+        checker = manager._checkers[1]
+        checker._info = {'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'}, 'fan2': {'type': 'Fan'}}
+        release.wait(5)
+        checker.set_object_not_ok('Fan', 'fan2', 'fan2 is broken')
+
+    def check(config):
+        manager._checkers[1]._info = {'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'}}
+
+    mock_hw_check.side_effect = slow_check
+    stat = manager.check(chassis)
+    assert stat['Hardware'] == {'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'}}
+    assert stat['Internal']['HardwareChecker']['status'] == 'Not OK'
+    assert 'results are partial' in stat['Internal']['HardwareChecker']['message']
+    assert 'ServiceChecker' not in stat['Internal']
+    assert HealthChecker.summary == HealthChecker.STATUS_NOT_OK
+
+    # The unfinished check is not started again
+    stat = manager.check(chassis)
+    assert 'HardwareChecker' in stat['Internal']
+    assert mock_hw_check.call_count == 1
+
+    # Result of the late check is not reported, nor changes the summary of the next check
+    release.set()
+    assert manager._running['HardwareChecker'][1].result()['fan2']['status'] == 'Not OK'
+    mock_hw_check.side_effect = check
+    stat = manager.check(chassis)
+    assert 'Internal' not in stat
+    assert stat['Hardware'] == {'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'}}
+    assert HealthChecker.summary == HealthChecker.STATUS_OK
+    assert mock_hw_check.call_count == 2
+
+    assert manager.latency['HardwareChecker'].count == 2
+    assert manager.latency['HardwareChecker'].timeouts == 2
+    assert manager.latency['ServiceChecker'].count == 3
+    data = manager.latency['ServiceChecker'].to_dict()
+    assert data['le_0.1'] == '3'
+    assert data['le_inf'] == '3'
+    assert data['timeouts'] == '0'
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    for latency in [0.05, 0.3, 0.3, 2, 100]:
+        histogram.add(latency)
+    data = histogram.to_dict()
+    assert data['le_0.1'] == '1'
+    assert data['le_0.5'] == '3'
+    assert data['le_1'] == '3'
+    assert data['le_5'] == '4'
+    assert data['le_60'] == '4'
+    assert data['le_inf'] == '5'
+    assert data['sum'] == '102.650'
+    assert data['last'] == '100.000'
+
+    daemon = HealthDaemon()
+    daemon._publish_latency({'HardwareChecker': histogram})
+    assert MockConnector.data['SYSTEM_HEALTH_CHECKER_LATENCY|HardwareChecker'] == data
+
+
 def test_utils():
     output = utils.run_command('some invalid command')
     assert not output
@@ -1087,6 +1204,112 @@ def test_post_unit_status():
     assert result['app_ready_status'] == 'Down'
     assert result['fail_reason'] == 'mock reason'
 
+@patch('health_checker.utils.run_command')
+def test_run_systemctl_show_units(mock_run):
+    mock_run.return_value = ("Type=notify\nResult=success\nId=mock_bgp.service\nLoadState=loaded\nActiveState=active\n"
+                             "SubState=running\nUnitFileState=enabled\n\n"
+                             "Type=oneshot\nResult=exit-code\nId=mock_ns.service\nLoadState=loaded\nActiveState=failed\n"
+                             "SubState=failed\nUnitFileState=enabled\n")
+    sysmon = Sysmonitor()
+    result = sysmon.run_systemctl_show_units(['mock_bgp.service', 'mock_ns.service'])
+    assert mock_run.call_count == 1
+    assert mock_run.call_args[0][0].startswith('systemctl show mock_bgp.service mock_ns.service --property=')
+    assert result['mock_bgp.service']['SubState'] == 'running'
+    assert result['mock_ns.service']['Result'] == 'exit-code'
+
+    # a unit missing from the output makes the batch unusable
+    assert sysmon.run_systemctl_show_units(['mock_bgp.service', 'mock_ns.service', 'mock_snmp.service']) == {}
+
+
+@patch('health_checker.sysmonitor.Sysmonitor.get_all_service_list', MagicMock(return_value=['mock_snmp.service', 'mock_ns.service']))
+@patch('health_checker.sysmonitor.Sysmonitor.publish_system_status', MagicMock())
+@patch('health_checker.sysmonitor.Sysmonitor.get_app_ready_status', MagicMock(return_value=('Up', '-', '-')))
+@patch('health_checker.sysmonitor.Sysmonitor.run_systemctl_show')
+@patch('health_checker.sysmonitor.Sysmonitor.run_systemctl_show_units')
+def test_get_all_system_status_batch(mock_show_units, mock_show):
+    props = {
+        'mock_snmp.service': {'Type': 'simple', 'Result': 'success', 'Id': 'mock_snmp.service', 'LoadState': 'loaded',
+                              'ActiveState': 'active', 'SubState': 'running', 'UnitFileState': 'enabled'},
+        'mock_ns.service': {'Type': 'oneshot', 'Result': 'exit-code', 'Id': 'mock_ns.service', 'LoadState': 'loaded',
+                            'ActiveState': 'failed', 'SubState': 'failed', 'UnitFileState': 'enabled'},
+    }
+    mock_show_units.side_effect = lambda services: {service: dict(props[service]) for service in services}
+    sysmon = Sysmonitor()
+    sysmon.monitor_system_bus = MonitorSystemBusTask(myQ)
+    sysmon.monitor_system_bus.properties_subscribed.set()
+    with patch.object(swsscommon, 'DBConnector'), \
+         patch.object(swsscommon, 'RedisPipeline') as mock_pipeline, \
+         patch.object(swsscommon, 'Table') as mock_table, \
+         patch.object(swsscommon, 'FieldValuePairs', side_effect=lambda fvs: fvs):
+        assert sysmon.get_all_system_status() == 'DOWN'
+        mock_show_units.assert_called_once_with(['mock_snmp.service', 'mock_ns.service'])
+        assert not mock_show.called
+        # all units are written by one pipeline
+        assert mock_pipeline.return_value.flush.call_count == 1
+        written = {c[0][0]: dict(c[0][1]) for c in mock_table.return_value.set.call_args_list}
+        assert written['mock_snmp']['service_status'] == 'OK'
+        assert written['mock_ns']['service_status'] == 'Down'
+
+        # the next scan is served from the cache kept up to date by PropertiesChanged signals
+        sysmon.update_unit_properties('mock_ns.service', {'ActiveState': 'active', 'SubState': 'exited', 'Result': 'success'}, [])
+        sysmon.get_all_system_status()
+        assert mock_show_units.call_count == 2
+        assert mock_show_units.call_args[0][0] == []
+        assert mock_pipeline.return_value.flush.call_count == 2
+        written = {c[0][0]: dict(c[0][1]) for c in mock_table.return_value.set.call_args_list[2:]}
+        assert written['mock_ns']['service_status'] == 'OK'
+
+        # invalidated properties are read again
+        sysmon.update_unit_properties('mock_ns.service', {}, ['UnitFileState'])
+        sysmon.get_all_system_status()
+        assert mock_show_units.call_args[0][0] == ['mock_ns.service']
+    assert sysmon.status_batch is None
+
+
+def test_unit_properties_cache():
+    sysmon = Sysmonitor()
+    sysmon.run_systemctl_show = MagicMock(return_value={'ActiveState': 'active'})
+    # without the PropertiesChanged subscription the properties are always read
+    sysmon.get_unit_properties('mock_bgp.service')
+    sysmon.get_unit_properties('mock_bgp.service')
+    assert sysmon.run_systemctl_show.call_count == 2
+
+    sysmon.monitor_system_bus = MonitorSystemBusTask(myQ)
+    sysmon.monitor_system_bus.properties_subscribed.set()
+    sysmon.get_unit_properties('mock_bgp.service')
+    sysmon.get_unit_properties('mock_bgp.service')
+    assert sysmon.run_systemctl_show.call_count == 3
+
+    # properties of units which are not cached are not kept
+    sysmon.update_unit_properties('mock_snmp.service', {'ActiveState': 'failed'}, [])
+    assert 'mock_snmp.service' not in sysmon.unit_properties
+    sysmon.update_unit_properties('mock_bgp.service', {'ActiveState': 'failed'}, [])
+    assert sysmon.get_unit_properties('mock_bgp.service') == {'ActiveState': 'failed'}
+
+    sysmon.monitor_system_bus.properties_subscribed.clear()
+    assert not sysmon.is_unit_properties_tracked()
+    assert sysmon.unit_properties == {}
+
+
+def test_monitor_sysbus_properties_changed():
+    task_queue = queue.Queue()
+    sysbus = MonitorSystemBusTask(task_queue)
+    sysbus.on_properties_changed('org.freedesktop.systemd1.Unit',
+                                 {'ActiveState': 'inactive', 'SubState': 'dead', 'ActiveEnterTimestamp': 1},
+                                 ['Result'], path='/org/freedesktop/systemd1/unit/mock_5fbgp_2eservice')
+    msg = task_queue.get_nowait()
+    assert msg['unit'] == 'mock_bgp.service'
+    assert msg['evt_src'] == 'properties'
+    assert msg['properties'] == {'ActiveState': 'inactive', 'SubState': 'dead'}
+    assert msg['invalidated'] == ['Result']
+
+    # changes of other interfaces and untracked properties are not reported
+    sysbus.on_properties_changed('org.freedesktop.systemd1.Mount', {'ActiveState': 'active'}, [],
+                                 path='/org/freedesktop/systemd1/unit/mnt_2emount')
+    sysbus.on_properties_changed('org.freedesktop.systemd1.Unit', {'ActiveEnterTimestamp': 1}, [],
+                                 path='/org/freedesktop/systemd1/unit/mock_5fbgp_2eservice')
+    assert task_queue.empty()
+
 def test_post_system_status():
     sysmon = Sysmonitor()
     sysmon.post_system_status("UP")